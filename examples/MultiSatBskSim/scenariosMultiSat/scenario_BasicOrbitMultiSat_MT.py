@@ -39,8 +39,10 @@ multi-threading only functions for simulations where each Basilisk process can b
 
 .. warning::
 
-    The Basilisk v2.1 multi-threading does not have a thread-safe messaging system.  This will be
-    added in a later release.
+    Messages are not thread-safe by default.  A C++ message that is read by a process running on another thread
+    than its author must be double buffered with ``TheScenario.DoubleBufferMessage(msg)``.  Its writes are then
+    published at the end of each frame, whose period is set with ``TheScenario.TotalSim.setFramePeriod()``,
+    and the results are the same for any number of threads.  C message objects can't be double buffered.
 
 Illustration of Simulation Results
 ----------------------------------
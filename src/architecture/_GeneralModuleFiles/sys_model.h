@@ -48,6 +48,8 @@ public:
 public:
     std::string ModelTag = "";     //!< -- name for the algorithm to base off of
     uint64_t CallCounts = 0;       //!< -- Counts on the model being called
+    uint64_t updateNanos = 0;      //!< [ns] Wall time spent in UpdateState while the task is profiled
+    uint64_t maxUpdateNanos = 0;   //!< [ns] Longest UpdateState call while the task is profiled
     uint32_t RNGSeed = 0x1badcad1; //!< -- Giving everyone a random seed for ease of MC
     int64_t moduleID;              //!< -- Module ID for this module  (handed out by module_id_generator)
 };
@@ -14,13 +14,14 @@ from Basilisk.architecture.swig_common_model import *
 %include "sys_model.h"
 
 %pythonbegin %{
-from typing import Union, Iterable
+from typing import Union, Iterable, Optional
 %}
 
 %extend SysModel
 {
     %pythoncode %{
-        def logger(self, variableNames: Union[str, Iterable[str]], recordingTime: int = 0):
+        def logger(self, variableNames: Union[str, Iterable[str]], recordingTime: int = 0,
+                   stopTime: Optional[int] = None):
             if isinstance(variableNames, str):
                 variableNames = [variableNames]
 
@@ -37,6 +38,6 @@ from typing import Union, Iterable
                                     f"variable of {type(self).__name__}")
 
             from Basilisk.utilities import pythonVariableLogger
-            return pythonVariableLogger.PythonVariableLogger(logging_functions, recordingTime)
+            return pythonVariableLogger.PythonVariableLogger(logging_functions, recordingTime, stopTime)
     %}
 }
@@ -0,0 +1,202 @@
+#
+#  ISC License
+#
+#  Copyright (c) 2023, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+import numpy as np
+import pytest
+from Basilisk.architecture import bskLogging
+from Basilisk.architecture import messaging
+from Basilisk.moduleTemplates import cModuleTemplate
+from Basilisk.utilities import SimulationBaseClass
+from Basilisk.utilities import macros
+
+
+def test_RecorderView():
+    """
+    testing that the recorded payloads read through their numpy dtype match the payloads read through swig
+    """
+
+    bskLogging.setDefaultLogLevel(bskLogging.BSK_WARNING)
+
+    #  Create a sim module as an empty container
+    scSim = SimulationBaseClass.SimBaseClass()
+    dynProcess = scSim.CreateNewProcess("dynamicsProcess")
+    dynProcess.addTask(scSim.CreateNewTask("dynamicsTask", macros.sec2nano(1.)))
+
+    # create modules
+    mod1 = cModuleTemplate.cModuleTemplate()
+    mod1.ModelTag = "cModule1"
+    scSim.AddModelToTask("dynamicsTask", mod1)
+    inputData = messaging.CModuleTemplateMsgPayload()
+    inputData.dataVector = [1, 2, 3]
+    inputDataMsg = messaging.CModuleTemplateMsg().write(inputData)
+    mod1.dataInMsg.subscribeTo(inputDataMsg)
+
+    # setup message recording
+    msgRec = mod1.dataOutMsg.recorder()
+    scSim.AddModelToTask("dynamicsTask", msgRec)
+
+    scSim.InitializeSimulation()
+    scSim.ConfigureStopTime(macros.sec2nano(10.0))
+    scSim.ExecuteSimulation()
+
+    assert messaging.CModuleTemplateMsgPayloadDtype is not None
+    assert messaging.CModuleTemplateMsgPayloadDtype.itemsize == msgRec.getPayloadSize()
+    # the offsets of the fields were checked against offsetof, a dtype with another layout is refused
+    layout = messaging.CModuleTemplateMsgPayloadLayout()
+    assert layout[0] == msgRec.getPayloadSize()
+    shiftedDtype = np.dtype({"names": ["dataVector"], "formats": [("f8", 3)], "offsets": [8], "itemsize": 32})
+    with pytest.raises(ImportError):
+        messaging.checkPayloadDtype(shiftedDtype, [32] + list(layout[1:]), [("dataVector",)])
+
+    records = msgRec.record()()
+    expected = np.array([payload.dataVector for payload in records.iterator()])
+    assert msgRec.dataVector.shape == (11, 3)
+    np.testing.assert_array_equal(msgRec.dataVector, expected)
+    np.testing.assert_array_equal(records.dataVector, expected)
+
+    # the view shares the recorder memory
+    view = msgRec.view()
+    np.testing.assert_array_equal(view["dataVector"], expected)
+    assert not view.flags.writeable
+    np.testing.assert_array_equal(msgRec.times(copy=False), msgRec.times())
+    np.testing.assert_array_equal(msgRec.times(), np.arange(11) * macros.sec2nano(1.0))
+    np.testing.assert_array_equal(msgRec.timesWritten(), msgRec.times())
+
+    # the views keep the records they were created with while the recorder grows and is cleared
+    timesView = msgRec.times(copy=False)
+    scSim.ConfigureStopTime(macros.sec2nano(1000.0))
+    scSim.ExecuteSimulation()
+    assert msgRec.view().shape == (1001,)
+    np.testing.assert_array_equal(view["dataVector"], expected)
+    np.testing.assert_array_equal(timesView, np.arange(11) * macros.sec2nano(1.0))
+
+    # the copies outlive the recorded history
+    dataVector = msgRec.dataVector
+    msgRec.clear()
+    assert len(msgRec.times()) == 0
+    assert msgRec.view().shape == (0,)
+    np.testing.assert_array_equal(dataVector[:11], expected)
+    np.testing.assert_array_equal(view["dataVector"], expected)
+
+
+def test_RecorderModes():
+    """
+    testing the field-selective, decimating, on-change and min/max envelope recording modes
+    """
+
+    bskLogging.setDefaultLogLevel(bskLogging.BSK_WARNING)
+
+    scSim = SimulationBaseClass.SimBaseClass()
+    dynProcess = scSim.CreateNewProcess("dynamicsProcess")
+    dynProcess.addTask(scSim.CreateNewTask("dynamicsTask", macros.sec2nano(1.)))
+
+    mod1 = cModuleTemplate.cModuleTemplate()
+    mod1.ModelTag = "cModule1"
+    scSim.AddModelToTask("dynamicsTask", mod1)
+    inputData = messaging.CModuleTemplateMsgPayload()
+    inputData.dataVector = [1, 2, 3]
+    inputDataMsg = messaging.CModuleTemplateMsg().write(inputData)
+    mod1.dataInMsg.subscribeTo(inputDataMsg)
+
+    fullRec = mod1.dataOutMsg.recorder()
+    fieldRec = mod1.dataOutMsg.recorder(fields=["dataVector"], every=2)
+    inputRec = mod1.dataInMsg.recorder(fields=["dataVector"], onChange=True)
+    envelopeRec = mod1.dataOutMsg.recorder(fields=["dataVector"], envelope=4)
+    for rec in [fullRec, fieldRec, inputRec, envelopeRec]:
+        scSim.AddModelToTask("dynamicsTask", rec)
+
+    scSim.InitializeSimulation()
+    scSim.ConfigureStopTime(macros.sec2nano(10.0))
+    scSim.ExecuteSimulation()
+
+    expected = fullRec.dataVector
+    np.testing.assert_array_equal(fieldRec.dataVector, expected[::2])
+    np.testing.assert_array_equal(fieldRec.times(), fullRec.times()[::2])
+    assert fieldRec.view().dtype.names == ("dataVector",)
+
+    # the input message never changes
+    np.testing.assert_array_equal(inputRec.dataVector, [[1, 2, 3]])
+    np.testing.assert_array_equal(inputRec.times(), [0])
+
+    envelope = envelopeRec.dataVector
+    assert envelope.shape == (3, 2, 3)
+    for k, window in enumerate([slice(0, 4), slice(4, 8), slice(8, 11)]):
+        np.testing.assert_array_equal(envelope[k, 0], expected[window].min(axis=0))
+        np.testing.assert_array_equal(envelope[k, 1], expected[window].max(axis=0))
+    np.testing.assert_array_equal(envelopeRec.times(), fullRec.times()[[3, 7, 10]])
+
+    # the envelope fields must be doubles, also when the recorder is set up without configure()
+    with pytest.raises(ValueError):
+        messaging.SCStatesMsg().recorder(fields=["MRPSwitchCount"], envelope=4)
+    intRec = messaging.SCStatesMsg().recorder()
+    intRec.addField(messaging.SCStatesMsgPayloadDtype.fields["MRPSwitchCount"][1], 4)
+    intRec.recordEnvelope(4)
+    assert intRec.getEnvelopeWindow() == 0
+
+
+def test_RecorderBounded(tmp_path):
+    """
+    testing the ring buffer and spill file recording modes
+    """
+
+    bskLogging.setDefaultLogLevel(bskLogging.BSK_WARNING)
+
+    scSim = SimulationBaseClass.SimBaseClass()
+    dynProcess = scSim.CreateNewProcess("dynamicsProcess")
+    dynProcess.addTask(scSim.CreateNewTask("dynamicsTask", macros.sec2nano(1.)))
+
+    mod1 = cModuleTemplate.cModuleTemplate()
+    mod1.ModelTag = "cModule1"
+    scSim.AddModelToTask("dynamicsTask", mod1)
+
+    fullRec = mod1.dataOutMsg.recorder()
+    ringRec = mod1.dataOutMsg.recorder(capacity=4)
+    ringFieldRec = mod1.dataOutMsg.recorder(fields=["dataVector"], capacity=3)
+    spillRec = mod1.dataOutMsg.recorder(spillFile=tmp_path / "dataOut.bin", spillChunk=3)
+    spillFieldRec = mod1.dataOutMsg.recorder(fields=["dataVector"], spillFile=tmp_path / "dataVector.bin",
+                                             spillChunk=2)
+    for rec in [fullRec, ringRec, ringFieldRec, spillRec, spillFieldRec]:
+        scSim.AddModelToTask("dynamicsTask", rec)
+
+    scSim.InitializeSimulation()
+    scSim.ConfigureStopTime(macros.sec2nano(5.0))
+    scSim.ExecuteSimulation()
+    # the records of the first part are read from the spill file while the simulation is not finished
+    np.testing.assert_array_equal(spillRec.dataVector, fullRec.dataVector)
+    scSim.ConfigureStopTime(macros.sec2nano(10.0))
+    scSim.ExecuteSimulation()
+
+    expected = fullRec.dataVector
+    np.testing.assert_array_equal(ringRec.dataVector, expected[-4:])
+    np.testing.assert_array_equal(ringRec.times(), fullRec.times()[-4:])
+    assert ringRec.view().shape == (4,)
+    # the ring buffers overwrite their oldest records in place
+    assert ringRec.getRingHead() == 11 % 4
+    np.testing.assert_array_equal(ringFieldRec.dataVector, expected[-3:])
+    np.testing.assert_array_equal(ringFieldRec.times(), fullRec.times()[-3:])
+
+    for rec in [spillRec, spillFieldRec]:
+        np.testing.assert_array_equal(rec.dataVector, expected)
+        np.testing.assert_array_equal(rec.times(), fullRec.times())
+        np.testing.assert_array_equal(rec.timesWritten(), fullRec.timesWritten())
+        assert rec.getSpilledCount() == len(expected)
+
+
+if __name__ == "__main__":
+    test_RecorderView()
+    test_RecorderModes()
@@ -0,0 +1,32 @@
+/*
+ISC License
+
+Copyright (c) 2016, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+
+Permission to use, copy, modify, and/or distribute this software for any
+        purpose with or without fee is hereby granted, provided that the above
+copyright notice and this permission notice appear in all copies.
+
+THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+        ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+        OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+*/
+
+#ifndef MESSAGE_BUFFER_H
+#define MESSAGE_BUFFER_H
+
+/*! Base class of the buffers that hold the writes to a message until the simulation publishes them at a frame
+    boundary, see ``Message::doubleBuffer()``.  The simulation shares the ownership of the buffers it publishes, see
+    ``SimModel::addMessageBuffer()``, so a buffer outlives the message it belongs to. */
+class MessageBuffer{
+public:
+    virtual ~MessageBuffer(){};
+    //! copy the last buffered write into the message read by the subscribers
+    virtual void publish() = 0;
+};
+
+#endif /* MESSAGE_BUFFER_H */
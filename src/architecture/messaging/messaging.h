@@ -20,9 +20,16 @@ ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
 #include "architecture/_GeneralModuleFiles/sys_model.h"
 #include <vector>
 #include "architecture/messaging/msgHeader.h"
+#include "architecture/messaging/messageBuffer.h"
 #include "architecture/utilities/bskLogging.h"
 #include <typeinfo>
 #include <stdlib.h>
+#include <stdint.h>
+#include <string.h>
+#include <stdio.h>
+#include <string>
+#include <algorithm>
+#include <memory>
 
 /*! forward-declare sim message for use by read functor */
 template<typename messageType>
@@ -172,6 +179,40 @@ public:
 template<typename messageType>
 class Recorder;
 
+#ifndef SWIG
+/*! Write buffer of a double buffered message */
+template<typename messageType>
+class DoubleBuffer : public MessageBuffer{
+public:
+    messageType payload = {};   //!< the payload written during the frame
+    MsgHeader header = {};      //!< the header written during the frame
+
+    //! constructor, from the payload and header read by the subscribers
+    DoubleBuffer(messageType *publishedPayload, MsgHeader *publishedHeader) :
+        publishedPayload(publishedPayload), publishedHeader(publishedHeader){};
+
+    void publish(){
+        if (!this->publishedPayload || !this->header.isWritten) {
+            return;
+        }
+        *this->publishedPayload = this->payload;
+        this->publishedHeader->isWritten = 1;
+        this->publishedHeader->timeWritten = this->header.timeWritten;
+        this->publishedHeader->moduleID = this->header.moduleID;
+    }
+
+    //! stop publishing, once the message the buffer belongs to is destroyed
+    void detach(){
+        this->publishedPayload = nullptr;
+        this->publishedHeader = nullptr;
+    }
+
+private:
+    messageType *publishedPayload;  //!< payload read by the subscribers
+    MsgHeader *publishedHeader;     //!< header read by the subscribers
+};
+#endif
+
 /*!
  * base class template for bsk messages
  */
@@ -182,6 +223,15 @@ private:
     MsgHeader header = {};      //!< struct defining the message header, zero'd on creation
     ReadFunctor<messageType> read = ReadFunctor<messageType>(&payload, &header);  //!< read functor instance
 public:
+    //! constructor
+    Message() = default;
+    //! copy constructor, the copy of a double buffered message has its own buffer
+    Message(const Message<messageType> &source);
+    //! copy assignment, the copy of a double buffered message has its own buffer
+    Message<messageType>& operator=(const Message<messageType> &source);
+    //! destructor, stops the simulation from publishing the buffer into the destroyed message
+    ~Message();
+
     //! write functor to this message
     WriteFunctor<messageType> write = WriteFunctor<messageType>(&payload, &header);
     //! -- request read rights. returns reference to class ``read`` variable
@@ -204,8 +254,62 @@ public:
 
     //! Return the memory size of the payload, be careful about dynamically sized things
     uint64_t getPayloadSize() {return sizeof(messageType);};
+
+    //! -- make the writes visible to the subscribers only when the simulation publishes them, returns the buffer
+    std::shared_ptr<MessageBuffer> doubleBuffer();
+
+private:
+    //! copy the content of the source message, and give this message its own buffer if the source has one
+    void copyFrom(const Message<messageType> &source);
+
+    std::shared_ptr<DoubleBuffer<messageType>> buffer;  //!< write buffer, if the message is double buffered
 };
 
+/*! Copying a message that is not double buffered copies its read and write functors, which keep pointing to the
+    source message.  The copy of a double buffered message is a message of its own: it reads its own payload, and
+    writes to its own buffer.  That buffer is not published until it is passed to ``SimModel::addMessageBuffer()``.
+ */
+template<typename messageType>
+Message<messageType>::Message(const Message<messageType> &source){
+    this->copyFrom(source);
+}
+
+template<typename messageType>
+Message<messageType>& Message<messageType>::operator=(const Message<messageType> &source){
+    if (this != &source) {
+        if (this->buffer) {
+            this->buffer->detach();
+            this->buffer.reset();
+        }
+        this->copyFrom(source);
+    }
+    return *this;
+}
+
+template<typename messageType>
+Message<messageType>::~Message(){
+    if (this->buffer) {
+        this->buffer->detach();
+    }
+}
+
+template<typename messageType>
+void Message<messageType>::copyFrom(const Message<messageType> &source){
+    this->payload = source.payload;
+    this->header = source.header;
+    this->zeroMsgPayload = source.zeroMsgPayload;
+    if (!source.buffer) {
+        this->read = source.read;
+        this->write = source.write;
+        return;
+    }
+    this->read = ReadFunctor<messageType>(&this->payload, &this->header);
+    this->buffer = std::make_shared<DoubleBuffer<messageType>>(&this->payload, &this->header);
+    this->buffer->header = source.buffer->header;
+    this->buffer->payload = source.buffer->payload;
+    this->write = WriteFunctor<messageType>(&this->buffer->payload, &this->buffer->header);
+}
+
 
 template<typename messageType>
 ReadFunctor<messageType> Message<messageType>::addSubscriber(){
@@ -218,6 +322,23 @@ WriteFunctor<messageType> Message<messageType>::addAuthor(){
     return this->write;
 }
 
+/*! Double buffer the message, for messages read by processes that run on other threads.  The writes to the message
+    go to a buffer, and the subscribers only see them once the simulation publishes the buffer at the end of a frame,
+    see ``SimModel::addMessageBuffer()``.  The simulation results are then the same however the processes are spread
+    across threads.  Authors that were added before the message is double buffered keep writing to the message.
+ @return the buffer, to be passed to ``SimModel::addMessageBuffer()``
+ */
+template<typename messageType>
+std::shared_ptr<MessageBuffer> Message<messageType>::doubleBuffer(){
+    if (!this->buffer) {
+        this->buffer = std::make_shared<DoubleBuffer<messageType>>(&this->payload, &this->header);
+        this->buffer->header = this->header;
+        this->buffer->payload = this->payload;
+        this->write = WriteFunctor<messageType>(&this->buffer->payload, &this->buffer->header);
+    }
+    return this->buffer;
+}
+
 template<typename messageType>
 messageType* Message<messageType>::subscribeRaw(MsgHeader **msgPtr){
     *msgPtr = &this->header;
@@ -231,6 +352,66 @@ messageType* Message<messageType>::getMsgPointers(MsgHeader **msgPtr){
     return &this->payload;
 }
 
+/*! Block of recorder memory exported to python. The memory stays valid, and unchanged, as long as the block
+    exists, see ``RecordStorage`` */
+class RecordBlock{
+public:
+#ifndef SWIG
+    //! constructor, from the owner of the memory and the first exported record
+    RecordBlock(std::shared_ptr<const void> memory, const void* data) : memory(memory), data(data){};
+#endif
+    //! address of the first exported record
+    uint64_t address(){return (uint64_t) (uintptr_t) this->data;};
+
+private:
+    std::shared_ptr<const void> memory;     //!< keeps the exported memory alive
+    const void* data;                       //!< first exported record
+};
+
+#ifndef SWIG
+/*! Contiguous records of a recorder, which can be exported to python as ``RecordBlock``.  While a block exists the
+    recorder does not modify or move the exported memory: before the records are modified in place, or moved by
+    the growth of the vector, they are copied to a new vector that the recorder continues with */
+template<typename T>
+class RecordStorage{
+public:
+    //! the records
+    std::vector<T>& get(){return *this->records;};
+    //! number of records
+    size_t size() const {return this->records->size();};
+    //! the records, to modify in place
+    std::vector<T>& modify(){
+        if (this->records.use_count() > 1) {
+            this->detach(this->records->capacity());
+        }
+        return *this->records;
+    };
+    //! append records, which only copies them to a new vector if they are exported and the vector is full
+    void append(const T* first, const T* last){
+        size_t size = this->records->size() + (last - first);
+        if (this->records.use_count() > 1 && size > this->records->capacity()) {
+            this->detach(std::max(2*this->records->capacity(), size));
+        }
+        this->records->insert(this->records->end(), first, last);
+    };
+    //! append a record
+    void push_back(const T& value){this->append(&value, &value + 1);};
+    //! export the records from index ``first`` on
+    RecordBlock block(size_t first) const {return RecordBlock(this->records, this->records->data() + first);};
+
+private:
+    //! continue with a copy of the records, the exported vector is released with its last block
+    void detach(size_t capacity){
+        auto copy = std::make_shared<std::vector<T>>();
+        copy->reserve(capacity);
+        copy->assign(this->records->begin(), this->records->end());
+        this->records = copy;
+    };
+
+    std::shared_ptr<std::vector<T>> records = std::make_shared<std::vector<T>>();  //!< the records
+};
+#endif
+
 /*! Keep a time history of messages accessible to users from python */
 template<typename messageType>
 class Recorder : public SysModel{
@@ -276,25 +457,181 @@ public:
     //! -- Read and record the message
     void UpdateState(uint64_t CurrentSimNanos){
         if (CurrentSimNanos >= this->nextUpdateTime) {
-            this->msgRecordTimes.push_back(CurrentSimNanos);
-            this->msgWrittenTimes.push_back(this->readMessage.timeWritten());
-            this->msgRecord.push_back(this->readMessage());
             this->nextUpdateTime += this->timeInterval;
+            this->sampleCount++;
+            if ((this->sampleCount - 1) % this->decimation != 0) {
+                return;
+            }
+            const messageType& payload = this->readMessage();
+            uint64_t index;
+            if (this->fieldOffsets.empty()) {
+                if (this->onChange && this->isUnchanged((const uint8_t*) &payload, sizeof(messageType))) {
+                    return;
+                }
+                index = this->nextIndex();
+                this->storeRows(this->msgRecord, &payload, 1, index);
+            } else if (!this->recordFields(payload, index)) {
+                return;
+            }
+            uint64_t timeWritten = this->readMessage.timeWritten();
+            this->storeRows(this->msgRecordTimes, &CurrentSimNanos, 1, index);
+            this->storeRows(this->msgWrittenTimes, &timeWritten, 1, index);
+            if (!this->spillFileName.empty() && this->msgRecordTimes.size() >= this->spillChunk) {
+                this->flush();
+            }
         }
     };
     //! Reset method
     void Reset(uint64_t CurrentSimNanos){
-        this->msgRecord.clear();    //!< -- Can only reset to 0 for now
-        this->msgRecordTimes.clear();
-        this->msgWrittenTimes.clear();
+        this->clear();    //!< -- Can only reset to 0 for now
         this->nextUpdateTime = CurrentSimNanos;
     };
     //! time recorded method
-    std::vector<uint64_t>& times(){return this->msgRecordTimes;}
+    std::vector<uint64_t>& times(){return this->msgRecordTimes.get();}
     //! time written method
-    std::vector<uint64_t>& timesWritten(){return this->msgWrittenTimes;}
+    std::vector<uint64_t>& timesWritten(){return this->msgWrittenTimes.get();}
     //! record method
-    std::vector<messageType>& record(){return this->msgRecord;};
+    std::vector<messageType>& record(){return this->msgRecord.get();};
+
+    //! number of recorded messages held in memory
+    uint64_t getRecordCount(){return this->msgRecordTimes.size();};
+    //! memory size of a recorded payload
+    uint64_t getPayloadSize(){return sizeof(messageType);};
+    //! contiguous recorded payloads, lets python view them without a copy
+    RecordBlock recordBlock(){return this->msgRecord.block(0);};
+    //! contiguous record times
+    RecordBlock timesBlock(){return this->msgRecordTimes.block(0);};
+    //! contiguous written times
+    RecordBlock timesWrittenBlock(){return this->msgWrittenTimes.block(0);};
+    /*! index in the record vectors of the oldest record. It is only non-zero once a ring buffer is full, the records
+     are then stored from this index to the end of the vectors followed by the start of the vectors */
+    uint64_t getRingHead(){return this->ringHead;};
+
+    /*! record only a field of the payload, given by its byte offset and size in the payload, and whether it only
+     holds doubles. The selected fields are packed in their order of selection into the field record instead of
+     recording the whole payload */
+    void addField(uint64_t offset, uint64_t size, bool doubles = false){
+        if (offset + size > sizeof(messageType)) {
+            bskLogger.bskLog(BSK_ERROR, "Recorder: the field at offset %llu of size %llu is outside of the payload.",
+                             (unsigned long long) offset, (unsigned long long) size);
+            return;
+        }
+        if (this->envelopeWindow > 0 && !(doubles && size % sizeof(double) == 0)) {
+            bskLogger.bskLog(BSK_ERROR, "Recorder: the field at offset %llu is not made of doubles, it cannot be "
+                             "added to a min/max envelope.", (unsigned long long) offset);
+            return;
+        }
+        this->fieldOffsets.push_back(offset);
+        this->fieldSizes.push_back(size);
+        this->fieldDoubles.push_back(doubles && size % sizeof(double) == 0);
+        this->fieldRowSize += size;
+        this->fieldRow.resize(this->fieldRowSize);
+    };
+    //! number of selected fields, zero if the whole payload is recorded
+    uint64_t getFieldCount(){return this->fieldOffsets.size();};
+    //! byte offset in the payload of a selected field
+    uint64_t getFieldOffset(uint64_t index){return this->fieldOffsets.at(index);};
+    //! contiguous field record, each record holds the packed selected fields
+    RecordBlock fieldRecordBlock(){return this->fieldRecord.block(0);};
+    //! only keep one out of every ``n`` samples
+    void recordEvery(uint64_t n){this->decimation = n > 0 ? n : 1;};
+    //! only record a sample if the recorded fields, or the whole payload, differ from the previous record
+    void recordOnChange(bool flag){this->onChange = flag;};
+    /*! only compare these bytes of the records in on change mode, given by their offset and size in a record. They
+     are the values of the fields, without the padding between them, which can differ between equal samples */
+    void addChangeRange(uint64_t offset, uint64_t size){
+        if (offset + size > this->recordRowSize()) {
+            bskLogger.bskLog(BSK_ERROR, "Recorder: the compared bytes at offset %llu of size %llu are outside of "
+                             "the record.", (unsigned long long) offset, (unsigned long long) size);
+            return;
+        }
+        this->changeOffsets.push_back(offset);
+        this->changeSizes.push_back(size);
+    };
+    /*! record the minimum and the maximum of every selected field over windows of ``windowSamples`` samples instead
+     of the samples. The selected fields must be doubles. A record holds the packed minima followed by the packed
+     maxima, with the times of the last sample of the window */
+    void recordEnvelope(uint64_t windowSamples){
+        if (windowSamples > 0 && (this->fieldDoubles.empty() ||
+            std::find(this->fieldDoubles.begin(), this->fieldDoubles.end(), false) != this->fieldDoubles.end())) {
+            bskLogger.bskLog(BSK_ERROR, "Recorder: a min/max envelope can only be recorded for selected fields made "
+                             "of doubles.");
+            return;
+        }
+        this->envelopeWindow = windowSamples;
+        this->envelopeCount = 0;
+    };
+    //! number of samples of a min/max envelope window, 0 if the samples are recorded
+    uint64_t getEnvelopeWindow(){return this->envelopeWindow;};
+    //! memory size of a record, the payload or the packed recorded fields
+    uint64_t recordRowSize(){
+        if (this->fieldOffsets.empty()) {
+            return sizeof(messageType);
+        }
+        return this->envelopeWindow > 0 ? 2*this->fieldRowSize : this->fieldRowSize;
+    };
+
+    /*! only keep the latest ``n`` records, 0 to keep all of them. The records are kept in a ring buffer of ``n``
+     records, in which each new record overwrites the oldest one once it is full, see ``getRingHead()`` */
+    void setCapacity(uint64_t n){
+        this->unwrapRing();
+        uint64_t count = this->msgRecordTimes.size();
+        if (n > 0 && count > n) {
+            this->dropRecords(count - n);
+        }
+        this->capacity = n;
+        this->msgRecordTimes.modify().reserve(n);
+        this->msgWrittenTimes.modify().reserve(n);
+    };
+    //! maximum number of records kept, 0 if unbounded
+    uint64_t getCapacity(){return this->capacity;};
+    /*! stream the records to the file ``fileName`` in chunks of ``chunkRecords`` records instead of keeping them
+     in memory. Each record is appended to the file as its time, its written time and the record bytes. The file
+     is replaced by an empty file now and whenever the recorder is reset or cleared, which discards the records of
+     earlier simulations: use another file name to keep them */
+    void setSpillFile(std::string fileName, uint64_t chunkRecords){
+        this->spillFileName = fileName;
+        this->spillChunk = chunkRecords > 0 ? chunkRecords : 1;
+        this->truncateSpillFile();
+    };
+    //! name of the spill file, empty if the records are kept in memory
+    std::string getSpillFile(){return this->spillFileName;};
+    //! number of records written to the spill file
+    uint64_t getSpilledCount(){return this->spilledCount;};
+    //! append the records held in memory to the spill file and release them, except an unfinished envelope window
+    void flush(){
+        uint64_t count = this->msgRecordTimes.size();
+        if (this->envelopeWindow > 0 && this->envelopeCount > 0 && count > 0) {
+            count--;
+        }
+        if (this->spillFileName.empty() || count == 0) {
+            return;
+        }
+        uint64_t rowSize = this->recordRowSize();
+        uint64_t fileRowSize = 2*sizeof(uint64_t) + rowSize;
+        const uint8_t* records = this->fieldOffsets.empty() ? (const uint8_t*) this->msgRecord.get().data()
+                                                              : this->fieldRecord.get().data();
+        this->spillBuffer.resize(count*fileRowSize);
+        for (uint64_t k = 0; k < count; k++) {
+            uint8_t* row = &this->spillBuffer[k*fileRowSize];
+            memcpy(row, &this->msgRecordTimes.get()[k], sizeof(uint64_t));
+            memcpy(row + sizeof(uint64_t), &this->msgWrittenTimes.get()[k], sizeof(uint64_t));
+            memcpy(row + 2*sizeof(uint64_t), records + k*rowSize, rowSize);
+        }
+        FILE* spillFile = fopen(this->spillFileName.c_str(), "ab");
+        if (spillFile == NULL) {
+            bskLogger.bskLog(BSK_ERROR, "Recorder: could not open the spill file %s.", this->spillFileName.c_str());
+            return;
+        }
+        size_t written = fwrite(this->spillBuffer.data(), 1, this->spillBuffer.size(), spillFile);
+        fclose(spillFile);
+        if (written != this->spillBuffer.size()) {
+            bskLogger.bskLog(BSK_ERROR, "Recorder: could not write to the spill file %s.", this->spillFileName.c_str());
+            return;
+        }
+        this->spilledCount += count;
+        this->dropRecords(count);
+    };
 
     //! determine message name
     std::string findMsgName(std::string msgName) {
@@ -317,9 +654,15 @@ public:
 
     //! clear the recorded messages, i.e. purge the history
     void clear(){
-        this->msgRecord.clear();
-        this->msgRecordTimes.clear();
-        this->msgWrittenTimes.clear();
+        this->msgRecord.modify().clear();
+        this->msgRecordTimes.modify().clear();
+        this->msgWrittenTimes.modify().clear();
+        this->fieldRecord.modify().clear();
+        this->ringHead = 0;
+        this->lastRecord.clear();
+        this->sampleCount = 0;
+        this->envelopeCount = 0;
+        this->truncateSpillFile();
     };
 
     BSKLogger bskLogger;                          //!< -- BSK Logging
@@ -330,11 +673,170 @@ public:
     };
 
 private:
-    std::vector<messageType> msgRecord;           //!< vector of recorded messages
-    std::vector<uint64_t> msgRecordTimes;         //!< vector of times at which messages are recorded
-    std::vector<uint64_t> msgWrittenTimes;        //!< vector of times at which messages are written
+    /*! copy the selected fields of a sample into the field record, returns false if nothing was recorded. Sets
+     ``index`` to the index of the record the times of the sample go to */
+    bool recordFields(const messageType& payload, uint64_t& index){
+        const uint8_t* source = (const uint8_t*) &payload;
+        uint64_t position = 0;
+        for (size_t i = 0; i < this->fieldOffsets.size(); i++) {
+            memcpy(&this->fieldRow[position], source + this->fieldOffsets[i], this->fieldSizes[i]);
+            position += this->fieldSizes[i];
+        }
+
+        if (this->envelopeWindow > 0) {
+            // the envelope of a window is a record of the min values followed by the max values
+            if (this->envelopeCount == 0) {
+                index = this->nextIndex();
+                this->envelopeRow.resize(2*this->fieldRowSize);
+                memcpy(this->envelopeRow.data(), this->fieldRow.data(), this->fieldRowSize);
+                memcpy(this->envelopeRow.data() + this->fieldRowSize, this->fieldRow.data(), this->fieldRowSize);
+                this->storeRows(this->fieldRecord, this->envelopeRow.data(), 2*this->fieldRowSize, index);
+            } else {
+                // the current window is the latest record, its times become those of the latest sample
+                index = this->ringHead > 0 ? this->ringHead - 1 : this->msgRecordTimes.size() - 1;
+                uint8_t* minRow = &this->fieldRecord.modify()[index*2*this->fieldRowSize];
+                uint8_t* maxRow = minRow + this->fieldRowSize;
+                double value, minValue, maxValue;
+                for (uint64_t k = 0; k + sizeof(double) <= this->fieldRowSize; k += sizeof(double)) {
+                    memcpy(&value, &this->fieldRow[k], sizeof(double));
+                    memcpy(&minValue, minRow + k, sizeof(double));
+                    memcpy(&maxValue, maxRow + k, sizeof(double));
+                    minValue = std::min(minValue, value);
+                    maxValue = std::max(maxValue, value);
+                    memcpy(minRow + k, &minValue, sizeof(double));
+                    memcpy(maxRow + k, &maxValue, sizeof(double));
+                }
+            }
+            this->envelopeCount = (this->envelopeCount + 1) % this->envelopeWindow;
+            return true;
+        }
+
+        if (this->onChange && this->isUnchanged(this->fieldRow.data(), this->fieldRowSize)) {
+            return false;
+        }
+        index = this->nextIndex();
+        this->storeRows(this->fieldRecord, this->fieldRow.data(), this->fieldRowSize, index);
+        return true;
+    };
+
+    //! whether the compared bytes of a sample are identical to the last record, otherwise it becomes the last record
+    bool isUnchanged(const uint8_t* sample, uint64_t size){
+        if (!this->lastRecord.empty()) {
+            bool unchanged = true;
+            if (this->changeOffsets.empty()) {
+                unchanged = memcmp(this->lastRecord.data(), sample, size) == 0;
+            }
+            for (size_t i = 0; i < this->changeOffsets.size() && unchanged; i++) {
+                unchanged = memcmp(this->lastRecord.data() + this->changeOffsets[i], sample + this->changeOffsets[i],
+                                   this->changeSizes[i]) == 0;
+            }
+            if (unchanged) {
+                return true;
+            }
+        }
+        this->lastRecord.assign(sample, sample + size);
+        return false;
+    };
+
+    /*! index of the next record in the record vectors: the end of the vectors, or the oldest record once the ring
+     buffer is full */
+    uint64_t nextIndex(){
+        uint64_t count = this->msgRecordTimes.size();
+        if (this->capacity == 0 || count < this->capacity) {
+            return count;
+        }
+        uint64_t index = this->ringHead;
+        this->ringHead = (this->ringHead + 1) % this->capacity;
+        return index;
+    };
+
+    //! append a record of ``length`` elements if ``index`` is the end of the record vectors, otherwise overwrite it
+    template<typename T>
+    void storeRows(RecordStorage<T>& storage, const T* row, uint64_t length, uint64_t index){
+        if (index*length == storage.size()) {
+            storage.append(row, row + length);
+        } else {
+            std::copy(row, row + length, storage.modify().begin() + index*length);
+        }
+    };
+
+    //! store the records of a full ring buffer from the oldest to the latest
+    void unwrapRing(){
+        if (this->ringHead == 0) {
+            return;
+        }
+        std::vector<uint64_t>& times = this->msgRecordTimes.modify();
+        std::vector<uint64_t>& writtenTimes = this->msgWrittenTimes.modify();
+        std::rotate(times.begin(), times.begin() + this->ringHead, times.end());
+        std::rotate(writtenTimes.begin(), writtenTimes.begin() + this->ringHead, writtenTimes.end());
+        if (this->fieldOffsets.empty()) {
+            std::vector<messageType>& records = this->msgRecord.modify();
+            std::rotate(records.begin(), records.begin() + this->ringHead, records.end());
+        } else {
+            std::vector<uint8_t>& fieldRecord = this->fieldRecord.modify();
+            std::rotate(fieldRecord.begin(), fieldRecord.begin() + this->ringHead*this->recordRowSize(),
+                        fieldRecord.end());
+        }
+        this->ringHead = 0;
+    };
+
+    //! drop the oldest ``count`` records held in memory
+    void dropRecords(uint64_t count){
+        std::vector<uint64_t>& times = this->msgRecordTimes.modify();
+        std::vector<uint64_t>& writtenTimes = this->msgWrittenTimes.modify();
+        times.erase(times.begin(), times.begin() + count);
+        writtenTimes.erase(writtenTimes.begin(), writtenTimes.begin() + count);
+        if (this->fieldOffsets.empty()) {
+            std::vector<messageType>& records = this->msgRecord.modify();
+            records.erase(records.begin(), records.begin() + count);
+        } else {
+            std::vector<uint8_t>& fieldRecord = this->fieldRecord.modify();
+            fieldRecord.erase(fieldRecord.begin(), fieldRecord.begin() + count*this->recordRowSize());
+        }
+    };
+
+    /*! replace the spill file by an empty file. The earlier file is removed first, so that the memory maps of its
+     records that python may still hold stay valid on the systems that allow it */
+    void truncateSpillFile(){
+        this->spilledCount = 0;
+        if (this->spillFileName.empty()) {
+            return;
+        }
+        remove(this->spillFileName.c_str());
+        FILE* spillFile = fopen(this->spillFileName.c_str(), "wb");
+        if (spillFile == NULL) {
+            bskLogger.bskLog(BSK_ERROR, "Recorder: could not create the spill file %s.", this->spillFileName.c_str());
+            return;
+        }
+        fclose(spillFile);
+    };
+
+    RecordStorage<messageType> msgRecord;         //!< vector of recorded messages
+    RecordStorage<uint64_t> msgRecordTimes;       //!< vector of times at which messages are recorded
+    RecordStorage<uint64_t> msgWrittenTimes;      //!< vector of times at which messages are written
     uint64_t nextUpdateTime = 0;                  //!< [ns] earliest time at which the msg is recorded again
     uint64_t timeInterval;                        //!< [ns] recording time intervale
+    std::vector<uint64_t> fieldOffsets;           //!< [-] byte offsets of the recorded fields in the payload
+    std::vector<uint64_t> fieldSizes;             //!< [-] byte sizes of the recorded fields
+    std::vector<bool> fieldDoubles;               //!< flags of the recorded fields that only hold doubles
+    uint64_t fieldRowSize = 0;                    //!< [-] byte size of the packed recorded fields
+    std::vector<uint8_t> fieldRow;                //!< packed recorded fields of the current sample
+    RecordStorage<uint8_t> fieldRecord;           //!< packed recorded fields of all the records
+    uint64_t decimation = 1;                      //!< [-] only one out of every decimation samples is kept
+    uint64_t sampleCount = 0;                     //!< [-] number of samples since the last reset
+    bool onChange = false;                        //!< flag to only record samples that differ from the last record
+    uint64_t envelopeWindow = 0;                  //!< [-] number of samples of a min/max envelope window, 0 for none
+    uint64_t envelopeCount = 0;                   //!< [-] number of samples in the current envelope window
+    std::vector<uint8_t> lastRecord;              //!< bytes of the last record, compared to in on change mode
+    std::vector<uint64_t> changeOffsets;          //!< [-] offsets in a record of the bytes compared in on change mode
+    std::vector<uint64_t> changeSizes;            //!< [-] sizes of the bytes compared in on change mode, all if empty
+    uint64_t capacity = 0;                        //!< [-] number of records kept in ring buffer mode, 0 for all
+    uint64_t ringHead = 0;                        //!< [-] index of the oldest record once the ring buffer is full
+    std::vector<uint8_t> envelopeRow;             //!< min and max values of a new envelope window
+    std::string spillFileName;                    //!< file the records are streamed to, empty to keep them in memory
+    uint64_t spillChunk = 0;                      //!< [-] number of records streamed to the spill file at once
+    uint64_t spilledCount = 0;                    //!< [-] number of records in the spill file
+    std::vector<uint8_t> spillBuffer;             //!< staging buffer of a chunk of the spill file
 
 private:
     ReadFunctor<messageType> readMessage;   //!< method description
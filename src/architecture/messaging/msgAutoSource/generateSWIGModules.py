@@ -1,5 +1,8 @@
+import os
 import sys
 
+from payloadDtype import payloadDtype, payloadFieldPaths
+
 if __name__ == "__main__":
      moduleOutputPath = sys.argv[1]
      headerinputPath = sys.argv[2]
@@ -18,8 +21,18 @@ if __name__ == "__main__":
      swigCTemplateData = swigCFid.read()
      swigCFid.close()
 
+     # the header path is relative to the messaging directory, the parent of this working directory
+     headerPath = os.path.join('..', headerinputPath)
+     includeDirs = ['../../..', os.path.dirname(os.path.dirname(headerPath))]
+     dtype = payloadDtype(headerPath, structType + 'Payload', includeDirs)
+     # offsetof of the dtype fields, checked against the dtype when the module is imported
+     fieldPaths = payloadFieldPaths(headerPath, structType + 'Payload', includeDirs)
+     offsets = ''.join(', offsetof({}Payload, {})'.format(structType, designator) for designator, _ in fieldPaths)
+     fieldNames = repr([names for _, names in fieldPaths])
+
      moduleFileOut = open(moduleOutputPath, 'w')
-     moduleFileOut.write(swigTemplateData.format(type=structType, baseDir=baseDir))
+     moduleFileOut.write(swigTemplateData.format(type=structType, baseDir=baseDir, dtype=dtype, offsets=offsets,
+                                                 fieldNames=fieldNames))
      if(generateCInfo):
          moduleFileOut.write(swigCTemplateData.format(type=structType))
      moduleFileOut.close()
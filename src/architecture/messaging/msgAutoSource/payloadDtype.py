@@ -0,0 +1,234 @@
+#
+#  ISC License
+#
+#  Copyright (c) 2024, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+"""
+Derive the numpy structured dtype of a message payload from its ``*MsgPayload.h`` header.
+
+The dtype lets python view the history of a message recorder in place, without converting each recorded payload
+through swig. Only payloads made of plain data (integer, floating point, character and enum fields, fixed size
+arrays of these, ``Eigen::Vector3d`` and nested plain data structures) have a dtype. The layout follows the C
+alignment rules. The swig module checks the size of the dtype against ``sizeof`` of the payload, and the offset of every
+field against ``offsetof``, when it is imported.
+"""
+
+import os
+import re
+
+# numpy type codes of the C and C++ field types
+FIELD_TYPES = {
+    "double": "f8", "float": "f4",
+    "int": "i4", "unsigned int": "u4", "unsigned": "u4",
+    "long long": "i8", "unsigned long long": "u8",
+    "int8_t": "i1", "uint8_t": "u1", "int16_t": "i2", "uint16_t": "u2",
+    "int32_t": "i4", "uint32_t": "u4", "int64_t": "i8", "uint64_t": "u8",
+    "char": "S1", "unsigned char": "u1", "bool": "?",
+}
+
+# fixed size Eigen types, stored as their coefficients
+EIGEN_TYPES = {"Eigen::Vector3d": ("f8", (3,))}
+
+COMMENTS = re.compile(r"//[^\n]*|/\*.*?\*/", re.S)
+INCLUDE = re.compile(r'^\s*#\s*include\s+"([^"]+)"', re.M)
+DEFINE = re.compile(r"^[ \t]*#[ \t]*define[ \t]+(\w+)[ \t]+([^\n]+)$", re.M)
+ENUM = re.compile(r"\benum\s+(\w+)\s*\{|\btypedef\s+enum\s*\w*\s*\{[^}]*\}\s*(\w+)\s*;")
+STRUCT = re.compile(r"\btypedef\s+struct\s*\w*\s*\{(?P<body>[^{}]*)\}\s*(?P<name>\w+)\s*;"
+                    r"|\bstruct\s+(?P<name2>\w+)\s*\{(?P<body2>[^{}]*)\}\s*;")
+DECLARATOR = re.compile(r"^(?P<name>\w+)(?P<dims>(\s*\[[^\]]*\])*)$")
+
+
+class PayloadHeaders:
+    """
+    The definitions of the headers a payload header includes, searched for in ``includeDirs``
+
+    Args:
+        includeDirs: list of the directories quoted includes are relative to
+    """
+
+    def __init__(self, includeDirs):
+        self.includeDirs = includeDirs
+        self.defines = {}
+        self.enums = set()
+        self.structs = {}
+        self.visited = set()
+
+    def findHeader(self, include, currentDir):
+        for directory in [currentDir] + self.includeDirs:
+            path = os.path.normpath(os.path.join(directory, include))
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def read(self, path):
+        """Read a header and, recursively, the headers it includes"""
+        path = os.path.normpath(path)
+        if path in self.visited:
+            return
+        self.visited.add(path)
+        with open(path, "r") as headerFile:
+            text = headerFile.read()
+        for include in INCLUDE.findall(text):
+            includePath = self.findHeader(include, os.path.dirname(path))
+            if includePath is not None:
+                self.read(includePath)
+        text = COMMENTS.sub("", text)
+        # brace initializers of the fields would end the structure bodies early
+        text = re.sub(r"=\s*\{[^{}]*\}", "", text)
+        for name, value in DEFINE.findall(text):
+            self.defines[name] = value.strip()
+        for match in ENUM.finditer(text):
+            self.enums.add(match.group(1) or match.group(2))
+        for match in STRUCT.finditer(text):
+            name = match.group("name") or match.group("name2")
+            self.structs[name] = match.group("body") if match.group("name") else match.group("body2")
+
+    def evaluate(self, expression, depth=0):
+        """Evaluate an array dimension, None if it is not an integer constant expression"""
+        expression = re.sub(r"\b[A-Za-z_]\w*\b",
+                            lambda m: "(" + self.defines.get(m.group(0), m.group(0)) + ")", expression)
+        if re.search(r"[A-Za-z_]", expression):
+            return self.evaluate(expression, depth + 1) if depth < 8 else None
+        if not re.fullmatch(r"[\d\s+\-*/()]+", expression):
+            return None
+        try:
+            value = eval(expression.replace("/", "//"), {"__builtins__": {}})
+        except (SyntaxError, ZeroDivisionError):
+            return None
+        return value if isinstance(value, int) and value > 0 else None
+
+    def fieldType(self, typeName, depth=0):
+        """
+        Source of the numpy type of a field type, its shape and the name of the structure if the type is a nested
+        structure, None if the type has no fixed layout
+        """
+        typeName = " ".join(typeName.replace("struct ", "").replace("const ", "").split())
+        if typeName.startswith("enum "):
+            typeName = typeName[5:]
+        if typeName in FIELD_TYPES:
+            return repr(FIELD_TYPES[typeName]), (), None
+        if typeName in EIGEN_TYPES:
+            code, shape = EIGEN_TYPES[typeName]
+            return repr(code), shape, None
+        if typeName in self.enums:
+            # the underlying type of the enums of the payloads is int
+            return repr("i4"), (), None
+        if typeName in self.structs and depth < 8:
+            nested = self.dtype(typeName, depth + 1)
+            return (nested, (), typeName) if nested is not None else None
+        return None
+
+    def fields(self, structName, depth=0):
+        """
+        Fields of a structure as tuples of their name, the source of their numpy type, their shape and the name of
+        their structure if they are nested structures. None if the structure has a field without a fixed layout
+        """
+        fields = []
+        for declaration in self.structs[structName].split(";"):
+            declaration = " ".join(declaration.split())
+            if not declaration:
+                continue
+            if re.search(r"[(<&]|\*(?![^\[]*\])", declaration):
+                # pointers, references, containers and methods have no fixed layout
+                return None
+            declaration = declaration.split("=")[0].strip()
+            match = re.match(r"^(?P<type>[\w:]+(\s+[\w:]+)*?)\s+(?P<declarators>\w+\s*(\[[^\]]*\]\s*)*"
+                             r"(,\s*\w+\s*(\[[^\]]*\]\s*)*)*)$", declaration)
+            if match is None:
+                return None
+            fieldType = self.fieldType(match.group("type"), depth)
+            if fieldType is None:
+                return None
+            code, baseShape, nestedName = fieldType
+            for declarator in match.group("declarators").split(","):
+                declarator = DECLARATOR.match(declarator.strip())
+                if declarator is None:
+                    return None
+                shape = []
+                for dimension in re.findall(r"\[([^\]]*)\]", declarator.group("dims")):
+                    size = self.evaluate(dimension)
+                    if size is None:
+                        return None
+                    shape.append(size)
+                if code == repr("S1") and len(shape) > 0:
+                    # character arrays are strings
+                    fieldCode, shape = repr("S" + str(shape[-1])), shape[:-1]
+                else:
+                    fieldCode = code
+                fields.append((declarator.group("name"), fieldCode, tuple(shape) + tuple(baseShape), nestedName))
+        return fields or None
+
+    def dtype(self, structName, depth=0):
+        """
+        Source of the numpy dtype of a structure, such as
+        ``np.dtype([('r_BN_N', 'f8', (3,)), ('MRPSwitchCount', 'u8')], align=True)``,
+        None if the structure has a field without a fixed layout
+        """
+        fields = self.fields(structName, depth)
+        if fields is None:
+            return None
+        return "np.dtype([" + ", ".join("(" + repr(name) + ", " + code + (", " + repr(shape) if shape else "") + ")"
+                                        for name, code, shape, _ in fields) + "], align=True)"
+
+    def fieldPaths(self, structName, depth=0):
+        """
+        The fields of a structure and of its nested structures, as tuples of their C member designator, such as
+        ``config[0].gain``, and of the names of the fields to go through in the numpy dtype, such as
+        ``('config', 'gain')``. The first element of the arrays of structures stands for the others.
+        """
+        paths = []
+        for name, _, shape, nestedName in self.fields(structName, depth) or []:
+            paths.append((name, (name,)))
+            if nestedName is not None:
+                designator = name + "[0]" * len(shape)
+                for nestedDesignator, nestedNames in self.fieldPaths(nestedName, depth + 1):
+                    paths.append((designator + "." + nestedDesignator, (name,) + nestedNames))
+        return paths
+
+
+def payloadDtype(headerPath, structName, includeDirs):
+    """
+    Source of the numpy dtype of the payload ``structName`` defined in ``headerPath``, or ``None`` if the payload
+    has no fixed memory layout
+
+    Args:
+        headerPath: path of the payload header
+        structName: name of the payload structure
+        includeDirs: list of the directories quoted includes are relative to
+    """
+    headers = PayloadHeaders(includeDirs)
+    headers.read(headerPath)
+    if structName not in headers.structs:
+        return "None"
+    return headers.dtype(structName) or "None"
+
+
+def payloadFieldPaths(headerPath, structName, includeDirs):
+    """
+    The fields of the payload ``structName`` defined in ``headerPath``, and of its nested structures, whose offsets
+    the swig module checks against ``offsetof`` of the payload, see ``PayloadHeaders.fieldPaths()``. Empty if the
+    payload has no fixed memory layout
+
+    Args:
+        headerPath: path of the payload header
+        structName: name of the payload structure
+        includeDirs: list of the directories quoted includes are relative to
+    """
+    headers = PayloadHeaders(includeDirs)
+    headers.read(headerPath)
+    if structName not in headers.structs or headers.dtype(structName) is None:
+        return []
+    return headers.fieldPaths(structName)
@@ -0,0 +1,112 @@
+#
+#  ISC License
+#
+#  Copyright (c) 2024, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+import random
+import time
+
+from Basilisk.architecture import bskLogging
+from Basilisk.moduleTemplates import cppModuleTemplate
+from Basilisk.utilities import SimulationBaseClass
+from Basilisk.utilities import macros
+
+
+def createQuietSimulation():
+    """Empty simulation, whose modules only log warnings and errors"""
+    scSim = SimulationBaseClass.SimBaseClass()
+    scSim.bskLogger = bskLogging.BSKLogger(bskLogging.BSK_WARNING)
+    return scSim
+
+
+def addModuleProcess(scSim, processName, taskName, taskPeriod, numModules, modelTag="module"):
+    """Adds a process with a single task executing numModules cppModuleTemplate modules, tagged modelTag followed by
+    their index.  Returns the process and its modules."""
+    proc = scSim.CreateNewProcess(processName)
+    proc.addTask(scSim.CreateNewTask(taskName, taskPeriod))
+    modules = []
+    for i in range(numModules):
+        module = cppModuleTemplate.CppModuleTemplate()
+        module.ModelTag = modelTag + str(i)
+        module.bskLogger = scSim.bskLogger
+        scSim.AddModelToTask(taskName, module)
+        modules.append(module)
+    return proc, modules
+
+
+def createTaskSimulation(numTasks, taskPeriods, taskPriorities):
+    """Simulation with a process of numTasks empty tasks, named task0, task1..., whose periods and priorities are
+    drawn from taskPeriods and taskPriorities.  Returns the simulation and its process."""
+    rng = random.Random(0)
+    scSim = createQuietSimulation()
+    proc = scSim.CreateNewProcess("process")
+    for i in range(numTasks):
+        proc.addTask(scSim.CreateNewTask("task" + str(i), rng.choice(taskPeriods)), rng.choice(taskPriorities))
+    return scSim, proc
+
+
+def createBarrierSimulation(numThreads, spinCount, framePeriod):
+    """Initialized simulation with a process of one module per thread, the modules being kept in scSim.modules.
+    The output of the first module is double buffered, so that the threads meet at the barrier at the end of every
+    frame."""
+    scSim = createQuietSimulation()
+    scSim.modules = []
+    for i in range(numThreads):
+        _, modules = addModuleProcess(scSim, "process" + str(i), "task" + str(i), framePeriod, 1)
+        scSim.modules += modules
+    scSim.DoubleBufferMessage(scSim.modules[0].dataOutMsg)
+    scSim.TotalSim.setFramePeriod(framePeriod)
+    scSim.TotalSim.setThreadSpinCount(spinCount)
+    scSim.TotalSim.resetThreads(numThreads)
+    scSim.InitializeSimulation()
+    return scSim
+
+
+def benchmarkTaskScheduling(taskCounts=(10, 100, 1000, 5000), numSteps=200):
+    """Time spent per task execution [ns] for processes of empty tasks, which is the scheduling overhead.  It grows
+    with the logarithm of the number of tasks.  Returns a (numTasks, time) tuple per task count."""
+    rows = []
+    for numTasks in taskCounts:
+        scSim, _ = createTaskSimulation(numTasks, [macros.sec2nano(1.)], [-1])
+        scSim.InitializeSimulation()
+        scSim.ConfigureStopTime(macros.sec2nano(numSteps - 1))
+        start = time.perf_counter()
+        scSim.ExecuteSimulation()
+        elapsed = time.perf_counter() - start
+        rows.append((numTasks, 1e9 * elapsed / (numTasks * numSteps)))
+    return rows
+
+
+def benchmarkThreadBarrier(threadCounts=(2, 4, 8, 16, 32), spinCounts=(0, 100, 10000), numFrames=5000):
+    """Wall time per frame [us] of processes that execute a single cheap module, which is dominated by the cost of
+    the frame barrier.  Returns a (numThreads, spinCount, time) tuple per run."""
+    rows = []
+    for numThreads in threadCounts:
+        for spinCount in spinCounts:
+            scSim = createBarrierSimulation(numThreads, spinCount, 1000)
+            scSim.ConfigureStopTime(1000 * (numFrames - 1))
+            start = time.perf_counter()
+            scSim.ExecuteSimulation()
+            elapsed = time.perf_counter() - start
+            scSim.TotalSim.deleteThreads()
+            rows.append((numThreads, spinCount, 1e6 * elapsed / numFrames))
+    return rows
+
+
+if __name__ == "__main__":
+    for numTasks, taskTime in benchmarkTaskScheduling():
+        print(f"{numTasks:6d} tasks: {taskTime:8.1f} ns per task execution")
+    for numThreads, spinCount, frameTime in benchmarkThreadBarrier():
+        print(f"{numThreads:3d} threads, spin count {spinCount:6d}: {frameTime:8.2f} us per frame")
@@ -0,0 +1,76 @@
+#
+#  ISC License
+#
+#  Copyright (c) 2024, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+from Basilisk.utilities import macros
+
+from systemModel_test_utilities import addModuleProcess, createQuietSimulation
+
+
+def createSimulation(numModules, numThreads):
+    """Simulation with one process per entry of numModules, each executing that many modules"""
+    scSim = createQuietSimulation()
+    scSim.modules = []
+    procs = []
+    for i, count in enumerate(numModules):
+        proc, modules = addModuleProcess(scSim, "process" + str(i), "task" + str(i), macros.sec2nano(1.), count)
+        scSim.modules += modules
+        procs.append(proc)
+    scSim.TotalSim.resetThreads(numThreads)
+    return scSim, procs
+
+
+def threadProcesses(scSim):
+    """Names of the processes executed by each thread"""
+    return [[proc.processName for proc in scSim.TotalSim.getThreadProcesses(i)]
+            for i in range(scSim.TotalSim.getThreadCount())]
+
+
+def test_loadBalancing():
+    """The most expensive process gets a thread of its own at the end of the warm-up, instead of sharing one with
+    the processes that round-robin placed with it"""
+    scSim, procs = createSimulation([200, 10, 10, 10, 10], 2)
+    scSim.InitializeSimulation()
+    assert threadProcesses(scSim) == [["process0", "process2", "process4"], ["process1", "process3"]]
+
+    scSim.TotalSim.enableLoadBalancing(macros.sec2nano(5.))
+    scSim.ConfigureStopTime(macros.sec2nano(10.))
+    scSim.ExecuteSimulation()
+    assert threadProcesses(scSim) == [["process0"], ["process1", "process2", "process3", "process4"]]
+    assert procs[0].processData.executionNanos > procs[1].processData.executionNanos > 0
+    for i in range(2):
+        assert scSim.TotalSim.getThreadBusyTime(i) > 0
+        assert scSim.TotalSim.getThreadBarrierWait(i) >= 0
+    # the processes moved to other threads keep their schedule
+    assert all(module.dummy == 11 for module in scSim.modules)
+    scSim.ShowThreadLoad()
+    scSim.TotalSim.deleteThreads()
+
+
+def test_loadBalancingPinnedProcess():
+    """Processes placed on a thread by the user stay there, and count in the load of their thread"""
+    scSim, procs = createSimulation([200, 10, 10, 10, 10], 2)
+    scSim.TotalSim.addProcessToThread(procs[1].processData, 0)
+    scSim.InitializeSimulation()
+    scSim.TotalSim.enableLoadBalancing(macros.sec2nano(5.))
+    scSim.ConfigureStopTime(macros.sec2nano(10.))
+    scSim.ExecuteSimulation()
+    assert threadProcesses(scSim) == [["process1", "process2", "process3", "process4"], ["process0"]]
+    scSim.TotalSim.deleteThreads()
+
+
+if __name__ == "__main__":
+    test_loadBalancing()
@@ -0,0 +1,94 @@
+#
+#  ISC License
+#
+#  Copyright (c) 2024, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+import numpy as np
+import pytest
+
+from Basilisk.utilities import macros
+
+from systemModel_test_utilities import addModuleProcess, createQuietSimulation
+
+
+def runSimulation(numThreads, framePeriod):
+    """Two processes whose modules read the output message of each other, returns the outputs of both modules"""
+    scSim = createQuietSimulation()
+    modules = []
+    recorders = []
+    for i in range(2):
+        taskName = "task" + str(i)
+        _, [module] = addModuleProcess(scSim, "process" + str(i), taskName, macros.sec2nano(1.), 1)
+        recorders.append(module.dataOutMsg.recorder())
+        scSim.AddModelToTask(taskName, recorders[-1])
+        modules.append(module)
+    for i, module in enumerate(modules):
+        scSim.DoubleBufferMessage(module.dataOutMsg)
+        modules[1 - i].dataInMsg.subscribeTo(module.dataOutMsg)
+    scSim.TotalSim.setFramePeriod(framePeriod)
+    scSim.TotalSim.resetThreads(numThreads)
+    scSim.InitializeSimulation()
+    scSim.ConfigureStopTime(macros.sec2nano(10.))
+    scSim.ExecuteSimulation()
+    scSim.ConfigureStopTime(macros.sec2nano(20.))
+    scSim.ExecuteSimulation()
+    scSim.TotalSim.deleteThreads()
+    return [recorder.dataVector for recorder in recorders]
+
+
+@pytest.mark.parametrize("numThreads", [1, 2])
+def test_messageBuffers(numThreads):
+    """With double buffered messages, the modules read the messages written in the previous frames, whatever the
+    number of threads"""
+    framePeriod = macros.sec2nano(1.)
+    outputs = runSimulation(numThreads, framePeriod)
+    # each module adds its update count to the output of the other module written in the previous frame, and the
+    # recorders see the outputs once they are published, at the end of the frame
+    k = np.arange(21)
+    expected = np.zeros((21, 3))
+    expected[:, 0] = k * (k + 1) / 2
+    for output in outputs:
+        np.testing.assert_array_equal(output, expected)
+    for output, reference in zip(outputs, runSimulation(1, framePeriod)):
+        np.testing.assert_array_equal(output, reference)
+
+
+def test_doubleBufferCMessage():
+    """C message objects can't be double buffered"""
+    from Basilisk.architecture import messaging
+    scSim = createQuietSimulation()
+    with pytest.raises(TypeError):
+        scSim.DoubleBufferMessage(messaging.CModuleTemplateMsg_C())
+
+
+def test_doubleBufferDeletedMessage():
+    """The simulation keeps the buffer of a deleted message alive, and stops publishing it"""
+    from Basilisk.architecture import messaging
+    scSim = createQuietSimulation()
+    proc = scSim.CreateNewProcess("process")
+    proc.addTask(scSim.CreateNewTask("task", macros.sec2nano(1.)))
+    msg = messaging.CModuleTemplateMsg()
+    assert not isinstance(msg.doubleBuffer(), int)
+    scSim.DoubleBufferMessage(msg)
+    msg.write(messaging.CModuleTemplateMsgPayload())
+    del msg
+    scSim.TotalSim.setFramePeriod(macros.sec2nano(1.))
+    scSim.InitializeSimulation()
+    scSim.ConfigureStopTime(macros.sec2nano(5.))
+    scSim.ExecuteSimulation()
+
+
+if __name__ == "__main__":
+    test_messageBuffers(2)
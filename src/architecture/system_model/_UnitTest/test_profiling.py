@@ -0,0 +1,101 @@
+#
+#  ISC License
+#
+#  Copyright (c) 2024, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+import json
+
+from Basilisk.simulation import spacecraft
+from Basilisk.utilities import macros
+
+from systemModel_test_utilities import addModuleProcess, createQuietSimulation
+
+
+def createSimulation():
+    """Simulation with a dynamics process integrating a spacecraft and a flight software process"""
+    scSim = createQuietSimulation()
+    dynProcess = scSim.CreateNewProcess("dynProcess")
+    dynProcess.addTask(scSim.CreateNewTask("dynTask", macros.sec2nano(1.)))
+    scObject = spacecraft.Spacecraft()
+    scObject.ModelTag = "spacecraft"
+    scSim.AddModelToTask("dynTask", scObject)
+    scSim.scObject = scObject
+    addModuleProcess(scSim, "fswProcess", "fswTask", macros.sec2nano(2.), 3, "fswModule")
+    scSim.InitializeSimulation()
+    return scSim
+
+
+def test_profiling(tmp_path):
+    """The profiler times the modules, tasks and processes while it is enabled, and writes their calls as a trace"""
+    scSim = createSimulation()
+    scSim.ConfigureStopTime(macros.sec2nano(4.))
+    scSim.ExecuteSimulation()
+    assert (scSim.GetProfile()["totalTime"] == 0).all()
+
+    scSim.EnableProfiling(recordTrace=True)
+    scSim.ConfigureStopTime(macros.sec2nano(10.))
+    scSim.ExecuteSimulation()
+
+    modules = scSim.GetProfile().set_index("module")
+    assert list(modules.loc["spacecraft", ["process", "task", "calls"]]) == ["dynProcess", "dynTask", 6]
+    assert (modules.loc[["fswModule0", "fswModule1", "fswModule2"], "calls"] == 3).all()
+    assert (modules["totalTime"] > 0).all()
+    assert (modules["maxTime"] <= modules["totalTime"]).all()
+    assert (modules["meanTime"] <= modules["maxTime"]).all()
+    # the RK4 integrator evaluates the equations of motion 4 times per profiled integration step
+    assert modules.loc["spacecraft", "subSteps"] == 4 * 6
+
+    tasks = scSim.GetProfile("task").set_index("task")
+    assert list(tasks["calls"].sort_index()) == [6, 3]
+    assert tasks.loc["fswTask", "totalTime"] >= modules.loc[["fswModule0", "fswModule1", "fswModule2"],
+                                                            "totalTime"].sum()
+    processes = scSim.GetProfile("process").set_index("process")
+    assert processes.loc["dynProcess", "totalTime"] == tasks.loc["dynTask", "totalTime"]
+
+    traceFile = tmp_path / "trace.json"
+    scSim.WriteChromeTrace(str(traceFile))
+    events = [event for event in json.loads(traceFile.read_text())["traceEvents"] if event["ph"] == "X"]
+    assert len(events) == 6 + 3 * 3
+    assert sorted(set(event["name"] for event in events)) == ["fswModule0", "fswModule1", "fswModule2",
+                                                              "spacecraft"]
+    assert min(event["ts"] for event in events) == 0
+
+    scSim.DisableProfiling()
+    scSim.ConfigureStopTime(macros.sec2nano(12.))
+    scSim.ExecuteSimulation()
+    assert scSim.GetProfile("task").set_index("task").loc["dynTask", "calls"] == 6
+
+    scSim.ResetProfile()
+    modules = scSim.GetProfile().set_index("module")
+    assert (modules["totalTime"] == 0).all()
+    assert modules.loc["spacecraft", "subSteps"] == 0
+
+
+def test_profilingDisabledTask():
+    """A disabled task is not counted as executed by the profiler"""
+    scSim = createSimulation()
+    scSim.EnableProfiling()
+    scSim.disableTask("fswTask")
+    scSim.ConfigureStopTime(macros.sec2nano(10.))
+    scSim.ExecuteSimulation()
+
+    tasks = scSim.GetProfile("task").set_index("task")
+    assert tasks.loc["dynTask", "calls"] == 11
+    assert tasks.loc["fswTask", "calls"] == 0
+    assert tasks.loc["fswTask", "totalTime"] == 0
+
+
+if __name__ == "__main__":
+    test_profiling()
@@ -0,0 +1,63 @@
+#
+#  ISC License
+#
+#  Copyright (c) 2024, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+from Basilisk.architecture import sysModel
+from Basilisk.utilities import macros
+
+from systemModel_test_utilities import createTaskSimulation
+
+
+class RecordingModule(sysModel.SysModel):
+    """Module recording the order in which the tasks execute"""
+
+    def __init__(self, executions, *args):
+        super().__init__(*args)
+        self.executions = executions
+
+    def UpdateState(self, CurrentSimNanos):
+        self.executions.append((self.ModelTag, CurrentSimNanos))
+
+
+def test_taskScheduling():
+    """The tasks of a process execute by start time, then by decreasing priority, then in the order of the process
+    task list"""
+    executions = []
+    periods = [macros.sec2nano(period) for period in [1., 2., 3., 5.]]
+    scSim, proc = createTaskSimulation(40, periods, [-1, 0, 5, 10])
+    for i in range(40):
+        module = RecordingModule(executions)
+        module.ModelTag = "task" + str(i)
+        scSim.AddModelToTask(module.ModelTag, module)
+    scSim.InitializeSimulation()
+    scSim.ConfigureStopTime(macros.sec2nano(30.))
+    scSim.ExecuteSimulation()
+
+    # reference: the task with the earliest start time, highest priority and lowest task list index runs next
+    entries = [[0, entry.taskPriority, index, entry.TaskPtr]
+               for index, entry in enumerate(proc.processData.processTasks)]
+    expected = []
+    while True:
+        entry = min(entries, key=lambda e: (e[0], -e[1], e[2]))
+        if entry[0] > macros.sec2nano(30.):
+            break
+        expected.append((entry[3].TaskName, entry[0]))
+        entry[0] += entry[3].TaskPeriod
+    assert executions == expected
+
+
+if __name__ == "__main__":
+    test_taskScheduling()
@@ -0,0 +1,51 @@
+#
+#  ISC License
+#
+#  Copyright (c) 2024, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+import os
+
+import pytest
+from Basilisk.utilities import macros
+
+from systemModel_test_utilities import createBarrierSimulation
+
+
+@pytest.mark.parametrize("spinCount", [0, 1000])
+def test_threadBarrier(spinCount):
+    """The threads step through every frame, whether they spin or park at the barrier"""
+    scSim = createBarrierSimulation(4, spinCount, macros.sec2nano(1.))
+    scSim.ConfigureStopTime(macros.sec2nano(99.))
+    scSim.ExecuteSimulation()
+    assert scSim.TotalSim.getThreadSpinCount() == spinCount
+    assert [module.CallCounts for module in scSim.modules] == [100] * 4
+    scSim.TotalSim.deleteThreads()
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_getaffinity"), reason="thread pinning is only supported on Linux")
+def test_threadAffinity():
+    """Threads can be pinned to the CPUs the process may run on"""
+    scSim = createBarrierSimulation(2, 0, macros.sec2nano(1.))
+    cpu = min(os.sched_getaffinity(0))
+    assert scSim.TotalSim.setThreadAffinity(0, cpu)
+    assert scSim.TotalSim.setThreadAffinity(1, -1)
+    scSim.ConfigureStopTime(macros.sec2nano(9.))
+    scSim.ExecuteSimulation()
+    assert [module.CallCounts for module in scSim.modules] == [10] * 2
+    scSim.TotalSim.deleteThreads()
+
+
+if __name__ == "__main__":
+    test_threadBarrier(1000)
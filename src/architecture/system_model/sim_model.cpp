@@ -18,8 +18,15 @@
  */
 
 #include "sim_model.h"
+#include "architecture/messaging/messaging.h"
+#include <algorithm>
+#include <chrono>
 #include <cstring>
 #include <iostream>
+#if defined(__linux__)
+#include <pthread.h>
+#include <sched.h>
+#endif
 
 void activateNewThread(void *threadData)
 {
@@ -78,6 +85,10 @@ SimThreadExecution::SimThreadExecution() {
     stopThreadNanos=0;
     nextProcPriority = -1;
     threadContext = nullptr;
+    timeProcesses = false;
+    lastStepNanos = 0;
+    busyNanos = 0;
+    barrierWaitNanos = 0;
 
 }
 
@@ -134,12 +145,22 @@ void SimThreadExecution::SingleStepProcesses(int64_t stopPri)
         SysProcess *localProc = (*it);
         if(localProc->processEnabled())
         {
+            std::chrono::steady_clock::time_point procStart;
+            if(this->timeProcesses)
+            {
+                procStart = std::chrono::steady_clock::now();
+            }
             while(localProc->nextTaskTime < this->CurrentNanos ||
                   (localProc->nextTaskTime == this->CurrentNanos &&
                    localProc->processPriority >= stopPri))
             {
                 localProc->singleStepNextTask(this->CurrentNanos);
             }
+            if(this->timeProcesses)
+            {
+                localProc->executionNanos += std::chrono::duration_cast<std::chrono::nanoseconds>(
+                    std::chrono::steady_clock::now() - procStart).count();
+            }
             if(localProc->getNextTime() < nextCallTime)
             {
                 nextCallTime = localProc->getNextTime();
@@ -157,6 +178,64 @@ void SimThreadExecution::SingleStepProcesses(int64_t stopPri)
 
 }
 
+/*! This method finds the time and priority of the next process to step, after
+    processes have been added to or removed from the thread.
+    @return void
+*/
+void SimThreadExecution::updateNextTaskTime()
+{
+    uint64_t nextCallTime = ~((uint64_t) 0);
+    std::vector<SysProcess *>::iterator it;
+    for(it = this->processList.begin(); it != this->processList.end(); it++)
+    {
+        if(!(*it)->processEnabled())
+        {
+            continue;
+        }
+        if((*it)->getNextTime() < nextCallTime ||
+           ((*it)->getNextTime() == nextCallTime && (*it)->processPriority > this->nextProcPriority))
+        {
+            nextCallTime = (*it)->getNextTime();
+            this->nextProcPriority = (*it)->processPriority;
+        }
+    }
+    this->NextTaskTime = nextCallTime != ~((uint64_t) 0) ? nextCallTime : this->CurrentNanos;
+}
+
+/*! This method sets how long the thread and its parent check the barrier
+    before they park on it.  Spinning lowers the latency of each frame when
+    the threads have cores of their own, parking frees the cores while they
+    wait.
+    @param spinCount Number of checks before parking, 0 parks right away
+    @return void
+*/
+void SimThreadExecution::setSpinCount(uint64_t spinCount)
+{
+    this->selfThreadLock.setSpinCount(spinCount);
+    this->parentThreadLock.setSpinCount(spinCount);
+}
+
+/*! This method pins the thread to a CPU, so that the operating system does not
+    migrate it between cores.  Pinning is only supported on Linux.
+    @param cpu Index of the CPU
+    @return true if the thread was pinned
+*/
+bool SimThreadExecution::pinToCpu(int64_t cpu)
+{
+#if defined(__linux__)
+    if(this->threadContext == nullptr || cpu < 0 || cpu >= CPU_SETSIZE)
+    {
+        return false;
+    }
+    cpu_set_t cpuSet;
+    CPU_ZERO(&cpuSet);
+    CPU_SET((int) cpu, &cpuSet);
+    return pthread_setaffinity_np(this->threadContext->native_handle(), sizeof(cpu_set_t), &cpuSet) == 0;
+#else
+    return false;
+#endif
+}
+
 /*! This method steps the simulation until the specified stop time and
  stop priority have been reached.
  @return void
@@ -168,6 +247,7 @@ void SimThreadExecution::StepUntilStop()
      SimStopTime, then the inPri shouldn't come into effect, so set it to -1
      (that's less than all process priorities, so it will run through the next
      process)*/
+    std::chrono::steady_clock::time_point stepStart = std::chrono::steady_clock::now();
     int64_t inPri = stopThreadNanos == this->NextTaskTime ? stopThreadPriority : -1;
     while(this->threadValid() && (this->NextTaskTime < stopThreadNanos || (this->NextTaskTime == stopThreadNanos &&
                                                this->nextProcPriority >= stopThreadPriority)) )
@@ -175,20 +255,9 @@ void SimThreadExecution::StepUntilStop()
         this->SingleStepProcesses(inPri);
         inPri = stopThreadNanos == this->NextTaskTime ? stopThreadPriority : -1;
     }
-}
-
-/*! This method is currently vestigial and needs to be populated once the message
-    sharing process between different threads is handled.
-    TODO: Make this method move messages safely between threads
- @return void
- */
-void SimThreadExecution::moveProcessMessages() {
-    std::vector<SysProcess *>::iterator it;
-    for(it = this->processList.begin(); it != this->processList.end(); it++)
-    {
-        //(*it)->routeInterfaces(this->CurrentNanos);
-    }
-
+    this->lastStepNanos = std::chrono::duration_cast<std::chrono::nanoseconds>(
+        std::chrono::steady_clock::now() - stepStart).count();
+    this->busyNanos += this->lastStepNanos;
 }
 
 /*! Once threads are released for execution, this method ensures that they finish
@@ -283,6 +352,10 @@ SimModel::SimModel()
     this->CurrentNanos = 0;
     this->NextTaskTime = 0;
     this->nextProcPriority = -1;
+    this->framePeriod = 0;
+    this->balancePending = false;
+    this->balanceTime = 0;
+    this->threadSpinCount = 0;
 }
 
 /*! Nothing to destroy really */
@@ -292,23 +365,62 @@ SimModel::~SimModel()
 }
 
 /*! This method steps the simulation until the specified stop time and
- stop priority have been reached.
+ stop priority have been reached.  The threads step in frames, and the double
+ buffered messages are published at the end of every frame.  Frame k covers
+ the times from k*framePeriod to (k+1)*framePeriod - 1, or the whole call if
+ framePeriod is 0.  If load balancing is enabled, the threads also stop at
+ the end of the warm-up to be balanced.
  @param SimStopTime Nanoseconds to step the simulation for
  @param stopPri The priority level below which the sim won't go
  @return void
  */
 void SimModel::StepUntilStop(uint64_t SimStopTime, int64_t stopPri)
 {
-    std::vector<SimThreadExecution*>::iterator thrIt;
     std::cout << std::flush;
-    for(thrIt=this->threadList.begin(); thrIt != this->threadList.end(); thrIt++)
+    uint64_t frameStop;
+    do
     {
-        (*thrIt)->moveProcessMessages();
-    }
+        frameStop = SimStopTime;
+        int64_t framePri = stopPri;
+        if(this->framePeriod > 0 && !this->messageBuffers.empty())
+        {
+            uint64_t frameEnd = this->NextTaskTime - this->NextTaskTime % this->framePeriod + this->framePeriod - 1;
+            if(frameEnd < SimStopTime)
+            {
+                frameStop = frameEnd;
+                framePri = -1;
+            }
+        }
+        if(this->balancePending && this->balanceTime > this->NextTaskTime && this->balanceTime - 1 < frameStop)
+        {
+            frameStop = this->balanceTime - 1;
+            framePri = -1;
+        }
+        this->stepThreads(frameStop, framePri);
+        this->publishMessageBuffers();
+        if(this->balancePending && this->NextTaskTime >= this->balanceTime)
+        {
+            this->balanceThreads();
+        }
+    } while(frameStop < SimStopTime && this->NextTaskTime <= SimStopTime);
+}
+
+/*! This method releases the threads until the specified stop time and stop
+ priority have been reached, and waits for all of them to get there.
+ @param stopNanos Nanoseconds to step the threads for
+ @param stopPri The priority level below which the threads won't go
+ @return void
+ */
+void SimModel::stepThreads(uint64_t stopNanos, int64_t stopPri)
+{
+    std::vector<SimThreadExecution*>::iterator thrIt;
+    std::chrono::steady_clock::time_point frameStart = std::chrono::steady_clock::now();
     for(thrIt=this->threadList.begin(); thrIt != this->threadList.end(); thrIt++)
     {
-        (*thrIt)->stopThreadNanos = SimStopTime;
+        (*thrIt)->stopThreadNanos = stopNanos;
         (*thrIt)->stopThreadPriority = stopPri;
+        (*thrIt)->timeProcesses = this->balancePending;
+        (*thrIt)->lastStepNanos = 0;
         if((*thrIt)->procCount() > 0) {
             (*thrIt)->unlockThread();
         }
@@ -325,8 +437,206 @@ void SimModel::StepUntilStop(uint64_t SimStopTime, int64_t stopPri)
                                  (*thrIt)->CurrentNanos : this->CurrentNanos;
         }
     }
+    uint64_t frameNanos = std::chrono::duration_cast<std::chrono::nanoseconds>(
+        std::chrono::steady_clock::now() - frameStart).count();
+    for(thrIt=this->threadList.begin(); thrIt != this->threadList.end(); thrIt++)
+    {
+        (*thrIt)->barrierWaitNanos += frameNanos > (*thrIt)->lastStepNanos ? frameNanos - (*thrIt)->lastStepNanos : 0;
+    }
+}
+
+/*! This method publishes the writes to the double buffered messages.  It is
+ called while all of the threads wait at the end of a frame, so no thread
+ reads or writes the messages at the same time.
+ @return void
+ */
+void SimModel::publishMessageBuffers()
+{
+    std::vector<std::shared_ptr<MessageBuffer>>::iterator it;
+    for(it = this->messageBuffers.begin(); it != this->messageBuffers.end(); it++)
+    {
+        (*it)->publish();
+    }
+}
+
+/*! This method adds a double buffered message to the messages published at
+ the end of every frame.  Messages read by processes that run on a different
+ thread than their author must be double buffered for the simulation to be
+ thread-safe.
+ The simulation shares the ownership of the buffer, which stops publishing once
+ its message is destroyed.
+ @param buffer The buffer returned by the doubleBuffer() method of the message
+ @return void
+ */
+void SimModel::addMessageBuffer(std::shared_ptr<MessageBuffer> buffer)
+{
+    if(std::find(this->messageBuffers.begin(), this->messageBuffers.end(), buffer) == this->messageBuffers.end())
+    {
+        this->messageBuffers.push_back(buffer);
+    }
+}
+
+
+/*! This method requests the processes placed by assignRemainingProcs to be
+ spread across the threads according to their cost.  The wall time of each
+ process is measured until the end of the warm-up, then balanceThreads()
+ repartitions the processes.
+ @param balanceNanos Simulation time at the end of the warm-up, in ns
+ @return void
+ */
+void SimModel::enableLoadBalancing(uint64_t balanceNanos)
+{
+    std::vector<SysProcess *>::iterator it;
+    for(it = this->processList.begin(); it != this->processList.end(); it++)
+    {
+        (*it)->executionNanos = 0;
+    }
+    this->balanceTime = balanceNanos;
+    this->balancePending = true;
+}
+
+/*! This method repartitions the processes placed by assignRemainingProcs
+ across the threads to minimize the wall time of the slowest thread, the
+ critical path of each frame.  The processes are taken from the most to the
+ least expensive, according to their measured wall time, and each goes to the
+ thread with the least load so far.  The processes that the user placed with
+ addProcessToThread stay on their thread.  It must be called while the threads
+ wait at the barrier.
+ @return void
+ */
+void SimModel::balanceThreads()
+{
+    this->balancePending = false;
+    for(size_t i = 0; i < this->threadList.size(); i++)
+    {
+        this->threadList[i]->timeProcesses = false;
+    }
+    if(this->threadList.size() < 2)
+    {
+        return;
+    }
+    std::vector<uint64_t> threadLoads(this->threadList.size(), 0);
+    std::vector<size_t> procThreads(this->processList.size(), this->threadList.size());
+    std::vector<size_t> movableProcs;
+    for(size_t i = 0; i < this->processList.size(); i++)
+    {
+        SysProcess *proc = this->processList[i];
+        if(std::find(this->balancedProcs.begin(), this->balancedProcs.end(), proc) != this->balancedProcs.end())
+        {
+            movableProcs.push_back(i);
+            continue;
+        }
+        for(size_t j = 0; j < this->threadList.size(); j++)
+        {
+            std::vector<SysProcess *> threadProcs = this->threadList[j]->getProcessList();
+            if(std::find(threadProcs.begin(), threadProcs.end(), proc) != threadProcs.end())
+            {
+                procThreads[i] = j;
+                threadLoads[j] += proc->executionNanos;
+                break;
+            }
+        }
+    }
+    std::stable_sort(movableProcs.begin(), movableProcs.end(), [this](size_t first, size_t second) {
+        return this->processList[first]->executionNanos > this->processList[second]->executionNanos;
+    });
+    for(size_t i = 0; i < movableProcs.size(); i++)
+    {
+        size_t lightest = std::min_element(threadLoads.begin(), threadLoads.end()) - threadLoads.begin();
+        procThreads[movableProcs[i]] = lightest;
+        threadLoads[lightest] += this->processList[movableProcs[i]]->executionNanos;
+    }
+    for(size_t j = 0; j < this->threadList.size(); j++)
+    {
+        SimThreadExecution *thread = this->threadList[j];
+        thread->clearProcessList();
+        for(size_t i = 0; i < this->processList.size(); i++)
+        {
+            if(procThreads[i] == j)
+            {
+                thread->addNewProcess(this->processList[i]);
+            }
+        }
+        thread->CurrentNanos = this->CurrentNanos;
+        thread->updateNextTaskTime();
+    }
 }
 
+/*! This method sets how long the threads check the frame barrier before they
+ park on it, for the current threads and those created by resetThreads.  With
+ fine task rates and cheap models, spinning avoids the wake-up latency of each
+ frame, as long as every thread has a core of its own.
+ @param spinCount Number of checks before parking, 0 parks right away
+ @return void
+ */
+void SimModel::setThreadSpinCount(uint64_t spinCount)
+{
+    this->threadSpinCount = spinCount;
+    std::vector<SimThreadExecution*>::iterator thrIt;
+    for(thrIt=this->threadList.begin(); thrIt != this->threadList.end(); thrIt++)
+    {
+        (*thrIt)->setSpinCount(spinCount);
+    }
+}
+
+/*! This method pins a thread of the thread-pool to a CPU, now if the thread
+ is running, and whenever assignRemainingProcs starts it.  Pinning is only
+ supported on Linux.
+ @param threadIndex The thread index in the thread-pool
+ @param cpu Index of the CPU, -1 to stop pinning the thread when it is started
+ @return false if the running thread could not be pinned
+ */
+bool SimModel::setThreadAffinity(uint64_t threadIndex, int64_t cpu)
+{
+    if(this->threadCpus.size() <= threadIndex)
+    {
+        this->threadCpus.resize(threadIndex + 1, -1);
+    }
+    this->threadCpus[threadIndex] = cpu;
+    if(cpu < 0 || threadIndex >= this->threadList.size() || this->threadList[threadIndex]->threadContext == nullptr)
+    {
+        return true;
+    }
+    if(!this->threadList[threadIndex]->pinToCpu(cpu))
+    {
+        bskLogger.bskLog(BSK_WARNING, "Thread %llu could not be pinned to CPU %lld", (unsigned long long) threadIndex,
+                         (long long) cpu);
+        return false;
+    }
+    return true;
+}
+
+/*! This method gets the wall time a thread has spent stepping its processes.
+ @param threadIndex The thread index in the thread-pool
+ @return The wall time, in ns
+ */
+uint64_t SimModel::getThreadBusyTime(uint64_t threadIndex)
+{
+    return this->threadList.at(threadIndex)->busyNanos;
+}
+
+/*! This method gets the wall time a thread has spent waiting at the barrier
+ for the other threads to finish their frames.
+ @param threadIndex The thread index in the thread-pool
+ @return The wall time, in ns
+ */
+uint64_t SimModel::getThreadBarrierWait(uint64_t threadIndex)
+{
+    return this->threadList.at(threadIndex)->barrierWaitNanos;
+}
+
+/*! This method zeroes the busy and barrier wait times of the threads.
+ @return void
+ */
+void SimModel::resetThreadTimes()
+{
+    std::vector<SimThreadExecution*>::iterator thrIt;
+    for(thrIt=this->threadList.begin(); thrIt != this->threadList.end(); thrIt++)
+    {
+        (*thrIt)->busyNanos = 0;
+        (*thrIt)->barrierWaitNanos = 0;
+    }
+}
 
 /*! This method allows the user to attach a process to the simulation for
     execution.  Note that the priority level of the process determines what
@@ -468,6 +778,7 @@ void SimModel::clearProcsFromThreads() {
     {
         (*thrIt)->clearProcessList();
     }
+    this->balancedProcs.clear();
     std::vector<SysProcess *>::iterator it;
     //! - Iterate through model list and call the Task model initializer
     for(it = this->processList.begin(); it != this->processList.end(); it++)
@@ -493,6 +804,7 @@ void SimModel::resetThreads(uint64_t threadCount)
     for(uint64_t i=0; i<threadCount; i++)
     {
         SimThreadExecution *newThread = new SimThreadExecution(0, 0);
+        newThread->setSpinCount(this->threadSpinCount);
         this->threadList.push_back(newThread);
     }
 
@@ -541,6 +853,7 @@ void SimModel::assignRemainingProcs() {
         else
         {
             (*thrIt)->addNewProcess((*it));
+            this->balancedProcs.push_back((*it));
         }
     }
     for(thrIt=this->threadList.begin(); thrIt != this->threadList.end(); thrIt++)
@@ -551,6 +864,13 @@ void SimModel::assignRemainingProcs() {
         (*thrIt)->CurrentNanos = 0;
         //(*thrIt)->lockThread();
         (*thrIt)->threadContext = new std::thread(activateNewThread, (*thrIt));
+        size_t threadIndex = thrIt - this->threadList.begin();
+        if(threadIndex < this->threadCpus.size() && this->threadCpus[threadIndex] >= 0 &&
+           !(*thrIt)->pinToCpu(this->threadCpus[threadIndex]))
+        {
+            bskLogger.bskLog(BSK_WARNING, "Thread %llu could not be pinned to CPU %lld", (unsigned long long) threadIndex,
+                             (long long) this->threadCpus[threadIndex]);
+        }
     }
     for(thrIt=this->threadList.begin(); thrIt != this->threadList.end(); thrIt++)
     {
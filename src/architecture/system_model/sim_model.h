@@ -26,10 +26,13 @@
 #include <mutex>
 #include <condition_variable>
 #include <iostream>
+#include <memory>
 #include "architecture/system_model/sys_process.h"
+#include "architecture/messaging/messageBuffer.h"
 #include "architecture/utilities/bskLogging.h"
 #include "architecture/utilities/bskSemaphore.h"
 
+
 //! This class handles the management of a given "thread" of execution and provides the main mechanism for running concurrent jobs inside BSK
 class SimThreadExecution
 {
@@ -39,6 +42,7 @@ public:
     ~SimThreadExecution();   //!< Destructor for given sim thread
     void updateNewStopTime(uint64_t newStopNanos) {stopThreadNanos = newStopNanos;}  //!< Method to update a new simulation stop time
     void clearProcessList() {processList.clear();}  //!< clear the process list
+    std::vector<SysProcess*> getProcessList() {return processList;}  //!< get the processes executed by the thread
     void selfInitProcesses();
     void crossInitProcesses();
     void resetProcesses();
@@ -56,7 +60,9 @@ public:
     void unlockParent();
     void StepUntilStop();  //!< Step simulation until stop time uint64_t reached
     void SingleStepProcesses(int64_t stopPri=-1); //!< Step only the next Task in the simulation
-    void moveProcessMessages();
+    void updateNextTaskTime();
+    void setSpinCount(uint64_t spinCount);
+    bool pinToCpu(int64_t cpu);
 public:
     uint64_t currentThreadNanos;  //!< Current simulation time available at thread
     uint64_t stopThreadNanos;   //!< Current stop conditions for the thread
@@ -69,6 +75,10 @@ public:
     bool selfInitNow;              //!< Flag requesting self init
     bool crossInitNow;             //!< Flag requesting cross-init
     bool resetNow;                 //!< Flag requesting that the thread execute reset
+    bool timeProcesses;            //!< Flag requesting that the wall time of each process is measured
+    uint64_t lastStepNanos;        //!< [ns] Wall time of the last step of the thread
+    uint64_t busyNanos;            //!< [ns] Wall time spent stepping the processes
+    uint64_t barrierWaitNanos;     //!< [ns] Wall time spent waiting at the barrier for the other threads
 private:
     bool threadRunning;            //!< Flag that will allow for easy concurrent locking
     bool terminateThread;          //!< Flag that indicates that it is time to take thread down
@@ -98,6 +108,20 @@ public:
     void deleteThreads();
     void assignRemainingProcs();
     uint64_t getThreadCount() {return threadList.size();} //!< returns the number of threads used
+    void addMessageBuffer(std::shared_ptr<MessageBuffer> buffer);
+    void clearMessageBuffers() {messageBuffers.clear();} //!< stop publishing the double buffered messages
+    void setFramePeriod(uint64_t newPeriod) {framePeriod = newPeriod;} //!< set the period of the frames, in ns
+    uint64_t getFramePeriod() {return framePeriod;} //!< get the period of the frames, in ns
+    void enableLoadBalancing(uint64_t balanceNanos);
+    void disableLoadBalancing() {balancePending = false;} //!< cancel the pending balancing of the threads
+    void balanceThreads();
+    uint64_t getThreadBusyTime(uint64_t threadIndex);
+    uint64_t getThreadBarrierWait(uint64_t threadIndex);
+    std::vector<SysProcess*> getThreadProcesses(uint64_t threadIndex) {return threadList.at(threadIndex)->getProcessList();} //!< get the processes executed by a thread
+    void setThreadSpinCount(uint64_t spinCount);
+    uint64_t getThreadSpinCount() {return threadSpinCount;} //!< get the number of checks of the barrier before the threads park
+    bool setThreadAffinity(uint64_t threadIndex, int64_t cpu);
+    void resetThreadTimes();
 
     BSKLogger bskLogger;                      //!< -- BSK Logging
 
@@ -108,6 +132,18 @@ public:
     uint64_t CurrentNanos;  //!< [ns] Current sim time
     uint64_t NextTaskTime;  //!< [ns] time for the next Task
     int64_t nextProcPriority;  //!< [-] Priority level for the next process
+
+private:
+    void stepThreads(uint64_t stopNanos, int64_t stopPri);
+    void publishMessageBuffers();
+
+    uint64_t framePeriod;  //!< [ns] Period of the frames at the end of which the double buffered messages are published
+    std::vector<std::shared_ptr<MessageBuffer>> messageBuffers;  //!< -- Buffers of the double buffered messages
+    bool balancePending;  //!< -- Flag indicating that the threads are balanced at the end of the warm-up
+    uint64_t balanceTime;  //!< [ns] Simulation time at the end of the warm-up
+    std::vector<SysProcess *> balancedProcs;  //!< -- Processes that assignRemainingProcs placed, which balancing may move
+    uint64_t threadSpinCount;  //!< -- Number of checks of the barrier before a waiting thread parks
+    std::vector<int64_t> threadCpus;  //!< -- CPU each thread is pinned to, -1 if it is not pinned
 };
 
 #endif /* _SimModel_H_ */
@@ -30,6 +30,8 @@
 %include "exception.i"
 %include "cdata.i"
 %include "swig_eigen.i"
+%include <std_shared_ptr.i>
+%shared_ptr(MessageBuffer)
 
 %array_functions(double, doubleArray);
 %array_functions(long, longArray);
@@ -76,4 +78,5 @@ namespace std {
 %include "sys_model_task.h"
 %include "sys_model.h"
 %include "sys_process.h"
+%include "architecture/messaging/messageBuffer.h"
 %include "sim_model.h"
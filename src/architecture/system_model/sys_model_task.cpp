@@ -18,6 +18,7 @@
  */
 
 #include "sys_model_task.h"
+#include <chrono>
 
 /*! The task constructor.  */
 SysModelTask::SysModelTask()
@@ -29,6 +30,10 @@ SysModelTask::SysModelTask()
     this->NextPickupTime = 0;
     this->FirstTaskTime = 0;
     this->taskActive = true;
+    this->profilingEnabled = false;
+    this->traceEnabled = false;
+    this->executionNanos = 0;
+    this->executionCount = 0;
 }
 /*! A construction option that allows the user to set some task parameters.
  Note that the only required argument is InputPeriod.
@@ -43,6 +48,10 @@ SysModelTask::SysModelTask(uint64_t InputPeriod, uint64_t FirstStartTime)
     this->NextPickupTime = this->NextStartTime + this->TaskPeriod;
     this->FirstTaskTime = FirstStartTime;
     this->taskActive = true;
+    this->profilingEnabled = false;
+    this->traceEnabled = false;
+    this->executionNanos = 0;
+    this->executionCount = 0;
 }
 
 //! The destructor.
@@ -96,18 +105,89 @@ void SysModelTask::ExecuteTaskList(uint64_t CurrentSimNanos)
     std::vector<ModelPriorityPair>::iterator ModelPair;
     SysModel* NonIt;
     
-    //! - Loop over all of the models in the simulation and call their UpdateState
-    for(ModelPair = this->TaskModels.begin(); (ModelPair != this->TaskModels.end() && this->taskActive);
-        ModelPair++)
+    if(this->profilingEnabled)
     {
-        NonIt = (ModelPair->ModelPtr);
-        NonIt->UpdateState(CurrentSimNanos);
-        NonIt->CallCounts += 1;
+        this->executeProfiledTaskList(CurrentSimNanos);
+    }
+    else
+    {
+        //! - Loop over all of the models in the simulation and call their UpdateState
+        for(ModelPair = this->TaskModels.begin(); (ModelPair != this->TaskModels.end() && this->taskActive);
+            ModelPair++)
+        {
+            NonIt = (ModelPair->ModelPtr);
+            NonIt->UpdateState(CurrentSimNanos);
+            NonIt->CallCounts += 1;
+        }
     }
     //! - NextStartTime is set to allow the scheduler to fit the next call in
     this->NextStartTime += this->TaskPeriod;
 }
 
+/*! This method executes the models like ExecuteTaskList, and adds the wall
+ time of each UpdateState call to the model and task totals.  The clock is
+ read once per model.  A disabled task runs no model, and is not counted.
+ @return void
+ @param CurrentSimNanos The current simulation time in [ns]
+ */
+void SysModelTask::executeProfiledTaskList(uint64_t CurrentSimNanos)
+{
+    if(!this->taskActive)
+    {
+        return;
+    }
+    std::chrono::steady_clock::time_point taskStart = std::chrono::steady_clock::now();
+    std::chrono::steady_clock::time_point modelStart = taskStart;
+    for(size_t i = 0; i < this->TaskModels.size() && this->taskActive; i++)
+    {
+        SysModel *model = this->TaskModels[i].ModelPtr;
+        model->UpdateState(CurrentSimNanos);
+        model->CallCounts += 1;
+        std::chrono::steady_clock::time_point modelEnd = std::chrono::steady_clock::now();
+        uint64_t modelNanos = std::chrono::duration_cast<std::chrono::nanoseconds>(modelEnd - modelStart).count();
+        model->updateNanos += modelNanos;
+        model->maxUpdateNanos = modelNanos > model->maxUpdateNanos ? modelNanos : model->maxUpdateNanos;
+        if(this->traceEnabled)
+        {
+            this->traceEvents.push_back(i);
+            this->traceEvents.push_back(std::chrono::duration_cast<std::chrono::nanoseconds>(
+                modelStart.time_since_epoch()).count());
+            this->traceEvents.push_back(modelNanos);
+            this->traceEvents.push_back(CurrentSimNanos);
+        }
+        modelStart = modelEnd;
+    }
+    this->executionNanos += std::chrono::duration_cast<std::chrono::nanoseconds>(modelStart - taskStart).count();
+    this->executionCount += 1;
+}
+
+/*! This method starts timing the UpdateState calls of the models of the task.
+ @return void
+ @param recordTrace Flag to also record the start time and duration of every call, for a trace of the execution
+ */
+void SysModelTask::enableProfiling(bool recordTrace)
+{
+    this->profilingEnabled = true;
+    this->traceEnabled = recordTrace;
+}
+
+/*! This method zeroes the timing of the task and of its models, and clears the
+ recorded UpdateState calls.
+ @return void
+ */
+void SysModelTask::resetProfile()
+{
+    std::vector<ModelPriorityPair>::iterator ModelPair;
+    for(ModelPair = this->TaskModels.begin(); ModelPair != this->TaskModels.end(); ModelPair++)
+    {
+        ModelPair->ModelPtr->updateNanos = 0;
+        ModelPair->ModelPtr->maxUpdateNanos = 0;
+    }
+    this->executionNanos = 0;
+    this->executionCount = 0;
+    this->traceEvents.clear();
+}
+
 /*! This method adds a new model into the Task list.  Note that the Priority
  parameter is option as it defaults to -1 (lowest, latest)
  @return void
@@ -22,6 +22,7 @@
 
 #include <vector>
 #include <stdint.h>
+#include <string>
 #include "architecture/_GeneralModuleFiles/sys_model.h"
 #include "architecture/utilities/bskLogging.h"
 
@@ -49,6 +50,14 @@ public:
 	void disableTask() {this->taskActive = false;} //!< Disables the task.  I know.
     void updatePeriod(uint64_t newPeriod);
     void updateParentProc(std::string parent) {this->parentProc = parent;} //!< Allows the system to move task to a different process
+    void enableProfiling(bool recordTrace = false);
+    void disableProfiling() {this->profilingEnabled = false;} //!< Stops timing the models
+    void resetProfile();
+    size_t getTraceEventCount() const {return this->traceEvents.size() / 4;} //!< Number of recorded UpdateState calls
+    uint64_t traceAddress() const {return reinterpret_cast<uint64_t>(this->traceEvents.data());} //!< Address of the recorded UpdateState calls
+
+private:
+    void executeProfiledTaskList(uint64_t CurrentSimNanos);
     
 public:
     std::vector<ModelPriorityPair> TaskModels;  //!< -- Array that has pointers to all task sysModels
@@ -59,7 +68,14 @@ public:
     uint64_t TaskPeriod;  //!< [ns] Cycle rate for Task
     uint64_t FirstTaskTime;  //!< [ns] Time to start Task for first time.  After this time the normal periodic updates resume.
 	bool taskActive;  //!< -- Flag indicating whether the Task has been disabled
+    bool profilingEnabled;  //!< -- Flag indicating that the models are timed
+    bool traceEnabled;  //!< -- Flag indicating that every UpdateState call is recorded
+    uint64_t executionNanos;  //!< [ns] Wall time spent executing the task while profiled
+    uint64_t executionCount;  //!< -- Number of executions of the task while profiled
   BSKLogger bskLogger;                      //!< -- BSK Logging
+
+private:
+    std::vector<uint64_t> traceEvents;  //!< -- Model index, wall start [ns], wall duration [ns] and sim time [ns] of each UpdateState call
 };
 
 #endif /* _SysModelTask_H_ */
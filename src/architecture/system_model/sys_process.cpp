@@ -18,6 +18,7 @@
  */
 
 #include "sys_process.h"
+#include <algorithm>
 #include <cstring>
 #include <iostream>
 
@@ -28,6 +29,7 @@ SysProcess :: SysProcess()
     this->processActive = true;
     this->processPriority = -1;
     this->processOnThread = false;
+    this->executionNanos = 0;
     this->disableProcess();
 }
 /*! Make a process AND attach a storage bucket with the provided name. Give
@@ -42,6 +44,7 @@ SysProcess::SysProcess(std::string messageContainer)
     this->processName = messageContainer;
     this->prevRouteTime = 0xFF;
     this->processOnThread = false;
+    this->executionNanos = 0;
     this->disableProcess();
 }
 
@@ -120,47 +123,77 @@ void SysProcess::reInitProcess()
  */
 void SysProcess::singleStepNextTask(uint64_t currentNanos)
 {
-    std::vector<ModelScheduleEntry>::iterator it;
-    std::vector<ModelScheduleEntry>::iterator fireIt;
-
     //! - Check to make sure that there are models to be called.
     if(this->processTasks.begin() == this->processTasks.end())
     {
         bskLogger.bskLog(BSK_WARNING, "Received a step command on sim that has no active Tasks.");
         return;
     }
-    fireIt=this->processTasks.begin();
-    //! - If the requested time does not meet our next start time, just return
-    for(it=this->processTasks.begin(); it!=this->processTasks.end(); it++)
+    if(this->taskSchedule.size() != this->processTasks.size())
     {
-        if(it->NextTaskStart < fireIt->NextTaskStart ||
-                (it->NextTaskStart==fireIt->NextTaskStart && it->taskPriority > fireIt->taskPriority))
-        {
-            fireIt = it;
-        }
+        this->rebuildTaskSchedule();
     }
-    if(fireIt->NextTaskStart > currentNanos)
+    auto laterTask = [this](size_t first, size_t second) {return this->taskRunsBefore(second, first);};
+    //! - If the requested time does not meet our next start time, just return
+    size_t fireIndex = this->taskSchedule.front();
+    if(this->processTasks[fireIndex].NextTaskStart > currentNanos)
     {
-        this->nextTaskTime = fireIt->NextTaskStart;
+        this->nextTaskTime = this->processTasks[fireIndex].NextTaskStart;
         return;
     }
     //! - Call the next scheduled model, and set the time to its start
-    SysModelTask *localTask = fireIt->TaskPtr;
+    std::pop_heap(this->taskSchedule.begin(), this->taskSchedule.end(), laterTask);
+    SysModelTask *localTask = this->processTasks[fireIndex].TaskPtr;
     localTask->ExecuteTaskList(currentNanos);
-    fireIt->NextTaskStart = localTask->NextStartTime;
-    
+    this->processTasks[fireIndex].NextTaskStart = localTask->NextStartTime;
+    if(this->taskSchedule.back() == fireIndex)
+    {
+        std::push_heap(this->taskSchedule.begin(), this->taskSchedule.end(), laterTask);
+    }
+    else
+    {
+        //! - The tasks were changed while the task executed
+        this->rebuildTaskSchedule();
+    }
+
     //! - Figure out when we are going to be called next for scheduling purposes
-    fireIt=this->processTasks.begin();
-    //! - If the requested time does not meet our next start time, just return
-    for(it=this->processTasks.begin(); it!=this->processTasks.end(); it++)
+    this->nextTaskTime = this->processTasks[this->taskSchedule.front()].NextTaskStart;
+}
+
+/*! This method orders two tasks of the process the way they are executed: by next start time, then by decreasing
+ priority, then in the order of the task list.
+ @return bool true if the task at index first runs before the task at index second
+ @param first index of a task in processTasks
+ @param second index of a task in processTasks
+ */
+bool SysProcess::taskRunsBefore(size_t first, size_t second) const
+{
+    const ModelScheduleEntry &firstEntry = this->processTasks[first];
+    const ModelScheduleEntry &secondEntry = this->processTasks[second];
+    if(firstEntry.NextTaskStart != secondEntry.NextTaskStart)
     {
-        if(it->NextTaskStart < fireIt->NextTaskStart ||
-           (it->NextTaskStart==fireIt->NextTaskStart && it->taskPriority > fireIt->taskPriority))
-        {
-            fireIt = it;
-        }
+        return firstEntry.NextTaskStart < secondEntry.NextTaskStart;
+    }
+    if(firstEntry.taskPriority != secondEntry.taskPriority)
+    {
+        return firstEntry.taskPriority > secondEntry.taskPriority;
+    }
+    return first < second;
+}
+
+/*! This method rebuilds the heap of tasks singleStepNextTask() picks the next task from, it is called whenever the
+ task list or the start time of a task are changed outside of singleStepNextTask().
+ @return void
+ */
+void SysProcess::rebuildTaskSchedule()
+{
+    this->taskSchedule.resize(this->processTasks.size());
+    for(size_t i = 0; i < this->taskSchedule.size(); i++)
+    {
+        this->taskSchedule[i] = i;
     }
-    this->nextTaskTime = fireIt->NextTaskStart;
+    std::make_heap(this->taskSchedule.begin(), this->taskSchedule.end(),
+                   [this](size_t first, size_t second) {return this->taskRunsBefore(second, first);});
 }
 
 /*! This method adds a new task into the Task list.  Note that
@@ -200,11 +233,13 @@ void SysProcess::scheduleTask(ModelScheduleEntry & taskCall)
             taskCall.taskPriority > it->taskPriority))
         {
             this->processTasks.insert(it, taskCall);
+            this->rebuildTaskSchedule();
             return;
         }
     }
     //! - Default case is to put the Task at the end of the schedule
     this->processTasks.push_back(taskCall);
+    this->rebuildTaskSchedule();
 }
 
 /*! The name kind of says it all right?  It is a shotgun used to disable all of 
@@ -253,6 +288,7 @@ void SysProcess::changeTaskPeriod(std::string taskName, uint64_t newPeriod)
 			it->TaskPtr->updatePeriod(newPeriod);
 			it->NextTaskStart = it->TaskPtr->NextStartTime;
 			it->TaskUpdatePeriod = it->TaskPtr->TaskPeriod;
+			this->rebuildTaskSchedule();
 			return;
 		}
 	}
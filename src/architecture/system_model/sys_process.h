@@ -59,7 +59,11 @@ public:
     void enableAllTasks(); //!< class method
     bool getProcessControlStatus() {return this->processOnThread;} //!< Allows caller to see if this process is parented by a thread
     void setProcessControlStatus(bool processTaken) {processOnThread = processTaken;} //!< Provides a mechanism to say that this process is allocated to a thread
-    
+
+private:
+    bool taskRunsBefore(size_t first, size_t second) const;
+    void rebuildTaskSchedule();
+
 public:
     std::vector<ModelScheduleEntry> processTasks;  //!< -- Array that has pointers to all process tasks
     uint64_t nextTaskTime;  //!< [ns] time for the next Task
@@ -68,7 +72,11 @@ public:
 	bool processActive;  //!< -- Flag indicating whether the Process is active
 	bool processOnThread; //!< -- Flag indicating that the process has been added to a thread for execution
     int64_t processPriority;  //!< [-] Priority level for process (higher first)
+    uint64_t executionNanos;  //!< [ns] Wall time spent executing the process while its thread measures it
     BSKLogger bskLogger;                      //!< -- BSK Logging
+
+private:
+    std::vector<size_t> taskSchedule;  //!< -- Heap of the processTasks indices, the next task to run on top
 };
 
 #endif /* _SysProcess_H_ */
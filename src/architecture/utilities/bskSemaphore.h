@@ -21,45 +21,82 @@
 #define COMMON_UTILS_SEMAPHORE_H
 // https://riptutorial.com/cplusplus/example/30142/semaphore-cplusplus-11
 
+#include <atomic>
 #include <mutex>
 #include <condition_variable>
+#include <thread>
 
 
-/*! Basilisk semaphore class */
+/*! Basilisk semaphore class.  A thread that acquires the semaphore first spins
+    for up to spinCount checks of the count, yielding its core between checks,
+    before it parks on the condition variable.  Spinning avoids the wake-up
+    latency of the condition variable when the semaphore is released soon. */
 class BSKSemaphore
 {
     std::mutex mutex;
     std::condition_variable cv;
-    size_t count;
+    std::atomic<size_t> count;
+    std::atomic<size_t> waiters;
+    std::atomic<size_t> spinCount;
+
+    /*! take one from the count if it is not zero */
+    inline bool tryAcquire()
+    {
+        size_t current = count.load();
+        while (current > 0)
+        {
+            if (count.compare_exchange_weak(current, current - 1))
+            {
+                return true;
+            }
+        }
+        return false;
+    }
 
 public:
     /*! method description */
     BSKSemaphore(int count_in = 0)
-        : count(count_in)
+        : count(count_in), waiters(0), spinCount(0)
     {
     }
-    
+
+    /*! set the number of checks of the count before parking, 0 parks right away */
+    inline void setSpinCount(size_t spinCount_in)
+    {
+        spinCount = spinCount_in;
+    }
+
     /*! release the lock */
     inline void release()
     {
+        ++count;
+        if (waiters.load() > 0)
         {
+            //notify the waiting thread, after it has parked or before it checks the count
             std::unique_lock<std::mutex> lock(mutex);
-            ++count;
-            //notify the waiting thread
+            cv.notify_one();
         }
-        cv.notify_one();
     }
     
     /*! aquire the lock */
     inline void acquire()
     {
+        for (size_t i = spinCount.load(); i > 0; i--)
+        {
+            if (tryAcquire())
+            {
+                return;
+            }
+            std::this_thread::yield();
+        }
         std::unique_lock<std::mutex> lock(mutex);
-        while (count == 0)
+        ++waiters;
+        while (!tryAcquire())
         {
             //wait on the mutex until notify is called
             cv.wait(lock);
         }
-        --count;
+        --waiters;
     }
 };
 
@@ -0,0 +1,219 @@
+/*
+ ISC License
+
+ Copyright (c) 2024, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+
+ Permission to use, copy, modify, and/or distribute this software for any
+ purpose with or without fee is hereby granted, provided that the above
+ copyright notice and this permission notice appear in all copies.
+
+ THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+ WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+ MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+ ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+ WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+ ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+ OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+ */
+
+#include "architecture/utilities/variableLogger.h"
+#include <string.h>
+
+/*! The constructor
+ @param minLogPeriod [ns] minimum time between two samples
+ */
+VariableLogger::VariableLogger(uint64_t minLogPeriod) : minLogPeriod(minLogPeriod), nextLogTime(0)
+{
+}
+
+VariableLogger::~VariableLogger()
+{
+}
+
+/*! Clear the history of the variables
+ @param CurrentSimNanos [ns] current simulation time
+ */
+void VariableLogger::Reset(uint64_t CurrentSimNanos)
+{
+    this->clear();
+}
+
+/*! Record the variables if the minimum log period has elapsed since the last sample
+ @param CurrentSimNanos [ns] current simulation time
+ */
+void VariableLogger::UpdateState(uint64_t CurrentSimNanos)
+{
+    if (CurrentSimNanos < this->nextLogTime) {
+        return;
+    }
+    this->logTimes.push_back(CurrentSimNanos);
+    for (auto &variable : this->variables) {
+        this->recordSample(variable);
+    }
+    this->nextLogTime += this->minLogPeriod;
+}
+
+/*! Append the current value of a variable to its history */
+void VariableLogger::recordSample(LoggedVariable &variable)
+{
+    size_t sampleSize = variable.rows * variable.cols;
+    variable.history.resize(variable.history.size() + sampleSize);
+    double *sample = variable.history.data() + variable.history.size() - sampleSize;
+    if (variable.accessor) {
+        variable.accessor(sample);
+    } else if (!variable.columnMajor || variable.cols == 1 || variable.rows == 1) {
+        memcpy(sample, variable.source, sampleSize * sizeof(double));
+    } else {
+        for (size_t row = 0; row < variable.rows; row++) {
+            for (size_t col = 0; col < variable.cols; col++) {
+                sample[row * variable.cols + col] = variable.source[col * variable.rows + row];
+            }
+        }
+    }
+}
+
+/*! Log the rows x cols doubles stored at source.  The memory must remain valid while the logger runs.
+ @param name name of the variable
+ @param source memory of the variable
+ @param rows number of rows of the variable
+ @param cols number of columns of the variable
+ @param columnMajor whether the variable is stored column-major, as Eigen matrices are
+ */
+void VariableLogger::addVariable(const std::string &name, const double *source, size_t rows, size_t cols,
+                                 bool columnMajor)
+{
+    if (source == nullptr || rows == 0 || cols == 0) {
+        this->bskLogger.bskLog(BSK_ERROR, "VariableLogger: cannot log %s, it has no memory or no elements",
+                               name.c_str());
+        return;
+    }
+    if (this->getVariableIndex(name) >= 0) {
+        this->bskLogger.bskLog(BSK_ERROR, "VariableLogger: %s is already logged", name.c_str());
+        return;
+    }
+    LoggedVariable variable;
+    variable.name = name;
+    variable.rows = rows;
+    variable.cols = cols;
+    variable.source = source;
+    variable.columnMajor = columnMajor;
+    variable.history.reserve(this->logTimes.capacity() * rows * cols);
+    this->variables.push_back(std::move(variable));
+}
+
+/*! Log a variable read with an accessor
+ @param name name of the variable
+ @param accessor function writing the rows x cols values of the variable, row-major, into its argument
+ @param rows number of rows of the variable
+ @param cols number of columns of the variable
+ */
+void VariableLogger::addVariable(const std::string &name, std::function<void(double *)> accessor, size_t rows,
+                                 size_t cols)
+{
+    if (!accessor || rows == 0 || cols == 0) {
+        this->bskLogger.bskLog(BSK_ERROR, "VariableLogger: cannot log %s, it has no accessor or no elements",
+                               name.c_str());
+        return;
+    }
+    if (this->getVariableIndex(name) >= 0) {
+        this->bskLogger.bskLog(BSK_ERROR, "VariableLogger: %s is already logged", name.c_str());
+        return;
+    }
+    LoggedVariable variable;
+    variable.name = name;
+    variable.rows = rows;
+    variable.cols = cols;
+    variable.source = nullptr;
+    variable.columnMajor = false;
+    variable.accessor = std::move(accessor);
+    variable.history.reserve(this->logTimes.capacity() * rows * cols);
+    this->variables.push_back(std::move(variable));
+}
+
+/*! Log the doubles at a memory address, such as the address of a state returned by ``StateData.getStateAddress()``
+ @param name name of the variable
+ @param address address of the variable
+ @param rows number of rows of the variable
+ @param cols number of columns of the variable
+ @param columnMajor whether the variable is stored column-major, as Eigen matrices are
+ */
+void VariableLogger::addVariableAtAddress(const std::string &name, uint64_t address, size_t rows, size_t cols,
+                                          bool columnMajor)
+{
+    this->addVariable(name, reinterpret_cast<const double *>(address), rows, cols, columnMajor);
+}
+
+/*! Preallocate the buffers for a number of samples, so that no allocation happens while they are recorded
+ @param numSamples number of samples
+ */
+void VariableLogger::reserve(size_t numSamples)
+{
+    this->logTimes.reserve(numSamples);
+    for (auto &variable : this->variables) {
+        variable.history.reserve(numSamples * variable.rows * variable.cols);
+    }
+}
+
+/*! Clear the history of the variables, the buffers keep their capacity */
+void VariableLogger::clear()
+{
+    this->logTimes.clear();
+    for (auto &variable : this->variables) {
+        variable.history.clear();
+    }
+    this->nextLogTime = 0;
+}
+
+/*! Get the number of recorded samples */
+size_t VariableLogger::getSampleCount() const
+{
+    return this->logTimes.size();
+}
+
+/*! Get the number of logged variables */
+size_t VariableLogger::getVariableCount() const
+{
+    return this->variables.size();
+}
+
+/*! Get the index of a variable, -1 if it is not logged */
+int VariableLogger::getVariableIndex(const std::string &name) const
+{
+    for (size_t i = 0; i < this->variables.size(); i++) {
+        if (this->variables[i].name == name) {
+            return (int) i;
+        }
+    }
+    return -1;
+}
+
+/*! Get the name of a variable */
+std::string VariableLogger::getVariableName(size_t index) const
+{
+    return this->variables.at(index).name;
+}
+
+/*! Get the number of rows of a variable */
+size_t VariableLogger::getVariableRows(size_t index) const
+{
+    return this->variables.at(index).rows;
+}
+
+/*! Get the number of columns of a variable */
+size_t VariableLogger::getVariableCols(size_t index) const
+{
+    return this->variables.at(index).cols;
+}
+
+/*! Get the address of the sample times, valid until the next sample is recorded */
+uint64_t VariableLogger::timesAddress() const
+{
+    return reinterpret_cast<uint64_t>(this->logTimes.data());
+}
+
+/*! Get the address of the history of a variable, valid until the next sample is recorded */
+uint64_t VariableLogger::variableAddress(size_t index) const
+{
+    return reinterpret_cast<uint64_t>(this->variables.at(index).history.data());
+}
@@ -0,0 +1,102 @@
+/*
+ ISC License
+
+ Copyright (c) 2024, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+
+ Permission to use, copy, modify, and/or distribute this software for any
+ purpose with or without fee is hereby granted, provided that the above
+ copyright notice and this permission notice appear in all copies.
+
+ THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+ WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+ MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+ ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+ WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+ ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+ OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+ */
+
+#ifndef VARIABLE_LOGGER_H
+#define VARIABLE_LOGGER_H
+
+#include <functional>
+#include <string>
+#include <vector>
+#include <stdint.h>
+#include <Eigen/Dense>
+#include "architecture/_GeneralModuleFiles/sys_model.h"
+#include "architecture/utilities/bskLogging.h"
+
+/*! @brief Logger of module variables that records their values in native buffers, without calling into python
+    at every time step.  A variable is bound once, when the logger is set up, to the memory of a double, a C array of
+    doubles or an Eigen matrix, or to a C++ accessor.  Each variable is stored in its own contiguous buffer of
+    doubles, one row-major sample after the other.
+ */
+class VariableLogger : public SysModel {
+public:
+    VariableLogger(uint64_t minLogPeriod = 0);
+    ~VariableLogger();
+
+    void Reset(uint64_t CurrentSimNanos);
+    void UpdateState(uint64_t CurrentSimNanos);
+
+    /*! Log the rows x cols doubles at source, stored row-major, or column-major as Eigen matrices are */
+    void addVariable(const std::string &name, const double *source, size_t rows = 1, size_t cols = 1,
+                     bool columnMajor = false);
+    /*! Log an accessor that writes the rows x cols values of the variable, row-major, into its argument */
+    void addVariable(const std::string &name, std::function<void(double *)> accessor, size_t rows = 1,
+                     size_t cols = 1);
+
+    /*! Log an Eigen vector or matrix, with the size it has when it is added */
+    template <typename Derived>
+    void addVariable(const std::string &name, const Eigen::PlainObjectBase<Derived> &source)
+    {
+        size_t rows = (size_t) source.rows();
+        size_t cols = (size_t) source.cols();
+        this->addVariable(name, [&source, rows, cols](double *sample) {
+            Eigen::Map<Eigen::Matrix<double, Eigen::Dynamic, Eigen::Dynamic, Eigen::RowMajor>>(
+                sample, (Eigen::Index) rows, (Eigen::Index) cols) = source.template cast<double>();
+        }, rows, cols);
+    }
+
+    void addVariableAtAddress(const std::string &name, uint64_t address, size_t rows = 1, size_t cols = 1,
+                              bool columnMajor = false);
+
+    void reserve(size_t numSamples);
+    void clear();
+
+    size_t getSampleCount() const;
+    size_t getVariableCount() const;
+    int getVariableIndex(const std::string &name) const;
+    std::string getVariableName(size_t index) const;
+    size_t getVariableRows(size_t index) const;
+    size_t getVariableCols(size_t index) const;
+
+    uint64_t timesAddress() const;
+    uint64_t variableAddress(size_t index) const;
+
+public:
+    uint64_t minLogPeriod;              //!< [ns] minimum time between two samples
+    BSKLogger bskLogger;                //!< -- BSK Logging
+
+private:
+    /*! @brief A logged variable and its history */
+    struct LoggedVariable {
+        std::string name;                               //!< name of the variable
+        size_t rows;                                    //!< number of rows of a sample
+        size_t cols;                                    //!< number of columns of a sample
+        const double *source;                           //!< memory the variable is copied from, if bound to memory
+        bool columnMajor;                               //!< whether the source memory is column-major
+        std::function<void(double *)> accessor;         //!< accessor the variable is read with, if bound to one
+        std::vector<double> history;                    //!< the samples, one after the other
+    };
+
+    void recordSample(LoggedVariable &variable);
+
+    std::vector<LoggedVariable> variables;  //!< the logged variables
+    std::vector<uint64_t> logTimes;         //!< [ns] the times of the samples
+    uint64_t nextLogTime;                   //!< [ns] time of the next sample
+};
+
+#endif /* VARIABLE_LOGGER_H */
@@ -0,0 +1,97 @@
+/*
+ ISC License
+
+ Copyright (c) 2024, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+
+ Permission to use, copy, modify, and/or distribute this software for any
+ purpose with or without fee is hereby granted, provided that the above
+ copyright notice and this permission notice appear in all copies.
+
+ THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+ WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+ MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+ ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+ WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+ ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+ OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+ */
+%module variableLogger
+%{
+   #include "variableLogger.h"
+%}
+
+%pythoncode %{
+from Basilisk.architecture.swig_common_model import *
+import ctypes
+import numpy as np
+%}
+
+%include "std_string.i"
+%include "stdint.i"
+%include "sys_model.i"
+
+// the memory and accessor bindings are for C++ code, python binds variables with addVariable() below
+%ignore VariableLogger::addVariable;
+%rename(__addVariableAtAddress) VariableLogger::addVariableAtAddress;
+
+%include "variableLogger.h"
+
+%extend VariableLogger {
+    %pythoncode %{
+        def addVariable(self, name, source, rows=1, cols=1, columnMajor=False):
+            """
+            Log a variable, bound once to its memory
+
+            Args:
+                name: the name the history is retrieved with, ``logger.<name>``
+                source: a ``StateData`` (whose size and layout are used), or the address of rows x cols doubles
+                rows: number of rows of the variable
+                cols: number of columns of the variable
+                columnMajor: whether the doubles at the address are stored column-major, as Eigen matrices are
+            """
+            if hasattr(source, "getStateAddress"):
+                address, rows, cols, columnMajor = (source.getStateAddress(), source.getRowSize(),
+                                                    source.getColumnSize(), True)
+            else:
+                address = int(source)
+            if self.getVariableIndex(name) >= 0:
+                raise ValueError(f"'{name}' is already logged")
+            self.__addVariableAtAddress(name, address, rows, cols, columnMajor)
+
+        def variableNames(self):
+            """Names of the logged variables"""
+            return [self.getVariableName(i) for i in range(self.getVariableCount())]
+
+        def times(self):
+            """Retrieve the times when the data was logged"""
+            count = self.getSampleCount()
+            if count == 0:
+                return np.zeros(0, dtype=np.uint64)
+            buffer = (ctypes.c_uint64 * count).from_address(self.timesAddress())
+            return np.frombuffer(buffer, dtype=np.uint64).copy()
+
+        def __getattr__(self, name):
+            if name == "this" or name.startswith("_"):
+                # the swig pointer is looked up here until the object is constructed
+                raise AttributeError(name)
+            index = self.getVariableIndex(name)
+            if index < 0:
+                raise AttributeError(f"Logger is not logging '{name}'. "
+                                     f"Must be one of: {', '.join(self.variableNames())}")
+            count = self.getSampleCount()
+            shape = (self.getVariableRows(index), self.getVariableCols(index))
+            if count == 0:
+                values = np.zeros((0,) + shape)
+            else:
+                buffer = (ctypes.c_double * (count * shape[0] * shape[1])).from_address(self.variableAddress(index))
+                values = np.frombuffer(buffer, dtype=np.float64).reshape((count,) + shape).copy()
+            # same shapes as the PythonVariableLogger, the samples of a vector are 1D and those of a scalar are 0D
+            return values.reshape((count,) + tuple(n for n in shape if n != 1))
+    %}
+}
+
+%pythoncode %{
+import sys
+protectAllClasses(sys.modules[__name__])
+%}
@@ -0,0 +1,76 @@
+# ISC License
+#
+# Copyright (c) 2024, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import pytest
+from numpy.testing import assert_array_equal
+
+from Basilisk.architecture import variableLogger
+from Basilisk.simulation import spacecraft
+from Basilisk.utilities import SimulationBaseClass
+from Basilisk.utilities import macros
+from Basilisk.utilities import pythonVariableLogger
+
+
+def test_variableLogger():
+    """Check the native logger against the python logger on the spacecraft hub states"""
+    simulation = SimulationBaseClass.SimBaseClass()
+    process = simulation.CreateNewProcess("testProcess")
+    taskName = "task"
+    process.addTask(simulation.CreateNewTask(taskName, macros.sec2nano(0.1)))
+
+    scObject = spacecraft.Spacecraft()
+    scObject.ModelTag = "spacecraftBody"
+    scObject.hub.r_CN_NInit = [7000e3, 0.0, 0.0]
+    scObject.hub.v_CN_NInit = [0.0, 7.5e3, 0.0]
+    scObject.hub.omega_BN_BInit = [[0.01], [-0.02], [0.03]]
+    simulation.AddModelToTask(taskName, scObject)
+
+    nativeLog = variableLogger.VariableLogger(macros.sec2nano(0.5))
+    simulation.AddModelToTask(taskName, nativeLog)
+
+    positionState = scObject.dynManager.getStateObject("hubPosition")
+    omegaState = scObject.dynManager.getStateObject("hubOmega")
+    pythonLog = pythonVariableLogger.PythonVariableLogger({
+        "r_BN_N": lambda _: positionState.getState(),
+        "omega_BN_B": lambda _: omegaState.getState(),
+    }, macros.sec2nano(0.5))
+    simulation.AddModelToTask(taskName, pythonLog)
+
+    simulation.InitializeSimulation()
+    nativeLog.addVariable("r_BN_N", positionState)
+    nativeLog.addVariable("omega_BN_B", omegaState)
+    nativeLog.reserve(11)
+    with pytest.raises(ValueError):
+        nativeLog.addVariable("r_BN_N", positionState)
+
+    simulation.ConfigureStopTime(macros.sec2nano(5.0))
+    simulation.ExecuteSimulation()
+
+    assert nativeLog.variableNames() == ["r_BN_N", "omega_BN_B"]
+    assert_array_equal(nativeLog.times(), pythonLog.times())
+    assert nativeLog.r_BN_N.shape == (11, 3)
+    assert_array_equal(nativeLog.r_BN_N, pythonLog.r_BN_N)
+    assert_array_equal(nativeLog.omega_BN_B, pythonLog.omega_BN_B)
+    with pytest.raises(AttributeError):
+        nativeLog.sigma_BN
+
+    nativeLog.clear()
+    assert len(nativeLog.times()) == 0
+    assert nativeLog.r_BN_N.shape == (0, 3)
+
+
+if __name__ == "__main__":
+    test_variableLogger()
@@ -0,0 +1,141 @@
+#
+#  ISC License
+#
+#  Copyright (c) 2024, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+
+import time
+
+import numpy as np
+from Basilisk import __path__
+from Basilisk.simulation import spacecraft
+from Basilisk.simulation import svIntegrators
+from Basilisk.utilities import SimulationBaseClass
+from Basilisk.utilities import macros
+from Basilisk.utilities import orbitalMotion
+from Basilisk.utilities import simIncludeGravBody
+
+bskPath = __path__[0]
+
+# Dormand-Prince 5(4), whose last stage is the first stage of the next step
+dormandPrince = dict(
+    largest_order=5,
+    a_coefficients=[
+        [0, 0, 0, 0, 0, 0, 0],
+        [1/5, 0, 0, 0, 0, 0, 0],
+        [3/40, 9/40, 0, 0, 0, 0, 0],
+        [44/45, -56/15, 32/9, 0, 0, 0, 0],
+        [19372/6561, -25360/2187, 64448/6561, -212/729, 0, 0, 0],
+        [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656, 0, 0],
+        [35/384, 0, 500/1113, 125/192, -2187/6784, 11/84, 0],
+    ],
+    b_coefficients=[35/384, 0, 500/1113, 125/192, -2187/6784, 11/84, 0],
+    b_star_coefficients=[5179/57600, 0, 7571/16695, 393/640, -92097/339200, 187/2100, 1/40],
+    c_coefficients=[0, 1/5, 3/10, 4/5, 8/9, 1, 1],
+)
+
+
+def orbitElements(a, e, f=0.):
+    """Classical elements of an inclined orbit of semi-major axis a [m], eccentricity e and true anomaly f [rad]"""
+    oe = orbitalMotion.ClassicElements()
+    oe.a = a
+    oe.e = e
+    oe.i = 33.3 * macros.D2R
+    oe.Omega = 48.2 * macros.D2R
+    oe.omega = 347.8 * macros.D2R
+    oe.f = f
+    return oe
+
+
+def createIntegrator(integratorCase, scObject):
+    """Integrator of the spacecraft: rkf45, rkf78, dop853, dormandPrince, gaussJackson or abm"""
+    if integratorCase == "rkf45":
+        integrator = svIntegrators.svIntegratorRKF45(scObject)
+    elif integratorCase == "rkf78":
+        integrator = svIntegrators.svIntegratorRKF78(scObject)
+    elif integratorCase == "dop853":
+        integrator = svIntegrators.svIntegratorDOP853(scObject)
+    elif integratorCase == "dormandPrince":
+        integrator = svIntegrators.svIntegratorAdaptiveRungeKutta(scObject, **dormandPrince)
+    elif integratorCase == "gaussJackson":
+        integrator = svIntegrators.svIntegratorGaussJackson(scObject)
+        integrator.addSecondOrderStates(scObject.hub.nameOfHubPosition, scObject.hub.nameOfHubVelocity)
+    elif integratorCase == "abm":
+        integrator = svIntegrators.svIntegratorABM(scObject)
+    else:
+        raise ValueError("Unknown integrator " + integratorCase)
+    scObject.setIntegrator(integrator)
+    return integrator
+
+
+def createOrbitSimulation(integratorCase, taskStep, oe, sphericalHarmonicsDegree=0):
+    """Simulation of a spacecraft on the orbit oe around the Earth, with a single task of taskStep [s].  It is not
+    initialized, so that the integrator and the spacecraft can still be configured.  Returns the simulation, the
+    spacecraft, its integrator and the gravitational parameter of the Earth."""
+    scSim = SimulationBaseClass.SimBaseClass()
+    scSim.CreateNewProcess("process").addTask(scSim.CreateNewTask("task", macros.sec2nano(taskStep)))
+
+    scObject = spacecraft.Spacecraft()
+    integrator = createIntegrator(integratorCase, scObject)
+    scSim.AddModelToTask("task", scObject)
+
+    gravFactory = simIncludeGravBody.gravBodyFactory()
+    earth = gravFactory.createEarth()
+    earth.isCentralBody = True
+    if sphericalHarmonicsDegree > 0:
+        earth.useSphericalHarmonicsGravityModel(bskPath + '/supportData/LocalGravData/GGM03S.txt',
+                                                sphericalHarmonicsDegree)
+    scObject.gravField.gravBodies = spacecraft.GravBodyVector(list(gravFactory.gravBodies.values()))
+
+    rN, vN = orbitalMotion.elem2rv(earth.mu, oe)
+    scObject.hub.r_CN_NInit = rN
+    scObject.hub.v_CN_NInit = vN
+    return scSim, scObject, integrator, earth.mu
+
+
+def benchmarkMultistep(periods=10, taskSteps=(10., 30., 60.), sphericalHarmonicsDegree=20):
+    """Evaluations of the equations of motion, wall time [s] and distance [m] to the RKF78 solution, with a 1e-12
+    relative tolerance, of long scenarioBasicOrbit-style runs in a spherical harmonics gravity field.  Returns a
+    (taskStep, integratorCase, evaluations, wallTime, distance) tuple per run."""
+    oe = orbitElements(7000. * 1000 / 0.9, 0.1)
+    rows = []
+    for taskStep in taskSteps:
+        results = {}
+        for integratorCase in ["rkf78", "gaussJackson", "abm"]:
+            scSim, scObject, integrator, mu = createOrbitSimulation(integratorCase, taskStep, oe,
+                                                                    sphericalHarmonicsDegree)
+            if integratorCase == "rkf78":
+                integrator.setRelativeTolerance(1e-12)
+                integrator.setAbsoluteTolerance(1e-6)
+            scSim.InitializeSimulation()
+            stopTime = periods * 2 * np.pi * np.sqrt(oe.a ** 3 / mu)
+            scSim.ConfigureStopTime(macros.sec2nano(taskStep * np.ceil(stopTime / taskStep)))
+            start = time.perf_counter()
+            scSim.ExecuteSimulation()
+            elapsed = time.perf_counter() - start
+            results[integratorCase] = (integrator.subStepCount, elapsed,
+                                       np.array(scObject.scStateOutMsg.read().r_BN_N))
+
+        for integratorCase, (evaluations, elapsed, r_BN_N) in results.items():
+            rows.append((taskStep, integratorCase, evaluations, elapsed,
+                         np.linalg.norm(r_BN_N - results["rkf78"][2])))
+    return rows
+
+
+if __name__ == "__main__":
+    for taskStep, integratorCase, evaluations, elapsed, distance in benchmarkMultistep():
+        print(f"task step {taskStep:5.1f} s, {integratorCase:12s}: {evaluations:8d} evaluations, "
+              f"{elapsed:7.3f} s, {distance:.2e} m from RKF78")
@@ -0,0 +1,73 @@
+#
+#  ISC License
+#
+#  Copyright (c) 2024, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+import numpy as np
+import pytest
+from Basilisk.simulation import spacecraft
+from Basilisk.simulation import svIntegrators
+from Basilisk.utilities import macros
+
+from svIntegrators_test_utilities import createOrbitSimulation, orbitElements
+
+
+def runOrbit(integratorCase, rememberStepSize):
+    """Propagate an eccentric orbit and return the integrator, its number of integration calls and final position"""
+    taskStep = 600.
+    scSim, scObject, integrator, _ = createOrbitSimulation(integratorCase, taskStep,
+                                                           orbitElements(20000. * 1000, 0.6, 85.3 * macros.D2R))
+    integrator.setRelativeTolerance(1e-10)
+    integrator.setAbsoluteTolerance(1e-6)
+    integrator.rememberStepSize = rememberStepSize
+
+    numSteps = 50
+    scSim.InitializeSimulation()
+    scSim.ConfigureStopTime(macros.sec2nano(numSteps * taskStep))
+    scSim.ExecuteSimulation()
+
+    return integrator, numSteps, np.array(scObject.scStateOutMsg.read().r_BN_N)
+
+
+@pytest.mark.parametrize("integratorCase", ["rkf45", "rkf78", "dormandPrince"])
+def test_stepSizeMemory(integratorCase):
+    """The step size carried across calls to integrate avoids most rejected steps, with the same accuracy"""
+    # the results only change when the step size memory is requested
+    assert not svIntegrators.svIntegratorRKF45(spacecraft.Spacecraft()).rememberStepSize
+    forgetful, _, rForgetful = runOrbit(integratorCase, False)
+    remembering, _, rRemembering = runOrbit(integratorCase, True)
+
+    assert remembering.rejectedStepCount < forgetful.rejectedStepCount
+    assert remembering.subStepCount < forgetful.subStepCount
+    np.testing.assert_allclose(rRemembering, rForgetful, rtol=0, atol=1.)
+
+
+@pytest.mark.parametrize("rememberStepSize", [False, True])
+def test_evaluationCounts(rememberStepSize):
+    """The first stage is reused after a rejected step, and after an accepted step for FSAL methods"""
+    rkf45, _, _ = runOrbit("rkf45", rememberStepSize)
+    assert not rkf45.isFirstSameAsLast()
+    assert rkf45.acceptedStepCount > 0
+    assert rkf45.subStepCount == 6 * rkf45.acceptedStepCount + 5 * rkf45.rejectedStepCount
+
+    dormandPrince, numSteps, _ = runOrbit("dormandPrince", rememberStepSize)
+    assert dormandPrince.isFirstSameAsLast()
+    assert dormandPrince.subStepCount == numSteps + 6 * (dormandPrince.acceptedStepCount
+                                                         + dormandPrince.rejectedStepCount)
+
+
+if __name__ == "__main__":
+    test_stepSizeMemory("rkf78")
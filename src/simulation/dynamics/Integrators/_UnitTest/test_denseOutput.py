@@ -0,0 +1,94 @@
+#
+#  ISC License
+#
+#  Copyright (c) 2024, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+import numpy as np
+import pytest
+from Basilisk.utilities import macros
+
+from svIntegrators_test_utilities import createOrbitSimulation, orbitElements
+
+rPeriapsis = 7000. * 1000  # [m]
+eccentricity = 0.3
+
+
+def createSimulation(integratorCase, denseOutput, taskStep):
+    """Set up a spacecraft on an eccentric orbit, starting at periapsis"""
+    scSim, scObject, integrator, mu = createOrbitSimulation(
+        integratorCase, taskStep, orbitElements(rPeriapsis / (1 - eccentricity), eccentricity))
+    integrator.setRelativeTolerance(1e-12)
+    integrator.setAbsoluteTolerance(1e-6)
+    integrator.denseOutput = denseOutput
+    scSim.InitializeSimulation()
+    return scSim, scObject, integrator, mu
+
+
+@pytest.mark.parametrize("integratorCase", ["rkf45", "rkf78", "dop853"])
+def test_denseOutput(integratorCase):
+    """With a fast dynamics task, dense output interpolates between few, long integration steps. The RKF methods
+    have no interpolant and keep integrating the time steps they are given"""
+    results = {}
+    for denseOutput in [False, True]:
+        scSim, scObject, integrator, _ = createSimulation(integratorCase, denseOutput, 1.)
+        dataLog = scObject.scStateOutMsg.recorder()
+        scSim.AddModelToTask("task", dataLog)
+        scSim.ConfigureStopTime(macros.sec2nano(3000.))
+        scSim.ExecuteSimulation()
+        results[denseOutput] = (integrator.subStepCount, dataLog.r_BN_N)
+
+    if integratorCase != "dop853":
+        assert integrator.getDenseOutputOrder() == 0
+        assert results[True][0] == results[False][0]
+        np.testing.assert_array_equal(results[True][1], results[False][1])
+        with pytest.raises(Exception):
+            integrator.getInterpolatedState(scObject, scObject.hub.nameOfHubPosition, 2999.5)
+        return
+
+    # the 7th order interpolant of DOP853 is as accurate as its steps, which are within the tolerances of the run
+    # with short steps
+    assert results[True][0] < results[False][0] / 5
+    assert integrator.getDenseOutputOrder() == 7
+    np.testing.assert_allclose(results[True][1], results[False][1], rtol=0, atol=1e-3)
+
+
+def test_locateEvent():
+    """The interpolated position locates the time the spacecraft rises above a radius"""
+    taskStep = 60.
+    scSim, scObject, integrator, mu = createSimulation("dop853", True, taskStep)
+    rEvent = 8000. * 1000
+
+    eventTime = None
+    for step in range(1, 40):
+        scSim.ConfigureStopTime(macros.sec2nano(step * taskStep))
+        scSim.ExecuteSimulation()
+        eventTime = integrator.locateEvent(scObject, scObject.hub.nameOfHubPosition,
+                                           lambda r_BN_N: np.linalg.norm(r_BN_N) - rEvent, tolerance=1e-6)
+        if eventTime is not None:
+            break
+
+    # time from periapsis to the radius, from Kepler's equation
+    a = rPeriapsis / (1 - eccentricity)
+    eccentricAnomaly = np.arccos((1 - rEvent / a) / eccentricity)
+    trueEventTime = (eccentricAnomaly - eccentricity * np.sin(eccentricAnomaly)) / np.sqrt(mu / a ** 3)
+    assert eventTime == pytest.approx(trueEventTime, abs=1e-3)
+
+    with pytest.raises(Exception):
+        integrator.getInterpolatedState(scObject, scObject.hub.nameOfHubPosition, eventTime + 2 * taskStep)
+
+
+if __name__ == "__main__":
+    test_locateEvent()
@@ -0,0 +1,132 @@
+#
+#  ISC License
+#
+#  Copyright (c) 2024, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+import numpy as np
+import pytest
+from Basilisk.architecture import messaging
+from Basilisk.simulation import extForceTorque
+from Basilisk.utilities import macros
+from Basilisk.utilities import orbitalMotion
+
+from svIntegrators_test_utilities import createOrbitSimulation, orbitElements
+
+rPeriapsis = 7000. * 1000  # [m]
+eccentricity = 0.1
+
+
+def createSimulation(integratorCase, taskStep, controlled=False):
+    """Set up a spacecraft on an eccentric orbit, starting at periapsis, with an external force to fire. A controlled
+    spacecraft starts tumbling, and its external torque is read from ``scSim.torqueMsg``"""
+    oe = orbitElements(rPeriapsis / (1 - eccentricity), eccentricity)
+    scSim, scObject, integrator, mu = createOrbitSimulation(integratorCase, taskStep, oe)
+    if integratorCase == "rkf78":
+        integrator.setRelativeTolerance(1e-12)
+        integrator.setAbsoluteTolerance(1e-6)
+
+    thruster = extForceTorque.ExtForceTorque()
+    scObject.addDynamicEffector(thruster)
+    scSim.AddModelToTask("task", thruster)
+    if controlled:
+        scObject.hub.IHubPntBc_B = [[100., 0., 0.], [0., 100., 0.], [0., 0., 100.]]
+        scObject.hub.omega_BN_BInit = [[0.01], [-0.02], [0.005]]
+        scSim.torqueMsg = messaging.CmdTorqueBodyMsg()
+        thruster.cmdTorqueInMsg.subscribeTo(scSim.torqueMsg)
+
+    scSim.InitializeSimulation()
+    return scSim, scObject, integrator, thruster, mu, oe
+
+
+@pytest.mark.parametrize("integratorCase", ["gaussJackson", "abm"])
+def test_multistepAccuracy(integratorCase):
+    """The multistep integrators follow a Keplerian orbit at two evaluations of the equations of motion per step"""
+    taskStep = 10.
+    numSteps = 1200
+    scSim, scObject, integrator, _, mu, oe = createSimulation(integratorCase, taskStep)
+    scSim.ConfigureStopTime(macros.sec2nano(numSteps * taskStep))
+    scSim.ExecuteSimulation()
+
+    meanAnomaly = np.sqrt(mu / oe.a ** 3) * numSteps * taskStep
+    oe.f = orbitalMotion.E2f(orbitalMotion.M2E(meanAnomaly, oe.e), oe.e)
+    rTrue, _ = orbitalMotion.elem2rv(mu, oe)
+    r_BN_N = scObject.scStateOutMsg.read().r_BN_N
+    np.testing.assert_allclose(r_BN_N, rTrue, rtol=0, atol=1e-2)
+
+    # the start up steps of the RKF78 integrator cost a few hundred evaluations
+    assert integrator.subStepCount < 2 * numSteps + 500
+    assert integrator.restartCount == 0
+    if integratorCase == "abm":
+        assert 1 <= integrator.getOrder() <= integrator.getMaximumOrder()
+
+
+@pytest.mark.parametrize("integratorCase", ["gaussJackson", "abm"])
+def test_restartOnDiscontinuity(integratorCase):
+    """The integration restarts when the thruster is turned on and off, and stays as accurate as RKF78"""
+    taskStep = 10.
+    results = {}
+    for case in [integratorCase, integratorCase + "Tolerance", integratorCase + "NoRestart", "rkf78"]:
+        scSim, scObject, integrator, thruster, _, _ = createSimulation(
+            case.replace("Tolerance", "").replace("NoRestart", ""), taskStep)
+        if case.endswith("Tolerance"):
+            integrator.discontinuityTolerance = 1e-6
+        for stopTime, force in [(1000., [0., 0., 0.]), (1600., [0., 0.01, 0.]), (3000., [0., 0., 0.])]:
+            thruster.extForce_N = force
+            if case == integratorCase:
+                integrator.restart()
+            scSim.ConfigureStopTime(macros.sec2nano(stopTime))
+            scSim.ExecuteSimulation()
+        results[case] = np.array(scObject.scStateOutMsg.read().r_BN_N)
+        if case in [integratorCase, integratorCase + "Tolerance"]:
+            assert integrator.restartCount == 2
+        elif case.endswith("NoRestart"):
+            assert integrator.restartCount == 0
+
+    assert np.linalg.norm(results[integratorCase] - results["rkf78"]) < 1e-2
+    assert np.linalg.norm(results[integratorCase + "Tolerance"] - results["rkf78"]) < 1e-2
+    # continuing the steps across the discontinuities of the force is much less accurate
+    assert np.linalg.norm(results[integratorCase + "NoRestart"] - results["rkf78"]) > 1.
+
+
+@pytest.mark.parametrize("integratorCase", ["gaussJackson", "abm"])
+def test_controlledSpacecraft(integratorCase):
+    """An attitude control loop that updates its torque at every time step only restarts the integration at every
+    time step when the derivatives are checked for discontinuities"""
+    taskStep = 10.
+    numSteps = 100
+    restartCounts = {}
+    for discontinuityTolerance in [None, 1e-6]:
+        scSim, scObject, integrator, _, _, _ = createSimulation(integratorCase, taskStep, controlled=True)
+        if discontinuityTolerance is not None:
+            integrator.discontinuityTolerance = discontinuityTolerance
+
+        # PD control of the attitude, the torque is held over each time step
+        torque = messaging.CmdTorqueBodyMsgPayload()
+        for step in range(numSteps):
+            state = scObject.scStateOutMsg.read()
+            torque.torqueRequestBody = (-0.2 * np.array(state.sigma_BN) - 5. * np.array(state.omega_BN_B)).tolist()
+            scSim.torqueMsg.write(torque, scSim.TotalSim.CurrentNanos)
+            scSim.ConfigureStopTime(macros.sec2nano((step + 1) * taskStep))
+            scSim.ExecuteSimulation()
+        restartCounts[discontinuityTolerance] = integrator.restartCount
+        assert np.linalg.norm(scObject.scStateOutMsg.read().omega_BN_B) < 1e-3
+
+    assert restartCounts[None] == 0
+    assert restartCounts[1e-6] > numSteps / 2
+
+
+if __name__ == "__main__":
+    test_multistepAccuracy("gaussJackson")
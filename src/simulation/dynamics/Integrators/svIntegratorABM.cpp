@@ -0,0 +1,110 @@
+/*
+ ISC License
+
+ Copyright (c) 2023, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+
+ Permission to use, copy, modify, and/or distribute this software for any
+ purpose with or without fee is hereby granted, provided that the above
+ copyright notice and this permission notice appear in all copies.
+
+ THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+ WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+ MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+ ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+ WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+ ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+ OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+ */
+
+#include "svIntegratorABM.h"
+#include <algorithm>
+#include <cfloat>
+
+svIntegratorABM::svIntegratorABM(DynamicObject* dyn, size_t maximumOrder)
+    : svIntegratorMultistep(dyn, std::min<size_t>(std::max<size_t>(maximumOrder, 1), 12) + 1),
+      maximumOrder(std::min<size_t>(std::max<size_t>(maximumOrder, 1), 12)), order(this->maximumOrder)
+{
+    // The predictor of order q is the Adams-Bashforth method that uses f(n)...f(n-q+1), and the corrector the
+    // Adams-Moulton method that uses f(n+1)...f(n-q+2).  The next term of the corrector estimates its error.
+    std::vector<double> adamsBashforth = adamsBashforthCoefficients(this->maximumOrder + 2);
+    this->adamsMoulton = adamsMoultonCoefficients(this->maximumOrder + 2);
+    this->predictorWeights.resize(this->maximumOrder + 1);
+    this->correctorWeights.resize(this->maximumOrder + 1);
+    for (size_t q = 1; q <= this->maximumOrder; q++) {
+        this->predictorWeights[q] =
+            toDerivativeWeights(std::vector<double>(adamsBashforth.begin(), adamsBashforth.begin() + q));
+        this->correctorWeights[q] =
+            toDerivativeWeights(std::vector<double>(this->adamsMoulton.begin(), this->adamsMoulton.begin() + q));
+    }
+}
+
+void svIntegratorABM::initializeHistory(double timeStep)
+{
+    this->order = this->maximumOrder;
+}
+
+void svIntegratorABM::computeStep(double time, double timeStep)
+{
+    this->nextState.setScaled(this->currentState, 1.0);
+    for (size_t age = 0; age < this->order; age++) {
+        this->nextState.addScaled(this->getDerivative(age), timeStep * this->predictorWeights[this->order][age]);
+    }
+
+    ExtendedStateVector& nextDerivative = this->pushDerivative();
+    this->computeDerivatives(time + timeStep, timeStep, this->nextState, nextDerivative);
+
+    this->nextState.setScaled(this->currentState, 1.0);
+    for (size_t age = 0; age < this->order; age++) {
+        this->nextState.addScaled(this->getDerivative(age), timeStep * this->correctorWeights[this->order][age]);
+    }
+}
+
+void svIntegratorABM::updateCurrentDerivative(const ExtendedStateVector& derivative)
+{
+    svIntegratorMultistep::updateCurrentDerivative(derivative);
+    if (this->historyCount < this->historySize) {
+        return;
+    }
+
+    // The order whose next term is the smallest, of the current order and its two neighbours, is the most
+    // accurate for the next step
+    size_t bestOrder = this->order;
+    double bestError = this->estimateError(this->order);
+    for (size_t candidate : {this->order - 1, this->order + 1}) {
+        if (candidate < 1 || candidate > this->maximumOrder) {
+            continue;
+        }
+        double error = this->estimateError(candidate);
+        if (error < bestError) {
+            bestOrder = candidate;
+            bestError = error;
+        }
+    }
+    this->order = bestOrder;
+}
+
+double svIntegratorABM::estimateError(size_t estimateOrder)
+{
+    // nabla^q f(n+1) = sum_k (-1)^k binomial(q, k) f(n+1-k)
+    double binomial = 1.0;
+    for (size_t k = 0; k <= estimateOrder; k++) {
+        double weight = (k % 2 == 0 ? 1.0 : -1.0) * binomial;
+        if (k == 0) {
+            this->difference.setScaled(this->getDerivative(k), weight);
+        } else {
+            this->difference.addScaled(this->getDerivative(k), weight);
+        }
+        binomial = binomial * (estimateOrder - k) / (k + 1);
+    }
+
+    double error = 0.0;
+    const ExtendedStateVector& derivative = this->getDerivative(0);
+    for (const auto& entry : this->stateLayout->entries) {
+        size_t size = entry.rows * entry.cols;
+        double differenceNorm = this->difference.getValues().segment(entry.offset, size).norm();
+        double derivativeNorm = derivative.getValues().segment(entry.offset, size).norm();
+        error = std::max(error, differenceNorm / std::max(derivativeNorm, DBL_MIN));
+    }
+    return std::abs(this->adamsMoulton[estimateOrder]) * error;
+}
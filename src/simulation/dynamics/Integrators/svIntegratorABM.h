@@ -0,0 +1,62 @@
+/*
+ ISC License
+
+ Copyright (c) 2023, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+
+ Permission to use, copy, modify, and/or distribute this software for any
+ purpose with or without fee is hereby granted, provided that the above
+ copyright notice and this permission notice appear in all copies.
+
+ THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+ WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+ MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+ ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+ WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+ ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+ OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+ */
+
+#ifndef svIntegratorABM_h
+#define svIntegratorABM_h
+
+#include "svIntegratorMultistep.h"
+#include <vector>
+
+/*! @brief Variable order Adams-Bashforth-Moulton multistep integrator with fixed steps */
+class svIntegratorABM : public svIntegratorMultistep {
+  public:
+    /** Creates an integrator whose order is at most maximumOrder, between 1 and 12 */
+    svIntegratorABM(DynamicObject* dyn, size_t maximumOrder = 8);
+
+    /** Returns the order of the next step */
+    size_t getOrder() const { return this->order; }
+
+    /** Returns the largest order of the steps */
+    size_t getMaximumOrder() const { return this->maximumOrder; }
+
+  protected:
+    /** Starts at the largest order after a start or restart */
+    void initializeHistory(double timeStep) override;
+
+    /** Predicts the next state, evaluates the equations of motion there and corrects it */
+    void computeStep(double time, double timeStep) override;
+
+    /** Selects the order of the next step once the derivative at the corrected state is known */
+    void updateCurrentDerivative(const ExtendedStateVector& derivative) override;
+
+  private:
+    /** Estimates the local error of the corrector of the given order, relative to the derivatives */
+    double estimateError(size_t estimateOrder);
+
+    const size_t maximumOrder; //!< largest order of the steps
+    size_t order;              //!< order of the next step
+
+    std::vector<std::vector<double>> predictorWeights; //!< weights of the derivatives of the Adams-Bashforth predictor, by order
+    std::vector<std::vector<double>> correctorWeights; //!< weights of the derivatives of the Adams-Moulton corrector, by order
+    std::vector<double> adamsMoulton;                  //!< coefficients of the backward differences of the corrector
+
+    ExtendedStateVector difference; //!< backward difference of the derivatives
+};
+
+#endif /* svIntegratorABM_h */
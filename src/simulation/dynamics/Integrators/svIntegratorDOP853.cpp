@@ -0,0 +1,293 @@
+/*
+ ISC License
+
+ Copyright (c) 2023, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+
+ Permission to use, copy, modify, and/or distribute this software for any
+ purpose with or without fee is hereby granted, provided that the above
+ copyright notice and this permission notice appear in all copies.
+
+ THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+ WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+ MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+ ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+ WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+ ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+ OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+ */
+
+#include "svIntegratorDOP853.h"
+#include <algorithm>
+#include <cmath>
+
+namespace {
+// Coefficients from E. Hairer, S. P. Norsett and G. Wanner (1993) Solving Ordinary Differential
+// Equations I: Nonstiff Problems, and the DOP853 code of E. Hairer
+
+/** Weights of the 5th order error estimator, e5 = h sum(E5_i k_i) */
+const std::array<double, 13> fifthOrderErrorWeights = {
+    0.1312004499419488073250102996e-1, 0.0, 0.0, 0.0, 0.0, -0.1225156446376204440720569753e+1,
+    -0.4957589496572501915214079952, 0.1664377182454986536961530415e+1,
+    -0.3503288487499736816886487290, 0.3341791187130174790297318841,
+    0.8192320648511571246570742613e-1, -0.2235530786388629525884427845e-1, 0.0};
+
+/** Weights of the 3rd order solution, which gives the 3rd order error estimator */
+const std::array<double, 13> thirdOrderWeights = {
+    0.244094488188976377952755905512, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0,
+    0.733846688281611857341361741547, 0.0, 0.0, 0.220588235294117647058823529412e-1, 0.0};
+
+/** "c" coefficients of the three extra stages of the dense output */
+const std::array<double, 3> denseStageTimes = {0.1, 0.2, 0.777777777777777777777777777778};
+
+/** "a" coefficients of the three extra stages of the dense output */
+const std::array<std::array<double, 16>, 3> denseStageWeights = {{
+    {
+        5.61675022830479523392909219681e-2, 0.0, 0.0, 0.0, 0.0, 0.0,
+        2.53500210216624811088794765333e-1, -2.46239037470802489917441475441e-1,
+        -1.24191423263816360469010140626e-1, 1.5329179827876569731206322685e-1,
+        8.20105229563468988491666602057e-3, 7.56789766054569976138603589584e-3, -8.298e-3, 0.0, 0.0,
+        0.0
+    },
+    {
+        3.18346481635021405060768473261e-2, 0.0, 0.0, 0.0, 0.0, 2.83009096723667755288322961402e-2,
+        5.35419883074385676223797384372e-2, -5.49237485713909884646569340306e-2, 0.0, 0.0,
+        -1.08347328697249322858509316994e-4, 3.82571090835658412954920192323e-4,
+        -3.40465008687404560802977114492e-4, 1.41312443674632500278074618366e-1, 0.0, 0.0
+    },
+    {
+        -4.28896301583791923408573538692e-1, 0.0, 0.0, 0.0, 0.0, -4.69762141536116384314449447206,
+        7.68342119606259904184240953878, 4.06898981839711007970213554331,
+        3.56727187455281109270669543021e-1, 0.0, 0.0, 0.0, -1.39902416515901462129418009734e-3,
+        2.9475147891527723389556272149, -9.15095847217987001081870187138, 0.0
+    },
+}};
+
+/** Weights of the "k" coefficients in the 4th to 7th coefficients of the interpolant */
+const std::array<std::array<double, 16>, 4> denseOutputWeights = {{
+    {
+        -0.84289382761090128651353491142e+1, 0.0, 0.0, 0.0, 0.0, 0.56671495351937776962531783590,
+        -0.30689499459498916912797304727e+1, 0.23846676565120698287728149680e+1,
+        0.21170345824450282767155149946e+1, -0.87139158377797299206789907490,
+        0.22404374302607882758541771650e+1, 0.63157877876946881815570249290,
+        -0.88990336451333310820698117400e-1, 0.18148505520854727256656404962e+2,
+        -0.91946323924783554000451984436e+1, -0.44360363875948939664310572000e+1
+    },
+    {
+        0.10427508642579134603413151009e+2, 0.0, 0.0, 0.0, 0.0, 0.24228349177525818288430175319e+3,
+        0.16520045171727028198505394887e+3, -0.37454675472269020279518312152e+3,
+        -0.22113666853125306036270938578e+2, 0.77334326684722638389603898808e+1,
+        -0.30674084731089398182061213626e+2, -0.93321305264302278729567221706e+1,
+        0.15697238121770843886131091075e+2, -0.31139403219565177677282850411e+2,
+        -0.93529243588444783865713862664e+1, 0.35816841486394083752465898540e+2
+    },
+    {
+        0.19985053242002433820987653617e+2, 0.0, 0.0, 0.0, 0.0, -0.38703730874935176555105901742e+3,
+        -0.18917813819516756882830838328e+3, 0.52780815920542364900561016686e+3,
+        -0.11573902539959630126141871134e+2, 0.68812326946963000169666922661e+1,
+        -0.10006050966910838403183860980e+1, 0.77771377980534432092869265740,
+        -0.27782057523535084065932004339e+1, -0.60196695231264120758267380846e+2,
+        0.84320405506677161018159903784e+2, 0.11992291136182789328035130030e+2
+    },
+    {
+        -0.25693933462703749003312586129e+2, 0.0, 0.0, 0.0, 0.0,
+        -0.15418974869023643374053993627e+3, -0.23152937917604549567536039109e+3,
+        0.35763911791061412378285349910e+3, 0.93405324183624310003907691704e+2,
+        -0.37458323136451633156875139351e+2, 0.10409964950896230045147246184e+3,
+        0.29840293426660503123344363579e+2, -0.43533456590011143754432175058e+2,
+        0.96324553959188282948394950600e+2, -0.39177261675615439165231486172e+2,
+        -0.14972683625798562581422125276e+3
+    },
+}};
+} // namespace
+
+svIntegratorDOP853::svIntegratorDOP853(DynamicObject* dyn)
+    : svIntegratorAdaptiveRungeKutta(dyn, svIntegratorDOP853::getCoefficients(), 8.)
+{
+}
+
+int svIntegratorDOP853::getDenseOutputOrder() const
+{
+    return 7;
+}
+
+RKAdaptiveCoefficients<13> svIntegratorDOP853::getCoefficients()
+{
+    RKAdaptiveCoefficients<13> coefficients;
+
+    // The 13th stage is evaluated at the end of the step with the 8th order solution,
+    // so it is the first stage of the next step (FSAL)
+
+    coefficients.aMatrix.at(1).at(0) = 5.26001519587677318785587544488e-2;
+
+    coefficients.aMatrix.at(2).at(0) = 1.97250569845378994544595329183e-2;
+    coefficients.aMatrix.at(2).at(1) = 5.91751709536136983633785987549e-2;
+
+    coefficients.aMatrix.at(3).at(0) = 2.95875854768068491816892993775e-2;
+    coefficients.aMatrix.at(3).at(2) = 8.87627564304205475450678981324e-2;
+
+    coefficients.aMatrix.at(4).at(0) = 2.41365134159266685502369798665e-1;
+    coefficients.aMatrix.at(4).at(2) = -8.84549479328286085344864962717e-1;
+    coefficients.aMatrix.at(4).at(3) = 9.24834003261792003115737966543e-1;
+
+    coefficients.aMatrix.at(5).at(0) = 3.7037037037037037037037037037e-2;
+    coefficients.aMatrix.at(5).at(3) = 1.70828608729473871279604482173e-1;
+    coefficients.aMatrix.at(5).at(4) = 1.25467687566822425016691814123e-1;
+
+    coefficients.aMatrix.at(6).at(0) = 3.7109375e-2;
+    coefficients.aMatrix.at(6).at(3) = 1.70252211019544039314978060272e-1;
+    coefficients.aMatrix.at(6).at(4) = 6.02165389804559606850219397283e-2;
+    coefficients.aMatrix.at(6).at(5) = -1.7578125e-2;
+
+    coefficients.aMatrix.at(7).at(0) = 3.70920001185047927108779319836e-2;
+    coefficients.aMatrix.at(7).at(3) = 1.70383925712239993810214054705e-1;
+    coefficients.aMatrix.at(7).at(4) = 1.07262030446373284651809199168e-1;
+    coefficients.aMatrix.at(7).at(5) = -1.53194377486244017527936158236e-2;
+    coefficients.aMatrix.at(7).at(6) = 8.27378916381402288758473766002e-3;
+
+    coefficients.aMatrix.at(8).at(0) = 6.24110958716075717114429577812e-1;
+    coefficients.aMatrix.at(8).at(3) = -3.36089262944694129406857109825;
+    coefficients.aMatrix.at(8).at(4) = -8.68219346841726006818189891453e-1;
+    coefficients.aMatrix.at(8).at(5) = 2.75920996994467083049415600797e1;
+    coefficients.aMatrix.at(8).at(6) = 2.01540675504778934086186788979e1;
+    coefficients.aMatrix.at(8).at(7) = -4.34898841810699588477366255144e1;
+
+    coefficients.aMatrix.at(9).at(0) = 4.77662536438264365890433908527e-1;
+    coefficients.aMatrix.at(9).at(3) = -2.48811461997166764192642586468;
+    coefficients.aMatrix.at(9).at(4) = -5.90290826836842996371446475743e-1;
+    coefficients.aMatrix.at(9).at(5) = 2.12300514481811942347288949897e1;
+    coefficients.aMatrix.at(9).at(6) = 1.52792336328824235832596922938e1;
+    coefficients.aMatrix.at(9).at(7) = -3.32882109689848629194453265587e1;
+    coefficients.aMatrix.at(9).at(8) = -2.03312017085086261358222928593e-2;
+
+    coefficients.aMatrix.at(10).at(0) = -9.3714243008598732571704021658e-1;
+    coefficients.aMatrix.at(10).at(3) = 5.18637242884406370830023853209;
+    coefficients.aMatrix.at(10).at(4) = 1.09143734899672957818500254654;
+    coefficients.aMatrix.at(10).at(5) = -8.14978701074692612513997267357;
+    coefficients.aMatrix.at(10).at(6) = -1.85200656599969598641566180701e1;
+    coefficients.aMatrix.at(10).at(7) = 2.27394870993505042818970056734e1;
+    coefficients.aMatrix.at(10).at(8) = 2.49360555267965238987089396762;
+    coefficients.aMatrix.at(10).at(9) = -3.0467644718982195003823669022;
+
+    coefficients.aMatrix.at(11).at(0) = 2.27331014751653820792359768449;
+    coefficients.aMatrix.at(11).at(3) = -1.05344954667372501984066689879e1;
+    coefficients.aMatrix.at(11).at(4) = -2.00087205822486249909675718444;
+    coefficients.aMatrix.at(11).at(5) = -1.79589318631187989172765950534e1;
+    coefficients.aMatrix.at(11).at(6) = 2.79488845294199600508499808837e1;
+    coefficients.aMatrix.at(11).at(7) = -2.85899827713502369474065508674;
+    coefficients.aMatrix.at(11).at(8) = -8.87285693353062954433549289258;
+    coefficients.aMatrix.at(11).at(9) = 1.23605671757943030647266201528e1;
+    coefficients.aMatrix.at(11).at(10) = 6.43392746015763530355970484046e-1;
+
+    coefficients.aMatrix.at(12).at(0) = 5.42937341165687622380535766363e-2;
+    coefficients.aMatrix.at(12).at(5) = 4.45031289275240888144113950566;
+    coefficients.aMatrix.at(12).at(6) = 1.89151789931450038304281599044;
+    coefficients.aMatrix.at(12).at(7) = -5.8012039600105847814672114227;
+    coefficients.aMatrix.at(12).at(8) = 3.1116436695781989440891606237e-1;
+    coefficients.aMatrix.at(12).at(9) = -1.52160949662516078556178806805e-1;
+    coefficients.aMatrix.at(12).at(10) = 2.01365400804030348374776537501e-1;
+    coefficients.aMatrix.at(12).at(11) = 4.47106157277725905176885569043e-2;
+
+    coefficients.cArray.at(1) = 0.526001519587677318785587544488e-01;
+    coefficients.cArray.at(2) = 0.789002279381515978178381316732e-01;
+    coefficients.cArray.at(3) = 0.118350341907227396726757197510;
+    coefficients.cArray.at(4) = 0.281649658092772603273242802490;
+    coefficients.cArray.at(5) = 0.333333333333333333333333333333;
+    coefficients.cArray.at(6) = 0.25;
+    coefficients.cArray.at(7) = 0.307692307692307692307692307692;
+    coefficients.cArray.at(8) = 0.651282051282051282051282051282;
+    coefficients.cArray.at(9) = 0.6;
+    coefficients.cArray.at(10) = 0.857142857142857142857142857142;
+    coefficients.cArray.at(11) = 1.0;
+    coefficients.cArray.at(12) = 1.0;
+
+    coefficients.bArray.at(0) = 5.42937341165687622380535766363e-2;
+    coefficients.bArray.at(5) = 4.45031289275240888144113950566;
+    coefficients.bArray.at(6) = 1.89151789931450038304281599044;
+    coefficients.bArray.at(7) = -5.8012039600105847814672114227;
+    coefficients.bArray.at(8) = 3.1116436695781989440891606237e-1;
+    coefficients.bArray.at(9) = -1.52160949662516078556178806805e-1;
+    coefficients.bArray.at(10) = 2.01365400804030348374776537501e-1;
+    coefficients.bArray.at(11) = 4.47106157277725905176885569043e-2;
+
+    // The error is computed by computeMaxRelativeError, these give the 5th order error estimator
+    for (size_t i = 0; i < 13; i++) {
+        coefficients.bStarArray.at(i) = coefficients.bArray.at(i) - fifthOrderErrorWeights.at(i);
+    }
+
+    return coefficients;
+}
+
+double svIntegratorDOP853::computeMaxRelativeError(
+    double timeStep,
+    const ExtendedStateVector& candidateNextState,
+    const typename svIntegratorRungeKutta<13>::KCoefficientsValues& kVectors)
+{
+    // The 5th order error estimator is corrected by the 3rd order one, which is
+    // the difference between the 8th order and the 3rd order solutions
+    this->truncationError.setScaled(kVectors.at(0), fifthOrderErrorWeights.at(0) * timeStep);
+    this->thirdOrderError.setScaled(
+        kVectors.at(0), (this->coefficients->bArray.at(0) - thirdOrderWeights.at(0)) * timeStep);
+    for (size_t stageIndex = 1; stageIndex < 13; stageIndex++) {
+        double fifthOrderWeight = fifthOrderErrorWeights.at(stageIndex);
+        double thirdOrderWeight = this->coefficients->bArray.at(stageIndex) - thirdOrderWeights.at(stageIndex);
+        if (fifthOrderWeight != 0) {
+            this->truncationError.addScaled(kVectors.at(stageIndex), fifthOrderWeight * timeStep);
+        }
+        if (thirdOrderWeight != 0) {
+            this->thirdOrderError.addScaled(kVectors.at(stageIndex), thirdOrderWeight * timeStep);
+        }
+    }
+
+    double maxRelativeError = 0;
+    for (const auto& entry : candidateNextState.getLayout()->entries) {
+        size_t entrySize = entry.rows * entry.cols;
+        double fifthOrderError = this->truncationError.getValues().segment(entry.offset, entrySize).norm();
+        double thirdOrderError = this->thirdOrderError.getValues().segment(entry.offset, entrySize).norm();
+        double denominator = std::sqrt(fifthOrderError * fifthOrderError + 0.01 * thirdOrderError * thirdOrderError);
+        double thisTruncationError = denominator > 0 ? fifthOrderError * fifthOrderError / denominator : 0.;
+        double thisErrorTolerance = this->getTolerance(
+            entry.id.first,
+            entry.id.second,
+            candidateNextState.getValues().segment(entry.offset, entrySize).norm());
+        maxRelativeError = std::max(maxRelativeError, thisTruncationError / thisErrorTolerance);
+    }
+
+    return maxRelativeError;
+}
+
+void svIntegratorDOP853::computeDenseCoefficients(double timeStep,
+                                                  const ExtendedStateVector& endDerivative,
+                                                  RKDenseStep& denseStep)
+{
+    // The 7th order interpolant needs three more stages, which use the 13 "k" coefficients of the step
+    auto kValue = [&](size_t stageIndex) -> const ExtendedStateVector& {
+        return stageIndex < 13 ? this->kValues.at(stageIndex) : this->denseKValues.at(stageIndex - 13);
+    };
+    for (size_t extraIndex = 0; extraIndex < 3; extraIndex++) {
+        this->stageState.setScaled(this->currentState, 1.);
+        for (size_t stageIndex = 0; stageIndex < 13 + extraIndex; stageIndex++) {
+            double weight = denseStageWeights.at(extraIndex).at(stageIndex);
+            if (weight == 0) continue;
+            this->stageState.addScaled(kValue(stageIndex), weight * timeStep);
+        }
+        this->computeDerivatives(denseStep.startTime + denseStageTimes.at(extraIndex) * timeStep,
+                                 timeStep,
+                                 this->stageState,
+                                 this->denseKValues.at(extraIndex));
+    }
+
+    // The first three coefficients are the cubic Hermite interpolant
+    svIntegratorAdaptiveRungeKutta<13>::computeDenseCoefficients(timeStep, endDerivative, denseStep);
+
+    denseStep.coefficients.resize(7);
+    for (size_t coefficientIndex = 0; coefficientIndex < 4; coefficientIndex++) {
+        ExtendedStateVector& coefficient = denseStep.coefficients.at(3 + coefficientIndex);
+        coefficient.setScaled(kValue(0), denseOutputWeights.at(coefficientIndex).at(0) * timeStep);
+        for (size_t stageIndex = 1; stageIndex < 16; stageIndex++) {
+            double weight = denseOutputWeights.at(coefficientIndex).at(stageIndex);
+            if (weight == 0) continue;
+            coefficient.addScaled(kValue(stageIndex), weight * timeStep);
+        }
+    }
+}
@@ -0,0 +1,53 @@
+/*
+ ISC License
+
+ Copyright (c) 2023, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+
+ Permission to use, copy, modify, and/or distribute this software for any
+ purpose with or without fee is hereby granted, provided that the above
+ copyright notice and this permission notice appear in all copies.
+
+ THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+ WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+ MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+ ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+ WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+ ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+ OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+ */
+
+#ifndef svIntegratorDOP853_h
+#define svIntegratorDOP853_h
+
+#include "../_GeneralModuleFiles/svIntegratorAdaptiveRungeKutta.h"
+#include <array>
+
+/*! @brief 8th order Dormand-Prince variable time step integrator, with a 7th order dense output */
+class svIntegratorDOP853 : public svIntegratorAdaptiveRungeKutta<13> {
+  public:
+    svIntegratorDOP853(DynamicObject* dyn); //!< class method
+
+    /** Returns 7, the order of the interpolant of the method */
+    int getDenseOutputOrder() const override;
+
+  protected:
+    /** Combines the 5th and 3rd order error estimators of the method */
+    double computeMaxRelativeError(
+        double timeStep,
+        const ExtendedStateVector& candidateNextState,
+        const typename svIntegratorRungeKutta<13>::KCoefficientsValues& kVectors) override;
+
+    /** Computes the 7th order interpolant of the method, which needs three more stages */
+    void computeDenseCoefficients(double timeStep,
+                                  const ExtendedStateVector& endDerivative,
+                                  RKDenseStep& denseStep) override;
+
+  private:
+    static RKAdaptiveCoefficients<13> getCoefficients();
+
+    ExtendedStateVector thirdOrderError;             //!< 3rd order error estimate of every state
+    std::array<ExtendedStateVector, 3> denseKValues; //!< "k" coefficients of the extra stages of the dense output
+};
+
+#endif /* svIntegratorDOP853_h */
@@ -0,0 +1,172 @@
+/*
+ ISC License
+
+ Copyright (c) 2023, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+
+ Permission to use, copy, modify, and/or distribute this software for any
+ purpose with or without fee is hereby granted, provided that the above
+ copyright notice and this permission notice appear in all copies.
+
+ THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+ WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+ MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+ ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+ WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+ ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+ OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+ */
+
+#include "svIntegratorGaussJackson.h"
+#include <algorithm>
+
+namespace {
+/** Copies the 9 coefficients from the given index on, and converts them to weights of the derivatives */
+std::array<double, 9> derivativeWeights(const std::vector<double>& differenceCoefficients, size_t firstIndex)
+{
+    std::vector<double> coefficients(differenceCoefficients.begin() + firstIndex,
+                                     differenceCoefficients.begin() + firstIndex + 9);
+    std::array<double, 9> weights;
+    std::vector<double> derivativeWeights = svIntegratorMultistep::toDerivativeWeights(coefficients);
+    std::copy(derivativeWeights.begin(), derivativeWeights.end(), weights.begin());
+    return weights;
+}
+
+/** Product of two series of backward differences */
+std::vector<double> multiplySeries(const std::vector<double>& lhs, const std::vector<double>& rhs)
+{
+    std::vector<double> product(std::min(lhs.size(), rhs.size()), 0.0);
+    for (size_t j = 0; j < product.size(); j++) {
+        for (size_t i = 0; i <= j; i++) {
+            product[j] += lhs[i] * rhs[j - i];
+        }
+    }
+    return product;
+}
+}
+
+svIntegratorGaussJackson::svIntegratorGaussJackson(DynamicObject* dyn)
+    : svIntegratorMultistep(dyn, 9)
+{
+    // With the sums S1(n) = S1(n-1) + f(n) and S2(n) = S2(n-1) + S1(n) of the derivatives, whose integration
+    // constants match the current states, the summed Adams method integrates the first order states:
+    //     y(n+1) = h (S1(n) + sum(gamma_(j+1) nabla^j f(n)))             predictor
+    //     y(n+1) = h (S1(n+1) + sum(gamma*_(j+1) nabla^j f(n+1)))        corrector
+    // and the Gauss-Jackson method integrates the positions from the accelerations a, the derivatives of the
+    // velocities:
+    //     r(n+1) = h^2 (S2(n) + sum(delta_(j+2) nabla^j a(n)))           predictor
+    //     r(n+1) = h^2 (S2(n) + sum(sigma*_(j+2) nabla^j a(n+1)))        corrector
+    // where delta = gamma * gamma* and sigma* = gamma* * gamma* are the coefficients of the Stormer-Cowell
+    // methods, the Adams coefficients of the second integral of the derivatives.
+    std::vector<double> adamsBashforth = adamsBashforthCoefficients(11);
+    std::vector<double> adamsMoulton = adamsMoultonCoefficients(11);
+    this->firstPredictorWeights = derivativeWeights(adamsBashforth, 1);
+    this->firstCorrectorWeights = derivativeWeights(adamsMoulton, 1);
+    this->secondPredictorWeights = derivativeWeights(multiplySeries(adamsBashforth, adamsMoulton), 2);
+    this->secondCorrectorWeights = derivativeWeights(multiplySeries(adamsMoulton, adamsMoulton), 2);
+}
+
+void svIntegratorGaussJackson::addSecondOrderStates(const std::string& positionName,
+                                                    const std::string& velocityName)
+{
+    this->secondOrderStateNames.emplace_back(positionName, velocityName);
+    this->secondOrderLayout.reset();
+    this->restart();
+}
+
+void svIntegratorGaussJackson::resolveSecondOrderStates()
+{
+    if (this->secondOrderLayout == this->stateLayout) {
+        return;
+    }
+    this->secondOrderBlocks.clear();
+    for (size_t dynIndex = 0; dynIndex < this->dynPtrs.size(); dynIndex++) {
+        for (const auto& names : this->secondOrderStateNames) {
+            const ExtendedStateEntry* position = this->stateLayout->find({dynIndex, names.first});
+            const ExtendedStateEntry* velocity = this->stateLayout->find({dynIndex, names.second});
+            if (position && velocity && position->rows == velocity->rows && position->cols == velocity->cols) {
+                this->secondOrderBlocks.push_back(
+                    {position->offset, velocity->offset, position->rows * position->cols});
+            }
+        }
+    }
+    this->secondOrderLayout = this->stateLayout;
+}
+
+void svIntegratorGaussJackson::initializeHistory(double timeStep)
+{
+    this->resolveSecondOrderStates();
+
+    // Integration constants of the sums for which the correctors give the current state
+    this->firstSum.setScaled(this->currentState, 1.0 / timeStep);
+    for (size_t age = 0; age < 9; age++) {
+        this->firstSum.addScaled(this->getDerivative(age), -this->firstCorrectorWeights[age]);
+    }
+
+    this->secondSum.setScaled(this->currentState, 1.0 / (timeStep * timeStep));
+    Eigen::VectorXd& secondSum = this->secondSum.getValues();
+    for (const auto& block : this->secondOrderBlocks) {
+        secondSum.segment(block.positionOffset, block.size) +=
+            this->firstSum.getValues().segment(block.velocityOffset, block.size);
+        for (size_t age = 0; age < 9; age++) {
+            secondSum.segment(block.positionOffset, block.size) -=
+                this->secondCorrectorWeights[age] *
+                this->getDerivative(age).getValues().segment(block.velocityOffset, block.size);
+        }
+    }
+}
+
+void svIntegratorGaussJackson::computeStep(double time, double timeStep)
+{
+    double timeStep2 = timeStep * timeStep;
+    Eigen::VectorXd& nextState = this->nextState.getValues();
+
+    this->nextState.setScaled(this->firstSum, timeStep);
+    for (size_t age = 0; age < 9; age++) {
+        this->nextState.addScaled(this->getDerivative(age), timeStep * this->firstPredictorWeights[age]);
+    }
+    for (const auto& block : this->secondOrderBlocks) {
+        auto position = nextState.segment(block.positionOffset, block.size);
+        position = timeStep2 * this->secondSum.getValues().segment(block.positionOffset, block.size);
+        for (size_t age = 0; age < 9; age++) {
+            position += timeStep2 * this->secondPredictorWeights[age] *
+                        this->getDerivative(age).getValues().segment(block.velocityOffset, block.size);
+        }
+    }
+
+    ExtendedStateVector& nextDerivative = this->pushDerivative();
+    this->computeDerivatives(time + timeStep, timeStep, this->nextState, nextDerivative);
+    this->firstSum.addScaled(nextDerivative, 1.0);
+
+    this->nextState.setScaled(this->firstSum, timeStep);
+    for (size_t age = 0; age < 9; age++) {
+        this->nextState.addScaled(this->getDerivative(age), timeStep * this->firstCorrectorWeights[age]);
+    }
+    for (const auto& block : this->secondOrderBlocks) {
+        auto position = nextState.segment(block.positionOffset, block.size);
+        position = timeStep2 * this->secondSum.getValues().segment(block.positionOffset, block.size);
+        for (size_t age = 0; age < 9; age++) {
+            position += timeStep2 * this->secondCorrectorWeights[age] *
+                        this->getDerivative(age).getValues().segment(block.velocityOffset, block.size);
+        }
+        this->secondSum.getValues().segment(block.positionOffset, block.size) +=
+            this->firstSum.getValues().segment(block.velocityOffset, block.size);
+    }
+}
+
+void svIntegratorGaussJackson::updateCurrentDerivative(const ExtendedStateVector& derivative)
+{
+    // S1(n) and S2(n) both include f(n), once the history is initialized
+    if (this->historyCount < this->historySize) {
+        svIntegratorMultistep::updateCurrentDerivative(derivative);
+        return;
+    }
+    this->firstSum.addScaled(this->getDerivative(0), -1.0);
+    this->firstSum.addScaled(derivative, 1.0);
+    for (const auto& block : this->secondOrderBlocks) {
+        this->secondSum.getValues().segment(block.positionOffset, block.size) +=
+            derivative.getValues().segment(block.velocityOffset, block.size) -
+            this->getDerivative(0).getValues().segment(block.velocityOffset, block.size);
+    }
+    svIntegratorMultistep::updateCurrentDerivative(derivative);
+}
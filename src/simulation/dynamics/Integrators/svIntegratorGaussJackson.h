@@ -0,0 +1,73 @@
+/*
+ ISC License
+
+ Copyright (c) 2023, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+
+ Permission to use, copy, modify, and/or distribute this software for any
+ purpose with or without fee is hereby granted, provided that the above
+ copyright notice and this permission notice appear in all copies.
+
+ THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+ WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+ MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+ ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+ WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+ ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+ OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+ */
+
+#ifndef svIntegratorGaussJackson_h
+#define svIntegratorGaussJackson_h
+
+#include "svIntegratorMultistep.h"
+#include <array>
+#include <string>
+#include <utility>
+#include <vector>
+
+/*! @brief 8th order Gauss-Jackson multistep integrator with fixed steps, for the second order equations of
+    motion of orbits */
+class svIntegratorGaussJackson : public svIntegratorMultistep {
+  public:
+    svIntegratorGaussJackson(DynamicObject* dyn); //!< class method
+
+    /** Integrates a position state and the velocity state that is its derivative as a second order equation,
+        for every dynamic object that has both states */
+    void addSecondOrderStates(const std::string& positionName, const std::string& velocityName);
+
+  protected:
+    /** Computes the sums of the derivatives that match the current state */
+    void initializeHistory(double timeStep) override;
+
+    /** Predicts the next state, evaluates the equations of motion there and corrects it */
+    void computeStep(double time, double timeStep) override;
+
+    /** Updates the sums of the derivatives along with the derivative at the current state */
+    void updateCurrentDerivative(const ExtendedStateVector& derivative) override;
+
+  private:
+    /** Where a position state and its velocity state are stored */
+    struct SecondOrderBlock {
+        size_t positionOffset; //!< index of the first value of the position state
+        size_t velocityOffset; //!< index of the first value of the velocity state
+        size_t size;           //!< number of values of the states
+    };
+
+    /** Finds the second order states in the layout of the states, when it changed */
+    void resolveSecondOrderStates();
+
+    std::vector<std::pair<std::string, std::string>> secondOrderStateNames; //!< names of the position and velocity states
+    std::vector<SecondOrderBlock> secondOrderBlocks;                        //!< the second order states of the layout
+    std::shared_ptr<const ExtendedStateLayout> secondOrderLayout;           //!< layout the blocks were found in
+
+    std::array<double, 9> firstPredictorWeights;  //!< weights of the derivatives in the summed Adams predictor
+    std::array<double, 9> firstCorrectorWeights;  //!< weights of the derivatives in the summed Adams corrector
+    std::array<double, 9> secondPredictorWeights; //!< weights of the accelerations in the Gauss-Jackson predictor
+    std::array<double, 9> secondCorrectorWeights; //!< weights of the accelerations in the Gauss-Jackson corrector
+
+    ExtendedStateVector firstSum;  //!< sum of the derivatives of every state, with the integration constant
+    ExtendedStateVector secondSum; //!< sum of firstSum, at the offsets of the position states
+};
+
+#endif /* svIntegratorGaussJackson_h */
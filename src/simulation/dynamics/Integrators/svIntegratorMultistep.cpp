@@ -0,0 +1,204 @@
+/*
+ ISC License
+
+ Copyright (c) 2023, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+
+ Permission to use, copy, modify, and/or distribute this software for any
+ purpose with or without fee is hereby granted, provided that the above
+ copyright notice and this permission notice appear in all copies.
+
+ THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+ WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+ MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+ ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+ WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+ ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+ OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+ */
+
+#include "svIntegratorMultistep.h"
+#include <algorithm>
+#include <cmath>
+
+svIntegratorMultistep::svIntegratorMultistep(DynamicObject* dynIn, size_t historySize)
+    : StateVecIntegrator(dynIn), historySize(historySize), derivativeHistory(historySize), starter(dynIn)
+{
+}
+
+void svIntegratorMultistep::integrate(double currentTime, double timeStep)
+{
+    if (timeStep <= 0) {
+        return;
+    }
+
+    size_t numberSteps = 1;
+    if (this->maximumStepSize > 0) {
+        numberSteps = std::max<size_t>(1, (size_t) std::ceil(timeStep / this->maximumStepSize * (1 - 1e-12)));
+    }
+    double stepSize = timeStep / numberSteps;
+
+    this->startState.readStates(this->updateStateLayout());
+    if (!this->continuesHistory(currentTime, stepSize)) {
+        if (this->historyCount > 0) {
+            this->restartCount++;
+        }
+        this->historyCount = 0;
+        this->restartRequested = false;
+        this->currentState.setScaled(this->startState, 1.0);
+        if (!this->startDerivativeKnown) {
+            this->computeDerivatives(currentTime, stepSize, this->currentState, this->startDerivative);
+        }
+        this->pushDerivative().setScaled(this->startDerivative, 1.0);
+        this->starter.resetStepSize();
+    }
+    this->stepSize = stepSize;
+
+    for (size_t stepIndex = 0; stepIndex < numberSteps; stepIndex++) {
+        double time = currentTime + stepIndex * stepSize;
+        if (this->historyCount < this->historySize) {
+            this->takeStartupStep(time, stepSize);
+            if (this->historyCount == this->historySize) {
+                this->initializeHistory(stepSize);
+            }
+        } else {
+            this->computeStep(time, stepSize);
+            std::swap(this->currentState, this->nextState);
+            if (stepIndex + 1 < numberSteps) {
+                this->computeDerivatives(time + stepSize, stepSize, this->currentState, this->correctedDerivative);
+                this->updateCurrentDerivative(this->correctedDerivative);
+            }
+        }
+    }
+
+    this->endTime = currentTime + timeStep;
+    this->currentState.setStates(this->dynPtrs);
+}
+
+void svIntegratorMultistep::restart()
+{
+    this->restartRequested = true;
+}
+
+bool svIntegratorMultistep::continuesHistory(double currentTime, double stepSize)
+{
+    this->startDerivativeKnown = false;
+    if (this->historyCount == 0 || this->restartRequested || currentTime != this->endTime ||
+        std::abs(stepSize - this->stepSize) > 1e-9 * this->stepSize ||
+        this->startState.getLayout() != this->currentState.getLayout() ||
+        this->startState.getValues() != this->currentState.getValues()) {
+        return false;
+    }
+
+    // The newest derivative of the history was computed at the end of the last time step, with the inputs of
+    // the dynamics at that time, and at the predicted state after a multistep step
+    this->computeDerivatives(currentTime, stepSize, this->startState, this->startDerivative);
+    this->startDerivativeKnown = true;
+    if (this->discontinuityTolerance >= 0) {
+        const ExtendedStateVector& lastDerivative = this->getDerivative(0);
+        for (const auto& entry : this->stateLayout->entries) {
+            size_t size = entry.rows * entry.cols;
+            auto last = lastDerivative.getValues().segment(entry.offset, size);
+            auto start = this->startDerivative.getValues().segment(entry.offset, size);
+            if ((start - last).norm() > this->discontinuityTolerance * last.norm()) {
+                return false;
+            }
+        }
+    }
+    this->updateCurrentDerivative(this->startDerivative);
+    return true;
+}
+
+void svIntegratorMultistep::takeStartupStep(double time, double timeStep)
+{
+    this->currentState.setStates(this->dynPtrs);
+    this->starter.dynPtrs = this->dynPtrs;
+    this->starter.relTol = this->startupRelTol;
+    this->starter.absTol = this->startupAbsTol;
+    uint64_t starterSubSteps = this->starter.subStepCount;
+    this->starter.integrate(time, timeStep);
+    this->subStepCount += this->starter.subStepCount - starterSubSteps;
+
+    this->currentState.readStates(this->stateLayout);
+    this->computeDerivatives(time + timeStep, timeStep, this->currentState, this->pushDerivative());
+}
+
+void svIntegratorMultistep::updateCurrentDerivative(const ExtendedStateVector& derivative)
+{
+    this->derivativeHistory.at(this->newestIndex).setScaled(derivative, 1.0);
+}
+
+const std::shared_ptr<const ExtendedStateLayout>& svIntegratorMultistep::updateStateLayout()
+{
+    if (!this->stateLayout || !this->stateLayout->matches(this->dynPtrs)) {
+        this->stateLayout = ExtendedStateLayout::fromDynamicObjects(this->dynPtrs);
+    }
+    return this->stateLayout;
+}
+
+void svIntegratorMultistep::computeDerivatives(double time,
+                                               double timeStep,
+                                               const ExtendedStateVector& states,
+                                               ExtendedStateVector& derivatives)
+{
+    states.setStates(this->dynPtrs);
+    this->subStepCount++;
+
+    for (auto dynPtr : this->dynPtrs) {
+        dynPtr->equationsOfMotion(time, timeStep);
+    }
+
+    derivatives.readStateDerivs(states.getLayout());
+}
+
+ExtendedStateVector& svIntegratorMultistep::pushDerivative()
+{
+    this->newestIndex = (this->newestIndex + 1) % this->derivativeHistory.size();
+    this->historyCount = std::min(this->historyCount + 1, this->historySize);
+    return this->derivativeHistory.at(this->newestIndex);
+}
+
+const ExtendedStateVector& svIntegratorMultistep::getDerivative(size_t age) const
+{
+    size_t size = this->derivativeHistory.size();
+    return this->derivativeHistory.at((this->newestIndex + size - age) % size);
+}
+
+std::vector<double> svIntegratorMultistep::adamsBashforthCoefficients(size_t count)
+{
+    std::vector<double> coefficients(count);
+    for (size_t j = 0; j < count; j++) {
+        coefficients[j] = 1.0;
+        for (size_t i = 0; i < j; i++) {
+            coefficients[j] -= coefficients[i] / (j + 1 - i);
+        }
+    }
+    return coefficients;
+}
+
+std::vector<double> svIntegratorMultistep::adamsMoultonCoefficients(size_t count)
+{
+    std::vector<double> coefficients(count);
+    for (size_t j = 0; j < count; j++) {
+        coefficients[j] = j == 0 ? 1.0 : 0.0;
+        for (size_t i = 0; i < j; i++) {
+            coefficients[j] -= coefficients[i] / (j + 1 - i);
+        }
+    }
+    return coefficients;
+}
+
+std::vector<double> svIntegratorMultistep::toDerivativeWeights(const std::vector<double>& differenceCoefficients)
+{
+    // nabla^j f(n) = sum_k (-1)^k binomial(j, k) f(n-k)
+    size_t count = differenceCoefficients.size();
+    std::vector<double> weights(count, 0.0);
+    for (size_t j = 0; j < count; j++) {
+        double binomial = 1.0;
+        for (size_t k = 0; k <= j; k++) {
+            weights[k] += (k % 2 == 0 ? 1.0 : -1.0) * binomial * differenceCoefficients[j];
+            binomial = binomial * (j - k) / (k + 1);
+        }
+    }
+    return weights;
+}
@@ -0,0 +1,159 @@
+/*
+ ISC License
+
+ Copyright (c) 2023, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+
+ Permission to use, copy, modify, and/or distribute this software for any
+ purpose with or without fee is hereby granted, provided that the above
+ copyright notice and this permission notice appear in all copies.
+
+ THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+ WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+ MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+ ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+ WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+ ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+ OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+ */
+
+#ifndef svIntegratorMultistep_h
+#define svIntegratorMultistep_h
+
+#include "../_GeneralModuleFiles/dynamicObject.h"
+#include "../_GeneralModuleFiles/extendedStateVector.h"
+#include "../_GeneralModuleFiles/stateVecIntegrator.h"
+#include "svIntegratorRKF78.h"
+#include <memory>
+#include <stdint.h>
+#include <vector>
+
+/**
+ * The svIntegratorMultistep class is the base of the multistep integrators,
+ * which compute each step of constant size from the derivatives of the states
+ * at the previous steps. A step costs two evaluations of the equations of
+ * motion, regardless of the order of the method: one at the predicted state,
+ * and one at the corrected state. The latter is evaluated at the start of the
+ * next time step for the last step of a time step, so that it is evaluated
+ * with the inputs of the dynamics, such as the thruster commands, at that time.
+ *
+ * The derivatives of the previous steps are only valid while the dynamics are
+ * smooth. The first steps are taken with an RKF78 integrator until the history
+ * holds enough derivatives, and the integration restarts this way whenever it
+ * cannot continue from the history: when the states were changed between two
+ * time steps, for example by an MRP switch or an impulsive maneuver, when the
+ * size of the steps changes, or when restart() is called, for example when a
+ * thruster is turned on or off. The changes of the inputs of the dynamics are
+ * not detected by default: an attitude control loop changes its torques at
+ * every time step, which would restart the integration at every time step. A
+ * non-negative discontinuityTolerance also restarts the integration when the
+ * derivative of a state at the start of a time step changed by more than this
+ * tolerance.
+ */
+class svIntegratorMultistep : public StateVecIntegrator {
+  public:
+    /** Creates a multistep integrator that keeps the derivatives of historySize steps */
+    svIntegratorMultistep(DynamicObject* dynIn, size_t historySize);
+
+    /** Performs the integration of the associated dynamic objects up to time currentTime+timeStep */
+    void integrate(double currentTime, double timeStep) override;
+
+    /** Restarts the integration with the RKF78 integrator at the next time step */
+    void restart();
+
+    double maximumStepSize = 0;           //!< [s] largest step, the time steps are split into equal steps; 0 takes one step per time step
+    double discontinuityTolerance = -1;   //!< relative change of the derivative of any state at the start of a time step that restarts the integration; negative, the default, to only restart when the states change or restart() is called
+    double startupRelTol = 1e-12;         //!< relative tolerance of the RKF78 steps of a start or restart
+    double startupAbsTol = 1e-8;          //!< absolute tolerance of the RKF78 steps of a start or restart
+    uint64_t restartCount = 0;            //!< number of restarts of the integration since it started
+
+    /**
+     * Returns the first count coefficients of the backward difference form of
+     * the Adams-Bashforth methods: y(n+1) = y(n) + h sum(gamma_j nabla^j f(n))
+     */
+    static std::vector<double> adamsBashforthCoefficients(size_t count);
+
+    /**
+     * Returns the first count coefficients of the backward difference form of
+     * the Adams-Moulton methods: y(n+1) = y(n) + h sum(gamma*_j nabla^j f(n+1))
+     */
+    static std::vector<double> adamsMoultonCoefficients(size_t count);
+
+    /**
+     * Converts the coefficients c_j of a sum of backward differences,
+     * sum(c_j nabla^j f(n)), into the weights w_k of the derivatives, sum(w_k f(n-k))
+     */
+    static std::vector<double> toDerivativeWeights(const std::vector<double>& differenceCoefficients);
+
+  protected:
+    /**
+     * Called when the history holds historySize derivatives after a start or
+     * restart, to set up what the method keeps between its steps.
+     */
+    virtual void initializeHistory(double timeStep) {}
+
+    /**
+     * Computes nextState, the state one step after currentState, and pushes
+     * the derivative at the predicted state into the history.
+     */
+    virtual void computeStep(double time, double timeStep) = 0;
+
+    /**
+     * Replaces the derivative at the predicted state, the newest derivative of
+     * the history, with the derivative at currentState, the corrected state.
+     */
+    virtual void updateCurrentDerivative(const ExtendedStateVector& derivative);
+
+    /**
+     * Returns the layout of the states of the dynamic objects, which is
+     * only resolved again when states were added or resized.
+     */
+    const std::shared_ptr<const ExtendedStateLayout>& updateStateLayout();
+
+    /**
+     * Computes the derivatives of every state given a time and current states.
+     *
+     * Internally, this sets the states on the dynamic objects and
+     * calls the equationsOfMotion methods.
+     */
+    void computeDerivatives(double time,
+                            double timeStep,
+                            const ExtendedStateVector& states,
+                            ExtendedStateVector& derivatives);
+
+    /** Makes room in the history for the derivative of a new step, and returns it */
+    ExtendedStateVector& pushDerivative();
+
+    /** Returns the derivative age steps before the current state, 0 being the derivative at the current state */
+    const ExtendedStateVector& getDerivative(size_t age) const;
+
+  protected:
+    const size_t historySize; /**< Number of derivatives the method needs */
+    size_t historyCount = 0;  /**< Number of derivatives in the history since the last start or restart */
+
+    /** Layout of the states of the dynamic objects, shared by the buffers below */
+    std::shared_ptr<const ExtendedStateLayout> stateLayout;
+
+    ExtendedStateVector currentState; /**< State at the start of the step */
+    ExtendedStateVector nextState;    /**< State at the end of the step */
+
+  private:
+    /** Whether the integration can continue from the history at the start of a time step */
+    bool continuesHistory(double currentTime, double stepSize);
+
+    /** Takes a step with the RKF78 integrator and pushes the derivative at its end */
+    void takeStartupStep(double time, double timeStep);
+
+    std::vector<ExtendedStateVector> derivativeHistory; /**< Ring buffer of the derivatives of the last steps */
+    size_t newestIndex = 0;                             /**< Index of the derivative at the current state */
+    ExtendedStateVector startState;                     /**< States of the dynamic objects at the start of a time step */
+    ExtendedStateVector startDerivative;                /**< Derivative at the start of a time step */
+    ExtendedStateVector correctedDerivative;            /**< Derivative at the corrected state */
+    bool startDerivativeKnown = false;                  /**< Whether startDerivative holds the derivative at startState */
+    bool restartRequested = false;                      /**< Whether restart() was called */
+    double stepSize = 0;                                /**< [s] Size of the steps of the history */
+    double endTime = 0;                                 /**< [s] Time the last time step ended at */
+    svIntegratorRKF78 starter;                          /**< Integrator of the steps of a start or restart */
+};
+
+#endif /* svIntegratorMultistep_h */
@@ -27,6 +27,10 @@
    #include "svIntegratorRK2.h"
    #include "svIntegratorRKF45.h"
    #include "svIntegratorRKF78.h"
+   #include "svIntegratorDOP853.h"
+   #include "svIntegratorMultistep.h"
+   #include "svIntegratorGaussJackson.h"
+   #include "svIntegratorABM.h"
    #include "architecture/_GeneralModuleFiles/sys_model.h"
    #include "../_GeneralModuleFiles/dynamicObject.h"
 %}
@@ -40,6 +44,7 @@ _rk_adaptive_base_classes = {}
 %}
 
 %include <std_vector.i>
+%include "swig_eigen.i"
 %template() std::vector<double>;
 %template() std::vector<std::vector<double>>;
 
@@ -56,6 +61,7 @@ _rk_adaptive_base_classes = {}
 %include "../_GeneralModuleFiles/stateVecIntegrator.h"
 
 %include "../_GeneralModuleFiles/svIntegratorRungeKutta.h"
+%ignore RKDenseStep;
 %include "../_GeneralModuleFiles/svIntegratorAdaptiveRungeKutta.h"
 
 // We add a constructor for svIntegratorRungeKutta and svIntegratorAdaptiveRungeKutta
@@ -104,6 +110,51 @@ _rk_adaptive_base_classes = {}
   }
 }
 
+%extend svIntegratorAdaptiveRungeKutta {
+    %pythoncode %{
+        def locateEvent(self, dynamicObject, stateName, eventFunction, tolerance=1e-6, samples=10):
+            """
+            Locate the first time of the last time step at which a function of an interpolated state
+            changes sign, such as the altitude above a threshold or the distance to a shadow cone.
+            The integrator must be in dense output mode.
+
+            The event is located on the interpolated states, so its accuracy is that of the interpolant of
+            order ``getDenseOutputOrder()``, 7 for DOP853.
+
+            Args:
+                dynamicObject: the DynamicObject the state belongs to
+                stateName: the name of the state, such as ``"hubPosition"``
+                eventFunction: function of the value of the state, a numpy array, whose sign change is the event
+                tolerance: [s] accuracy of the time of the event
+                samples: number of intervals the time step is searched for a sign change in
+
+            Returns:
+                The time of the event [s], or None if the function does not change sign in the last time step
+            """
+            def evaluate(time):
+                return eventFunction(np.array(self.getInterpolatedState(dynamicObject, stateName, time)))
+
+            times = np.linspace(self.getDenseOutputStartTime(), self.getDenseOutputEndTime(), samples + 1)
+            lower, valueLower = times[0], evaluate(times[0])
+            for upper in times[1:]:
+                valueUpper = evaluate(upper)
+                if valueLower == 0:
+                    return lower
+                if valueLower * valueUpper < 0:
+                    # bisection, the interpolated states are cheap to evaluate
+                    while upper - lower > tolerance:
+                        middle = 0.5 * (lower + upper)
+                        valueMiddle = evaluate(middle)
+                        if valueLower * valueMiddle <= 0:
+                            upper = middle
+                        else:
+                            lower, valueLower = middle, valueMiddle
+                    return 0.5 * (lower + upper)
+                lower, valueLower = upper, valueUpper
+            return None
+    %}
+}
+
 %define TEMPLATE_HELPER(stageNumber)
 %template(svIntegratorRungeKutta ## stageNumber) svIntegratorRungeKutta< ## stageNumber>;
 %template(svIntegratorAdaptiveRungeKutta ## stageNumber) svIntegratorAdaptiveRungeKutta< ## stageNumber>;
@@ -129,6 +180,10 @@ TEMPLATE_HELPER(13)
 %include "svIntegratorRK2.h"
 %include "svIntegratorRKF45.h"
 %include "svIntegratorRKF78.h"
+%include "svIntegratorDOP853.h"
+%include "svIntegratorMultistep.h"
+%include "svIntegratorGaussJackson.h"
+%include "svIntegratorABM.h"
 
 // The following methods allow users to create new Runge-Kutta
 // methods simply by providing their coefficients on the Python side
@@ -18,27 +18,107 @@
  */
 
 #include "extendedStateVector.h"
+#include <algorithm>
+#include <stdexcept>
+
+std::shared_ptr<const ExtendedStateLayout>
+ExtendedStateLayout::fromDynamicObjects(const std::vector<DynamicObject*>& dynPtrs)
+{
+    auto layout = std::make_shared<ExtendedStateLayout>();
+
+    for (size_t dynIndex = 0; dynIndex < dynPtrs.size(); dynIndex++) {
+        for (auto&& [stateName, stateData] :
+             dynPtrs.at(dynIndex)->dynManager.stateContainer.stateMap) {
+            ExtendedStateEntry entry{std::make_pair(dynIndex, stateName),
+                                     &stateData,
+                                     layout->size,
+                                     (size_t)stateData.state.rows(),
+                                     (size_t)stateData.state.cols()};
+            layout->entryIndices.emplace(entry.id, layout->entries.size());
+            layout->entries.push_back(entry);
+            layout->size += entry.rows * entry.cols;
+        }
+    }
+
+    return layout;
+}
+
+bool ExtendedStateLayout::matches(const std::vector<DynamicObject*>& dynPtrs) const
+{
+    auto entry = this->entries.begin();
+    for (size_t dynIndex = 0; dynIndex < dynPtrs.size(); dynIndex++) {
+        for (auto&& [stateName, stateData] :
+             dynPtrs.at(dynIndex)->dynManager.stateContainer.stateMap) {
+            if (entry == this->entries.end() || entry->stateData != &stateData ||
+                entry->id.first != dynIndex || entry->rows != (size_t)stateData.state.rows() ||
+                entry->cols != (size_t)stateData.state.cols() ||
+                (size_t)stateData.stateDeriv.size() != entry->rows * entry->cols) {
+                return false;
+            }
+            entry++;
+        }
+    }
+    return entry == this->entries.end();
+}
+
+const ExtendedStateEntry* ExtendedStateLayout::find(const ExtendedStateId& id) const
+{
+    auto index = this->entryIndices.find(id);
+    return index == this->entryIndices.end() ? nullptr : &this->entries.at(index->second);
+}
+
+ExtendedStateVector::ExtendedStateVector(std::shared_ptr<const ExtendedStateLayout> layout)
+    : stateLayout(std::move(layout))
+{
+    this->values.setZero(this->stateLayout->size);
+}
 
 ExtendedStateVector ExtendedStateVector::fromStates(const std::vector<DynamicObject*>& dynPtrs)
 {
-    return fromStateData(dynPtrs, [](const StateData& data) { return data.getState(); });
+    ExtendedStateVector result;
+    result.readStates(ExtendedStateLayout::fromDynamicObjects(dynPtrs));
+    return result;
 }
 
 ExtendedStateVector ExtendedStateVector::fromStateDerivs(const std::vector<DynamicObject*>& dynPtrs)
 {
-    return fromStateData(dynPtrs, [](const StateData& data) { return data.getStateDeriv(); });
+    ExtendedStateVector result;
+    result.readStateDerivs(ExtendedStateLayout::fromDynamicObjects(dynPtrs));
+    return result;
+}
+
+void ExtendedStateVector::readStates(const std::shared_ptr<const ExtendedStateLayout>& layout)
+{
+    this->stateLayout = layout;
+    this->values.resize(layout->size);
+    for (const auto& entry : layout->entries) {
+        std::copy_n(entry.stateData->state.data(), entry.rows * entry.cols, this->values.data() + entry.offset);
+    }
+}
+
+void ExtendedStateVector::readStateDerivs(const std::shared_ptr<const ExtendedStateLayout>& layout)
+{
+    this->stateLayout = layout;
+    this->values.resize(layout->size);
+    for (const auto& entry : layout->entries) {
+        std::copy_n(entry.stateData->stateDeriv.data(),
+                    entry.rows * entry.cols,
+                    this->values.data() + entry.offset);
+    }
 }
 
 ExtendedStateVector ExtendedStateVector::map(
     std::function<Eigen::MatrixXd(const size_t&, const std::string&, const Eigen::MatrixXd&)>
         functor) const
 {
-    ExtendedStateVector result;
-    result.reserve(this->size());
-
-    for (auto&& [extendedStateId, stateMatrix] : *this) {
-        const auto& [dynObjIndex, stateName] = extendedStateId;
-        result.emplace(extendedStateId, functor(dynObjIndex, stateName, stateMatrix));
+    if (!this->stateLayout) return ExtendedStateVector();
+    ExtendedStateVector result(this->stateLayout);
+
+    for (const auto& entry : this->stateLayout->entries) {
+        Eigen::MatrixXd stateMatrix =
+            Eigen::Map<const Eigen::MatrixXd>(this->values.data() + entry.offset, entry.rows, entry.cols);
+        Eigen::Map<Eigen::MatrixXd>(result.values.data() + entry.offset, entry.rows, entry.cols) =
+            functor(entry.id.first, entry.id.second, stateMatrix);
     }
 
     return result;
@@ -47,62 +127,75 @@ ExtendedStateVector ExtendedStateVector::map(
 void ExtendedStateVector::apply(
     std::function<void(const size_t&, const std::string&, const Eigen::MatrixXd&)> functor) const
 {
-    for (auto&& [extendedStateId, stateMatrix] : *this) {
-        const auto& [dynObjIndex, stateName] = extendedStateId;
-        functor(dynObjIndex, stateName, stateMatrix);
+    if (!this->stateLayout) return;
+    for (const auto& entry : this->stateLayout->entries) {
+        Eigen::MatrixXd stateMatrix =
+            Eigen::Map<const Eigen::MatrixXd>(this->values.data() + entry.offset, entry.rows, entry.cols);
+        functor(entry.id.first, entry.id.second, stateMatrix);
     }
 }
 
 void ExtendedStateVector::modify(
-    std::function<void(const size_t&, const std::string&, Eigen::MatrixXd&)> functor)
+    std::function<void(const size_t&, const std::string&, Eigen::Map<Eigen::MatrixXd>&)> functor)
 {
-    for (auto&& [extendedStateId, stateMatrix] : *this) {
-        const auto& [dynObjIndex, stateName] = extendedStateId;
-        functor(dynObjIndex, stateName, stateMatrix);
+    if (!this->stateLayout) return;
+    for (const auto& entry : this->stateLayout->entries) {
+        Eigen::Map<Eigen::MatrixXd> stateMatrix(this->values.data() + entry.offset, entry.rows, entry.cols);
+        functor(entry.id.first, entry.id.second, stateMatrix);
     }
 }
 
-ExtendedStateVector ExtendedStateVector::operator+=(const ExtendedStateVector& rhs)
+ExtendedStateVector& ExtendedStateVector::operator+=(const ExtendedStateVector& rhs)
 {
-    this->modify([&rhs](const size_t& dynObjIndex,
-                        const std::string& stateName,
-                        Eigen::MatrixXd& thisState) {
-        thisState += rhs.at({dynObjIndex, stateName});
-    });
-
-    return *this;
+    return this->addScaled(rhs, 1.0);
 }
 
 ExtendedStateVector ExtendedStateVector::operator*(const double rhs) const
 {
-    return this->map([rhs](const size_t& dynObjIndex,
-                           const std::string& stateName,
-                           const Eigen::MatrixXd& thisState) { return thisState * rhs; });
+    ExtendedStateVector result;
+    result.setScaled(*this, rhs);
+    return result;
 }
 
-void ExtendedStateVector::setStates(std::vector<DynamicObject*>& dynPtrs) const
+ExtendedStateVector& ExtendedStateVector::addScaled(const ExtendedStateVector& rhs, double scale)
 {
-    this->apply([&dynPtrs](const size_t& dynObjIndex,
-                                 const std::string& stateName,
-                                 const Eigen::MatrixXd& thisState) {
-        StateData& stateData =
-            dynPtrs.at(dynObjIndex)->dynManager.stateContainer.stateMap.at(stateName);
-        stateData.setState(thisState);
+    if (this->stateLayout == rhs.stateLayout) {
+        this->values += rhs.values * scale;
+        return *this;
+    }
+
+    // Vectors with different layouts are added state by state
+    this->modify([&rhs, scale](const size_t& dynObjIndex,
+                               const std::string& stateName,
+                               Eigen::Map<Eigen::MatrixXd>& thisState) {
+        thisState += rhs.at({dynObjIndex, stateName}) * scale;
     });
+    return *this;
 }
 
-ExtendedStateVector
-ExtendedStateVector::fromStateData(const std::vector<DynamicObject*>& dynPtrs,
-                                   std::function<Eigen::MatrixXd(const StateData&)> functor)
+ExtendedStateVector& ExtendedStateVector::setScaled(const ExtendedStateVector& rhs, double scale)
 {
-    ExtendedStateVector result;
+    this->stateLayout = rhs.stateLayout;
+    this->values = rhs.values * scale;
+    return *this;
+}
 
-    for (size_t dynIndex = 0; dynIndex < dynPtrs.size(); dynIndex++) {
-        for (auto&& [stateName, stateData] :
-             dynPtrs.at(dynIndex)->dynManager.stateContainer.stateMap) {
-            result.emplace(std::make_pair(dynIndex, stateName), functor(stateData));
-        }
+Eigen::Map<const Eigen::MatrixXd> ExtendedStateVector::at(const ExtendedStateId& id) const
+{
+    const ExtendedStateEntry* entry = this->stateLayout ? this->stateLayout->find(id) : nullptr;
+    if (entry == nullptr) {
+        throw std::out_of_range("State " + id.second + " of dynamic object " +
+                                std::to_string(id.first) + " is not in the ExtendedStateVector");
     }
+    return Eigen::Map<const Eigen::MatrixXd>(this->values.data() + entry->offset,
+                                             entry->rows,
+                                             entry->cols);
+}
 
-    return result;
+void ExtendedStateVector::setStates(std::vector<DynamicObject*>& dynPtrs) const
+{
+    if (!this->stateLayout) return;
+    for (const auto& entry : this->stateLayout->entries) {
+        std::copy_n(this->values.data() + entry.offset, entry.rows * entry.cols, entry.stateData->state.data());
+    }
 }
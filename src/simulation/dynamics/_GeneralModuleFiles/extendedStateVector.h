@@ -25,8 +25,10 @@
 
 #include <Eigen/Dense>
 #include <functional>
+#include <memory>
 #include <stdint.h>
 #include <unordered_map>
+#include <vector>
 
 /*
 Each DynamicObject has a series of states associated to them. Each state
@@ -40,11 +42,15 @@ which in practice means that all states of all DynamicObjects need to
 be integrated in parallel.
 
 In order to facilitate this task, the ExtendedStateVector was created.
-This class is a map that can hold an Eigen::MatrixXd for every state
-of every DynamicObject that we want to integrate. Thus, it can be
+This class holds the values of every state of every DynamicObject that
+we want to integrate, packed one after the other in a single, contiguous
+Eigen::VectorXd. Where each state is stored is given by an
+ExtendedStateLayout, which is resolved once from the DynamicObjects and
+shared by all of the ExtendedStateVectors of an integrator. Thus, it can be
 used to store the value of the states, their derivatives, errors...
-in a single, flat object. This is similar to the behaviour of StateVector,
-except that this supports multiple DynamicObjects.
+in a single, flat object, and operations on all of the states are
+operations on a single vector. This is similar to the behaviour of
+StateVector, except that this supports multiple DynamicObjects.
 
 ExtendedStateVector supports a series of utility functions that
 makes performing state-wise operations easier.
@@ -71,15 +77,56 @@ struct ExtendedStateIdHash {
     }
 };
 
+/** Where a state is stored in the values of an ExtendedStateVector */
+struct ExtendedStateEntry {
+    ExtendedStateId id;   /**< Index of the DynamicObject and name of the state */
+    StateData* stateData; /**< The state */
+    size_t offset;        /**< Index of the first value of the state, stored column-major */
+    size_t rows;          /**< Number of rows of the state */
+    size_t cols;          /**< Number of columns of the state */
+};
+
+/**
+ * The layout of the states of a set of DynamicObjects in an
+ * ExtendedStateVector: the states are stored one after the other,
+ * by DynamicObject and then by name.
+ */
+class ExtendedStateLayout {
+  public:
+    /** Resolves the layout of all states of the given dynamic objects */
+    static std::shared_ptr<const ExtendedStateLayout>
+    fromDynamicObjects(const std::vector<DynamicObject*>& dynPtrs);
+
+    /**
+     * Whether the layout still describes the states of the given dynamic
+     * objects: the same states, with the same sizes. This does not allocate,
+     * so it can be checked at every integration step.
+     */
+    bool matches(const std::vector<DynamicObject*>& dynPtrs) const;
+
+    /** Returns the entry of a state, or nullptr if the state is not in the layout */
+    const ExtendedStateEntry* find(const ExtendedStateId& id) const;
+
+    std::vector<ExtendedStateEntry> entries; /**< The states, in storage order */
+    size_t size = 0;                         /**< Total number of values of the states */
+
+  private:
+    std::unordered_map<ExtendedStateId, size_t, ExtendedStateIdHash> entryIndices;
+};
+
 /**
  * Conceptually similar to StateVector, this class allows us to handle
  * the states of multiple DynamicObject with a single object.
  *
  * It also supports several utility functions.
  */
-class ExtendedStateVector
-    : public std::unordered_map<ExtendedStateId, Eigen::MatrixXd, ExtendedStateIdHash> {
+class ExtendedStateVector {
   public:
+    ExtendedStateVector() = default;
+
+    /** Builds a zeroed ExtendedStateVector with the given layout */
+    explicit ExtendedStateVector(std::shared_ptr<const ExtendedStateLayout> layout);
+
     /**
      * Builds a ExtendedStateVector from all states in the given
      * dynamic objects
@@ -92,6 +139,20 @@ class ExtendedStateVector
      */
     static ExtendedStateVector fromStateDerivs(const std::vector<DynamicObject*>& dynPtrs);
 
+    /**
+     * Copies the states of the given layout into this object, which
+     * takes that layout. No memory is allocated if this object already
+     * holds as many values.
+     */
+    void readStates(const std::shared_ptr<const ExtendedStateLayout>& layout);
+
+    /**
+     * Copies the derivatives of the states of the given layout into
+     * this object, which takes that layout. No memory is allocated if
+     * this object already holds as many values.
+     */
+    void readStateDerivs(const std::shared_ptr<const ExtendedStateLayout>& layout);
+
     /**
      * This method will call the given std::function for every
      * state in the ExtendedStateVector. The arguments to the functor
@@ -113,27 +174,49 @@ class ExtendedStateVector
                    functor) const;
 
     /**
-     * Modifies each Eigen::MatrixXd stored in this object according to
+     * Modifies each state stored in this object according to
      * the given functor
      */
-    void modify(std::function<void(const size_t&, const std::string&, Eigen::MatrixXd&)> functor);
+    void modify(std::function<void(const size_t&, const std::string&, Eigen::Map<Eigen::MatrixXd>&)>
+                    functor);
 
     /** Adds the values of `rhs` to this
      *
      * This functions as a state-wise addition operation.
      */
-    ExtendedStateVector operator+=(const ExtendedStateVector& rhs);
+    ExtendedStateVector& operator+=(const ExtendedStateVector& rhs);
 
     /** Returns a new ExtendedStateVector that is the result of multiplying each state by a constant
      */
     ExtendedStateVector operator*(const double rhs) const;
 
-    /** Calls StateData::setState for every entry in in this */
+    /** Adds `rhs` multiplied by a constant to this, without allocating memory */
+    ExtendedStateVector& addScaled(const ExtendedStateVector& rhs, double scale);
+
+    /** Sets this to `rhs` multiplied by a constant, without allocating memory if the sizes match */
+    ExtendedStateVector& setScaled(const ExtendedStateVector& rhs, double scale);
+
+    /** Returns the value of a state, which must be in the layout */
+    Eigen::Map<const Eigen::MatrixXd> at(const ExtendedStateId& id) const;
+
+    /** Number of states */
+    size_t size() const { return this->stateLayout ? this->stateLayout->entries.size() : 0; }
+
+    /** The packed values of all states */
+    const Eigen::VectorXd& getValues() const { return this->values; }
+
+    /** The packed values of all states */
+    Eigen::VectorXd& getValues() { return this->values; }
+
+    /** The layout of the states in the values */
+    const std::shared_ptr<const ExtendedStateLayout>& getLayout() const { return this->stateLayout; }
+
+    /** Copies the values of every state into its StateData */
     void setStates(std::vector<DynamicObject*>& dynPtrs) const;
 
   private:
-    static ExtendedStateVector fromStateData(const std::vector<DynamicObject*>& dynPtrs,
-                                             std::function<Eigen::MatrixXd(const StateData&)>);
+    std::shared_ptr<const ExtendedStateLayout> stateLayout; /**< Where each state is stored */
+    Eigen::VectorXd values;                                 /**< The packed values of all states */
 };
 
 #endif /* extendedStateVector_h */
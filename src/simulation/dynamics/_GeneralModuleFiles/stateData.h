@@ -55,5 +55,12 @@ public:
 
 };
 
+#ifdef SWIG
+%extend StateData
+{
+    /*! Address of the column-major state values, used to bind a VariableLogger to the state */
+    unsigned long long getStateAddress() {return reinterpret_cast<unsigned long long>($self->state.data());}
+}
+#endif
 
 #endif /* STATE_DATA_H */
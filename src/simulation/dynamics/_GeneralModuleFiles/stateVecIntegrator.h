@@ -22,6 +22,7 @@
 #define stateVecIntegrator_h
 
 #include <vector>
+#include <stdint.h>
 
 class DynamicObject;
 
@@ -34,6 +35,7 @@ public:
     virtual ~StateVecIntegrator(void);
     virtual void integrate(double currentTime, double timeStep) = 0; //!< class method
     std::vector<DynamicObject*> dynPtrs; //!< This is an object that contains the method equationsOfMotion(), also known as the F function.
+    uint64_t subStepCount = 0; //!< Number of evaluations of the equations of motion, the sub-steps of the integration steps
 
 };
 
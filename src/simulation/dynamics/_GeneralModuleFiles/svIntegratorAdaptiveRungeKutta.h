@@ -23,10 +23,14 @@
 #include "../_GeneralModuleFiles/dynamicObject.h"
 #include "../_GeneralModuleFiles/dynParamManager.h"
 #include "../_GeneralModuleFiles/svIntegratorRungeKutta.h"
+#include "architecture/utilities/bskLogging.h"
+#include <algorithm>
 #include <cmath>
 #include <memory>
 #include <optional>
+#include <stdexcept>
 #include <stdint.h>
+#include <vector>
 
 /**
  * Extends RKCoefficients with "b" coefficients used for the lower order method.
@@ -45,6 +49,36 @@ template <size_t numberStages> struct RKAdaptiveCoefficients : public RKCoeffici
     typename RKCoefficients<numberStages>::StageSizedArray bStarArray = {};
 };
 
+/**
+ * Interpolant of the states over an integration step, used for dense output.
+ *
+ * With x = (t - startTime) / timeStep, the interpolated states are:
+ *
+ *   y(x) = y0 + x (F0 + (1 - x) (F1 + x (F2 + (1 - x) (F3 + ...))))
+ *
+ * where y0 is the startState and F0, F1... are the coefficients. The first
+ * three coefficients of this form are a cubic Hermite interpolant.
+ */
+struct RKDenseStep {
+    double startTime = 0; /**< [s] Time at the start of the step */
+    double timeStep = 0;  /**< [s] Length of the step */
+
+    ExtendedStateVector startState;                /**< States at the start of the step */
+    std::vector<ExtendedStateVector> coefficients; /**< Coefficients F0, F1... of the interpolant */
+
+    /** Interpolates the states at the given time, without allocating memory if the sizes match */
+    void interpolate(double time, ExtendedStateVector& result) const
+    {
+        double x = (time - this->startTime) / this->timeStep;
+        result.setScaled(this->startState, 0.);
+        for (size_t i = this->coefficients.size(); i-- > 0;) {
+            result.addScaled(this->coefficients[i], 1.);
+            result.getValues() *= i % 2 == 0 ? x : 1. - x;
+        }
+        result.addScaled(this->startState, 1.);
+    }
+};
+
 /**
  * The svIntegratorRungeKutta class implements a state integrator based on the
  * family of explicit Runge-Kutta numerical integrators with variable time step.
@@ -53,6 +87,24 @@ template <size_t numberStages> struct RKAdaptiveCoefficients : public RKCoeffici
  * try to integrate with the given time step. It will then evaluate the error commited
  * and, if it's too large, internally use smaller time steps until the error tolerances
  * are met.
+ *
+ * The step size the integrator settled on is remembered between calls to 'integrate',
+ * so that the next call starts with it instead of repeating the rejected steps. The
+ * derivative at the start of a step is reused after a rejected step and, for methods
+ * with the first same as last (FSAL) property, after an accepted step.
+ *
+ * In dense output mode, the integrator takes the steps its error control allows,
+ * even past the end of the time step it is given, and interpolates the states at
+ * the end of the time step. Further calls to 'integrate' that end within the step
+ * already taken only interpolate, so the dynamics task can run as fast as the tasks
+ * that need the states without shortening the integration steps. The interpolant
+ * also allows locating events, such as an eclipse entry, between the time steps.
+ *
+ * Dense output needs an interpolant as accurate as the steps of the method, which
+ * getDenseOutputOrder returns the order of. Methods without one, such as RKF45 and
+ * RKF78, log an error when denseOutput is set and integrate the time steps they are
+ * given instead: a generic cubic interpolant would be far less accurate than their
+ * long steps.
  */
 template <size_t numberStages>
 class svIntegratorAdaptiveRungeKutta : public svIntegratorRungeKutta<numberStages> {
@@ -173,6 +225,43 @@ class svIntegratorAdaptiveRungeKutta : public svIntegratorRungeKutta<numberStage
     std::optional<double> getAbsoluteTolerance(const DynamicObject& dynamicObject,
                                                std::string stateName);
 
+    /**
+     * Forgets the step size remembered from the previous calls to integrate,
+     * so that the next call starts with the time step it is given.
+     *
+     * This is useful after a discontinuity of the dynamics, such as an impulsive
+     * maneuver, that the remembered step size is not suited to.
+     */
+    void resetStepSize();
+
+    /**
+     * Returns the value of a state of a DynamicObject, interpolated at a time between
+     * getDenseOutputStartTime and getDenseOutputEndTime, the start and the end of the
+     * last time step. Only available in dense output mode.
+     *
+     * The interpolated states are only as accurate as an interpolant of order
+     * getDenseOutputOrder, not as the integration steps.
+     */
+    Eigen::MatrixXd getInterpolatedState(const DynamicObject& dynamicObject,
+                                         std::string stateName,
+                                         double time) const;
+
+    /** Returns the start of the time interval the states can be interpolated in */
+    double getDenseOutputStartTime() const;
+
+    /** Returns the end of the time interval the states can be interpolated in */
+    double getDenseOutputEndTime() const;
+
+    /** Returns the order of the dense output interpolant, 0 for the methods without dense output */
+    virtual int getDenseOutputOrder() const;
+
+    /**
+     * Returns whether the method has the first same as last (FSAL) property:
+     * its last stage is evaluated at the end of the step with the state of the
+     * next step, so that it is also the first stage of the next step.
+     */
+    bool isFirstSameAsLast() const;
+
     /** Maximum relative truncation error allowed.
      *
      * The relative truncation error is the absolute error of the state divided by the magnitude of
@@ -202,7 +291,62 @@ class svIntegratorAdaptiveRungeKutta : public svIntegratorRungeKutta<numberStage
      */
     double minimumFactorDecreaseForNextStepSize = 0.1;
 
+    /** Whether the step size the integrator settled on is used as the first
+     * step size of the next call to integrate, instead of the time step it is given.
+     * Off by default, as it changes the results within the integration tolerances.
+     */
+    bool rememberStepSize = false;
+
+    /** Whether the integrator takes its steps regardless of the time steps it is given,
+     * and interpolates the states at the end of the time steps.
+     *
+     * The steps past the end of a time step are taken with the inputs of the dynamics,
+     * such as the thruster commands, at that time. Inputs that change within a step already
+     * taken are ignored until the next step, as the time steps that end within it only
+     * interpolate. The integration restarts from the states of the DynamicObjects when they
+     * were changed between two time steps, for example by an impulsive maneuver.
+     *
+     * Only used by the methods with an interpolant, see getDenseOutputOrder.
+     */
+    bool denseOutput = false;
+
+    /** Number of integration steps that met the error tolerances */
+    uint64_t acceptedStepCount = 0;
+
+    /** Number of integration steps that were rejected and repeated with a smaller step size.
+     *
+     * The number of evaluations of the equations of motion is StateVecIntegrator::subStepCount.
+     */
+    uint64_t rejectedStepCount = 0;
+
+    BSKLogger bskLogger; //!< -- BSK Logging
+
   protected:
+    /**
+     * Computes the "k" coefficients and the next state of a step from the current state,
+     * and returns the maximum relation between the error and the tolerance.
+     */
+    double computeStep(double time, double timeStep, bool firstStageKnown);
+
+    /** Computes the step size that meets the tolerances after a step with the given error */
+    double computeNewStepSize(double timeStep, double maxRelError) const;
+
+    /** Integrates with the steps the error control allows, and interpolates the states
+     *
+     * The interpolated states have the accuracy of an interpolant of order getDenseOutputOrder.
+     */
+    void integrateDense(double startingTime, double desiredTimeStep);
+
+    /**
+     * Computes the coefficients of the interpolant of an accepted step from its "k"
+     * coefficients, the states at the start and the end of the step, and the derivative
+     * at the end of the step. The default computes the first three coefficients, the cubic
+     * Hermite interpolant that the interpolants of the methods extend.
+     */
+    virtual void computeDenseCoefficients(double timeStep,
+                                          const ExtendedStateVector& endDerivative,
+                                          RKDenseStep& denseStep);
+
     /**
      * Computes the absolute error of every state
      * using the lower and higher order RK methods.
@@ -213,10 +357,10 @@ class svIntegratorAdaptiveRungeKutta : public svIntegratorRungeKutta<numberStage
      * which is the relation that defines the minimum acceptable
      * time step.
      */
-    double computeMaxRelativeError(
+    virtual double computeMaxRelativeError(
         double timeStep,
         const ExtendedStateVector& candidateNextState,
-        const typename svIntegratorRungeKutta<numberStages>::KCoefficientsValues& kVectors) const;
+        const typename svIntegratorRungeKutta<numberStages>::KCoefficientsValues& kVectors);
 
     /** Finds index of dynamicObject in dynPtrs (vector of pointers to DynamicObject) */
     size_t findDynamicObjectIndex(const DynamicObject& dynamicObject) const;
@@ -249,6 +393,23 @@ class svIntegratorAdaptiveRungeKutta : public svIntegratorRungeKutta<numberStage
     /** Holds the maximum absolute truncation error allowed for specific states of specific dynamic
      * objects*/
     std::unordered_map<ExtendedStateId, double, ExtendedStateIdHash> dynObjectStateSpecificAbsTol;
+
+    /** Absolute truncation error of every state, kept between steps so that it is only allocated once */
+    ExtendedStateVector truncationError;
+
+    /** Step size the integrator settled on in the previous call to integrate, 0 if there is none */
+    double nominalTimeStep = 0;
+
+    // Dense output state, kept between calls to integrate
+    double denseStepTime = 0;             /**< [s] Time of currentState, the end of the last step */
+    bool denseFirstStageKnown = false;    /**< Whether the first "k" coefficient is the derivative at denseStepTime */
+    double denseOutputStartTime = 0;      /**< [s] Start of the last time step */
+    double denseOutputEndTime = 0;        /**< [s] End of the last time step */
+    ExtendedStateVector outputState;      /**< States interpolated at the end of the last time step */
+    ExtendedStateVector endDerivative;    /**< Derivative at the end of a step, for non FSAL methods */
+    std::vector<RKDenseStep> denseSteps;  /**< Steps that cover the last time step, reused between calls */
+    size_t denseStepCount = 0;            /**< Number of denseSteps in use */
+    bool denseOutputRefused = false;      /**< Whether the missing interpolant was logged */
 };
 
 template <size_t numberStages>
@@ -268,21 +429,36 @@ template <size_t numberStages>
 void svIntegratorAdaptiveRungeKutta<numberStages>::integrate(double startingTime,
                                                              double desiredTimeStep)
 {
+    if (this->denseOutput && this->getDenseOutputOrder() > 0) {
+        this->integrateDense(startingTime, desiredTimeStep);
+        return;
+    }
+    if (this->denseOutput && !this->denseOutputRefused) {
+        this->bskLogger.bskLog(BSK_ERROR,
+                               "This integration method has no dense output interpolant, so it integrates the "
+                               "time steps it is given. Use svIntegratorDOP853 for dense output.");
+        this->denseOutputRefused = true;
+    }
+
     double time = startingTime;
-    double timeStep = desiredTimeStep;
-    ExtendedStateVector state = ExtendedStateVector::fromStates(this->dynPtrs);
-    typename svIntegratorRungeKutta<numberStages>::KCoefficientsValues kValues;
+    double endTime = startingTime + desiredTimeStep;
+    // The step size the method settles on, the time steps taken may be shorter to stop at endTime
+    double stepSize = desiredTimeStep;
+    if (this->rememberStepSize && this->nominalTimeStep > 0) {
+        stepSize = this->nominalTimeStep;
+    }
+    bool firstSameAsLast = this->isFirstSameAsLast();
+    bool firstStageKnown = false;
+    this->denseStepCount = 0;
+    this->currentState.readStates(this->updateStateLayout());
 
     // Continue until we are done with the desired time step
-    while (time < startingTime + desiredTimeStep) {
-        // Much like regular Runge Kutta, we compute the
-        // "k" coefficients and the next state from them.
-        kValues = this->computeKCoefficients(time, timeStep, state);
-        ExtendedStateVector candidateNextState = this->computeNextState(timeStep, state, kValues);
+    while (time < endTime) {
+        double timeStep = std::min(stepSize, endTime - time); // Avoid over-stepping
+        double maxRelError = this->computeStep(time, timeStep, firstStageKnown);
 
-        // For the adaptive RK, we also compute the maximum
-        // relationship between error and tolerance
-        double maxRelError = this->computeMaxRelativeError(timeStep, candidateNextState, kValues);
+        // Regardless of accepting or not the step, we compute a new time step
+        double newTimeStep = this->computeNewStepSize(timeStep, maxRelError);
 
         // If maxRelError > 1, then we need a smaller time step,
         // so we should reject the current time step.
@@ -292,42 +468,180 @@ void svIntegratorAdaptiveRungeKutta<numberStages>::integrate(double startingTime
         {
             // Advance time and set new state to the computed state
             time += timeStep;
-            state = std::move(candidateNextState);
-        }
+            std::swap(this->currentState, this->nextState);
+            this->acceptedStepCount++;
 
-        // Regardless of accepting or not the step, we compute a new time step
-        double newTimeStep = this->safetyFactorForNextStepSize * timeStep *
-                             std::pow(1.0 / maxRelError, 1.0 / this->methodLargestOrder);
-        newTimeStep = std::min(newTimeStep, timeStep * this->maximumFactorIncreaseForNextStepSize);
-        newTimeStep = std::max(newTimeStep, timeStep * this->minimumFactorDecreaseForNextStepSize);
-        newTimeStep =
-            std::min(newTimeStep, startingTime + desiredTimeStep - time); // Avoid over-stepping
-        timeStep = newTimeStep;
+            // The last "k" coefficient was computed at the new time and state
+            if (firstSameAsLast) {
+                std::swap(this->kValues.front(), this->kValues.back());
+            }
+            firstStageKnown = firstSameAsLast;
+
+            // A step shortened to stop at endTime does not shrink the step size
+            stepSize = timeStep < stepSize ? std::max(stepSize, newTimeStep) : newTimeStep;
+        }
+        else {
+            // The first "k" coefficient only depends on the current time and state
+            this->rejectedStepCount++;
+            firstStageKnown = true;
+            stepSize = newTimeStep;
+        }
     }
+    this->nominalTimeStep = stepSize;
 
     // Update the dynamic objects with the final state obtained
-    state.setStates(this->dynPtrs);
+    this->currentState.setStates(this->dynPtrs);
+}
+
+template <size_t numberStages>
+void svIntegratorAdaptiveRungeKutta<numberStages>::integrateDense(double startingTime,
+                                                                  double desiredTimeStep)
+{
+    double endTime = startingTime + desiredTimeStep;
+    const auto& layout = this->updateStateLayout();
+
+    // The steps taken by the previous calls are only continued if the states
+    // were not changed since they were interpolated at startingTime
+    this->stageState.readStates(layout);
+    bool continueSteps = startingTime == this->denseOutputEndTime && this->outputState.getLayout() == layout &&
+                         this->stageState.getValues() == this->outputState.getValues();
+    if (!continueSteps) {
+        std::swap(this->currentState, this->stageState);
+        this->denseStepTime = startingTime;
+        this->denseFirstStageKnown = false;
+        this->denseStepCount = 0;
+    }
+    else if (this->denseStepCount > 0 && this->denseStepTime > startingTime) {
+        // Keep the step that covers startingTime
+        std::swap(this->denseSteps.front(), this->denseSteps.at(this->denseStepCount - 1));
+        this->denseStepCount = 1;
+    }
+    else {
+        this->denseStepCount = 0;
+    }
+
+    double stepSize = desiredTimeStep;
+    if (this->nominalTimeStep > 0) {
+        stepSize = this->nominalTimeStep;
+    }
+    bool firstSameAsLast = this->isFirstSameAsLast();
+
+    while (this->denseStepTime < endTime) {
+        double timeStep = stepSize;
+        double maxRelError = this->computeStep(this->denseStepTime, timeStep, this->denseFirstStageKnown);
+        stepSize = this->computeNewStepSize(timeStep, maxRelError);
+        // The first "k" coefficient is the derivative at the current time and state, or at the
+        // next ones once the step is accepted
+        this->denseFirstStageKnown = true;
+
+        if (maxRelError > 1.) {
+            this->rejectedStepCount++;
+            continue;
+        }
+        this->acceptedStepCount++;
+
+        if (!firstSameAsLast) {
+            this->computeDerivatives(this->denseStepTime + timeStep,
+                                     timeStep,
+                                     this->nextState,
+                                     this->endDerivative);
+        }
+        ExtendedStateVector& endDerivative =
+            firstSameAsLast ? this->kValues.back() : this->endDerivative;
+
+        if (this->denseStepCount == this->denseSteps.size()) {
+            this->denseSteps.emplace_back();
+        }
+        RKDenseStep& denseStep = this->denseSteps.at(this->denseStepCount++);
+        denseStep.startTime = this->denseStepTime;
+        denseStep.timeStep = timeStep;
+        denseStep.startState.setScaled(this->currentState, 1.);
+        this->computeDenseCoefficients(timeStep, endDerivative, denseStep);
+
+        this->denseStepTime += timeStep;
+        std::swap(this->currentState, this->nextState);
+        std::swap(this->kValues.front(), endDerivative);
+    }
+    this->nominalTimeStep = stepSize;
+
+    if (this->denseStepCount > 0) {
+        this->denseSteps.at(this->denseStepCount - 1).interpolate(endTime, this->outputState);
+    }
+    else {
+        this->outputState.setScaled(this->currentState, 1.);
+    }
+    this->denseOutputStartTime = startingTime;
+    this->denseOutputEndTime = endTime;
+
+    // Update the dynamic objects with the interpolated states
+    this->outputState.setStates(this->dynPtrs);
+}
+
+template <size_t numberStages>
+double svIntegratorAdaptiveRungeKutta<numberStages>::computeStep(double time,
+                                                                 double timeStep,
+                                                                 bool firstStageKnown)
+{
+    // Much like regular Runge Kutta, we compute the
+    // "k" coefficients and the next state from them.
+    this->computeKCoefficients(time, timeStep, this->currentState, this->kValues, firstStageKnown);
+    this->computeNextState(timeStep, this->currentState, this->kValues, this->nextState);
+
+    // For the adaptive RK, we also compute the maximum
+    // relationship between error and tolerance
+    return this->computeMaxRelativeError(timeStep, this->nextState, this->kValues);
+}
+
+template <size_t numberStages>
+double svIntegratorAdaptiveRungeKutta<numberStages>::computeNewStepSize(double timeStep,
+                                                                        double maxRelError) const
+{
+    double newTimeStep = this->safetyFactorForNextStepSize * timeStep *
+                         std::pow(1.0 / maxRelError, 1.0 / this->methodLargestOrder);
+    newTimeStep = std::min(newTimeStep, timeStep * this->maximumFactorIncreaseForNextStepSize);
+    newTimeStep = std::max(newTimeStep, timeStep * this->minimumFactorDecreaseForNextStepSize);
+    return newTimeStep;
+}
+
+template <size_t numberStages>
+void svIntegratorAdaptiveRungeKutta<numberStages>::computeDenseCoefficients(
+    double timeStep,
+    const ExtendedStateVector& endDerivative,
+    RKDenseStep& denseStep)
+{
+    denseStep.coefficients.resize(3);
+    const Eigen::VectorXd& startState = this->currentState.getValues();
+    const Eigen::VectorXd& endState = this->nextState.getValues();
+
+    // F0 = y1 - y0, F1 = h f0 - (y1 - y0), F2 = 2 (y1 - y0) - h (f0 + f1)
+    denseStep.coefficients.at(0).setScaled(this->nextState, 1.);
+    denseStep.coefficients.at(0).getValues() -= startState;
+    denseStep.coefficients.at(1).setScaled(this->kValues.front(), timeStep);
+    denseStep.coefficients.at(1).getValues() -= endState - startState;
+    denseStep.coefficients.at(2).setScaled(denseStep.coefficients.at(0), 2.);
+    denseStep.coefficients.at(2).addScaled(this->kValues.front(), -timeStep);
+    denseStep.coefficients.at(2).addScaled(endDerivative, -timeStep);
 }
 
 template <size_t numberStages>
 double svIntegratorAdaptiveRungeKutta<numberStages>::computeMaxRelativeError(
     double timeStep,
     const ExtendedStateVector& candidateNextState,
-    const typename svIntegratorRungeKutta<numberStages>::KCoefficientsValues& kVectors) const
+    const typename svIntegratorRungeKutta<numberStages>::KCoefficientsValues& kVectors)
 {
     auto castCoefficients =
         static_cast<RKAdaptiveCoefficients<numberStages>*>(this->coefficients.get());
 
     // Compute the absolute truncation error for every state
-    ExtendedStateVector truncationError =
-        kVectors.at(0) *
-        ((castCoefficients->bArray.at(0) - castCoefficients->bStarArray.at(0)) * timeStep);
+    this->truncationError.setScaled(
+        kVectors.at(0),
+        (castCoefficients->bArray.at(0) - castCoefficients->bStarArray.at(0)) * timeStep);
 
     for (size_t stageIndex = 1; stageIndex < numberStages; stageIndex++) {
         double bDiff =
             castCoefficients->bArray.at(stageIndex) - castCoefficients->bStarArray.at(stageIndex);
         if (bDiff == 0) continue;
-        truncationError += kVectors.at(stageIndex) * (bDiff * timeStep);
+        this->truncationError.addScaled(kVectors.at(stageIndex), bDiff * timeStep);
     }
 
     // Compute the maximum relative error being committed
@@ -336,20 +650,80 @@ double svIntegratorAdaptiveRungeKutta<numberStages>::computeMaxRelativeError(
     // We care only about the largest relationship between
     // truncation error and tolerance.
     double maxRelativeError = 0;
-    auto maxRelativeErrorRef = std::ref(maxRelativeError);
-    candidateNextState.apply([this, &maxRelativeErrorRef, &truncationError](
-                                 const size_t& dynObjIndex,
-                                 const std::string& stateName,
-                                 const Eigen::MatrixXd& thisState) {
-        double thisTruncationError = truncationError.at({dynObjIndex, stateName}).norm();
-        double thisErrorTolerance = this->getTolerance(dynObjIndex, stateName, thisState.norm());
-        maxRelativeErrorRef.get() =
-            std::max(maxRelativeErrorRef.get(), thisTruncationError / thisErrorTolerance);
-    });
+    for (const auto& entry : candidateNextState.getLayout()->entries) {
+        size_t entrySize = entry.rows * entry.cols;
+        double thisTruncationError =
+            this->truncationError.getValues().segment(entry.offset, entrySize).norm();
+        double thisErrorTolerance = this->getTolerance(
+            entry.id.first,
+            entry.id.second,
+            candidateNextState.getValues().segment(entry.offset, entrySize).norm());
+        maxRelativeError = std::max(maxRelativeError, thisTruncationError / thisErrorTolerance);
+    }
 
     return maxRelativeError;
 }
 
+template <size_t numberStages>
+void svIntegratorAdaptiveRungeKutta<numberStages>::resetStepSize()
+{
+    this->nominalTimeStep = 0;
+}
+
+template <size_t numberStages>
+Eigen::MatrixXd
+svIntegratorAdaptiveRungeKutta<numberStages>::getInterpolatedState(const DynamicObject& dynamicObject,
+                                                                   std::string stateName,
+                                                                   double time) const
+{
+    if (!this->denseOutput || this->denseStepCount == 0) {
+        throw std::logic_error("The integrator has no dense output, enable denseOutput on an integrator with an "
+                               "interpolant and integrate first");
+    }
+    if (time < this->denseOutputStartTime || time > this->denseOutputEndTime) {
+        throw std::out_of_range("The time is outside of the last time step");
+    }
+
+    // The steps are in chronological order, find the first that ends after the time
+    size_t stepIndex = 0;
+    while (stepIndex + 1 < this->denseStepCount &&
+           time > this->denseSteps.at(stepIndex).startTime + this->denseSteps.at(stepIndex).timeStep) {
+        stepIndex++;
+    }
+    ExtendedStateVector interpolated;
+    this->denseSteps.at(stepIndex).interpolate(time, interpolated);
+    return interpolated.at({this->findDynamicObjectIndex(dynamicObject), stateName});
+}
+
+template <size_t numberStages>
+double svIntegratorAdaptiveRungeKutta<numberStages>::getDenseOutputStartTime() const
+{
+    return this->denseOutputStartTime;
+}
+
+template <size_t numberStages>
+double svIntegratorAdaptiveRungeKutta<numberStages>::getDenseOutputEndTime() const
+{
+    return this->denseOutputEndTime;
+}
+
+template <size_t numberStages>
+int svIntegratorAdaptiveRungeKutta<numberStages>::getDenseOutputOrder() const
+{
+    return 0;
+}
+
+template <size_t numberStages>
+bool svIntegratorAdaptiveRungeKutta<numberStages>::isFirstSameAsLast() const
+{
+    const auto& lastRow = this->coefficients->aMatrix.back();
+    if (numberStages < 2 || this->coefficients->cArray.back() != 1. ||
+        this->coefficients->bArray.back() != 0.) {
+        return false;
+    }
+    return std::equal(lastRow.cbegin(), lastRow.cend() - 1, this->coefficients->bArray.cbegin());
+}
+
 template <size_t numberStages>
 void svIntegratorAdaptiveRungeKutta<numberStages>::setRelativeTolerance(double relTol)
 {
@@ -61,7 +61,8 @@ template <size_t numberStages> struct RKCoefficients {
  *
  * A Runge-Kutta method is defined by its stage number and its coefficients.
  * The stage number drives the computational cost of the method: an RK method
- * of stage 4 requires 4 dynamics evaluations (FSAL optimizations are not done).
+ * of stage 4 requires 4 dynamics evaluations (FSAL optimizations are only done
+ * by the adaptive integrators).
  *
  * Note that the order of the integrator is lower or equal to the stage number.
  * A RK method of order 5, for example, requires 7 stages.
@@ -93,35 +94,58 @@ template <size_t numberStages> class svIntegratorRungeKutta : public StateVecInt
      */
     using KCoefficientsValues = std::array<ExtendedStateVector, numberStages>;
 
+    /**
+     * Returns the layout of the states of the dynamic objects, which is
+     * only resolved again when states were added or resized.
+     */
+    const std::shared_ptr<const ExtendedStateLayout>& updateStateLayout();
+
     /**
      * Computes the derivatives of every state given a time and current states.
      *
      * Internally, this sets the states on the dynamic objects and
      * calls the equationsOfMotion methods.
      */
-    ExtendedStateVector
-    computeDerivatives(double time, double timeStep, const ExtendedStateVector& states);
+    void computeDerivatives(double time,
+                            double timeStep,
+                            const ExtendedStateVector& states,
+                            ExtendedStateVector& derivatives);
 
     /**
      * Computes the "k" coefficients of the Runge-Kutta method
      * for a time and state.
+     *
+     * If firstStageKnown is true, the first "k" coefficient, the derivative
+     * at the current time and state, is already in kVectors and is reused.
      */
-    KCoefficientsValues computeKCoefficients(double currentTime,
-                                             double timeStep,
-                                             const ExtendedStateVector& currentStates);
+    void computeKCoefficients(double currentTime,
+                              double timeStep,
+                              const ExtendedStateVector& currentStates,
+                              KCoefficientsValues& kVectors,
+                              bool firstStageKnown = false);
 
     /**
      * Adds the "k" coefficients, weighted by the "c" coefficients
      * to find the state after the time step.
      */
-    ExtendedStateVector computeNextState(double timeStep,
-                                         const ExtendedStateVector& currentStates,
-                                         const KCoefficientsValues& kVectors);
+    void computeNextState(double timeStep,
+                          const ExtendedStateVector& currentStates,
+                          const KCoefficientsValues& kVectors,
+                          ExtendedStateVector& nextState);
 
   protected:
     // coefficients is stored as a pointer to support polymorphism
     /** Coefficients to be used in the method */
     const std::unique_ptr<RKCoefficients<numberStages>> coefficients;
+
+    /** Layout of the states of the dynamic objects, shared by the buffers below */
+    std::shared_ptr<const ExtendedStateLayout> stateLayout;
+
+    // The buffers are kept between integration steps so that they are only allocated once
+    ExtendedStateVector currentState; /**< State at the start of the step */
+    ExtendedStateVector nextState;    /**< State at the end of the step */
+    ExtendedStateVector stageState;   /**< State at which a "k" coefficient is computed */
+    KCoefficientsValues kValues;      /**< "k" coefficients of the step */
 };
 
 template <size_t numberStages>
@@ -144,73 +168,78 @@ svIntegratorRungeKutta<numberStages>::svIntegratorRungeKutta(
 template <size_t numberStages>
 void svIntegratorRungeKutta<numberStages>::integrate(double currentTime, double timeStep)
 {
-    ExtendedStateVector currentState = ExtendedStateVector::fromStates(this->dynPtrs);
-    KCoefficientsValues kValues = this->computeKCoefficients(currentTime, timeStep, currentState);
-    ExtendedStateVector nextState = this->computeNextState(timeStep, currentState, kValues);
-    nextState.setStates(this->dynPtrs);
+    this->currentState.readStates(this->updateStateLayout());
+    this->computeKCoefficients(currentTime, timeStep, this->currentState, this->kValues);
+    this->computeNextState(timeStep, this->currentState, this->kValues, this->nextState);
+    this->nextState.setStates(this->dynPtrs);
 }
 
 template <size_t numberStages>
-ExtendedStateVector
-svIntegratorRungeKutta<numberStages>::computeDerivatives(double time,
-                                                         double timeStep,
-                                                         const ExtendedStateVector& states)
+const std::shared_ptr<const ExtendedStateLayout>&
+svIntegratorRungeKutta<numberStages>::updateStateLayout()
+{
+    if (!this->stateLayout || !this->stateLayout->matches(this->dynPtrs)) {
+        this->stateLayout = ExtendedStateLayout::fromDynamicObjects(this->dynPtrs);
+    }
+    return this->stateLayout;
+}
+
+template <size_t numberStages>
+void svIntegratorRungeKutta<numberStages>::computeDerivatives(double time,
+                                                              double timeStep,
+                                                              const ExtendedStateVector& states,
+                                                              ExtendedStateVector& derivatives)
 {
     states.setStates(this->dynPtrs);
+    this->subStepCount++;
 
     for (auto dynPtr : this->dynPtrs) {
         dynPtr->equationsOfMotion(time, timeStep);
     }
 
-    return ExtendedStateVector::fromStateDerivs(this->dynPtrs);
+    derivatives.readStateDerivs(states.getLayout());
 }
 
 template <size_t numberStages>
-auto svIntegratorRungeKutta<numberStages>::computeKCoefficients(
+void svIntegratorRungeKutta<numberStages>::computeKCoefficients(
     double currentTime,
     double timeStep,
-    const ExtendedStateVector& currentStates) -> KCoefficientsValues
+    const ExtendedStateVector& currentStates,
+    KCoefficientsValues& kVectors,
+    bool firstStageKnown)
 {
-    KCoefficientsValues kVectors;
-
-    for (size_t stageIndex = 0; stageIndex < numberStages; stageIndex++) {
+    for (size_t stageIndex = firstStageKnown ? 1 : 0; stageIndex < numberStages; stageIndex++) {
         double timeToComputeK = currentTime + this->coefficients->cArray.at(stageIndex) * timeStep;
 
         if (stageIndex == 0) // Avoids one ExtendedStateVector copy
         {
-            kVectors.at(stageIndex) =
-                this->computeDerivatives(timeToComputeK, timeStep, currentStates);
+            this->computeDerivatives(timeToComputeK, timeStep, currentStates, kVectors.at(stageIndex));
             continue;
         }
 
-        ExtendedStateVector stateToComputeK = currentStates;
+        this->stageState.setScaled(currentStates, 1.0);
         for (size_t subStageIndex = 0; subStageIndex < stageIndex; subStageIndex++) {
             if (this->coefficients->aMatrix.at(stageIndex).at(subStageIndex) == 0) continue;
-            stateToComputeK +=
-                kVectors.at(subStageIndex) *
-                (this->coefficients->aMatrix.at(stageIndex).at(subStageIndex) * timeStep);
+            this->stageState.addScaled(kVectors.at(subStageIndex),
+                                       this->coefficients->aMatrix.at(stageIndex).at(subStageIndex) *
+                                           timeStep);
         }
 
-        kVectors.at(stageIndex) =
-            this->computeDerivatives(timeToComputeK, timeStep, stateToComputeK);
+        this->computeDerivatives(timeToComputeK, timeStep, this->stageState, kVectors.at(stageIndex));
     }
-
-    return kVectors;
 }
 
 template <size_t numberStages>
-ExtendedStateVector
-svIntegratorRungeKutta<numberStages>::computeNextState(double timeStep,
-                                                       const ExtendedStateVector& currentStates,
-                                                       const KCoefficientsValues& kVectors)
+void svIntegratorRungeKutta<numberStages>::computeNextState(double timeStep,
+                                                            const ExtendedStateVector& currentStates,
+                                                            const KCoefficientsValues& kVectors,
+                                                            ExtendedStateVector& nextState)
 {
-    ExtendedStateVector result = currentStates;
+    nextState.setScaled(currentStates, 1.0);
     for (size_t stageIndex = 0; stageIndex < numberStages; stageIndex++) {
         if (this->coefficients->bArray.at(stageIndex) == 0) continue;
-        result += kVectors.at(stageIndex) * (this->coefficients->bArray.at(stageIndex) * timeStep);
+        nextState.addScaled(kVectors.at(stageIndex), this->coefficients->bArray.at(stageIndex) * timeStep);
     }
-
-    return result;
 }
 
 #endif /* svIntegratorRungeKutta_h */
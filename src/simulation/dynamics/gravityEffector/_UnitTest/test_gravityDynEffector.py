@@ -32,6 +32,7 @@ from Basilisk.utilities import SimulationBaseClass
 from Basilisk.utilities import unitTestSupport  # general support file with common unit test functions
 from Basilisk.utilities import macros
 from Basilisk.simulation import gravityEffector
+from Basilisk.simulation import sphericalHarmonicsGravityModel
 from Basilisk.simulation import spiceInterface
 from Basilisk.topLevelModules import pyswice
 from Basilisk.utilities.pyswice_spk_utilities import spkRead
@@ -575,6 +576,35 @@ def multiBodyGravity(show_plots):
 
     return [testFailCount, ''.join(testMessages)]
 
+def test_sphericalHarmonicsBatchAndOrder():
+    """Checks the batch field, the maximum order and the caller-provided workspace"""
+    spherHarm = gravityEffector.SphericalHarmonicsGravityModel().loadFromFile(path + '/GGM03S.txt', 20)
+    spherHarm.initializeParameters()
+
+    rng = np.random.default_rng(0)
+    positions = rng.uniform(-1.0, 1.0, (11, 3))
+    positions *= (7000.0E3 / np.linalg.norm(positions, axis=1))[:, np.newaxis]
+
+    # the points are swept together, but give the same field as one at a time
+    fields = np.array(spherHarm.computeFields(positions))
+    for position, field in zip(positions, fields):
+        np.testing.assert_array_equal(field, np.array(spherHarm.computeField(position)).flatten())
+
+    workspace = sphericalHarmonicsGravityModel.SphericalHarmonicsWorkspace()
+    np.testing.assert_array_equal(np.array(spherHarm.computeField(positions[0], 20, True, workspace)).flatten(),
+                                  fields[0])
+
+    # ignoring the orders above 4 is the same as zeroing their coefficients
+    truncated = gravityEffector.SphericalHarmonicsGravityModel().loadFromFile(path + '/GGM03S.txt', 20, 4)
+    truncated.initializeParameters()
+    zeroed = gravityEffector.SphericalHarmonicsGravityModel().loadFromFile(path + '/GGM03S.txt', 20)
+    zeroed.cBar = [[c if m <= 4 else 0.0 for m, c in enumerate(row)] for row in zeroed.cBar]
+    zeroed.sBar = [[s if m <= 4 else 0.0 for m, s in enumerate(row)] for row in zeroed.sBar]
+    zeroed.initializeParameters()
+    for position in positions:
+        np.testing.assert_allclose(np.array(truncated.computeField(position)).flatten(),
+                                   np.array(zeroed.computeField(position)).flatten(), rtol=1e-14)
+
 if __name__ == "__main__":
     # test_gravityEffectorAllTest(False)
     # independentSphericalHarmonics(False)
@@ -16,13 +16,15 @@
 #  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
 #
 import csv
+from typing import Optional
 
 from Basilisk import __path__
 
 def loadGravFromFile(
         fileName: str, 
         spherHarm: "SphericalHarmonicsGravityModel", 
-        maxDeg: int = 2
+        maxDeg: int = 2,
+        maxOrder: Optional[int] = None
     ):
 
     [clmList, slmList, mu, radEquator] = loadGravFromFileToList(fileName, maxDeg=2)
@@ -32,6 +34,7 @@ def loadGravFromFile(
     spherHarm.cBar = clmList
     spherHarm.sBar = slmList
     spherHarm.maxDeg = maxDeg
+    spherHarm.maxOrder = -1 if maxOrder is None else maxOrder
 
 def loadGravFromFileToList(fileName: str, maxDeg: int = 2):
     with open(fileName, 'r') as csvfile:
@@ -167,15 +167,17 @@ struct SpicePlanetStateMsg_C;
     def usePointMassGravityModel(self):
         self.gravityModel = PointMassGravityModel()
 
-    def useSphericalHarmonicsGravityModel(self, file: str, maxDeg: int):
+    def useSphericalHarmonicsGravityModel(self, file: str, maxDeg: int, maxOrder: Optional[int] = None):
         """Makes the GravBodyData use Spherical Harmonics as its gravity model.
 
         Args:
             file (str): The file that contains the spherical harmonics data in the
                 JPL format.
             maxDeg (int): The maximum degree to use in the spherical harmonics.
+            maxOrder (int, optional): The maximum order to use in the spherical
+                harmonics. Defaults to ``maxDeg``.
         """
-        self.gravityModel = SphericalHarmonicsGravityModel().loadFromFile(file, maxDeg)
+        self.gravityModel = SphericalHarmonicsGravityModel().loadFromFile(file, maxDeg, maxOrder)
 
     def usePolyhedralGravityModel(self, file: str):
         """Makes the GravBodyData use the Polyhedral gravity model.
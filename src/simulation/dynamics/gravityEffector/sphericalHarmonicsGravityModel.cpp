@@ -21,12 +21,24 @@
 #include "architecture/utilities/bskLogging.h"
 #include "simulation/dynamics/_GeneralModuleFiles/gravityEffector.h"
 
+#include <algorithm>
+
 namespace {
 // Computes the term (2 - d_l), where d_l is the kronecker delta.
 inline double getK(const size_t degree)
 {
     return (degree == 0) ? 1.0 : 2.0;
 }
+
+// The workspace of the calling thread, used when the caller does not provide one
+SphericalHarmonicsWorkspace& getThreadWorkspace()
+{
+    thread_local SphericalHarmonicsWorkspace workspace;
+    return workspace;
+}
+
+// Number of positions computeFields() sweeps together
+constexpr size_t blockWidth = 4;
 }
 
 std::optional<std::string> SphericalHarmonicsGravityModel::initializeParameters()
@@ -36,41 +48,49 @@ std::optional<std::string> SphericalHarmonicsGravityModel::initializeParameters(
                "provided.";
     }
 
-    for (size_t i = 0; i <= this->maxDeg + 1; i++) {
-        std::vector<double> aRow, n1Row, n2Row;
-        aRow.resize(i + 1, 0.0);
-        // Diagonal elements of A_bar
-        if (i == 0) { aRow[i] = 1.0; }
-        else {
-            aRow[i] = sqrt(double((2 * i + 1) * getK(i)) / (2 * i * getK(i - 1))) *
-                      this->aBar[i - 1][i - 1];
-        }
-        n1Row.resize(i + 1, 0.0);
-        n2Row.resize(i + 1, 0.0);
-        for (size_t m = 0; m <= i; m++) {
-            if (i >= m + 2) {
-                n1Row[m] = sqrt(double((2 * i + 1) * (2 * i - 1)) / ((i - m) * (i + m)));
-                n2Row[m] = sqrt(double((i + m - 1) * (2 * i + 1) * (i - m - 1)) /
-                                ((i + m) * (i - m) * (2 * i - 3)));
-            }
+    size_t maxDegree = this->maxDeg;
+    this->packedDegree = maxDegree;
+    this->orderLimit = this->maxOrder < 0 ? maxDegree : std::min<size_t>(this->maxOrder, maxDegree);
+    for (size_t l = 0; l <= maxDegree; l++) {
+        size_t rowSize = std::min(l, this->orderLimit) + 1;
+        if (l >= this->cBar.size() || l >= this->sBar.size() || this->cBar[l].size() < rowSize ||
+            this->sBar[l].size() < rowSize) {
+            return "Could not initialize spherical harmonics: the 'C' and 'S' parameters do not "
+                   "reach the maximum degree and order.";
         }
-        this->n1.push_back(n1Row);
-        this->n2.push_back(n2Row);
-        this->aBar.push_back(aRow);
     }
 
-    for (size_t l = 0; l <= this->maxDeg; l++) // up to _maxDegree-1
-    {
-        std::vector<double> nq1Row, nq2Row;
-        nq1Row.resize(l + 1, 0.0);
-        nq2Row.resize(l + 1, 0.0);
-        for (size_t m = 0; m <= l; m++) {
-            if (m < l) { nq1Row[m] = sqrt(double((l - m) * getK(m) * (l + m + 1)) / getK(m + 1)); }
-            nq2Row[m] = sqrt(double((l + m + 2) * (l + m + 1) * (2 * l + 1) * getK(m)) /
-                             ((2 * l + 3) * getK(m + 1)));
+    // Diagonal and sub-diagonal elements of A_bar, which do not depend on the position
+    this->aBarDiagonal.assign(maxDegree + 2, 1.0);
+    this->aBarSubDiagonal.assign(maxDegree + 2, 0.0);
+    for (size_t i = 1; i <= maxDegree + 1; i++) {
+        this->aBarDiagonal[i] = sqrt(double((2 * i + 1) * getK(i)) / (2 * i * getK(i - 1))) *
+                                this->aBarDiagonal[i - 1];
+        this->aBarSubDiagonal[i] = sqrt(double((2 * i) * getK(i - 1)) / getK(i)) * this->aBarDiagonal[i];
+    }
+
+    // The terms of each order m, from degree m to maxDegree + 1, one order after the other. The order
+    // after the maximum order is needed for the derivatives of the potential.
+    this->terms.clear();
+    this->orderOffsets.assign(this->orderLimit + 2, 0);
+    for (size_t m = 0; m <= this->orderLimit + 1; m++) {
+        this->orderOffsets[m] = this->terms.size();
+        for (size_t l = m; l <= maxDegree + 1; l++) {
+            Term term = {};
+            if (l >= m + 2) {
+                term.n1 = sqrt(double((2 * l + 1) * (2 * l - 1)) / ((l - m) * (l + m)));
+                term.n2 = sqrt(double((l + m - 1) * (2 * l + 1) * (l - m - 1)) /
+                               ((l + m) * (l - m) * (2 * l - 3)));
+            }
+            if (l <= maxDegree && m <= this->orderLimit) {
+                term.cBar = this->cBar[l][m];
+                term.sBar = this->sBar[l][m];
+                if (m < l) { term.nQuot1 = sqrt(double((l - m) * getK(m) * (l + m + 1)) / getK(m + 1)); }
+                term.nQuot2 = sqrt(double((l + m + 2) * (l + m + 1) * (2 * l + 1) * getK(m)) /
+                                   ((2 * l + 3) * getK(m + 1)));
+            }
+            this->terms.push_back(term);
         }
-        this->nQuot1.push_back(nq1Row);
-        this->nQuot2.push_back(nq2Row);
     }
 
     return {}; // No error!
@@ -87,115 +107,194 @@ SphericalHarmonicsGravityModel::initializeParameters(const GravBodyData& body)
 Eigen::Vector3d
 SphericalHarmonicsGravityModel::computeField(const Eigen::Vector3d& position_planetFixed) const
 {
-    return this->computeField(position_planetFixed, this->maxDeg, true);
+    return this->computeField(position_planetFixed, this->packedDegree, true, getThreadWorkspace());
 }
 
 Eigen::Vector3d
 SphericalHarmonicsGravityModel::computeField(const Eigen::Vector3d& position_planetFixed,
                                              size_t degree, bool include_zero_degree) const
 {
-    if (degree > this->maxDeg) {
+    return this->computeField(position_planetFixed, degree, include_zero_degree, getThreadWorkspace());
+}
+
+Eigen::Vector3d
+SphericalHarmonicsGravityModel::computeField(const Eigen::Vector3d& position_planetFixed,
+                                             SphericalHarmonicsWorkspace& workspace) const
+{
+    return this->computeField(position_planetFixed, this->packedDegree, true, workspace);
+}
+
+Eigen::Vector3d
+SphericalHarmonicsGravityModel::computeField(const Eigen::Vector3d& position_planetFixed,
+                                             size_t degree, bool include_zero_degree,
+                                             SphericalHarmonicsWorkspace& workspace) const
+{
+    if (degree > this->packedDegree) {
         auto errorMsg =
             "Requested degree greater than maximum degree in Spherical Harmonics gravity model";
         if (bskLogger) bskLogger->bskLog(BSK_ERROR, errorMsg);
         throw std::invalid_argument(errorMsg);
     }
 
-    double x = position_planetFixed[0];
-    double y = position_planetFixed[1];
-    double z = position_planetFixed[2];
-    double r, s, t, u;
-    double order;
-    double rho;
-    double a1, a2, a3, a4, sum_a1, sum_a2, sum_a3, sum_a4;
-    std::vector<double> rE, iM, rhol;
-
-    // Change of variables: direction cosines
-    r = sqrt(x * x + y * y + z * z);
-    s = x / r;
-    t = y / r;
-    u = z / r;
-
-    // Future work: allow maximum order different than maximum degree
-    order = degree;
-
-    for (size_t l = 1; l <= degree + 1; l++) {
-        // Diagonal terms are computed in initializeParameters()
-        //  Low diagonal terms
-        this->aBar[l][l - 1] = sqrt(double((2 * l) * getK(l - 1)) / getK(l)) * this->aBar[l][l] * u;
-    }
+    Eigen::Vector3d field;
+    this->computeFieldBlock<1>(position_planetFixed.data(), degree, include_zero_degree, workspace,
+                               field.data());
+    return field;
+}
 
-    // Lower terms of A_bar
-    for (size_t m = 0; m <= order + 1; m++) {
-        for (size_t l = m + 2; l <= degree + 1; l++) {
-            this->aBar[l][m] =
-                u * this->n1[l][m] * this->aBar[l - 1][m] - this->n2[l][m] * this->aBar[l - 2][m];
-        }
+Eigen::MatrixX3d
+SphericalHarmonicsGravityModel::computeFields(const Eigen::MatrixX3d& positions_planetFixed) const
+{
+    SphericalHarmonicsWorkspace& workspace = getThreadWorkspace();
+    Eigen::MatrixX3d fields(positions_planetFixed.rows(), 3);
 
-        // Computation of real and imaginary parts of (2+j*t)^m
-        if (m == 0) {
-            rE.push_back(1.0);
-            iM.push_back(0.0);
+    // The positions and fields of a block, one after the other
+    double positions[3 * blockWidth];
+    double blockFields[3 * blockWidth];
+    Eigen::Index row = 0;
+    for (; row + (Eigen::Index) blockWidth <= positions_planetFixed.rows(); row += blockWidth) {
+        for (size_t p = 0; p < blockWidth; p++) {
+            for (size_t i = 0; i < 3; i++) {
+                positions[3 * p + i] = positions_planetFixed(row + p, i);
+            }
         }
-        else {
-            rE.push_back(s * rE[m - 1] - t * iM[m - 1]);
-            iM.push_back(s * iM[m - 1] + t * rE[m - 1]);
+        this->computeFieldBlock<blockWidth>(positions, this->packedDegree, true, workspace, blockFields);
+        for (size_t p = 0; p < blockWidth; p++) {
+            for (size_t i = 0; i < 3; i++) {
+                fields(row + p, i) = blockFields[3 * p + i];
+            }
         }
     }
+    for (; row < positions_planetFixed.rows(); row++) {
+        Eigen::Vector3d position = positions_planetFixed.row(row).transpose();
+        fields.row(row) = this->computeField(position, workspace).transpose();
+    }
+    return fields;
+}
 
-    rho = radEquator / r;
-    rhol.resize(degree + 2, 0.0);
-    rhol[0] = muBody / r;
-    rhol[1] = rhol[0] * rho;
-
-    // Degree 0
+template <size_t width>
+void SphericalHarmonicsGravityModel::computeFieldBlock(const double* positions, size_t degree,
+                                                       bool include_zero_degree,
+                                                       SphericalHarmonicsWorkspace& workspace,
+                                                       double* fields) const
+{
+    // Only the columns m and m+1 of A_bar are kept, and the recursions over the degrees are done for
+    // the `width` positions together. The values of a degree l are stored at [l * width, (l + 1) * width)
+    size_t rows = degree + 2;
+    if (workspace.aBarColumn.size() < rows * width) {
+        workspace.aBarColumn.resize(rows * width);
+        workspace.aBarNextColumn.resize(rows * width);
+    }
+    if (workspace.sums.size() < 4 * rows * width) {
+        workspace.sums.resize(4 * rows * width);
+    }
+    double* aBar = workspace.aBarColumn.data();
+    double* aBarNext = workspace.aBarNextColumn.data();
+    double* sums = workspace.sums.data();
+    std::fill(sums, sums + 4 * rows * width, 0.0);
 
-    // Gravity field and potential of degree l = 0
-    // Gravity components
-    a1 = 0.0;
-    a2 = 0.0;
-    a3 = 0.0;
-    a4 = 0.0;
+    // Future work: allow the order to depend on the degree
+    size_t order = std::min(degree, this->orderLimit);
 
-    if (include_zero_degree) {
-        a4 = -rhol[1] / radEquator; // * this->_Nquot_2[0][0] * this->_A_bar[1][1]; //This is 1, so
-                                    // it's not included!
+    // Change of variables: direction cosines
+    double r[width], s[width], t[width], u[width];
+    // Real and imaginary parts of (s+j*t)^m and (s+j*t)^(m-1)
+    double rE[width], iM[width], rEPrevious[width], iMPrevious[width];
+    for (size_t p = 0; p < width; p++) {
+        double x = positions[3 * p];
+        double y = positions[3 * p + 1];
+        double z = positions[3 * p + 2];
+        r[p] = sqrt(x * x + y * y + z * z);
+        s[p] = x / r[p];
+        t[p] = y / r[p];
+        u[p] = z / r[p];
+        rE[p] = 1.0;
+        iM[p] = 0.0;
     }
 
-    for (size_t l = 1; l <= degree; l++) // does not include l = maxDegree
-    {
-        rhol[l + 1] = rho * rhol[l]; // rho_l computed
-
-        sum_a1 = 0.0;
-        sum_a2 = 0.0;
-        sum_a3 = 0.0;
-        sum_a4 = 0.0;
-
-        for (size_t m = 0; m <= l; m++) {
-            double D, E, F;
-            D = this->cBar[l][m] * rE[m] + this->sBar[l][m] * iM[m];
-            if (m == 0) {
-                E = 0.0;
-                F = 0.0;
+    // Column m of A_bar, from degree m to degree + 1
+    auto computeColumn = [&](size_t m, double* column) {
+        for (size_t p = 0; p < width; p++) {
+            column[m * width + p] = this->aBarDiagonal[m];
+        }
+        if (m + 1 <= degree + 1) {
+            for (size_t p = 0; p < width; p++) {
+                column[(m + 1) * width + p] = this->aBarSubDiagonal[m + 1] * u[p];
             }
-            else {
-                E = this->cBar[l][m] * rE[m - 1] + this->sBar[l][m] * iM[m - 1];
-                F = this->sBar[l][m] * rE[m - 1] - this->cBar[l][m] * iM[m - 1];
+        }
+        const Term* term = &this->terms[this->orderOffsets[m]];
+        for (size_t l = m + 2; l <= degree + 1; l++) {
+            double n1 = term[l - m].n1;
+            double n2 = term[l - m].n2;
+            for (size_t p = 0; p < width; p++) {
+                column[l * width + p] =
+                    u[p] * n1 * column[(l - 1) * width + p] - n2 * column[(l - 2) * width + p];
             }
+        }
+    };
 
-            sum_a1 = sum_a1 + m * this->aBar[l][m] * E;
-            sum_a2 = sum_a2 + m * this->aBar[l][m] * F;
-            if (m < l) { sum_a3 = sum_a3 + this->nQuot1[l][m] * this->aBar[l][m + 1] * D; }
-            sum_a4 = sum_a4 + this->nQuot2[l][m] * this->aBar[l + 1][m + 1] * D;
+    computeColumn(0, aBar);
+    for (size_t m = 0; m <= order; m++) {
+        computeColumn(m + 1, aBarNext);
+
+        // Add the terms of order m to the sums of each degree
+        const Term* term = &this->terms[this->orderOffsets[m]];
+        for (size_t l = std::max<size_t>(m, 1); l <= degree; l++) {
+            double cBar = term[l - m].cBar;
+            double sBar = term[l - m].sBar;
+            double nQuot1 = term[l - m].nQuot1;
+            double nQuot2 = term[l - m].nQuot2;
+            double* sum = &sums[4 * l * width];
+            for (size_t p = 0; p < width; p++) {
+                double D = cBar * rE[p] + sBar * iM[p];
+                if (m > 0) {
+                    double E = cBar * rEPrevious[p] + sBar * iMPrevious[p];
+                    double F = sBar * rEPrevious[p] - cBar * iMPrevious[p];
+                    sum[p] = sum[p] + m * aBar[l * width + p] * E;
+                    sum[width + p] = sum[width + p] + m * aBar[l * width + p] * F;
+                }
+                if (m < l) {
+                    sum[2 * width + p] = sum[2 * width + p] + nQuot1 * aBarNext[l * width + p] * D;
+                }
+                sum[3 * width + p] = sum[3 * width + p] + nQuot2 * aBarNext[(l + 1) * width + p] * D;
+            }
         }
 
-        a1 = a1 + rhol[l + 1] / radEquator * sum_a1;
-        a2 = a2 + rhol[l + 1] / radEquator * sum_a2;
-        a3 = a3 + rhol[l + 1] / radEquator * sum_a3;
-        a4 = a4 - rhol[l + 1] / radEquator * sum_a4;
+        for (size_t p = 0; p < width; p++) {
+            rEPrevious[p] = rE[p];
+            iMPrevious[p] = iM[p];
+            rE[p] = s[p] * rEPrevious[p] - t[p] * iMPrevious[p];
+            iM[p] = s[p] * iMPrevious[p] + t[p] * rEPrevious[p];
+        }
+        std::swap(aBar, aBarNext);
     }
 
-    return {a1 + s * a4, a2 + t * a4, a3 + u * a4};
+    for (size_t p = 0; p < width; p++) {
+        double rho = radEquator / r[p];
+        double rhol = muBody / r[p] * rho; // rho_(l+1), starting at l = 0
+
+        // Gravity field of degree l = 0
+        double a1 = 0.0;
+        double a2 = 0.0;
+        double a3 = 0.0;
+        double a4 = 0.0;
+        if (include_zero_degree) {
+            a4 = -rhol / radEquator;
+        }
+
+        for (size_t l = 1; l <= degree; l++) {
+            rhol = rho * rhol;
+            const double* sum = &sums[4 * l * width];
+            a1 = a1 + rhol / radEquator * sum[p];
+            a2 = a2 + rhol / radEquator * sum[width + p];
+            a3 = a3 + rhol / radEquator * sum[2 * width + p];
+            a4 = a4 - rhol / radEquator * sum[3 * width + p];
+        }
+
+        fields[3 * p] = a1 + s[p] * a4;
+        fields[3 * p + 1] = a2 + t[p] * a4;
+        fields[3 * p + 2] = a3 + u[p] * a4;
+    }
 }
 
 double SphericalHarmonicsGravityModel::computePotentialEnergy(
@@ -25,6 +25,19 @@
 
 #include <vector>
 
+/**
+ * Memory used to compute the field of a SphericalHarmonicsGravityModel.
+ *
+ * The buffers grow to the size the model needs on first use, and are reused
+ * afterwards, so that computing the field does not allocate. A workspace can
+ * be used with any model, but not by two threads at a time.
+ */
+struct SphericalHarmonicsWorkspace {
+    std::vector<double> aBarColumn;     /**< [-] Column m of A_bar (Eq. 61), for each point */
+    std::vector<double> aBarNextColumn; /**< [-] Column m+1 of A_bar, for each point */
+    std::vector<double> sums;           /**< [-] The four sums over the orders, for each degree and point */
+};
+
 /**
  * The Spherical Harmonics gravity model
  */
@@ -34,6 +47,10 @@ class SphericalHarmonicsGravityModel : public GravityModel {
      *
      * The attributes `muBody`and `radEquator` must be set separately.
      *
+     * The coefficients `cBar` and `sBar`, up to `maxDeg` and `maxOrder`, are packed
+     * here for the computation of the field. Later changes of these attributes are
+     * ignored until this method is called again.
+     *
      * Will return an error message (string) if `cBar` or `sBar` were not set.
      * Otherwise, returns an empty optional.
      */
@@ -72,6 +89,31 @@ class SphericalHarmonicsGravityModel : public GravityModel {
     Eigen::Vector3d computeField(const Eigen::Vector3d& position_planetFixed, size_t degree,
                                  bool include_zero_degree) const;
 
+    /** Returns the gravity acceleration at a position around this body,
+     * computed in the given workspace.
+     *
+     * The other overloads use a workspace local to the calling thread, so
+     * that a model can be shared by several spacecraft and threads.
+     */
+    Eigen::Vector3d computeField(const Eigen::Vector3d& position_planetFixed,
+                                 SphericalHarmonicsWorkspace& workspace) const;
+
+    /** Returns the gravity acceleration at a position around this body,
+     * up to the given `degree`, computed in the given workspace.
+     */
+    Eigen::Vector3d computeField(const Eigen::Vector3d& position_planetFixed, size_t degree,
+                                 bool include_zero_degree,
+                                 SphericalHarmonicsWorkspace& workspace) const;
+
+    /** Returns the gravity accelerations at many positions around this body.
+     *
+     * Each row of `positions_planetFixed` is a position in the body-fixed
+     * reference frame, and the same row of the result is the acceleration
+     * there. The positions are swept together, a few at a time, so that the
+     * recursions over the degrees and orders are vectorized across them.
+     */
+    Eigen::MatrixX3d computeFields(const Eigen::MatrixX3d& positions_planetFixed) const;
+
     /** Returns the gravitational potential energy at a position around this body.
      *
      * The current implementation returns the potential energy of a point-mass
@@ -91,27 +133,61 @@ class SphericalHarmonicsGravityModel : public GravityModel {
      * A value of maxDeg greater than the size of cBar or sBar will cause an error.
      * A value that is lower will truncate the spherical harmonics, ignoring any
      * parameters in cBar/sBar with degree greater than maxDeg.
+     *
+     * Must be set before initializeParameters is called.
      */
     size_t maxDeg = 0;
 
-    /** The normalized "C" spherical harmonics coefficients */
+    /** The maximum order of Spherical Harmonics to use
+     *
+     * The coefficients of order greater than maxOrder are ignored. A negative
+     * value, the default, uses the same maximum order as maxDeg.
+     *
+     * Must be set before initializeParameters is called.
+     */
+    int maxOrder = -1;
+
+    /** The normalized "C" spherical harmonics coefficients
+     *
+     * Must be set before initializeParameters is called, which packs them. To use
+     * new coefficients after the simulation is initialized, call initializeParameters again.
+     */
     std::vector<std::vector<double>> cBar;
 
-    /** The normalized "S" spherical harmonics coefficients */
+    /** The normalized "S" spherical harmonics coefficients
+     *
+     * Must be set before initializeParameters is called, which packs them. To use
+     * new coefficients after the simulation is initialized, call initializeParameters again.
+     */
     std::vector<std::vector<double>> sBar;
 
   private:
+    /** Computes the field at `width` positions, stored one after the other in `positions` */
+    template <size_t width>
+    void computeFieldBlock(const double* positions, size_t degree, bool include_zero_degree,
+                           SphericalHarmonicsWorkspace& workspace, double* fields) const;
+
     /**
      * The following parameters are used internally to compute the gravity.
      *
      * They are coefficients used in the method of Pines for the gravity due to SH.
      * For their definition, see the 'Basilisk-GravityEffector' documentation.
      */
-    mutable std::vector<std::vector<double>> aBar;  /**< [-] Eq. 61 */
-    std::vector<std::vector<double>> n1;            /**< [-] Eq. 63 */
-    std::vector<std::vector<double>> n2;            /**< [-] Eq. 64 */
-    std::vector<std::vector<double>> nQuot1;        /**< [-] Eq. 79 */
-    std::vector<std::vector<double>> nQuot2;        /**< [-] Eq. 80 */
+    struct Term {
+        double cBar;   /**< [-] "C" coefficient of the degree and order */
+        double sBar;   /**< [-] "S" coefficient of the degree and order */
+        double n1;     /**< [-] Eq. 63 */
+        double n2;     /**< [-] Eq. 64 */
+        double nQuot1; /**< [-] Eq. 79 */
+        double nQuot2; /**< [-] Eq. 80 */
+    };
+
+    size_t packedDegree = 0;             /**< [-] Value of maxDeg when the terms were packed */
+    size_t orderLimit = 0;               /**< [-] Maximum order of the terms, at most maxDeg */
+    std::vector<Term> terms;             /**< [-] Terms of degree m to maxDeg + 1, packed one order m after the other */
+    std::vector<size_t> orderOffsets;    /**< [-] Index in terms of the term of degree m and order m */
+    std::vector<double> aBarDiagonal;    /**< [-] Diagonal terms of A_bar, A_bar[l][l] */
+    std::vector<double> aBarSubDiagonal; /**< [-] Factor of u in the sub-diagonal terms of A_bar, A_bar[l][l-1] */
 };
 
 #endif /* SH_GRAVITY_MODEL_H */
@@ -23,6 +23,10 @@
    #include <memory>
 %}
 
+%pythoncode %{
+from typing import Optional
+%}
+
 %include "exception.i"
 
 %exception {
@@ -56,10 +60,14 @@
 
 %extend SphericalHarmonicsGravityModel {
    %pythoncode %{
-      def loadFromFile(self, fileName: str, maxDeg: int):
-          """Loads the C and S coefficients from a file."""
+      def loadFromFile(self, fileName: str, maxDeg: int, maxOrder: Optional[int] = None):
+          """Loads the C and S coefficients from a file.
+
+          The terms of order greater than ``maxOrder`` are ignored, all orders up
+          to ``maxDeg`` are used if it is not given.
+          """
           from Basilisk.simulation.gravityEffector import loadGravFromFile
-          loadGravFromFile(fileName, self, maxDeg)
+          loadGravFromFile(fileName, self, maxDeg, maxOrder)
           return self
    %}
 }
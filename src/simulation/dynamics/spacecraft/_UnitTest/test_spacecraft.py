@@ -56,12 +56,13 @@ def addTimeColumn(time, data):
                                       , "scOptionalRef"
                                       , "scAccumDV"
                                       , "scAccumDVExtForce"
+                                      , "scAccumDVOrbit"
                                       ])
 def test_spacecraftAllTest(show_plots, function):
     """Module Unit Test"""
     if function == "scOptionalRef":
         [testResults, testMessage] = eval(function + '(show_plots, 1e-3)')
-    elif function == "scAccumDV" or function == "scAccumDVExtForce":
+    elif function == "scAccumDV" or function == "scAccumDVExtForce" or function == "scAccumDVOrbit":
         [testResults, testMessage] = eval(function + '()')
     else:
         [testResults, testMessage] = eval(function + '(show_plots)')
@@ -1168,6 +1169,84 @@ def scAccumDVExtForce():
     return [testFailCount, ''.join(testMessages)]
 
 
+def scAccumDVOrbit():
+    """Module Unit Test"""
+    # The __tracebackhide__ setting influences pytest showing of tracebacks:
+    # the mrp_steering_tracking() function will not be shown unless the
+    # --fulltrace command line option is specified.
+    __tracebackhide__ = True
+
+    testFailCount = 0  # zero unit test result counter
+    testMessages = []  # create empty list to store test log messages
+
+    scObject = spacecraft.Spacecraft()
+    scObject.ModelTag = "spacecraftBody"
+
+    unitTaskName = "unitTask"  # arbitrary name (don't change)
+    unitProcessName = "TestProcess"  # arbitrary name (don't change)
+
+    #   Create a sim module as an empty container
+    unitTestSim = SimulationBaseClass.SimBaseClass()
+
+    # Create test thread
+    timeStep = 10.
+    testProcessRate = macros.sec2nano(timeStep)  # update process rate update time
+    testProc = unitTestSim.CreateNewProcess(unitProcessName)
+    testProc.addTask(unitTestSim.CreateNewTask(unitTaskName, testProcessRate))
+
+    # Add test module to runtime call list
+    unitTestSim.AddModelToTask(unitTaskName, scObject)
+
+    # Add external force and torque
+    extFTObject = extForceTorque.ExtForceTorque()
+    extFTObject.ModelTag = "externalDisturbance"
+    extFTObject.extTorquePntB_B = [[0], [0], [0]]
+    extForce = numpy.array([0.1, -0.2, 0.3])
+    extFTObject.extForce_B = [[item] for item in extForce]
+    scObject.addDynamicEffector(extFTObject)
+    unitTestSim.AddModelToTask(unitTaskName, extFTObject)
+
+    # add Earth
+    gravFactory = simIncludeGravBody.gravBodyFactory()
+    earth = gravFactory.createEarth()
+    earth.isCentralBody = True  # ensure this is the central gravitational body
+    scObject.gravField.gravBodies = spacecraft.GravBodyVector(list(gravFactory.gravBodies.values()))
+
+    # Define initial conditions of the spacecraft, which does not rotate, so that the body and inertial DV agree
+    scObject.hub.mHub = 100
+    scObject.hub.r_CN_NInit = [[-7000000.0],	[0.0],	[0.0]]
+    scObject.hub.v_CN_NInit = [[0.0],	[7000.0],	[0.0]]
+
+    dataLog = scObject.scStateOutMsg.recorder()
+    unitTestSim.AddModelToTask(unitTaskName, dataLog)
+
+    unitTestSim.InitializeSimulation()
+    # the gravity-accumulated velocity states are not reset between the integrations, so that they differ from the
+    # velocities by the accumulated DV, which must match the DV of the old per-integration reset
+    stopTime = 6000.
+    unitTestSim.ConfigureStopTime(macros.sec2nano(stopTime))
+    unitTestSim.ExecuteSimulation()
+
+    dataAccumDV_CN_N = dataLog.TotalAccumDV_CN_N
+    dataAccumDV_BN_B = dataLog.TotalAccumDV_BN_B
+    timeArraySec = dataLog.times() * macros.NANO2SEC
+
+    accuracy = 1e-8
+    for i in range(len(dataLog.times())):
+        truth_dataAccumDV = extForce * timeArraySec[i] / scObject.hub.mHub
+        if not unitTestSupport.isArrayEqual(dataAccumDV_CN_N[i], truth_dataAccumDV, 3, accuracy):
+            testFailCount += 1
+            testMessages.append("FAILED: Spacecraft Point C Accumulated DV on an orbit test failed unit test")
+        if not unitTestSupport.isArrayEqual(dataAccumDV_BN_B[i], truth_dataAccumDV, 3, accuracy):
+            testFailCount += 1
+            testMessages.append("FAILED: Spacecraft Point B Accumulated DV on an orbit test failed unit test")
+
+    if testFailCount == 0:
+        print("PASSED: Spacecraft Accumulated DV tests on an orbit")
+
+    return [testFailCount, ''.join(testMessages)]
+
+
 if __name__ == "__main__":
     # scAttRef(True, 1e-3)
     # SCTranslation(True)
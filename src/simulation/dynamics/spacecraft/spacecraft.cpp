@@ -456,8 +456,11 @@ void Spacecraft::preIntegration(double integrateToThisTime) {
     Eigen::Matrix3d oldDcm_NB = oldSigma_BN.toRotationMatrix(); // - dcm_NB before integration
     oldV_CN_N = oldV_BN_N + oldDcm_NB*(*this->cDot_B);
 
-    // - Integrate the state from the last time (timeBefore) to the integrateToThisTime
-    this->hub.matchGravitytoVelocityState(oldV_CN_N); // Set gravity velocity to base velocity for DV estimation
+    // - The accumulated DV of the integration is the change of the difference between the velocities and their
+    //   gravity-accumulated states.  These states are not reset to the velocities, so that an integrator can
+    //   continue its steps from one integration to the next (dense output)
+    this->oldDv_BN_N = oldV_BN_N - this->hubGravVelocity->getState();
+    this->oldDv_CN_N = oldV_CN_N - this->BcGravVelocity->getState();
     this->timeBefore = integrateToThisTime - this->timeStep;
 }
 
@@ -483,18 +486,18 @@ void Spacecraft::postIntegration(double integrateToThisTime) {
 
     // - Find accumulated DV of the center of mass in the body frame
     this->dvAccum_CN_B += newDcm_NB.transpose()*(newV_CN_N -
-                                              this->BcGravVelocity->getState());
+                                              this->BcGravVelocity->getState() - this->oldDv_CN_N);
 
     // - Find the accumulated DV of the body frame in the body frame
     this->dvAccum_BN_B += newDcm_NB.transpose()*(newV_BN_N -
-                                                 this->hubGravVelocity->getState());
+                                                 this->hubGravVelocity->getState() - this->oldDv_BN_N);
 
     // - Find the accumulated DV of the center of mass in the inertial frame
-    this->dvAccum_CN_N += newV_CN_N - this->BcGravVelocity->getState();
+    this->dvAccum_CN_N += newV_CN_N - this->BcGravVelocity->getState() - this->oldDv_CN_N;
 
     // - non-conservative acceleration of the body frame in the body frame
     this->nonConservativeAccelpntB_B = (newDcm_NB.transpose()*(newV_BN_N -
-                                                               this->hubGravVelocity->getState()))/this->timeStep;
+                                                               this->hubGravVelocity->getState() - this->oldDv_BN_N))/this->timeStep;
 
     // - angular acceleration in the body frame
     Eigen::Vector3d newOmega_BN_B;
@@ -114,6 +114,8 @@ private:
     Eigen::MatrixXd *sysTime;            //!< [s] System time
 
     Eigen::Vector3d oldOmega_BN_B;       //!< [r/s] prior angular rate of B wrt N in the Body frame
+    Eigen::Vector3d oldDv_BN_N;          //!< [m/s] prior difference between v_BN_N and its gravity-accumulated state
+    Eigen::Vector3d oldDv_CN_N;          //!< [m/s] prior difference between v_CN_N and its gravity-accumulated state
 
 private:
     void readOptionalRefMsg();                  //!< -- Read the optional attitude or translational reference input message and set the reference states
@@ -933,7 +933,11 @@ void SpacecraftSystem::findPriorStateInformation(SpacecraftUnit &spacecraft)
     // - Finally find v_CN_N
     Eigen::Matrix3d oldDcm_NB = oldSigma_BN.toRotationMatrix(); // - dcm_NB before integration
     spacecraft.oldV_CN_N = spacecraft.oldV_BN_N + oldDcm_NB*(*spacecraft.cDot_B);
-    spacecraft.hub.matchGravitytoVelocityState(spacecraft.oldV_CN_N);
+
+    // - The accumulated DV of the integration is the change of the difference between the velocities and their
+    //   gravity-accumulated states, as in Spacecraft, so that these states are not changed between two integrations
+    spacecraft.oldDv_BN_N = spacecraft.oldV_BN_N - spacecraft.hubGravVelocity->getState();
+    spacecraft.oldDv_CN_N = spacecraft.oldV_CN_N - spacecraft.BcGravVelocity->getState();
 
     return;
 }
@@ -993,15 +997,15 @@ void SpacecraftSystem::calculateDeltaVandAcceleration(SpacecraftUnit &spacecraft
 
     // - Find accumulated DV of the center of mass in the body frame
     spacecraft.dvAccum_CN_B += newDcm_NB.transpose()*(newV_CN_N -
-                                                    spacecraft.BcGravVelocity->getState());
+                                                    spacecraft.BcGravVelocity->getState() - spacecraft.oldDv_CN_N);
 
     // - Find the accumulated DV of the body frame in the body frame
     spacecraft.dvAccum_BN_B += newDcm_NB.transpose()*(newV_BN_N -
-                                                    spacecraft.hubGravVelocity->getState());
+                                                    spacecraft.hubGravVelocity->getState() - spacecraft.oldDv_BN_N);
 
     // - non-conservative acceleration of the body frame in the body frame
     spacecraft.nonConservativeAccelpntB_B = (newDcm_NB.transpose()*(newV_BN_N -
-                                                                   spacecraft.hubGravVelocity->getState()))/localTimeStep;
+                                                                   spacecraft.hubGravVelocity->getState() - spacecraft.oldDv_BN_N))/localTimeStep;
 
     // - angular acceleration in the body frame
     Eigen::Vector3d newOmega_BN_B;
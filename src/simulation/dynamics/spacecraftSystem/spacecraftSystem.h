@@ -85,6 +85,8 @@ public:
     Eigen::Vector3d oldV_CN_N;           //!< class variable
     Eigen::Vector3d oldV_BN_N;           //!< class variable
     Eigen::Vector3d oldOmega_BN_B;       //!< class variable
+    Eigen::Vector3d oldDv_BN_N;          //!< [m/s] prior difference between v_BN_N and its gravity-accumulated state
+    Eigen::Vector3d oldDv_CN_N;          //!< [m/s] prior difference between v_CN_N and its gravity-accumulated state
 
     Eigen::Vector3d dvAccum_CN_B;        //!< [m/s] Accumulated delta-v of center of mass relative to inertial frame in body frame coordinates
     Eigen::Vector3d dvAccum_BN_B;        //!< [m/s] accumulated delta-v of body frame relative to inertial frame in body frame coordinates
@@ -5,6 +5,8 @@ import time
 import numpy as np
 import pandas as pd
 from Basilisk.utilities import macros
+from Basilisk.utilities.MonteCarlo.DataWriter import ColumnarDataReader, isColumnarData
+from Basilisk.utilities.MonteCarlo.StreamingStatistics import StreamingStatistics
 
 try:
     import holoviews as hv
@@ -21,9 +23,14 @@ class mcAnalysisBaseClass:
         self.extremaRuns = []
         self.timeWindow = []
         self.data = None
+        self.statistics = None
 
+    @staticmethod
     def pull_and_format_df(path, varIdxLen):
-        df = pd.read_pickle(path)
+        if isColumnarData(path):
+            df = ColumnarDataReader(path).getDataFrame()
+        else:
+            df = pd.read_pickle(path)
         if len(np.unique(df.columns.codes[1])) is not varIdxLen:
             print("Warning: " + path + " not formatted correctly!")
             newMultIndex = pd.MultiIndex.from_product([df.columns.codes[0], range(varIdxLen)],
@@ -32,6 +39,68 @@ class mcAnalysisBaseClass:
             df = df.reindex(columns=newMultIndex, index=indices)
         return df
 
+    def loadData(self, runs=None, window=None):
+        """
+        Load the dataframe of the analyzed variable. Data written by the ``ColumnarDataWriter`` is read lazily,
+        so only the requested runs and time window are loaded from disk.
+
+        :param runs: optional list of run indices, all runs by default
+        :param window: optional [start, stop] time window in nanoseconds
+        :return: dataframe indexed by time with (runNum, varIdx) MultiIndex columns
+        """
+        path = self.dataDir + "/" + self.variableName + ".data"
+        if isColumnarData(path):
+            return ColumnarDataReader(path).getDataFrame(runs, window)
+        return pd.read_pickle(path)
+
+    def isStreamed(self):
+        """
+        Whether the data is analyzed one run at a time instead of being loaded as a whole, which is the case for
+        data written by the ``ColumnarDataWriter`` until ``self.data`` is set
+        """
+        return self.data is None and isColumnarData(self.dataDir + "/" + self.variableName + ".data")
+
+    def iterRuns(self, window=None):
+        """
+        Iterate over the runs of the analyzed variable, reading columnar data one run at a time
+
+        :param window: optional [start, stop] time window in nanoseconds
+        :return: generator yielding (runNum, times, values) tuples
+        """
+        if self.isStreamed():
+            yield from ColumnarDataReader(self.dataDir + "/" + self.variableName + ".data").iterRuns(window=window)
+            return
+        if self.data is None:
+            self.data = self.loadData()
+        data = self.data
+        if window is not None:
+            data = data[(data.index >= window[0]) & (data.index <= window[1])]
+        for runNum in data.columns.get_level_values(0).unique():
+            yield runNum, data.index.values, data[runNum].values
+
+    def getStatistics(self, quantiles=(0.5,)):
+        """
+        Get the streaming statistics of the analyzed variable. Statistics computed by the data writer during the
+        MonteCarlo are loaded from ``<variable>.stats.npz`` if they track the requested quantiles, otherwise they are
+        computed in a single pass over the runs.
+
+        :param quantiles: the quantiles the statistics need to track
+        :return: StreamingStatistics
+        """
+        if self.statistics is not None and np.isin(quantiles, self.statistics.quantiles).all():
+            return self.statistics
+        statsPath = self.dataDir + "/" + self.variableName + ".stats.npz"
+        if os.path.exists(statsPath):
+            statistics = StreamingStatistics.load(statsPath)
+            if statistics.times is not None and np.isin(quantiles, statistics.quantiles).all():
+                self.statistics = statistics
+                return statistics
+        statistics = StreamingStatistics(quantiles)
+        for runNum, times, values in self.iterRuns():
+            statistics.update(runNum, times, values)
+        self.statistics = statistics
+        return statistics
+
     def getNominalRunIndices(self, maxNumber=50):
         """
         Find the specific MC run indices of the most nominal cases (by iteratively widdling away runs which
@@ -40,18 +109,31 @@ class mcAnalysisBaseClass:
         :param maxNumber: the number of nominal runs to widdle down to.
         :return: list of run indices
         """
-        if self.data is None:
-            self.data = pd.read_pickle(self.dataDir + "/" + self.variableName + ".data")
-
-        dataBar = self.data[np.abs(self.data - self.data.mean()) < 0.5 * self.data.std()]
+        # fraction of the samples of each (run, component) that are not within half a std of the run's mean
+        runTimes = None
+        columns = []
+        inside = []
+        for runNum, times, values in self.iterRuns():
+            runTimes = times if runTimes is None else np.union1d(runTimes, times)
+            values = np.asarray(values, dtype=float).reshape(len(times), -1)
+            with np.errstate(invalid="ignore"):
+                deviation = np.abs(values - np.nanmean(values, axis=0))
+                inside.append((deviation < 0.5 * np.nanstd(values, axis=0, ddof=1)).sum(axis=0))
+            columns.extend((runNum, varIdx) for varIdx in range(values.shape[1]))
+        if len(columns) == 0:
+            return np.array([], dtype=int)
+        nullFraction = 1. - np.concatenate(inside) / len(runTimes)
+
+        # a column is dropped as soon as its null fraction exceeds the shrinking threshold, independently of the others
+        keep = np.ones(len(columns), dtype=bool)
         i = 5
-        while len(dataBar.columns.codes[0]) > maxNumber * self.variableDim:
+        while keep.sum() > maxNumber * self.variableDim:
             i += 1
-            cols_to_delete = dataBar.columns[dataBar.isnull().sum() / len(dataBar) > 1. / np.sqrt(i)]
-            dataBar.drop(cols_to_delete, axis=1, inplace=True)
+            keep &= nullFraction <= 1. / np.sqrt(i)
 
-        print("Nominal runs are ", list(dict.fromkeys(dataBar.columns.codes[0].tolist())))
-        return dataBar.columns.codes[0]
+        nominalRuns = np.array([runNum for (runNum, _), kept in zip(columns, keep) if kept], dtype=int)
+        print("Nominal runs are ", list(dict.fromkeys(nominalRuns.tolist())))
+        return nominalRuns
 
     def getExtremaRunIndices(self, numExtrema, window):
         """
@@ -61,9 +143,23 @@ class mcAnalysisBaseClass:
         :param window: window of time to search for the extremes in
         :return: list of run indices
         """
+        if self.isStreamed():
+            # two passes over the runs: the mean across the runs, then the deviation of each run within the window
+            statistics = self.getStatistics()
+            extrema = StreamingStatistics(quantiles=[], numExtrema=numExtrema, window=window, times=statistics.times)
+            extrema.setReference(statistics.getMean())
+            for runNum, times, values in self.iterRuns(window=window):
+                extrema.update(runNum, times, values)
+            self.timeWindow = [int(np.argmin(np.abs(extrema.times - window[0]))),
+                               int(np.argmin(np.abs(extrema.times - window[1])))]
+            self.extremaRuns = extrema.getExtremaRunIndices()
+            print("Extreme runs are ", list(dict.fromkeys(self.extremaRuns.tolist())))
+            return self.extremaRuns
+
         if self.data is None:
-            self.data = pd.read_pickle(self.dataDir + "/" + self.variableName + ".data")
-        times = self.data.index.tolist()
+            self.data = self.loadData()
+        data = self.data
+        times = data.index.tolist()
 
         # Find the closest indices to the time window requested
         indStart = min(range(len(times)), key=lambda i: abs(times[i] - window[0]))
@@ -71,8 +167,8 @@ class mcAnalysisBaseClass:
         self.timeWindow = [indStart, indEnd]
 
         # Find outliers based on largest deviation off of the mean
-        self.mean = self.data.mean(axis=1, level=1)
-        self.diff = self.data.subtract(self.mean)
+        self.mean = data.mean(axis=1, level=1)
+        self.diff = data.subtract(self.mean)
         self.diff = self.diff.abs()
         self.diff = self.diff.iloc[indStart:indEnd].max(axis=0)
         self.extremaRuns = self.diff.nlargest(numExtrema).index._codes[0]
@@ -84,8 +180,17 @@ class mcAnalysisBaseClass:
         Generate curves that represent the mean, median, and standard deviation of a particular variable.
         Not Tested.
         """
+        statsPath = self.dataDir + "/" + self.variableName + ".stats.npz"
+        if self.isStreamed() or (self.data is None and os.path.exists(statsPath)):
+            # out-of-core statistics, the median is the P-squared estimate
+            statistics = self.getStatistics(quantiles=(0.5,))
+            self.varNum = statistics.numComponents
+            return [statistics.getDataFrame(statistics.getMean()),
+                    statistics.getDataFrame(statistics.getQuantile(0.5)),
+                    statistics.getDataFrame(statistics.getStd())]
+
         if self.data is None:
-            self.data = pd.read_pickle(self.dataDir + "/" + self.variableName + ".data")
+            self.data = self.loadData()
 
         idx = pd.IndexSlice
         self.runs, self.varNum = self.data.columns.values[-1]
@@ -171,7 +276,10 @@ class mcAnalysisBaseClass:
                     continue
                 if "run" in filePath and "overrun" not in filePath:
                     continue
-                df = pd.read_pickle(filePath)
+                if isColumnarData(filePath):
+                    df = ColumnarDataReader(filePath).getDataFrame()
+                else:
+                    df = pd.read_pickle(filePath)
                 singleton = list(dict.fromkeys(np.array(df.columns.codes[0]).tolist()))
                 singletonRuns = list(dict.fromkeys(np.sort(np.array(runIdx)).tolist()))
                 if len(singleton) == len(singletonRuns):
@@ -190,8 +298,12 @@ class mcAnalysisBaseClass:
                 continue
             if "run" in filePath and "overrun" not in filePath:
                 continue
-            df = pd.read_pickle(filePath)
-            dfSubSet = df.loc[idx[:], idx[runIdx, :]]
+            if isColumnarData(filePath):
+                # only read the requested runs
+                dfSubSet = ColumnarDataReader(filePath).getDataFrame(runs=runIdx)
+            else:
+                df = pd.read_pickle(filePath)
+                dfSubSet = df.loc[idx[:], idx[runIdx, :]]
             varName = filePath.rsplit("/")
             pd.to_pickle(dfSubSet, baseDir + "/subset/" + varName[-1])
         print("Finished Populating Subset Directory")
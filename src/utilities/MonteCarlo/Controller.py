@@ -37,12 +37,20 @@ import copy
 import gzip
 import json
 import signal
+import threading
 import time
 import numpy as np
 import multiprocessing as mp
 import pickle as pickle
-from Basilisk.utilities.MonteCarlo.DataWriter import DataWriter
+import queue
+from Basilisk.utilities.MonteCarlo.Dispersions import setSimAttribute, toNativeValue
+from Basilisk.utilities.MonteCarlo.DataWriter import DataWriter, ColumnarDataWriter, packRetainedData, \
+    releaseSharedBlock, writeRunFile
 from Basilisk.utilities.MonteCarlo.RetentionPolicy import RetentionPolicy
+from Basilisk.utilities.MonteCarlo.Convergence import IMPORTANCE_WEIGHT
+from Basilisk.utilities.MonteCarlo.RunManifest import RunManifest
+from Basilisk.utilities.MonteCarlo.WorkQueue import WorkQueue, WorkQueueServer, runWorker
+from Basilisk.utilities.MonteCarlo.DispersionDesign import DispersionDesign
 from Basilisk.utilities.simulationProgessBar import SimulationProgressBar
 
 
@@ -59,7 +67,27 @@ class Controller:
         self.icDirectory = ""
         self.archiveDir = None
         self.varCast = None
+        self.dataWriterClass = DataWriter
         self.numProcess = mp.cpu_count()
+        self.maxTasksPerWorker = 50
+        self.maxRunsInFlight = None
+        self.runWallTimes = {}
+        self.runMetrics = {}
+        self.runsFinished = 0
+        self.convergenceCriteria = []
+        self.waveSize = None
+        self.maxWallTime = None
+        self.dispersionDesignMethod = None
+        self.reuseSimTemplate = False
+        self.statistics = {}
+        self.workQueueAddress = None
+        self.workQueueAuthkey = None
+        self.numLocalWorkers = 0
+        self.heartbeatTimeout = 60.
+        self.maxRetries = 2
+        self.runTimeout = None
+        self.dispersionDesignSeed = None
+        self.workerPool = None
 
         self.simParams = SimulationParameters(
             creationFunction=None,
@@ -95,8 +123,9 @@ class Controller:
             if data.simParams.verbose:
                 print("Loading montecarlo at", filename)
             data.multiProcManager = mp.Manager()
+            data.workerPool = None
             data.dataOutQueue = data.multiProcManager.Queue()
-            data.dataWriter = DataWriter(data.dataOutQueue)
+            data.dataWriter = getattr(data, "dataWriterClass", DataWriter)(data.dataOutQueue)
             data.dataWriter.daemon = False
             return data
 
@@ -177,6 +206,18 @@ class Controller:
         """
         self.simParams.retentionPolicies.append(policy)
 
+    def addStatistics(self, itemName, statistics):
+        """
+        Compute streaming statistics of a retained item in the data writer as the runs finish. The statistics are saved
+        in the archive directory as ``<item>.stats.npz`` and are ready as soon as the MonteCarlo is done.
+
+        Args:
+            itemName: str
+                The retained item, such as ``"scStateMsg.r_BN_N"``.
+            statistics: StreamingStatistics
+        """
+        self.statistics[itemName] = statistics
+
     def setThreadCount(self, threads):
         """
         Set the number of threads to use for the monte carlo simulation
@@ -187,6 +228,128 @@ class Controller:
         """
         self.numProcess = threads
 
+    def setMaxTasksPerWorker(self, maxTasks):
+        """
+        Set how many runs a worker process executes before it is replaced by a fresh process.
+        Recycling the workers bounds the memory that leaks from one simulation run to the next.
+
+        Args:
+            maxTasks: int
+                Number of runs per worker process. None keeps the workers alive for the whole MonteCarlo.
+        """
+        self.maxTasksPerWorker = maxTasks
+
+    def setMaxRunsInFlight(self, maxRuns):
+        """
+        Set how many runs may be handed to the worker pool before their results have come back.
+        This bounds the number of cloned simulation parameters held in memory at once.
+
+        Args:
+            maxRuns: int
+                Maximum number of dispatched but unfinished runs. None defaults to twice the process count.
+        """
+        self.maxRunsInFlight = maxRuns
+
+    def setSimulationTemplateReuse(self, reuse):
+        """
+        Build the simulation once in the controller process and fork every run from this initialized image, instead of
+        calling the creation function in each run. Kernels, gravity models and the message graph are then loaded once,
+        and each run only applies its dispersions to a copy-on-write copy of the template.
+
+        Each worker process executes a single run on its forked template, so ``setMaxTasksPerWorker()`` is ignored in
+        this mode. This requires the ``fork`` start method, which is not available on Windows.
+
+        Args:
+            reuse: bool
+        """
+        self.reuseSimTemplate = reuse
+
+    def setConvergence(self, criteria, waveSize=None, maxWallTime=None):
+        """
+        Execute the runs in waves until all the convergence criteria are met, instead of executing all of them. The
+        execution count set with ``setExecutionCount()`` is the budget of runs. The criteria are evaluated on the
+        metrics added to the retention policies with ``RetentionPolicy.addMetric()``.
+
+        Args:
+            criteria: ConvergenceCriterion[]
+                The criteria, see :mod:`Basilisk.utilities.MonteCarlo.Convergence`. An empty list executes all runs.
+            waveSize: int
+                The number of runs executed between two evaluations of the criteria, 4 per process by default.
+            maxWallTime: float
+                Seconds after which no new wave is started, even if the criteria are not met.
+        """
+        self.convergenceCriteria = criteria
+        self.waveSize = waveSize
+        self.maxWallTime = maxWallTime
+
+    def setImportanceWeight(self, weightFunction):
+        """
+        Set the importance sampling weight of the runs, when the dispersions are drawn from proposal distributions that
+        sample the rare cases of interest more often than the nominal distributions. The convergence criteria then
+        estimate the metrics under the nominal distributions.
+
+        Args:
+            weightFunction: function
+                Function of the modifications dictionary of a run returning the likelihood ratio of its dispersed
+                values, nominal over proposal density. It is called in the workers, so it must be picklable.
+        """
+        self.simParams.importanceWeight = weightFunction
+
+    def getRunMetrics(self):
+        """
+        Get the metrics of the runs executed by the last call to ``executeSimulations()``, as a dict of the metrics
+        dictionary of each run
+        """
+        return self.runMetrics
+
+    def getConvergenceSummary(self):
+        """
+        Evaluate the convergence criteria on the metrics of the finished runs
+
+        Returns:
+            list with, for each criterion, a dict with the ``metric``, its ``estimate``, the ``halfWidth`` of its
+            confidence interval, the ``numRuns`` it is based on and whether it has ``converged``
+        """
+        return [criterion.evaluate(self.runMetrics) for criterion in self.convergenceCriteria]
+
+    def setWorkQueue(self, address, authkey, numLocalWorkers=0, heartbeatTimeout=60., maxRetries=2, runTimeout=None):
+        """
+        Serve the runs over TCP to workers on this host or others, instead of executing them on a local process pool.
+        Workers are started with ``python -m Basilisk.utilities.MonteCarlo.WorkQueue host:port --authkey key``,
+        see :mod:`Basilisk.utilities.MonteCarlo.WorkQueue`.
+
+        Args:
+            address: (host, port)
+                The address to serve the runs on, port 0 picks a free port.
+                None to execute the runs locally again.
+            authkey: bytes
+                The key the workers must authenticate with.
+            numLocalWorkers: int
+                Number of worker processes to start on this host, each executing one run at a time.
+            heartbeatTimeout: float
+                Seconds after which the runs of a silent worker are handed out again.
+            maxRetries: int
+                Number of times a run is handed out again before it is recorded as failed.
+            runTimeout: float
+                Seconds of wall time after which the local workers kill a run and hand it back, None for no limit.
+                Remote workers set their own limit with ``--timeout``.
+        """
+        self.workQueueAddress = address
+        self.workQueueAuthkey = authkey
+        self.numLocalWorkers = numLocalWorkers
+        self.heartbeatTimeout = heartbeatTimeout
+        self.maxRetries = maxRetries
+        self.runTimeout = runTimeout
+
+    def getRunWallTimes(self):
+        """
+        Get the wall clock time each run of the last execution took
+
+        Returns:
+            A dictionary mapping the run index to the run wall time in seconds
+        """
+        return self.runWallTimes
+
     def setVerbose(self, verbose):
         """
         Use verbose output for this MonteCarlo run
@@ -232,6 +395,33 @@ class Controller:
         """
         self.varCast = varCast
 
+    def setDataWriter(self, writerClass):
+        """
+        Set the data writer used to store the retained data of all runs in the archive directory
+
+        Args:
+            writerClass: DataWriter subclass
+                ``DataWriter`` (default) stores one pickled dataframe per retained item.
+                ``ColumnarDataWriter`` appends each run to memory-mappable binary columns, which avoids
+                concatenating all runs once the MonteCarlo is done.
+        """
+        self.dataWriterClass = writerClass
+
+    def setDispersionDesign(self, method="random", seed=None):
+        """
+        Generate the dispersions of all runs up front, as a single design matrix, instead of drawing them one run at a
+        time in the workers. The design is saved in the archive directory as ``dispersionDesign.npy``.
+
+        Args:
+            method: str
+                ``"random"``, ``"lhs"`` (latin hypercube) or ``"sobol"`` (scrambled Sobol sequence, requires scipy).
+                None to generate the dispersions in the workers.
+            seed: int
+                The seed the design and the per-run random seeds are derived from.
+        """
+        self.dispersionDesignMethod = method
+        self.dispersionDesignSeed = seed
+
     def setICDir(self, dirName):
         """
         Set-up archives containing IC data
@@ -300,11 +490,29 @@ class Controller:
         if self.ICrunFlag:
             filename = self.icDirectory + "run" + str(caseNumber) + ".json"
         else:
+            dispersions = self.getManifestParameters(caseNumber)
+            if dispersions is not None:
+                return dispersions
             filename = self.archiveDir + "run" + str(caseNumber) + ".json"
         with open(filename, "r") as dispersionFile:
             dispersions = json.load(dispersionFile)
             return dispersions
 
+    def getManifestParameters(self, caseNumber):
+        """
+        Get the parameters of a run from the run manifest of the archive directory
+
+        :param caseNumber: The number of the run to get the parameters used for.
+        :return: A dictionary of the parameters of the simulation, or None if the manifest does not record them.
+        """
+        manifestFile = self.archiveDir + "manifest.db"
+        if not os.path.exists(manifestFile):
+            return None
+        manifest = RunManifest(manifestFile)
+        parameters = manifest.getParameters(caseNumber)
+        manifest.close()
+        return parameters
+
     def reRunCases(self, caseList):
         """
         Rerun some cases from a MonteCarlo run. Does not run in parallel
@@ -323,25 +531,30 @@ class Controller:
             if self.simParams.verbose:
                 print("Rerunning", caseNumber)
 
-            oldRunFile = self.archiveDir + "run" + str(caseNumber) + ".json"
-            if not os.path.exists(oldRunFile):
-                print("ERROR re-running case: " + oldRunFile)
-                continue
+            # the run manifest indexes the parameters of all runs, older archives only have the run json files
+            modifications = self.getManifestParameters(caseNumber)
+            if modifications is None:
+                oldRunFile = self.archiveDir + "run" + str(caseNumber) + ".json"
+                if not os.path.exists(oldRunFile):
+                    print("ERROR re-running case: " + oldRunFile)
+                    continue
+                with open(oldRunFile, "r") as runParameters:
+                    modifications = json.load(runParameters)
 
             # use old simulation parameters, modified slightly.
             simParams = copy.deepcopy(self.simParams)
             simParams.index = caseNumber
-            # don't redisperse seeds, we want to use the ones saved in the oldRunFile
+            # don't redisperse seeds, we want to use the ones saved in the manifest
             simParams.shouldDisperseSeeds = False
             # don't retain any data so remove all retention policies
             simParams.retentionPolicies = []
-
-            with open(oldRunFile, "r") as runParameters:
-                simParams.modifications = json.load(runParameters)
+            # a rerun does not change the recorded state of the run
+            simParams.manifestFile = None
+            simParams.modifications = modifications
 
             # execute simulation with dispersion
             executor = SimulationExecutor()
-            success = executor([simParams, self.dataOutQueue])
+            success = executor([simParams, self.dataOutQueue])[0]
 
             if not success:
                 print("Error re-executing run", caseNumber)
@@ -388,7 +601,7 @@ class Controller:
         # Create Queue, but don't ever start it.
         self.multiProcManager = mp.Manager()
         self.dataOutQueue = self.multiProcManager.Queue()
-        self.dataWriter = DataWriter(self.dataOutQueue)
+        self.dataWriter = self.dataWriterClass(self.dataOutQueue)
         self.dataWriter.daemon = False
 
         # If archiving the rerun data -- make sure not to delete the original data!
@@ -405,72 +618,39 @@ class Controller:
                 sys.exit("Change the archive directory to a new location when rerunning cases.")
         else:
             print("No archive data specified; no data will be logged to dataframes")
+            self.dataOutQueue = None  # nothing would consume the retained data
 
-        jobsFinished = 0  # keep track of what simulations have finished
+        self.runWallTimes = {}
+        self.runsFinished = 0
 
         # The simulation executor is responsible for executing simulation given a simulation's parameters
         # It is called within worker threads with each worker's simulation parameters
         simulationExecutor = SimulationExecutor()
         #
         progressBar = SimulationProgressBar(len(caseList), self.simParams.showProgressBar)
-        if self.numProcess == 1:  # don't make child thread
+        if self.numProcess == 1 and not self.reuseSimTemplate:  # don't make child thread
             if self.simParams.verbose:
                 print("Executing sequentially...")
-            i = 0
-            for i in range(len(caseList)):
-                simGenerator = self.generateICSims(caseList[i:i+1])
-                for sim in simGenerator:
-                    try:
-                        simulationExecutor([sim,  self.dataOutQueue])
-                    except:
-                        failed.append(i)
-                i += 1
-                progressBar.update(i)
-        else:
-            numSims = len(caseList)
-            if self.numProcess > numSims:
-                print("Fewer MCs spawned than processes assigned (%d < %d). Changing processes count to %d." % (numSims, self.numProcess, numSims))
-                self.numProcess = numSims
-            for i in range(numSims//self.numProcess):
-                # If number of sims doesn't factor evenly into the number of processes:
-                if numSims % self.numProcess != 0 and i == len(list(range(numSims//self.numProcess)))-1:
-                    offset = numSims % self.numProcess
-                else:
-                    offset = 0
-
-                simGenerator = self.generateICSims(caseList[self.numProcess*i:self.numProcess*(i+1)+offset])
-                pool = mp.Pool(self.numProcess)
+            for sim in self.generateICSims(caseList):
                 try:
-                    # yields results *as* the workers finish jobs
-                    for result in pool.imap_unordered(simulationExecutor, [(x, self.dataOutQueue) for x in simGenerator]):
-                        if result[0] is not True:  # workers return True on success
-                            failed.append(result[1])  # add failed jobs to the list of failures
-                            print("Job", result[1], "failed...")
-
-                        jobsFinished += 1
-                        progressBar.update(jobsFinished)
-                    pool.close()
-                except KeyboardInterrupt as e:
-                    print("Ctrl-C was hit, closing pool")
-                    # failed.extend(range(jobsFinished, numSims))  # fail all potentially running jobs...
-                    pool.terminate()
-                    raise e
-                except Exception as e:
-                    print("Unknown exception while running simulations:", e)
-                    # failed.extend(range(jobsFinished, numSims))  # fail all potentially running jobs...
-                    traceback.print_exc()
-                    pool.terminate()
-                finally:
-                    pool.join()
+                    result = simulationExecutor([sim, self.dataOutQueue])
+                except:
+                    result = (False, sim.index, 0., {})
+                self.recordRunResult(result, failed)
+                progressBar.update(self.runsFinished)
+        else:
+            self.startPool(len(caseList))
+            try:
+                failed.extend(self.executeCasePool(self.generateICSims(caseList), caseList, progressBar))
+            finally:
+                self.stopPool()
 
         progressBar.markComplete()
         progressBar.close()
-        # If the data was archiving, close the queue.
+        # If the data was archiving, close the queue and wait until the writer has logged all runs.
         if self.archiveDir is not None and self.archiveDir != self.icDirectory:
-            while not self.dataOutQueue.empty():
-               time.sleep(1)
             self.dataOutQueue.put((None, None, True))
-            time.sleep(5)
+            self.dataWriter.join()
 
         # if there are failures
         if len(failed) > 0:
@@ -517,6 +697,7 @@ class Controller:
             simParams.index = caseNumber
             # don't redisperse seeds, we want to use the ones saved in the oldRunFile
             simParams.shouldDisperseSeeds = False
+            simParams.manifestFile = None
 
             simParams.icfilename = self.icDirectory + "run" + str(caseNumber)
             with open(oldRunFile, "r") as runParameters:
@@ -524,7 +705,7 @@ class Controller:
 
             yield simParams
 
-    def generateSims(self, simNumList):
+    def generateSims(self, simNumList, design=None):
         """
         Generator function to clone a baseSimulation
 
@@ -533,6 +714,8 @@ class Controller:
                 A base simulation to clone.
             numSims: int[]
                 The desired runs to generate.
+            design: DispersionDesign
+                The dispersion design to take the samples and random seed of each run from, if any.
         Returns:
             generator<SimulationParams>
                 A generator that yields that number of cloned simulations
@@ -541,13 +724,245 @@ class Controller:
         # make a list of simulations to execute by cloning the base-simulation and
         # changing each clone's index and filename to make a list of
         # simulations to execute
+        runSeeds = None
+        if design is not None:
+            self.simParams.designSlices = design.getSlices()
+            runSeeds = design.getRunSeeds()
         for i in simNumList:
             simClone = copy.deepcopy(self.simParams)
             simClone.index = i
             simClone.filename += "run" + str(i)
+            if design is not None:
+                simClone.designRow = np.array(design.matrix[i])
+                simClone.designSeed = runSeeds[i]
 
             yield simClone
 
+    def recordRunResult(self, result, failed):
+        """
+        Record the outcome of a single run returned by the SimulationExecutor
+
+        Args:
+            result: (bool, int, float, dict[, dict])
+                The success flag, run index, run wall time in seconds, run metrics and, for a successful run, run
+                parameters returned by the executor.
+            failed: int[]
+                The list of failed runs, appended to if this run failed.
+        """
+        self.runsFinished += 1
+        if result[0] is not True:  # workers return True on success
+            failed.append(result[1])  # add failed jobs to the list of failures
+            print("Job", result[1], "failed...")
+        else:
+            self.runWallTimes[result[1]] = result[2]
+            if len(result) > 3:
+                self.runMetrics[result[1]] = result[3]
+            if self.simParams.verbose:
+                print("Job", result[1], "took {:.2f} s".format(result[2]))
+
+    def startPool(self, numRuns):
+        """
+        Start the pool of worker processes that executes the runs, kept until ``stopPool`` is called so that the
+        waves of a MonteCarlo are all executed by the same pool.
+
+        Args:
+            numRuns: int
+                The total number of runs the pool will execute. No more processes than runs are started.
+        """
+        numProcess = self.numProcess
+        if numProcess > numRuns:
+            print("Fewer MCs spawned than processes assigned (%d < %d). Using %d processes." % (numRuns, numProcess, numRuns))
+            numProcess = numRuns
+
+        context = mp.get_context()
+        maxTasksPerWorker = self.maxTasksPerWorker
+        if self.reuseSimTemplate:
+            if "fork" in mp.get_all_start_methods():
+                # the pool forks its workers from this process, each one gets a pristine copy of the template and is
+                # replaced after its run, so a run never starts from a sim that another run has already executed
+                context = mp.get_context("fork")
+                maxTasksPerWorker = 1
+                SimulationExecutor.templateSimulation = self.simParams.creationFunction()
+            else:
+                warnings.warn("Simulation template reuse requires the 'fork' start method, "
+                              "creating the simulation of every run instead")
+
+        self.workerPool = context.Pool(numProcess, maxtasksperchild=maxTasksPerWorker)
+
+    def stopPool(self, terminate=False):
+        """
+        Stop the pool of worker processes started by ``startPool``, if any
+
+        Args:
+            terminate: bool
+                Kill the workers instead of waiting for them to exit.
+        """
+        if self.workerPool is None:
+            return
+        if terminate:
+            self.workerPool.terminate()
+        else:
+            self.workerPool.close()
+        self.workerPool.join()
+        self.workerPool = None
+        SimulationExecutor.templateSimulation = None
+
+    def executeCasePool(self, simGenerator, caseList, progressBar):
+        """
+        Execute simulations on the long-lived pool of worker processes started by ``startPool``.
+
+        The simulations are streamed to the workers as they become idle, so a slow run never holds up the start of
+        the following runs. At most ``maxRunsInFlight`` simulations are dispatched ahead of the finished ones, and
+        each worker is recycled after ``maxTasksPerWorker`` runs. If the pool fails, it is stopped, and the next
+        call starts a new one.
+
+        Args:
+            simGenerator: generator<SimulationParams>
+                The simulations to execute.
+            caseList: int[]
+                The run indices that the generator yields, used to flag unfinished runs if the pool fails.
+            progressBar: SimulationProgressBar
+                The progress bar to update as runs finish.
+        Returns:
+            failures: int[]
+                The list of failed runs.
+        """
+        failed = []
+        finished = set()
+        maxRunsInFlight = self.maxRunsInFlight
+        if maxRunsInFlight is None:
+            maxRunsInFlight = 2 * self.numProcess
+        caseFeed = BoundedCaseFeed(simGenerator, self.dataOutQueue, maxRunsInFlight)
+
+        if self.workerPool is None:
+            self.startPool(len(caseList))
+        try:
+            # yields results *as* the workers finish jobs
+            for result in self.workerPool.imap_unordered(SimulationExecutor(), caseFeed):
+                caseFeed.release()
+                finished.add(result[1])
+                self.recordRunResult(result, failed)
+                progressBar.update(self.runsFinished)
+        except KeyboardInterrupt as e:
+            print("Ctrl-C was hit, closing pool")
+            caseFeed.stop()
+            self.stopPool(terminate=True)
+            raise e
+        except Exception as e:
+            print("Unknown exception while running simulations:", e)
+            traceback.print_exc()
+            failed.extend([case for case in caseList if case not in finished])  # fail all potentially running jobs...
+            caseFeed.stop()
+            self.stopPool(terminate=True)
+
+        return failed
+
+    def executeCaseQueue(self, simGenerator, caseList, progressBar):
+        """
+        Execute simulations on the workers connected to a work queue served by this controller.
+
+        The workers may not share the manifest database, so the parameters and the completion of the finished runs are
+        recorded on this host: by the data writer once it has saved the retained data of a run, or by the controller
+        for runs without retained data. The retained data of the runs is sent inline through the work queue
+        connection.
+
+        Args:
+            simGenerator: generator<SimulationParams>
+                The simulations to execute.
+            caseList: int[]
+                The run indices that the generator yields.
+            progressBar: SimulationProgressBar
+                The progress bar to update as runs finish.
+        Returns:
+            failures: int[]
+                The list of failed runs.
+        """
+        def servedSims():
+            for simParams in simGenerator:
+                simParams.manifestFile = None
+                simParams.shareRetainedData = False
+                yield simParams
+
+        failed = []
+        finished = set()
+        workQueue = WorkQueue(servedSims(), self.dataOutQueue, self.heartbeatTimeout, self.maxRetries)
+        server = WorkQueueServer(workQueue, self.workQueueAddress, self.workQueueAuthkey)
+        if self.simParams.verbose:
+            print("Serving runs to workers on", server.address)
+        localWorkers = [mp.Process(target=runWorker, args=(server.address, self.workQueueAuthkey, 1),
+                                   kwargs={"runTimeout": self.runTimeout})
+                        for _ in range(self.numLocalWorkers)]
+        for worker in localWorkers:
+            worker.start()
+
+        manifest = None
+        if self.simParams.manifestFile is not None:
+            manifest = RunManifest(self.simParams.manifestFile)
+        try:
+            while len(finished) < len(caseList):
+                try:
+                    result = workQueue.results.get(timeout=1.)
+                except queue.Empty:
+                    workQueue.poll()
+                    continue
+                finished.add(result[1])
+                self.recordRunResult(result, failed)
+                # the runs with retained data are recorded by the data writer, once it has saved their data
+                if manifest is not None and result[0] is True and len(self.simParams.retentionPolicies) == 0:
+                    manifest.markDispersed(result[1], result[4])
+                    manifest.markDone(result[1], None, None, result[2], result[3])
+                progressBar.update(self.runsFinished)
+        except KeyboardInterrupt as e:
+            print("Ctrl-C was hit, stopping the work queue")
+            for worker in localWorkers:
+                worker.terminate()
+            raise e
+        finally:
+            workQueue.stop()
+            for worker in localWorkers:
+                worker.join()
+            server.stop()
+            if manifest is not None:
+                manifest.close()
+
+        return failed
+
+    def executeRunList(self, runList, design, progressBar):
+        """
+        Execute a list of runs on the work queue, sequentially or on the process pool. The process pool is started
+        with ``startPool`` by the caller, or for this list of runs if it is not.
+
+        Args:
+            runList: int[]
+                The runs to execute.
+            design: DispersionDesign
+                The dispersion design of the MonteCarlo, if any.
+            progressBar: SimulationProgressBar
+                The progress bar to update as runs finish.
+        Returns:
+            failures: int[]
+                The list of failed runs.
+        """
+        failed = []
+        numSims = len(runList)
+        if self.workQueueAddress is not None:
+            failed.extend(self.executeCaseQueue(self.generateSims(runList, design), runList, progressBar))
+        elif self.numProcess == 1 and not self.reuseSimTemplate:  # don't make child thread
+            if self.simParams.verbose:
+                print("Executing sequentially...")
+            # The simulation executor is responsible for executing simulation given a simulation's parameters
+            simulationExecutor = SimulationExecutor()
+            for sim in self.generateSims(runList, design):
+                try:
+                    result = simulationExecutor([sim, self.dataOutQueue])
+                except:
+                    result = (False, sim.index, 0., {})
+                self.recordRunResult(result, failed)
+                progressBar.update(self.runsFinished)
+        elif numSims > 0:
+            failed.extend(self.executeCasePool(self.generateSims(runList, design), runList, progressBar))
+        return failed
+
     def executeCallbacks(self, rng=None, retentionPolicies=[]):
         """
         Execute retention policy callbacks after running a monteCarlo sim.
@@ -568,10 +983,12 @@ class Controller:
             for retentionPolicy in retentionPolicies:
                 retentionPolicy.executeCallback(data)
 
-    def executeSimulations(self):
+    def executeSimulations(self, resume=False):
         """
         Execute simulations in parallel
 
+        :param resume: continue a MonteCarlo that was interrupted, only executing the runs that the manifest in the
+                       archive directory does not record as done. Otherwise the archive directory is cleared.
         :return: failed: int[]
                  A list of the indices of all failed simulation runs.
         """
@@ -579,10 +996,25 @@ class Controller:
         if self.simParams.verbose:
             print("Beginning simulation with {0} runs on {1} threads".format(self.executionCount, self.numProcess))
 
+        runList = list(range(self.executionCount))
+        self.runMetrics = {}
+        self.simParams.manifestFile = None
         if self.simParams.shouldArchiveParameters:
-            if os.path.exists(self.archiveDir):
-                shutil.rmtree(self.archiveDir, ignore_errors=True)
-            os.mkdir(self.archiveDir)
+            manifestFile = self.archiveDir + "manifest.db"
+            if resume and os.path.exists(manifestFile):
+                manifest = RunManifest(manifestFile)
+                runList = manifest.getPendingRuns(self.executionCount)
+                # the convergence of a resumed MonteCarlo accounts for the runs that are already done
+                self.runMetrics = manifest.getMetrics()
+                manifest.close()
+                if self.simParams.verbose:
+                    print("Resuming MonteCarlo, {0} runs remaining".format(len(runList)))
+            else:
+                if os.path.exists(self.archiveDir):
+                    shutil.rmtree(self.archiveDir, ignore_errors=True)
+                os.mkdir(self.archiveDir)
+            # the workers record the progress of every run in the manifest
+            self.simParams.manifestFile = manifestFile
             if self.simParams.verbose:
                 print("Archiving a copy of this simulation before running it in 'MonteCarlo.data'")
             try:
@@ -591,16 +1023,29 @@ class Controller:
             except Exception as e:
                 print("Unknown exception while trying to pickle monte-carlo-controller... \ncontinuing...\n\n", e)
 
+        design = None
+        if self.dispersionDesignMethod is not None:
+            if resume and self.simParams.shouldArchiveParameters and DispersionDesign.exists(self.archiveDir):
+                design = DispersionDesign.load(self.archiveDir)
+            else:
+                design = DispersionDesign(self.simParams.dispersions, self.executionCount,
+                                          self.dispersionDesignMethod, self.dispersionDesignSeed)
+                if self.simParams.shouldArchiveParameters:
+                    design.save(self.archiveDir)
+
         self.multiProcManager = mp.Manager()
         self.dataOutQueue = self.multiProcManager.Queue()
-        self.dataWriter = DataWriter(self.dataOutQueue)
+        self.dataWriter = self.dataWriterClass(self.dataOutQueue)
         self.dataWriter.daemon = False
 
-        numSims = self.executionCount
+        numSims = len(runList)
 
         # start data writer process
         self.dataWriter.setLogDir(self.archiveDir)
         self.dataWriter.setVarCast(self.varCast)
+        self.dataWriter.setManifestFile(self.simParams.manifestFile)
+        for itemName, statistics in self.statistics.items():
+            self.dataWriter.addStatistics(itemName, statistics)
         self.dataWriter.start()
 
         # Avoid building a full list of all simulations to run in memory,
@@ -610,77 +1055,42 @@ class Controller:
         # There is a system-dependent chunking behavior, sometimes 10-20 are generated at a time.
         # simGenerator = self.generateSims(range(numSims))
         failed = []  # keep track of the indices of failed simulations
-        jobsFinished = 0  # keep track of what simulations have finished
-
-        # The simulation executor is responsible for executing simulation given a simulation's parameters
-        # It is called within worker threads with each worker's simulation parameters
-        simulationExecutor = SimulationExecutor()
+        self.runWallTimes = {}
+        self.runsFinished = 0
 
         progressBar = SimulationProgressBar(numSims, self.simParams.showProgressBar)
 
-        # The outermost for-loop for both the serial and multiprocessed sim generator is not necessary. It
-        # is a temporary fix to a memory leak which is assumed to be a result of the simGenerator not collecting
-        # garbage properly. # TODO: Find a more permenant solution to the leak.
-
-        if self.numProcess == 1:  # don't make child thread
-            if self.simParams.verbose:
-                print("Executing sequentially...")
-            i = 0
-            for i in range(numSims):
-                simGenerator = self.generateSims(list(range(i,i+1)))
-                for sim in simGenerator:
-                    try:
-                        run_ok = simulationExecutor([sim, self.dataOutQueue])[0]
-                    except:
-                        failed.append(i)
-                    else:
-                        if not run_ok:
-                            failed.append(i)
-                    i += 1
-                    progressBar.update(i)
+        if len(self.convergenceCriteria) == 0:
+            try:
+                failed.extend(self.executeRunList(runList, design, progressBar))
+            finally:
+                self.stopPool()
         else:
-            if self.numProcess > numSims:
-                print("Fewer MCs spawned than processes assigned (%d < %d). Changing processes count to %d." % (numSims, self.numProcess, numSims))
-                self.numProcess = numSims
-            for i in range(numSims//self.numProcess):
-                # If number of sims doesn't factor evenly into the number of processes:
-                if numSims % self.numProcess != 0 and i == len(list(range(numSims//self.numProcess)))-1:
-                    offset = numSims % self.numProcess
-                else:
-                    offset = 0
-                simGenerator = self.generateSims(list(range(self.numProcess*i, self.numProcess*(i+1)+offset)))
-                pool = mp.Pool(self.numProcess)
-                try:
-                    # yields results *as* the workers finish jobs
-                    for result in pool.imap_unordered(simulationExecutor, [(x, self.dataOutQueue) for x in simGenerator]):
-                        if result[0] is not True:  # workers return True on success
-                            failed.append(result[1])  # add failed jobs to the list of failures
-                            print("Job", result[1], "failed...")
-
-                        jobsFinished += 1
-                        progressBar.update(jobsFinished)
-                    pool.close()
-                except KeyboardInterrupt as e:
-                    print("Ctrl-C was hit, closing pool")
-                    failed.extend(list(range(jobsFinished, numSims)))  # fail all potentially running jobs...
-                    pool.terminate()
-                    raise e
-                except Exception as e:
-                    print("Unknown exception while running simulations:", e)
-                    failed.extend(list(range(jobsFinished, numSims)))  # fail all potentially running jobs...
-                    traceback.print_exc()
-                    pool.terminate()
-                finally:
-                    # Wait until all data is logged from the spawned runs before proceeding with the next set.
-                    pool.join()
+            # run in waves until the criteria are met or the budget of runs or time is spent
+            startTime = time.perf_counter()
+            waveSize = self.waveSize if self.waveSize is not None else 4 * self.numProcess
+            # all the waves are executed by the same pool of workers, forked from the same template if it is reused
+            usesPool = self.workQueueAddress is None and (self.numProcess > 1 or self.reuseSimTemplate)
+            if usesPool and len(runList) > 0:
+                self.startPool(len(runList))
+            try:
+                while len(runList) > 0 and not all(summary["converged"] for summary in self.getConvergenceSummary()):
+                    if self.maxWallTime is not None and time.perf_counter() - startTime > self.maxWallTime:
+                        break
+                    failed.extend(self.executeRunList(runList[:waveSize], design, progressBar))
+                    runList = runList[waveSize:]
+                    if self.simParams.verbose:
+                        for summary in self.getConvergenceSummary():
+                            print("Convergence of {metric}: {estimate:.6g} +/- {halfWidth:.3g} over {numRuns} runs"
+                                  .format(**summary))
+            finally:
+                self.stopPool()
 
         progressBar.markComplete()
         progressBar.close()
-        # Wait until all data logging is finished before concatenation dataframes and shutting down the pool
-        while not self.dataOutQueue.empty():
-           time.sleep(1)
+        # The writer handles the queue in order, so once it has exited after the end token all runs are logged
         self.dataOutQueue.put((None, None, True))
-        time.sleep(5)
+        self.dataWriter.join()
 
         # if there are failures
         if len(failed) > 0:
@@ -690,6 +1100,12 @@ class Controller:
                 print("Failed", failed, "saving to 'failures.txt'")
 
             if self.simParams.shouldArchiveParameters:
+                # runs lost with a crashed worker never got to record their failure themselves
+                manifest = RunManifest(self.simParams.manifestFile)
+                for caseNumber in failed:
+                    manifest.markFailed(caseNumber)
+                manifest.close()
+
                 # write a file that contains log of failed runs
                 with open(self.archiveDir + "failures.txt", "w") as failFile:
                     failFile.write(str(failed))
@@ -697,6 +1113,38 @@ class Controller:
         return failed
 
 
+class BoundedCaseFeed:
+    """
+    Iterable handed to ``Pool.imap_unordered`` that lets at most ``maxRunsInFlight`` simulations be dispatched before
+    their results are consumed. The pool pulls from this feed on its own task handler thread, so blocking here only
+    pauses the generation of new simulations, never the collection of results.
+    """
+
+    def __init__(self, simGenerator, dataOutQueue, maxRunsInFlight):
+        self.simGenerator = simGenerator
+        self.dataOutQueue = dataOutQueue
+        self.slots = threading.Semaphore(maxRunsInFlight)
+        self.stopped = threading.Event()
+
+    def __iter__(self):
+        for sim in self.simGenerator:
+            # poll so that a terminated pool does not leave its task handler blocked here forever
+            while not self.slots.acquire(timeout=0.5):
+                if self.stopped.is_set():
+                    return
+            if self.stopped.is_set():
+                return
+            yield (sim, self.dataOutQueue)
+
+    def release(self):
+        """Free the slot of a finished run"""
+        self.slots.release()
+
+    def stop(self):
+        """Stop feeding new runs to the pool"""
+        self.stopped.set()
+
+
 class SimulationParameters():
     """
     This class represents the run parameters for a simulation, with information including
@@ -707,12 +1155,16 @@ class SimulationParameters():
      - parameters describing the data to be retained for a simulation
      - whether randomized seeds should be applied to the simulation
      - whether data should be archived
+     - the run manifest recording the progress of the runs
+     - the samples of the dispersion design for the run, if any
+     - whether the retained data is handed to the data writer through shared memory
+     - the importance sampling weight function of the run, if any
     """
 
     def __init__(self, creationFunction, executionFunction, configureFunction,
                  retentionPolicies, dispersions, shouldDisperseSeeds,
                  shouldArchiveParameters, filename, icfilename, index=None, verbose=False, modifications={},
-                 showProgressBar=False):
+                 showProgressBar=False, manifestFile=None):
         self.index = index
         self.creationFunction = creationFunction
         self.executionFunction = executionFunction
@@ -728,7 +1180,12 @@ class SimulationParameters():
         self.dispersionMag = {}
         self.saveDispMag = False
         self.showProgressBar = showProgressBar
-
+        self.manifestFile = manifestFile
+        self.designSlices = None
+        self.designRow = None
+        self.designSeed = None
+        self.shareRetainedData = True
+        self.importanceWeight = None
 
 
 class SimulationExecutor:
@@ -741,8 +1198,11 @@ class SimulationExecutor:
         successFlag = executor(simParams)
 
     This class can be used to execute a simulation on a different thread, by using this class as the processes target.
+
+    If the worker process was forked with a ``templateSimulation``, the run is executed on this already created
+    simulation instead of calling the creation function.
     """
-    #
+    templateSimulation = None
 
     @classmethod
     def __call__(cls, params):
@@ -755,21 +1215,41 @@ class SimulationExecutor:
                 for the data writer.
         Returns:
             success: bool
-                (True, simParams.index) if simulation run was successful
-                (False, simParams.index) if simulation run was unsuccessful
+                (True, simParams.index, wallTime, metrics, modifications) if simulation run was successful
+                (False, simParams.index, wallTime, {}) if simulation run was unsuccessful
+                where wallTime is the time taken by the run in seconds, metrics the dictionary of the metrics
+                of the retention policies and of the importance sampling weight of the run, and modifications the
+                dictionary of the parameters and random seeds applied to the run
         """
         simParams = params[0]
         dataOutQueue = params[1]
+        startTime = time.perf_counter()
+        manifest = None
+        if getattr(simParams, "manifestFile", None) is not None:
+            manifest = RunManifest(simParams.manifestFile)
 
         try:
             signal.signal(signal.SIGINT, signal.SIG_IGN)  # On ctrl-c ignore the signal... let the parent deal with it.
 
             # must make new random seed on each new thread.
-            np.random.seed(simParams.index * 10)
-            random.seed(simParams.index * 10)
-
-            # create the users sim by calling their supplied creationFunction
-            simInstance = simParams.creationFunction()
+            designRow = getattr(simParams, "designRow", None)
+            if designRow is None:
+                runSeed = simParams.index * 10
+                np.random.seed(runSeed)
+                random.seed(runSeed)
+            else:
+                # 256 bits of the seed sequence of the run for each generator, instead of a 32 bit seed that other
+                # runs may share. Both generators are Mersenne twisters, so they are given different bits
+                runState = simParams.designSeed.generate_state(16)
+                np.random.seed(runState[:8])
+                random.seed(int.from_bytes(runState[8:].tobytes(), "little"))
+
+            # create the users sim by calling their supplied creationFunction, unless this worker was forked from a
+            # process holding an already created sim
+            if cls.templateSimulation is not None:
+                simInstance = cls.templateSimulation
+            else:
+                simInstance = simParams.creationFunction()
 
             # build a list of the parameter and random seed modifications to make
             modifications = simParams.modifications
@@ -788,20 +1268,32 @@ class SimulationExecutor:
             cls.populateSeeds(simInstance, modifications)
 
             # we may want to disperse parameters
-            for disp in simParams.dispersions:
+            # the dispersed values are kept as native floats and lists, applied and archived without string round-trips
+            # dispersions sampled by the dispersion design map their slice of the design row onto their value
+            for dispIndex, disp in enumerate(simParams.dispersions):
+                generateValue = getattr(disp, "generateValue", disp.generateString)
+                designSamples = None
+                if designRow is not None and simParams.designSlices[dispIndex] is not None:
+                    designSamples = designRow[simParams.designSlices[dispIndex]]
                 try:
                     name = disp.getName()
                     if name not in modifications:  # could be using a saved parameter.
-                        modifications[name] = disp.generateString(simInstance)
+                        if designSamples is not None:
+                            modifications[name] = toNativeValue(disp.generateFromUniform(designSamples, simInstance))
+                        else:
+                            modifications[name] = toNativeValue(generateValue(simInstance))
                         if simParams.saveDispMag:
                             magnitudes[name] = disp.generateMagString()
                 except TypeError:
                     # This accomodates dispersion variables that are co-dependent
-                    disp.generate()
+                    if designSamples is not None:
+                        disp.generateFromUniform(designSamples, simInstance)
+                    else:
+                        disp.generate()
                     for i in range(1, disp.numberOfSubDisps+1):
                         name = disp.getName(i)
                         if name not in modifications:  # could be using a saved parameter.
-                            modifications[name] = disp.generateString(i, simInstance)
+                            modifications[name] = toNativeValue(generateValue(i, simInstance))
                             if simParams.saveDispMag:
                                 magnitudes[name] = disp.generateMagString()
 
@@ -818,6 +1310,8 @@ class SimulationExecutor:
                         with open(simParams.filename + "mag.txt", 'w') as outfileMag:
                             for k in sorted(magnitudes.keys()):
                                 outfileMag.write("'%s':'%s', \n" % (k, magnitudes[k]))
+            if manifest is not None:
+                manifest.markDispersed(simParams.index, modifications)
 
             if simParams.configureFunction is not None:
                 if simParams.verbose:
@@ -826,10 +1320,9 @@ class SimulationExecutor:
 
             # apply the dispersions and the random seeds
             for variable, value in list(modifications.items()):
-                disperseStatement = "simInstance." + variable + "=" + value
                 if simParams.verbose:
-                    print("Executing parameter modification -> ", disperseStatement)
-                exec(disperseStatement)
+                    print("Executing parameter modification -> ", variable, "=", value)
+                setSimAttribute(simInstance, variable, toNativeValue(value))
 
             # setup data logging
             if len(simParams.retentionPolicies) > 0:
@@ -837,6 +1330,9 @@ class SimulationExecutor:
                     print("Adding retained data")
                 RetentionPolicy.addRetentionPoliciesToSim(simInstance, simParams.retentionPolicies)
 
+            if manifest is not None:
+                manifest.markRunning(simParams.index)
+
             if simParams.verbose:
                 print("Executing simulation")
             # execute the simulation, with the user-supplied executionFunction
@@ -845,6 +1341,10 @@ class SimulationExecutor:
             except TypeError:
                 simParams.executionFunction(simInstance, simParams.filename)
 
+            retentionFile = None
+            checksum = None
+            retainedData = None
+            metrics = {}
             if len(simParams.retentionPolicies) > 0:
                 if simParams.icfilename != "":
                     retentionFile = simParams.icfilename + ".data"
@@ -855,12 +1355,7 @@ class SimulationExecutor:
                     print("Retaining data for run in", retentionFile)
 
                 retainedData = RetentionPolicy.getDataForRetention(simInstance, simParams.retentionPolicies)
-                dataOutQueue.put((retainedData, simParams.index, None))
-                time.sleep(1)
-
-                with gzip.open(retentionFile, "w") as archive:
-                    retainedData["index"] = simParams.index # add run index
-                    pickle.dump(retainedData, archive)
+                metrics = RetentionPolicy.getMetrics(retainedData, simParams.retentionPolicies)
 
             if simParams.verbose:
                 print("Terminating simulation")
@@ -868,12 +1363,40 @@ class SimulationExecutor:
             if simParams.verbose:
                 print("Thread", os.getpid(), "Job", simParams.index, "finished successfully")
 
-            return (True, simParams.index)  # this function returns true only if the simulation was successful
+            if getattr(simParams, "importanceWeight", None) is not None:
+                metrics[IMPORTANCE_WEIGHT] = float(simParams.importanceWeight(modifications))
+
+            wallTime = time.perf_counter() - startTime
+            if retainedData is not None and dataOutQueue is not None:
+                # only a small descriptor of the shared memory holding the arrays goes through the queue. The writer
+                # saves the run file, and only then records the run as done, along with its parameters if this
+                # worker has no access to the manifest
+                doneRecord = (retentionFile, wallTime, metrics, modifications if manifest is None else None)
+                descriptor, block = packRetainedData(retainedData, getattr(simParams, "shareRetainedData", True))
+                try:
+                    dataOutQueue.put((descriptor, simParams.index, None, doneRecord))
+                except Exception:
+                    releaseSharedBlock(block, unlink=True)  # the writer will never receive this run
+                    raise
+                releaseSharedBlock(block)
+            else:
+                if retainedData is not None:
+                    checksum = writeRunFile(retentionFile, retainedData, simParams.index)
+                if manifest is not None:
+                    manifest.markDone(simParams.index, retentionFile, checksum, wallTime, metrics)
+            if manifest is not None:
+                manifest.close()
+
+            # this function returns true only if the simulation was successful
+            return (True, simParams.index, wallTime, metrics, modifications)
 
         except Exception as e:
             print("Error in worker thread", e)
             traceback.print_exc()
-            return (False, simParams.index)  # there was an error
+            if manifest is not None:
+                manifest.markFailed(simParams.index)
+                manifest.close()
+            return (False, simParams.index, time.perf_counter() - startTime, {})  # there was an error
 
     @staticmethod
     def disperseSeeds(simInstance):
@@ -897,10 +1420,9 @@ class SimulationExecutor:
         for i, task in enumerate(simInstance.TaskList):
             for j, model in enumerate(task.TaskModels):
                 taskVar = 'TaskList[' + str(i) + '].TaskModels' + '[' + str(j) + '].RNGSeed'
-                rand = str(random.randint(0, 1 << 32 - 1))
+                rand = random.randint(0, 1 << 32 - 1)
                 try:
-                    execStatement = "simInstance." + taskVar + "=" + str(rand)
-                    exec(execStatement)  # if this fails don't add to the list of modification
+                    model.RNGSeed = rand  # if this fails don't add to the list of modification
                     randomSeeds[taskVar] = rand
                 except:
                     pass
@@ -919,6 +1441,5 @@ class SimulationExecutor:
         """
         for variable, value in modifications.items():
             if ".RNGSeed" in variable:
-                rngStatement = "simInstance." + variable + "=" + value
-                exec(rngStatement)
+                setSimAttribute(simInstance, variable, toNativeValue(value))
 
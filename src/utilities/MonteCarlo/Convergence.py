@@ -0,0 +1,116 @@
+#
+#  ISC License
+#
+#  Copyright (c) 2024, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+from statistics import NormalDist
+
+import numpy as np
+
+# name of the importance sampling weight in the metrics of a run
+IMPORTANCE_WEIGHT = "importanceWeight"
+
+
+class ConvergenceCriterion:
+    """
+    Stopping criterion of an adaptive MonteCarlo on a scalar metric of the runs, added to a ``RetentionPolicy`` with
+    ``addMetric()``. The criterion is met once the confidence interval of its estimate is narrower than
+    ``halfWidth`` on each side.
+
+    If the runs carry an importance sampling weight (see ``Controller.setImportanceWeight()``), the estimate is the
+    mean of the weighted samples ``weight * sample``, an unbiased estimate under the nominal distributions.
+
+    Args:
+        metric: str, the name of the metric
+        halfWidth: float, the target half width of the confidence interval
+        confidence: float, the confidence level of the interval
+        relative: bool, whether ``halfWidth`` is relative to the magnitude of the estimate
+    """
+
+    def __init__(self, metric, halfWidth, confidence=0.95, relative=False):
+        self.metric = metric
+        self.halfWidth = halfWidth
+        self.confidence = confidence
+        self.relative = relative
+
+    def samples(self, values):
+        """Map the metric values of the runs onto the samples whose mean is estimated"""
+        return values
+
+    def isSupported(self, samples, values):
+        """Whether enough runs are available for the confidence interval to be meaningful"""
+        return len(samples) >= 2
+
+    def evaluate(self, runMetrics):
+        """
+        Evaluate the criterion on the metrics of the finished runs
+
+        Args:
+            runMetrics: dict of the metrics dictionary of each finished run
+        Returns:
+            dict with the ``metric``, its ``estimate``, the ``halfWidth`` of its confidence interval, the
+            ``numRuns`` it is based on and whether it has ``converged``
+        """
+        finished = [metrics for metrics in runMetrics.values() if self.metric in metrics]
+        values = np.array([metrics[self.metric] for metrics in finished], dtype=float)
+        weights = np.array([metrics.get(IMPORTANCE_WEIGHT, 1.) for metrics in finished], dtype=float)
+        samples = weights * self.samples(values)
+
+        summary = {"metric": self.metric, "estimate": np.nan, "halfWidth": np.inf, "numRuns": len(samples),
+                   "converged": False}
+        if len(samples) > 0:
+            summary["estimate"] = float(np.mean(samples))
+        if len(samples) > 1:
+            z = NormalDist().inv_cdf(0.5 + self.confidence / 2.)
+            summary["halfWidth"] = float(z * np.std(samples, ddof=1) / np.sqrt(len(samples)))
+        target = self.halfWidth * (abs(summary["estimate"]) if self.relative else 1.)
+        summary["converged"] = bool(self.isSupported(samples, values) and summary["halfWidth"] <= target)
+        return summary
+
+
+class MeanConvergence(ConvergenceCriterion):
+    """
+    Criterion on the mean of a metric, see :class:`ConvergenceCriterion`
+    """
+    pass
+
+
+class ProbabilityConvergence(ConvergenceCriterion):
+    """
+    Criterion on the probability that a metric exceeds a threshold, such as the probability of a failure. Until
+    ``minEvents`` runs have exceeded the threshold the interval is not trusted and the criterion is not met.
+
+    Args:
+        metric: str, the name of the metric
+        threshold: float
+        halfWidth: float, the target half width of the confidence interval of the probability
+        above: bool, True for the probability of ``metric > threshold``, False for ``metric < threshold``
+        minEvents: int
+        confidence: float, the confidence level of the interval
+        relative: bool, whether ``halfWidth`` is relative to the probability
+    """
+
+    def __init__(self, metric, threshold, halfWidth, above=True, minEvents=5, confidence=0.95, relative=False):
+        super(ProbabilityConvergence, self).__init__(metric, halfWidth, confidence, relative)
+        self.threshold = threshold
+        self.above = above
+        self.minEvents = minEvents
+
+    def samples(self, values):
+        return (values > self.threshold if self.above else values < self.threshold).astype(float)
+
+    def isSupported(self, samples, values):
+        return len(samples) >= 2 and self.samples(values).sum() >= self.minEvents
@@ -1,9 +1,15 @@
+import gzip
+import hashlib
+import json
 import multiprocessing as mp
 import os
 import pickle
+from multiprocessing import resource_tracker, shared_memory
 
 import numpy as np
 import pandas as pd
+from Basilisk.utilities.MonteCarlo.RunManifest import RunManifest
+from Basilisk.utilities.MonteCarlo.StreamingStatistics import StreamingStatistics
 
 
 class DataWriter(mp.Process):
@@ -20,6 +26,8 @@ class DataWriter(mp.Process):
         self._varCast = None
         self._logDir = ""
         self._dataFiles = set()
+        self._statistics = {}
+        self._manifestFile = None
 
     def run(self):
         """ The process run loop. Gets data from a queue and writes it out to per message csv files
@@ -28,69 +36,120 @@ class DataWriter(mp.Process):
             Returns:
                 Nil
         """
+        self.loadStatistics()
+        manifest = None
+        if self._manifestFile is not None:
+            manifest = RunManifest(self._manifestFile)
         while self._endToken is None:
-            data, mcSimIndex, self._endToken = self._queue.get()
+            message = self._queue.get()
+            descriptor, mcSimIndex, self._endToken = message[:3]
             print("Starting to log: " + str(mcSimIndex))
             if self._endToken:
                 continue
             print("Logging Dataframes from run " + str(mcSimIndex))
-            for dictName, dictData in data.items(): # Loops through Messages, Variables, Custom dictionaries in the retention policy
-                for itemName, itemData in dictData.items(): # Loop through all items and their data
-
-                    if itemName == "OrbitalElements.Omega": # Protects from OS that aren't case sensitive.
-                        itemName = "OrbitalElements.Omega_Capital"
-
-                    filePath = self._logDir + itemName + ".data"
-                    self._dataFiles.add(filePath)
-
-                    # Is the data a vector, scalar, or non-existant?
-                    try:
-                        variLen = itemData[:,1:].shape[1]
-                    except:
-                        variLen = 0
-
-                    # Generate the MultiLabel
-                    outerLabel = [mcSimIndex]
-                    innerLabel = []
-
-                    for i in range(variLen):
-                        innerLabel.append(i)
-                    if variLen == 0:
-                        innerLabel.append(0) # May not be necessary, might be able to leave blank and get a None
-                    labels = pd.MultiIndex.from_product([outerLabel, innerLabel], names=["runNum", "varIdx"])
-
-                    # Generate the individual run's dataframe
-                    if variLen >= 2:
-                        df = pd.DataFrame(itemData[:, 1:].tolist(), index=itemData[:,0], columns=labels)
-                    elif variLen == 1:
-                        df = pd.DataFrame(itemData[:, 1].tolist(), index=itemData[:,0], columns=labels)
-                    else:
-                        df = pd.DataFrame([np.nan], columns=labels)
-
-                    for i in range(0, variLen):
-                        try: # if the data is numeric reduce it to float32 rather than float64 to reduce storage footprint
-                            # Note: You might think you can simplify these three lines into a single:
-                            # df.iloc[:,i] = df.iloc[:,i].apply(pandas.to_numeric, downcast="float")
-                            # but you'd be wrong.
-                            varComp = df.iloc[:,i]
-                            if self._varCast != None:
-                                varComp = pd.to_numeric(varComp, downcast='float')
-                            df.iloc[:,i] = varComp
-                        except:
-                            pass
-
-                    # If the .data file doesn't exist save the dataframe to create the file
-                    # and skip the remainder of the loop
-                    if not os.path.exists(filePath):
-                        pickle.dump([df], open(filePath, "wb"))
-                        continue
-
-                    # If the .data file does exists, append the message's pickle.
-                    with open(filePath, "a+b") as pkl:
-                        pickle.dump([df], pkl)
+            data, block = unpackRetainedData(descriptor)
+            self.writeRun(data, mcSimIndex)
 
+            # a run handed over with its (outputFile, wallTime, metrics) record has its run file saved by the writer,
+            # the worker does not write it
+            record = message[3] if len(message) > 3 else None
+            checksum = None
+            if record is not None and record[0] is not None:
+                checksum = writeRunFile(record[0], data, mcSimIndex)
+
+            # the writer owns the shared memory of the run once it has been received
+            data = None
+            releaseSharedBlock(block, unlink=True)
             print("Finished logging dataframes from run" + str(mcSimIndex))
 
+            # the run is only done once its data is saved. Workers without access to the manifest also send the
+            # parameters of the run
+            if manifest is not None and record is not None:
+                outputFile, wallTime, metrics = record[:3]
+                if len(record) > 3 and record[3] is not None:
+                    manifest.markDispersed(mcSimIndex, record[3])
+                manifest.markDone(mcSimIndex, outputFile, checksum, wallTime, metrics)
+
+        if manifest is not None:
+            manifest.close()
+        self.finalize()
+        self.saveStatistics()
+
+    def writeRun(self, data, mcSimIndex):
+        """ Write out all retained items of one run
+            Args:
+                data: the retained data dictionary of the run
+                mcSimIndex: the run index
+        """
+        for dictName, dictData in data.items(): # Loops through Messages, Variables, Custom dictionaries in the retention policy
+            for itemName, itemData in dictData.items(): # Loop through all items and their data
+
+                if itemName == "OrbitalElements.Omega": # Protects from OS that aren't case sensitive.
+                    itemName = "OrbitalElements.Omega_Capital"
+
+                filePath = self._logDir + itemName + ".data"
+                self._dataFiles.add(filePath)
+                self.writeItem(filePath, itemData, mcSimIndex)
+
+                if itemName in self._statistics and np.ndim(itemData) == 2 and np.shape(itemData)[1] > 1:
+                    self._statistics[itemName].update(mcSimIndex, itemData[:, 0], itemData[:, 1:])
+
+    def writeItem(self, filePath, itemData, mcSimIndex):
+        """ Append the data of one retained item from one run to its data file
+            Args:
+                filePath: the data file of the retained item
+                itemData: array of the retained item with the time as the first column
+                mcSimIndex: the run index
+        """
+        # Is the data a vector, scalar, or non-existant?
+        try:
+            variLen = itemData[:,1:].shape[1]
+        except:
+            variLen = 0
+
+        # Generate the MultiLabel
+        outerLabel = [mcSimIndex]
+        innerLabel = []
+
+        for i in range(variLen):
+            innerLabel.append(i)
+        if variLen == 0:
+            innerLabel.append(0) # May not be necessary, might be able to leave blank and get a None
+        labels = pd.MultiIndex.from_product([outerLabel, innerLabel], names=["runNum", "varIdx"])
+
+        # Generate the individual run's dataframe
+        if variLen >= 2:
+            df = pd.DataFrame(itemData[:, 1:].tolist(), index=itemData[:,0], columns=labels)
+        elif variLen == 1:
+            df = pd.DataFrame(itemData[:, 1].tolist(), index=itemData[:,0], columns=labels)
+        else:
+            df = pd.DataFrame([np.nan], columns=labels)
+
+        for i in range(0, variLen):
+            try: # if the data is numeric reduce it to float32 rather than float64 to reduce storage footprint
+                # Note: You might think you can simplify these three lines into a single:
+                # df.iloc[:,i] = df.iloc[:,i].apply(pandas.to_numeric, downcast="float")
+                # but you'd be wrong.
+                varComp = df.iloc[:,i]
+                if self._varCast != None:
+                    varComp = pd.to_numeric(varComp, downcast='float')
+                df.iloc[:,i] = varComp
+            except:
+                pass
+
+        # If the .data file doesn't exist save the dataframe to create the file
+        # and skip the remainder of the loop
+        if not os.path.exists(filePath):
+            pickle.dump([df], open(filePath, "wb"))
+            return
+
+        # If the .data file does exists, append the message's pickle.
+        with open(filePath, "a+b") as pkl:
+            pickle.dump([df], pkl)
+
+    def finalize(self):
+        """ Combine the per run dataframes of each data file into a single dataframe
+        """
         # Sort by the MultiIndex (first by run number then by variable component)
         print("Starting to concatenate dataframes")
         for filePath in self._dataFiles:
@@ -99,10 +158,17 @@ class DataWriter(mp.Process):
             with open(filePath, 'rb') as pkl:
                 try:
                     while True:
-                        allData.extend(pickle.load(pkl))
+                        chunk = pickle.load(pkl)
+                        if isinstance(chunk, pd.DataFrame):
+                            # runs appended to the concatenated dataframe of a resumed MonteCarlo
+                            allData.append(chunk)
+                        else:
+                            allData.extend(chunk)
                 except EOFError:
                     pass
             allData = pd.concat(allData, axis=1)
+            # a run that was repeated when resuming a MonteCarlo keeps its latest data
+            allData = allData.loc[:, ~allData.columns.duplicated(keep="last")]
             newMultInd = pd.MultiIndex.from_product([list(range(allData.columns.min()[0], allData.columns.max()[0]+1)),
                                                          list(range(allData.columns.min()[1], allData.columns.max()[1]+1))],
                                                          names=["runNum", "varIdx"])
@@ -112,8 +178,311 @@ class DataWriter(mp.Process):
             allData.to_pickle(filePath)
         print("Finished concatenating dataframes")
 
+    def addStatistics(self, itemName, statistics):
+        """ Compute streaming statistics of a retained item as its runs are written
+            Args:
+                itemName: the retained item, such as ``"scStateMsg.r_BN_N"``
+                statistics: StreamingStatistics, saved as ``<item>.stats.npz`` once all runs are written
+        """
+        self._statistics[itemName] = statistics
+
+    def loadStatistics(self):
+        """ Continue the statistics saved by a previous writer, when resuming a MonteCarlo
+        """
+        for itemName in self._statistics:
+            statsPath = self._logDir + itemName + ".stats.npz"
+            if os.path.exists(statsPath):
+                self._statistics[itemName] = StreamingStatistics.load(statsPath)
+
+    def saveStatistics(self):
+        for itemName, statistics in self._statistics.items():
+            statistics.save(self._logDir + itemName + ".stats.npz")
+
     def setLogDir(self, logDir):
         self._logDir = logDir
 
     def setVarCast(self, varCast):
-        self._varCast = varCast
\ No newline at end of file
+        self._varCast = varCast
+
+    def setManifestFile(self, manifestFile):
+        """ Record the runs as done in the run manifest once their data is saved
+            Args:
+                manifestFile: path to the manifest database, or None
+        """
+        self._manifestFile = manifestFile
+
+
+def writeRunFile(filePath, retainedData, mcSimIndex):
+    """ Save the retained data of one run in its gzip-pickled run file, read back by ``Controller.getRetainedData``
+        Args:
+            filePath: the run file, ``run<index>.data`` in the archive directory
+            retainedData: the retained data dictionary of the run
+            mcSimIndex: the run index
+        Returns:
+            the sha256 hex digest of the run file
+    """
+    archive = gzip.compress(pickle.dumps(dict(retainedData, index=mcSimIndex)))
+    with open(filePath, "wb") as archiveFile:
+        archiveFile.write(archive)
+    return hashlib.sha256(archive).hexdigest()
+
+
+def packRetainedData(retainedData, useSharedMemory=True):
+    """ Move the numeric arrays of a run's retained data into one shared memory block so that only a small
+        descriptor has to be pickled through the data queue. Anything that is not a numeric array is sent inline.
+        Shared memory is not used on Windows, where a block is destroyed as soon as the worker closes it.
+        Args:
+            retainedData: the retained data dictionary returned by ``RetentionPolicy.getDataForRetention``
+            useSharedMemory: False to send all the data inline, when the writer runs on another host
+        Returns:
+            (descriptor, block): the picklable descriptor and the shared memory block, or None if no block was used.
+            The block must be released with ``releaseSharedBlock`` once the descriptor has been queued.
+    """
+    layout = {}
+    totalBytes = 0
+    for dictName, dictData in retainedData.items():
+        layout[dictName] = {}
+        for itemName, itemData in dictData.items():
+            array = None
+            if useSharedMemory and os.name != "nt" and isinstance(itemData, np.ndarray) and itemData.dtype.kind in "biuf" \
+                    and itemData.size > 0:
+                array = itemData
+            if array is None:
+                layout[dictName][itemName] = ("inline", itemData)
+            else:
+                offset = totalBytes
+                totalBytes += -(-array.nbytes // 64) * 64  # keep every array cache-line aligned
+                layout[dictName][itemName] = ("shared", offset, array)
+
+    block = None
+    if totalBytes > 0:
+        # the writer unlinks the block, it must not be removed when this worker process exits
+        try:
+            block = shared_memory.SharedMemory(create=True, size=totalBytes, track=False)
+        except TypeError:
+            # python < 3.13 always tracks the block, under its POSIX name
+            block = shared_memory.SharedMemory(create=True, size=totalBytes)
+            resource_tracker.unregister("/" + block.name, "shared_memory")
+
+    descriptor = {"sharedBlock": None if block is None else block.name, "items": {}}
+    for dictName, items in layout.items():
+        descriptor["items"][dictName] = {}
+        for itemName, entry in items.items():
+            if entry[0] == "inline":
+                descriptor["items"][dictName][itemName] = entry
+            else:
+                offset, array = entry[1], entry[2]
+                np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf, offset=offset)[...] = array
+                descriptor["items"][dictName][itemName] = ("shared", offset, array.shape, array.dtype.str)
+    return descriptor, block
+
+
+def unpackRetainedData(descriptor):
+    """ Rebuild a run's retained data from a descriptor created by ``packRetainedData``
+        Args:
+            descriptor: the descriptor received from the data queue
+        Returns:
+            (retainedData, block): the retained data, whose arrays are views into the shared memory block,
+            and the block, which must be released with ``releaseSharedBlock`` once the data is no longer used.
+    """
+    block = None
+    if descriptor["sharedBlock"] is not None:
+        block = shared_memory.SharedMemory(name=descriptor["sharedBlock"])
+    retainedData = {}
+    for dictName, items in descriptor["items"].items():
+        retainedData[dictName] = {}
+        for itemName, entry in items.items():
+            if entry[0] == "inline":
+                retainedData[dictName][itemName] = entry[1]
+            else:
+                retainedData[dictName][itemName] = np.ndarray(entry[2], dtype=np.dtype(entry[3]), buffer=block.buf,
+                                                              offset=entry[1])
+    return retainedData, block
+
+
+def releaseSharedBlock(block, unlink=False):
+    """ Close a shared memory block returned by ``packRetainedData`` or ``unpackRetainedData``
+        Args:
+            block: the shared memory block, or None
+            unlink: destroy the block, only done by the process that consumed the data
+    """
+    if block is None:
+        return
+    try:
+        block.close()
+    except BufferError:
+        # a view into the block is still alive, the mapping is released when it is garbage collected
+        pass
+    if unlink:
+        block.unlink()
+
+
+class ColumnarDataWriter(DataWriter):
+    """ Data writer that appends each run to fixed-dtype binary columns instead of pickled dataframes.
+
+        Each retained item ``<item>.data`` is a directory holding
+
+        - ``times.bin``: the float64 message times of all runs, back to back
+        - ``values.bin``: the rows ``[component 0, ..., component n-1]`` matching ``times.bin``
+        - ``index.bin``: one ``[runNum, firstRow, numRows]`` int64 row per logged run
+        - ``meta.json``: the value dtype and the number of components
+
+        Runs are only ever appended, so no concatenation pass is needed once the MonteCarlo is done. The data is
+        read back lazily with :class:`ColumnarDataReader`.
+    """
+    def writeItem(self, filePath, itemData, mcSimIndex):
+        """ Append the data of one retained item from one run to its column files
+            Args:
+                filePath: the data directory of the retained item
+                itemData: array of the retained item with the time as the first column
+                mcSimIndex: the run index
+        """
+        try:
+            values = np.asarray(itemData, dtype=np.float64)
+        except (TypeError, ValueError):
+            values = np.empty((0, 0))
+        if values.ndim != 2 or values.shape[1] < 2:
+            values = np.empty((0, 0))
+
+        if not os.path.exists(filePath):
+            os.mkdir(filePath)
+        metaPath = os.path.join(filePath, "meta.json")
+        if os.path.exists(metaPath):
+            with open(metaPath, "r") as metaFile:
+                meta = json.load(metaFile)
+        elif values.shape[0] > 0:
+            # the value layout is fixed by the first run that produced data
+            # if requested, only the values are downcast; the times always keep their full precision
+            dtype = "float32" if self._varCast is not None else "float64"
+            meta = {"dtype": dtype, "numComponents": values.shape[1] - 1}
+            with open(metaPath, "w") as metaFile:
+                json.dump(meta, metaFile)
+        else:
+            meta = None
+
+        if meta is None or values.shape[1] != meta["numComponents"] + 1:
+            # no data, or data that does not match the layout, is logged as an empty run
+            values = np.empty((0, 0))
+        timesPath = os.path.join(filePath, "times.bin")
+        firstRow = 0
+        if os.path.exists(timesPath):
+            firstRow = os.path.getsize(timesPath) // np.dtype(np.float64).itemsize
+
+        if values.shape[0] > 0:
+            with open(timesPath, "ab") as timesFile:
+                timesFile.write(np.ascontiguousarray(values[:, 0]).tobytes())
+            with open(os.path.join(filePath, "values.bin"), "ab") as valuesFile:
+                valuesFile.write(np.ascontiguousarray(values[:, 1:], dtype=meta["dtype"]).tobytes())
+        # the index entry is written last, so a run only becomes visible once all its rows are on disk
+        with open(os.path.join(filePath, "index.bin"), "ab") as indexFile:
+            indexFile.write(np.array([mcSimIndex, firstRow, values.shape[0]], dtype=np.int64).tobytes())
+
+    def finalize(self):
+        """ Columnar data is complete as soon as it is appended
+        """
+        pass
+
+
+def isColumnarData(path):
+    """ Check if a retained item path was written by the :class:`ColumnarDataWriter`
+        Args:
+            path: path to the ``<item>.data`` file or directory
+        Returns:
+            True if the path is a columnar data directory
+    """
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, "index.bin"))
+
+
+class ColumnarDataReader:
+    """ Lazy reader for a retained item written by the :class:`ColumnarDataWriter`.
+
+        The columns are memory-mapped, so only the runs and time windows that are requested are read from disk.
+        Args:
+            path: path to the ``<item>.data`` directory
+    """
+    def __init__(self, path):
+        self.path = path
+        index = np.fromfile(os.path.join(path, "index.bin"), dtype=np.int64).reshape(-1, 3)
+        # a rerun case replaces the earlier entry of the same run
+        self._index = {}
+        for runNum, firstRow, numRows in index:
+            self._index[int(runNum)] = (int(firstRow), int(numRows))
+
+        metaPath = os.path.join(path, "meta.json")
+        self._times = None
+        self._values = None
+        self.numComponents = 1
+        if os.path.exists(metaPath):
+            with open(metaPath, "r") as metaFile:
+                meta = json.load(metaFile)
+            self.numComponents = meta["numComponents"]
+            timesPath = os.path.join(path, "times.bin")
+            if os.path.getsize(timesPath) > 0:
+                self._times = np.memmap(timesPath, dtype=np.float64, mode="r")
+                self._values = np.memmap(os.path.join(path, "values.bin"), dtype=meta["dtype"],
+                                         mode="r").reshape(-1, self.numComponents)
+
+    def getRunIndices(self):
+        """ Get the sorted list of the logged runs
+        """
+        return sorted(self._index.keys())
+
+    def getRun(self, runNum, window=None):
+        """ Get the data of a single run
+            Args:
+                runNum: the run index
+                window: optional [start, stop] time window in nanoseconds
+            Returns:
+                (times, values) arrays of the run, views into the memory-mapped files.
+                ``values`` has one column per component.
+        """
+        firstRow, numRows = self._index[runNum]
+        if numRows == 0 or self._times is None:
+            return np.empty(0), np.empty((0, self.numComponents))
+        start = firstRow
+        stop = firstRow + numRows
+        if window is not None:
+            times = self._times[start:stop]
+            stop = start + np.searchsorted(times, window[1], side="right")
+            start = start + np.searchsorted(times, window[0], side="left")
+        return self._times[start:stop], self._values[start:stop]
+
+    def iterRuns(self, runs=None, window=None):
+        """ Iterate over the runs one at a time
+            Args:
+                runs: optional list of run indices, all runs by default
+                window: optional [start, stop] time window in nanoseconds
+            Returns:
+                generator yielding (runNum, times, values) tuples
+        """
+        if runs is None:
+            runs = self.getRunIndices()
+        for runNum in runs:
+            if runNum in self._index:
+                times, values = self.getRun(runNum, window)
+                yield runNum, times, values
+
+    def getDataFrame(self, runs=None, window=None):
+        """ Build the dataframe used by the pickled data files for a subset of the runs
+            Args:
+                runs: optional list of run indices, all runs by default
+                window: optional [start, stop] time window in nanoseconds
+            Returns:
+                dataframe indexed by time with (runNum, varIdx) MultiIndex columns
+        """
+        if runs is None:
+            runs = self.getRunIndices()
+        frames = []
+        for runNum, times, values in self.iterRuns(runs, window):
+            labels = pd.MultiIndex.from_product([[runNum], list(range(self.numComponents))],
+                                                names=["runNum", "varIdx"])
+            # runs without data are filled with NaNs by the reindex below
+            frames.append(pd.DataFrame(np.array(values), index=np.array(times), columns=labels))
+        if len(frames) == 0:
+            return pd.DataFrame()
+        allData = pd.concat(frames, axis=1)
+        newMultInd = pd.MultiIndex.from_product([list(runs), list(range(self.numComponents))],
+                                                names=["runNum", "varIdx"])
+        allData = allData.reindex(columns=newMultInd)
+        allData.index.name = 'time[ns]'
+        return allData
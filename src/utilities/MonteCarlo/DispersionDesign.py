@@ -0,0 +1,141 @@
+#
+#  ISC License
+#
+#  Copyright (c) 2024, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+import json
+import os
+import warnings
+
+import numpy as np
+
+DESIGN_METHODS = ["random", "lhs", "sobol"]
+
+
+class DispersionDesign:
+    """
+    Samples of all the dispersions of a MonteCarlo, generated at once as a single ``numRuns`` x ``numVariates``
+    matrix of values in the unit hypercube. Each dispersion that defines ``numVariates`` and ``generateFromUniform``
+    owns a slice of the columns, and maps its samples of a run onto its dispersed value. The remaining dispersions
+    are generated by the worker, seeded with the run seed.
+
+    The design and the run seeds are both derived from a single ``numpy.random.SeedSequence``, so a MonteCarlo is
+    reproduced by its seed, independently of the order in which the workers execute the runs.
+
+    Args:
+        dispersions: the dispersions of the MonteCarlo
+        numRuns: int
+        method: str
+            ``"random"`` independent uniform samples, ``"lhs"`` latin hypercube samples, or ``"sobol"`` scrambled
+            Sobol sequence (requires ``scipy``)
+        seed: int, None to draw a fresh entropy from the operating system
+    """
+
+    def __init__(self, dispersions, numRuns, method="random", seed=None):
+        if method not in DESIGN_METHODS:
+            raise ValueError("Unknown dispersion design method '" + str(method) + "', expected one of "
+                             + str(DESIGN_METHODS))
+        self.method = method
+        self.numRuns = numRuns
+        self.entropy = np.random.SeedSequence(seed).entropy
+        self.columns = self.assignColumns(dispersions)
+        if method != "random" and None in self.columns:
+            unsupported = [type(disp).__name__ for disp, column in zip(dispersions, self.columns) if column is None]
+            warnings.warn("The dispersions " + ", ".join(unsupported) + " do not define 'numVariates' and "
+                          "'generateFromUniform', they are sampled independently by the workers instead of by the '"
+                          + method + "' design")
+        self.matrix = self.sample(sum(stop - start for start, stop in filter(None, self.columns)))
+
+    @staticmethod
+    def assignColumns(dispersions):
+        """
+        Assign the columns of the design to the dispersions
+
+        Returns:
+            a list with, for each dispersion, the (start, stop) columns of its samples, or None if the dispersion is
+            generated by the worker
+        """
+        columns = []
+        numColumns = 0
+        for disp in dispersions:
+            numVariates = getattr(disp, "numVariates", None)
+            if numVariates is None or not hasattr(disp, "generateFromUniform"):
+                columns.append(None)
+                continue
+            columns.append((numColumns, numColumns + numVariates))
+            numColumns += numVariates
+        return columns
+
+    def seedSequences(self):
+        # the first child seeds the design, the second one is split into the run seeds
+        return np.random.SeedSequence(self.entropy).spawn(2)
+
+    def sample(self, numColumns):
+        rng = np.random.default_rng(self.seedSequences()[0])
+        if self.method == "random":
+            return rng.random((self.numRuns, numColumns))
+        if self.method == "lhs":
+            # one sample in each of the numRuns strata of every column, the strata shuffled independently per column
+            strata = rng.permuted(np.tile(np.arange(self.numRuns), (numColumns, 1)), axis=1).T
+            return (strata + rng.random((self.numRuns, numColumns))) / self.numRuns
+        try:
+            from scipy.stats import qmc
+        except ImportError:
+            raise ImportError("The 'sobol' dispersion design requires scipy")
+        if numColumns == 0:
+            return np.empty((self.numRuns, 0))
+        return qmc.Sobol(d=numColumns, scramble=True, seed=rng).random(self.numRuns)
+
+    def getRunSeeds(self):
+        """
+        Get the ``numpy.random.SeedSequence`` of every run, which seeds the dispersions and seeds generated by the
+        workers. Each run keeps the full entropy of the design and its own spawn key, so the runs never share a seed.
+        """
+        return self.seedSequences()[1].spawn(self.numRuns)
+
+    def getSlices(self):
+        """
+        Get, for each dispersion, the slice of the columns of a design row holding its samples, or None
+        """
+        return [None if column is None else slice(*column) for column in self.columns]
+
+    def save(self, directory):
+        """
+        Save the design matrix in ``dispersionDesign.npy`` and its settings in ``dispersionDesign.json``
+        """
+        np.save(os.path.join(directory, "dispersionDesign.npy"), self.matrix)
+        with open(os.path.join(directory, "dispersionDesign.json"), "w") as designFile:
+            json.dump({"method": self.method, "numRuns": self.numRuns, "entropy": str(self.entropy),
+                       "columns": self.columns}, designFile)
+
+    @classmethod
+    def load(cls, directory):
+        """
+        Load a design saved in a MonteCarlo archive directory
+        """
+        design = cls.__new__(cls)
+        with open(os.path.join(directory, "dispersionDesign.json"), "r") as designFile:
+            settings = json.load(designFile)
+        design.method = settings["method"]
+        design.numRuns = settings["numRuns"]
+        design.entropy = int(settings["entropy"])
+        design.columns = [None if column is None else tuple(column) for column in settings["columns"]]
+        design.matrix = np.load(os.path.join(directory, "dispersionDesign.npy"), mmap_mode="r")
+        return design
+
+    @staticmethod
+    def exists(directory):
+        return os.path.exists(os.path.join(directory, "dispersionDesign.npy"))
@@ -18,13 +18,150 @@
 
 
 import abc
+import ast
 import collections
+import functools
 import random
+import re
 
 import numpy as np
 from Basilisk.utilities import RigidBodyKinematics as rbk
 from Basilisk.utilities import orbitalMotion
 
+_pathToken = re.compile(r"\.?([A-Za-z_]\w*)|\[([^\]]+)\]")
+
+
+@functools.lru_cache(maxsize=None)
+def compileAttributePath(path):
+    """
+    Parse an attribute path such as ``'TaskList[0].TaskModels[1].hub.mHub'`` into the chain of attribute and item
+    accesses it describes. The result is cached, so every path is only parsed once per process.
+
+    Args:
+        path (str): the attribute path relative to the simulation object
+    Returns:
+        tuple of (isItem, key) steps
+    """
+    steps = []
+    position = 0
+    for match in _pathToken.finditer(path):
+        if match.start() != position:
+            break
+        if match.group(1) is not None:
+            steps.append((False, match.group(1)))
+        else:
+            steps.append((True, ast.literal_eval(match.group(2).strip())))
+        position = match.end()
+    if position != len(path) or len(steps) == 0:
+        raise ValueError("Cannot parse the attribute path '" + path + "'")
+    return tuple(steps)
+
+
+def getSimAttribute(sim, path):
+    """
+    Get the value at an attribute path of the simulation, equivalent to ``eval('sim.' + path)``
+    """
+    value = sim
+    for isItem, key in compileAttributePath(path):
+        value = value[key] if isItem else getattr(value, key)
+    return value
+
+
+def setSimAttribute(sim, path, value):
+    """
+    Set the value at an attribute path of the simulation, equivalent to ``exec('sim.' + path + '=' + str(value))``
+    without formatting and parsing the value.
+    """
+    steps = compileAttributePath(path)
+    target = sim
+    for isItem, key in steps[:-1]:
+        target = target[key] if isItem else getattr(target, key)
+    isItem, key = steps[-1]
+    if isItem:
+        target[key] = value
+    else:
+        setattr(target, key, value)
+
+
+def toNativeValue(value):
+    """
+    Convert a dispersed value to plain Python floats, ints and (nested) lists. These are applied to the simulation
+    as they are and stored in the run json file, which keeps the exact binary values of floats.
+    """
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return [toNativeValue(element) for element in value]
+    if isinstance(value, str):
+        # values archived as strings by earlier versions
+        try:
+            return ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            pass
+        # nan and inf are not literals, they are the only names allowed in an archived value
+        try:
+            return ast.literal_eval(NonFiniteNames().visit(ast.parse(value.strip(), mode="eval")))
+        except (ValueError, SyntaxError):
+            raise ValueError("Can't convert the archived value " + repr(value)
+                             + ", only literals, nan and inf are supported") from None
+    return value
+
+
+class NonFiniteNames(ast.NodeTransformer):
+    """
+    Replaces the ``nan`` and ``inf`` names of an archived value, also written ``np.nan`` and ``np.inf``, by their
+    float value so that ``ast.literal_eval`` accepts them
+    """
+    values = {"nan": float("nan"), "inf": float("inf")}
+
+    def visit_Name(self, node):
+        if node.id in self.values:
+            return ast.copy_location(ast.Constant(self.values[node.id]), node)
+        return node
+
+    def visit_Attribute(self, node):
+        if isinstance(node.value, ast.Name) and node.value.id == "np" and node.attr in self.values:
+            return ast.copy_location(ast.Constant(self.values[node.attr]), node)
+        return node
+
+
+def normalInverseCdf(u):
+    """
+    Inverse of the standard normal cumulative distribution, used to map samples of a dispersion design in (0, 1)
+    onto normally distributed dispersions. Uses ``scipy`` if it is installed, otherwise Acklam's rational
+    approximation (relative error below 1.15e-9).
+    """
+    # keep the samples of the design away from 0 and 1, which map to infinite dispersions
+    u = np.clip(np.asarray(u, dtype=float), np.finfo(float).tiny, 1. - np.finfo(float).epsneg)
+    try:
+        from scipy.special import ndtri
+        return ndtri(u)
+    except ImportError:
+        pass
+    a = [-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+         1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00]
+    b = [-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+         6.680131188771972e+01, -1.328068155288572e+01]
+    c = [-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+         -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00]
+    d = [7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00, 3.754408661907416e+00]
+    x = np.empty_like(u)
+    low = u < 0.02425
+    high = u > 1 - 0.02425
+    mid = ~(low | high)
+
+    q = u[mid] - 0.5
+    r = q * q
+    x[mid] = (((((a[0]*r + a[1])*r + a[2])*r + a[3])*r + a[4])*r + a[5])*q / \
+             (((((b[0]*r + b[1])*r + b[2])*r + b[3])*r + b[4])*r + 1)
+    for mask, sign, tail in ((low, 1., u[low]), (high, -1., 1 - u[high])):
+        q = np.sqrt(-2 * np.log(tail))
+        x[mask] = sign * (((((c[0]*q + c[1])*q + c[2])*q + c[3])*q + c[4])*q + c[5]) / \
+                  ((((d[0]*q + d[1])*q + d[2])*q + d[3])*q + 1)
+    return x
+
 
 class SingleVariableDispersion(object):
     __metaclass__ = abc.ABCMeta
@@ -57,11 +194,16 @@ class SingleVariableDispersion(object):
     def generateString(self, sim):
         return str(self.generate(sim))
 
+    def generateValue(self, sim):
+        return self.generate(sim)
+
     def generateMagString(self):
         return str(self.getDispersionMag())
 
 
 class UniformDispersion(SingleVariableDispersion):
+    numVariates = 1
+
     def __init__(self, varName, bounds=None):
         SingleVariableDispersion.__init__(self, varName, bounds)
         if self.bounds is None:
@@ -75,8 +217,19 @@ class UniformDispersion(SingleVariableDispersion):
         self.magnitude.append(str(round((dispValue - mid)/scale*100,2)) + " %")
         return dispValue
 
+    def generateFromUniform(self, u, sim=None):
+        """Map a dispersion design sample in [0, 1) onto the dispersion"""
+        dispValue = self.bounds[0] + (self.bounds[1] - self.bounds[0]) * float(u[0])
+
+        mid = (self.bounds[1] + self.bounds[0])/2.
+        scale = self.bounds[1] - mid
+        self.magnitude.append(str(round((dispValue - mid)/scale*100,2)) + " %")
+        return dispValue
+
 
 class NormalDispersion(SingleVariableDispersion):
+    numVariates = 1
+
     def __init__(self, varName, mean=0.0, stdDeviation=0.5, bounds=None):
         SingleVariableDispersion.__init__(self, varName, bounds)
         self.mean = mean
@@ -90,6 +243,15 @@ class NormalDispersion(SingleVariableDispersion):
             self.magnitude.append(str(round((dispValue - self.mean)/self.stdDeviation,2)) + " sigma")
         return dispValue
 
+    def generateFromUniform(self, u, sim=None):
+        """Map a dispersion design sample in (0, 1) onto the dispersion"""
+        dispValue = self.mean + self.stdDeviation * float(normalInverseCdf(u)[0])
+        if self.bounds is not None:
+            dispValue = self.checkBounds(dispValue)
+        if self.stdDeviation !=0 :
+            self.magnitude.append(str(round((dispValue - self.mean)/self.stdDeviation,2)) + " sigma")
+        return dispValue
+
 
 class VectorVariableDispersion(object):
     __metaclass__ = abc.ABCMeta
@@ -133,6 +295,13 @@ class VectorVariableDispersion(object):
                 self.magnitude.append(str(round((dispValues[i] - self.mean)/self.stdDeviation,2)) + r" $\sigma$")
         return dispValues
 
+    def nominalSphericalAngles(self, sim):
+        """Get the [phi, theta] spherical angles of the unit vector of the dispersed variable"""
+        vectorCart = getSimAttribute(sim, self.varName)
+        vectorCart = vectorCart/np.linalg.norm(vectorCart)
+        vectorSphere = self.cart2Spherical(vectorCart)
+        return vectorSphere[1], vectorSphere[2]
+
     def cart2Spherical(self, cartVector):
         # Spherical Coordinate Set: [rho, theta, phi]
         x = cartVector[0]
@@ -190,6 +359,9 @@ class VectorVariableDispersion(object):
         val = val[0:-1] + ']'
         return val
 
+    def generateValue(self, sim):
+        return self.generate(sim)
+
     def generateMagString(self):
         nextValue = self.getDispersionMag()
         val = '['
@@ -203,30 +375,55 @@ class VectorVariableDispersion(object):
 
 
 class UniformVectorDispersion(VectorVariableDispersion):
+    numVariates = 3
+
     def __init__(self, varName, bounds=None):
         VectorVariableDispersion.__init__(self, varName, bounds)
         if self.bounds is None:
             self.bounds = ([-1.0, 1.0])  # defines a hard floor/ceiling
 
     def generate(self, sim):
-        vector = eval('sim.' + self.varName)
+        vector = getSimAttribute(sim, self.varName)
         dispValue = self.perturbCartesianVectorUniform(vector)
         return dispValue
 
+    def generateFromUniform(self, u, sim=None):
+        """Map three dispersion design samples in [0, 1) onto the dispersion"""
+        dispValues = self.bounds[0] + (self.bounds[1] - self.bounds[0]) * np.asarray(u, dtype=float)
+        mid = (self.bounds[1] + self.bounds[0])/2.
+        scale = self.bounds[1] - mid
+        for dispValue in dispValues:
+            self.magnitude.append(str(round((dispValue - mid)/scale*100,2)) + " %")
+        return dispValues
+
 
 class NormalVectorDispersion(VectorVariableDispersion):
+    numVariates = 3
+
     def __init__(self, varName, mean=0.0, stdDeviation=0.5, bounds=None):
         VectorVariableDispersion.__init__(self, varName, bounds)
+        self.mean = mean
+        self.stdDeviation = stdDeviation
         if self.bounds is None:
             self.bounds = ([-1.0, 1.0])  # defines a hard floor/ceiling
 
     def generate(self, sim):
-        vector = eval('sim.' + self.varName)
-        dispValue = self.perturbCartesianVectorNormal(vector, self.mean, self.stdDeviation)
+        vector = getSimAttribute(sim, self.varName)
+        dispValue = self.perturbCartesianVectorNormal(vector)
         return dispValue
 
+    def generateFromUniform(self, u, sim=None):
+        """Map three dispersion design samples in (0, 1) onto the dispersion"""
+        dispValues = self.mean + self.stdDeviation * normalInverseCdf(u)
+        if self.stdDeviation != 0:
+            for dispValue in dispValues:
+                self.magnitude.append(str(round((dispValue - self.mean)/self.stdDeviation,2)) + r" $\sigma$")
+        return dispValues
+
 
 class UniformVectorAngleDispersion(VectorVariableDispersion):
+    numVariates = 2
+
     def __init__(self, varName, phiBoundsOffNom=None, thetaBoundsOffNom=None):
         super(UniformVectorAngleDispersion, self).__init__(varName, None)
         # @TODO these bounds are not currently being applied to the generated values
@@ -243,12 +440,7 @@ class UniformVectorAngleDispersion(VectorVariableDispersion):
 
     def generate(self, sim=None):
         # Note this dispersion is applied off of the nominal
-        vectorCart = eval('sim.' + self.varName)
-        vectorCart = vectorCart/np.linalg.norm(vectorCart)
-        vectorSphere = self.cart2Spherical(vectorCart)
-
-        meanPhi = vectorSphere[1] # Nominal phi
-        meanTheta = vectorSphere[2] #Nominal theta
+        meanPhi, meanTheta = self.nominalSphericalAngles(sim)
 
         self.phiBounds = [meanPhi + self.phiBoundsOffNom[0], meanPhi + self.phiBoundsOffNom[1]]
         self.thetaBounds = [meanTheta + self.thetaBoundsOffNom[0],  meanTheta + self.thetaBoundsOffNom[1]]
@@ -256,6 +448,23 @@ class UniformVectorAngleDispersion(VectorVariableDispersion):
         phiRnd = np.random.uniform(meanPhi+self.phiBounds[0], meanPhi+self.phiBounds[1])
         thetaRnd = np.random.uniform(meanTheta+self.thetaBounds[0], meanTheta+self.thetaBounds[1])
 
+        return self.anglesToVector(phiRnd, thetaRnd)
+
+    def generateFromUniform(self, u, sim=None):
+        """Map two dispersion design samples in [0, 1) onto the phi and theta angles of the dispersed unit vector,
+        uniformly distributed within their bounds around the nominal angles"""
+        meanPhi, meanTheta = self.nominalSphericalAngles(sim)
+
+        self.phiBounds = [meanPhi + self.phiBoundsOffNom[0], meanPhi + self.phiBoundsOffNom[1]]
+        self.thetaBounds = [meanTheta + self.thetaBoundsOffNom[0],  meanTheta + self.thetaBoundsOffNom[1]]
+
+        phiRnd = self.phiBounds[0] + (self.phiBounds[1] - self.phiBounds[0]) * float(u[0])
+        thetaRnd = self.thetaBounds[0] + (self.thetaBounds[1] - self.thetaBounds[0]) * float(u[1])
+
+        return self.anglesToVector(phiRnd, thetaRnd)
+
+    def anglesToVector(self, phiRnd, thetaRnd):
+        """Clip the dispersed angles to their bounds and convert them to the dispersed unit vector"""
         phiRnd = self.checkBounds(phiRnd, self.phiBounds)
         thetaRnd = self.checkBounds(thetaRnd, self.thetaBounds)
 
@@ -273,6 +482,8 @@ class UniformVectorAngleDispersion(VectorVariableDispersion):
 
 
 class NormalVectorAngleDispersion(VectorVariableDispersion):
+    numVariates = 2
+
     def __init__(self, varName, thetaStd = np.pi/3.0, phiStd=np.pi/3.0, thetaBoundsOffNom=None, phiBoundsOffNom=None):
         super(NormalVectorAngleDispersion, self).__init__(varName, None)
         # @TODO these bounds are not currently being applied to the generated values
@@ -291,16 +502,27 @@ class NormalVectorAngleDispersion(VectorVariableDispersion):
         self.magnitude = []
 
     def generate(self, sim=None):
-        vectorCart = eval('sim.' + self.varName)
-        vectorCart = vectorCart/np.linalg.norm(vectorCart)
-        vectorSphere = self.cart2Spherical(vectorCart)
-
-        meanPhi = vectorSphere[1] # Nominal phi
-        meanTheta = vectorSphere[2] # Nominal theta
+        meanPhi, meanTheta = self.nominalSphericalAngles(sim)
 
         phiRnd = np.random.normal(meanPhi, self.phiStd, 1)
         thetaRnd = np.random.normal(meanTheta, self.thetaStd, 1)
 
+        return self.anglesToVector(phiRnd, thetaRnd, meanPhi, meanTheta)
+
+    def generateFromUniform(self, u, sim=None):
+        """Map two dispersion design samples in (0, 1) onto the phi and theta angles of the dispersed unit vector,
+        normally distributed around the nominal angles"""
+        meanPhi, meanTheta = self.nominalSphericalAngles(sim)
+
+        normals = normalInverseCdf(u)
+        phiRnd = meanPhi + self.phiStd * normals[0]
+        thetaRnd = meanTheta + self.thetaStd * normals[1]
+
+        return self.anglesToVector(phiRnd, thetaRnd, meanPhi, meanTheta)
+
+    def anglesToVector(self, phiRnd, thetaRnd, meanPhi, meanTheta):
+        """Clip the dispersed angles to their bounds around the nominal angles and convert them to the dispersed unit
+        vector"""
         self.phiBounds = [meanPhi + self.phiBoundsOffNom[0], meanPhi + self.phiBoundsOffNom[1]]
         self.thetaBounds = [meanTheta + self.thetaBoundsOffNom[0],  meanTheta + self.thetaBoundsOffNom[1]]
 
@@ -316,6 +538,8 @@ class NormalVectorAngleDispersion(VectorVariableDispersion):
         return dispVec
 
 class UniformEulerAngleMRPDispersion(VectorVariableDispersion):
+    numVariates = 3
+
     def __init__(self, varName, bounds=None):
         """
         Args:
@@ -338,8 +562,18 @@ class UniformEulerAngleMRPDispersion(VectorVariableDispersion):
             self.magnitude.append(str(round((dispMRP[i] - np.pi)/np.pi*100,2))+ " %")
         return dispMRP
 
+    def generateFromUniform(self, u, sim=None):
+        """Map three dispersion design samples in [0, 1) onto the Euler angles of the dispersion"""
+        rndAngles = ((self.bounds[1] - self.bounds[0]) * np.asarray(u, dtype=float) + self.bounds[0]).reshape(3, 1)
+        dispMRP = rbk.euler3232MRP(rndAngles).reshape(3)
+        for i in range(3):
+            self.magnitude.append(str(round((dispMRP[i] - np.pi)/np.pi*100,2))+ " %")
+        return dispMRP
+
 
 class NormalThrusterUnitDirectionVectorDispersion(VectorVariableDispersion):
+    numVariates = 2
+
     def __init__(self, varName, thrusterIndex=0, phiStd=0.1745, bounds=None):
         """
         Args:
@@ -394,7 +628,7 @@ class NormalThrusterUnitDirectionVectorDispersion(VectorVariableDispersion):
             separator = '.'
             thrusterObject = getattr(sim, self.varNameComponents[0])
             totalVar = separator.join(self.varNameComponents[0:-1])
-            dirVec = eval('sim.' + totalVar + '.thrDir_B')
+            dirVec = getSimAttribute(sim, totalVar + '.thrDir_B')
             angle = np.random.normal(0, self.phiStd, 1)
             dirVec = np.array(dirVec).reshape(3).tolist()
             dispVec = self.perturbVectorByAngle(dirVec, angle)
@@ -402,8 +636,28 @@ class NormalThrusterUnitDirectionVectorDispersion(VectorVariableDispersion):
             self.magnitude.append(str(round(angleDisp / self.phiStd,2)) + " sigma")
         return dispVec
 
+    def generateFromUniform(self, u, sim=None):
+        """Map two dispersion design samples in (0, 1) onto the dispersion angle, normally distributed, and the
+        direction of the rotation axis about the thruster direction, uniformly distributed"""
+        totalVar = '.'.join(self.varNameComponents[0:-1])
+        dirVec = np.array(getSimAttribute(sim, totalVar + '.thrDir_B'), dtype=float).reshape(3)
+        angle = self.phiStd * float(normalInverseCdf(u[0:1])[0])
+
+        # the rotation axis is perpendicular to the thruster direction, at the sampled azimuth about it
+        unitDir = dirVec / np.linalg.norm(dirVec)
+        normal = np.cross(unitDir, [1., 0., 0.] if abs(unitDir[0]) < 0.9 else [0., 1., 0.])
+        normal = normal / np.linalg.norm(normal)
+        azimuth = 2. * np.pi * float(u[1])
+        eigenAxis = np.cos(azimuth) * normal + np.sin(azimuth) * np.cross(unitDir, normal)
+
+        dispVec = np.dot(self.eigAxisAndAngleToDCM(eigenAxis, angle), dirVec)
+        self.magnitude.append(str(round(abs(angle) / self.phiStd,2)) + " sigma")
+        return dispVec
+
 
 class UniformVectorCartDispersion(VectorVariableDispersion):
+    numVariates = 3
+
     def __init__(self, varName, bounds=None):
         super(UniformVectorCartDispersion, self).__init__(varName, bounds)
         if self.bounds is None:
@@ -422,8 +676,19 @@ class UniformVectorCartDispersion(VectorVariableDispersion):
             dispVec.append(rnd)
         return dispVec
 
+    def generateFromUniform(self, u, sim=None):
+        """Map three dispersion design samples in [0, 1) onto the dispersion"""
+        dispVec = self.bounds[0] + (self.bounds[1] - self.bounds[0]) * np.asarray(u, dtype=float)
+        mid = (self.bounds[1] + self.bounds[0])/2.
+        scale = self.bounds[1] - mid
+        for rnd in dispVec:
+            self.magnitude.append(str(round((rnd - mid) / scale * 100,2))+ " %")
+        return dispVec.tolist()
+
 
 class NormalVectorCartDispersion(VectorVariableDispersion):
+    numVariates = 3
+
     def __init__(self, varName, mean=0.0, stdDeviation=0.0, bounds=None):
         super(NormalVectorCartDispersion, self).__init__(varName, bounds)
         self.mean = mean
@@ -447,8 +712,22 @@ class NormalVectorCartDispersion(VectorVariableDispersion):
 
         return dispVec
 
+    def generateFromUniform(self, u, sim=None):
+        """Map three dispersion design samples in (0, 1) onto the dispersion"""
+        mean = np.broadcast_to(np.asarray(self.mean, dtype=float), (3,))
+        stdDeviation = np.broadcast_to(np.asarray(self.stdDeviation, dtype=float), (3,))
+        dispVec = mean + stdDeviation * normalInverseCdf(u)
+        for i in range(3):
+            if stdDeviation[i] != 0:
+                self.magnitude.append(str(round((dispVec[i] - mean[i]) / stdDeviation[i],2)) + " sigma")
+        if self.bounds is not None:
+            dispVec = np.clip(dispVec, self.bounds[0], self.bounds[1])
+        return dispVec.tolist()
+
 
 class InertiaTensorDispersion:
+    numVariates = 6
+
     def __init__(self, varName, stdDiag=None, boundsDiag=None, stdAngle=None):
         """
         Args:
@@ -477,31 +756,44 @@ class InertiaTensorDispersion:
             return
         else:
             vehDynObject = getattr(sim, self.varNameComponents[0])
-            I = np.array(eval('sim.' + self.varName)).reshape(3, 3)
+            I = np.array(getSimAttribute(sim, self.varName)).reshape(3, 3)
 
             # generate random values for the diagonals
             temp = []
             for i in range(3):
-                rnd = random.gauss(0, self.stdDiag)
-                rnd = self.checkBounds(rnd)
-                temp.append(rnd)
-                if self.stdDiag != 0:
-                    self.magnitude.append(str(round(rnd/self.stdDiag,2)) + " sigma")
-            dispIdentityMatrix = np.identity(3) * temp
+                temp.append(random.gauss(0, self.stdDiag))
             # generate random values for the similarity transform to produce off-diagonal terms
             angles = np.random.normal(0, self.stdAngle, 3)
-            for i in range(3):
-                if self.stdAngle != 0:
-                    self.magnitude.append(str(round(angles[i] / self.stdAngle,2)) + " sigma")
-            disp321Matrix = rbk.euler3212C(angles)
+            dispI = self.perturbInertia(I, temp, angles)
 
-            # disperse the diagonal elements
-            dispI = I + dispIdentityMatrix
-            # disperse the off diagonals with a slight similarity transform of the inertia tensor
-            dispI = np.dot(np.dot(disp321Matrix, dispI), disp321Matrix.T)
+        return dispI
 
+    def perturbInertia(self, I, diagOffsets, angles):
+        temp = []
+        for rnd in diagOffsets:
+            rnd = self.checkBounds(rnd)
+            temp.append(rnd)
+            if self.stdDiag != 0:
+                self.magnitude.append(str(round(rnd/self.stdDiag,2)) + " sigma")
+        dispIdentityMatrix = np.identity(3) * temp
+        for i in range(3):
+            if self.stdAngle != 0:
+                self.magnitude.append(str(round(angles[i] / self.stdAngle,2)) + " sigma")
+        disp321Matrix = rbk.euler3212C(angles)
+
+        # disperse the diagonal elements
+        dispI = I + dispIdentityMatrix
+        # disperse the off diagonals with a slight similarity transform of the inertia tensor
+        dispI = np.dot(np.dot(disp321Matrix, dispI), disp321Matrix.T)
         return dispI
 
+    def generateFromUniform(self, u, sim=None):
+        """Map six dispersion design samples in (0, 1) onto the diagonal offsets and the similarity transform
+        angles of the dispersion"""
+        I = np.array(getSimAttribute(sim, self.varName)).reshape(3, 3)
+        normals = normalInverseCdf(u)
+        return self.perturbInertia(I, (self.stdDiag * normals[:3]).tolist(), self.stdAngle * normals[3:])
+
     def getDispersionMag(self):
         return self.magnitude
 
@@ -525,6 +817,9 @@ class InertiaTensorDispersion:
         val = val[0:] + ']'
         return val
 
+    def generateValue(self, sim):
+        return self.generate(sim)
+
     def generateMagString(self):
         nextValue = self.getDispersionMag()
         val = '['
@@ -555,15 +850,19 @@ class OrbitalElementDispersion:
         self.varName2Components = self.varName2.split(".")
         self.oeDict = dispDict
 
+    @property
+    def numVariates(self):
+        return len([key for key in self.oeDict.keys() if self.oeDict[key] is not None and key != "mu"])
 
     def generate(self, sim=None):
         elems = orbitalMotion.ClassicElements
         for key in self.oeDict.keys():
             if self.oeDict[key] is not None and key != "mu":
-                exec("elems."+ key + " = np.random." + self.oeDict[key][0] + "(" +  str(self.oeDict[key][1]) + ', ' +  str(self.oeDict[key][2]) + ")")
+                distribution = getattr(np.random, self.oeDict[key][0])
+                setattr(elems, key, distribution(self.oeDict[key][1], self.oeDict[key][2]))
             else:
                 if key != "mu":
-                    exec("elems." + key + " = 0.")
+                    setattr(elems, key, 0.)
         if elems.e < 0:
             elems.e = 0
         r, v =orbitalMotion.elem2rv_parab( self.oeDict["mu"], elems)
@@ -571,6 +870,34 @@ class OrbitalElementDispersion:
         self.dispR = r
         self.dispV = v
 
+    def generateFromUniform(self, u, sim=None):
+        """Map one dispersion design sample in (0, 1) per dispersed orbital element onto the dispersion"""
+        elems = orbitalMotion.ClassicElements
+        i = 0
+        for key in self.oeDict.keys():
+            if self.oeDict[key] is not None and key != "mu":
+                if self.oeDict[key][0] == "normal":
+                    value = self.oeDict[key][1] + self.oeDict[key][2] * float(normalInverseCdf(u[i:i+1])[0])
+                elif self.oeDict[key][0] == "uniform":
+                    value = self.oeDict[key][1] + (self.oeDict[key][2] - self.oeDict[key][1]) * float(u[i])
+                else:
+                    raise ValueError("Orbital element dispersions in a dispersion design must be 'normal' or "
+                                     "'uniform', not '" + self.oeDict[key][0] + "'")
+                setattr(elems, key, value)
+                i += 1
+            else:
+                if key != "mu":
+                    setattr(elems, key, 0.)
+        if elems.e < 0:
+            elems.e = 0
+        self.dispR, self.dispV = orbitalMotion.elem2rv_parab(self.oeDict["mu"], elems)
+
+
+    def generateValue(self, index, sim=None):
+        if index == 1:
+            return self.dispR
+        if index == 2:
+            return self.dispV
 
     def generateString(self, index, sim=None):
         if index == 1:
@@ -590,6 +917,8 @@ class OrbitalElementDispersion:
             return self.varName2
 
 class MRPDispersionPerAxis(VectorVariableDispersion):
+    numVariates = 3
+
     def __init__(self, varName, bounds=None):
         """
         A function that disperses MRPs with specfic bounds per axis.
@@ -608,3 +937,8 @@ class MRPDispersionPerAxis(VectorVariableDispersion):
             rndAngles[i] = (self.bounds[i][1] - self.bounds[i][0]) * np.random.random() + self.bounds[i][0]
         dispMRP = rndAngles.reshape(3)
         return dispMRP
+
+    def generateFromUniform(self, u, sim=None):
+        """Map three dispersion design samples in [0, 1) onto the dispersion"""
+        bounds = np.asarray(self.bounds, dtype=float)
+        return (bounds[:, 1] - bounds[:, 0]) * np.asarray(u, dtype=float) + bounds[:, 0]
@@ -40,6 +40,7 @@ class RetentionPolicy:
         self.varLogList = []
         self.dataCallback = None
         self.retentionFunctions = []
+        self.metricFunctions = {}
 
     def addMessageLog(self, name, retainedVars):
         self.messageLogList.append(MessageRetentionParameters(name, retainedVars))
@@ -58,6 +59,14 @@ class RetentionPolicy:
     def addRetentionFunction(self, function):
         self.retentionFunctions.append(function)
 
+    def addMetric(self, name, function):
+        """ Add a scalar metric of a run, computed by the worker from the retained data of the run
+        Args:
+            name: name of the metric
+            function: function of the retained data dictionary of the run returning a float
+        """
+        self.metricFunctions[name] = function
+
     def setDataCallback(self, dataCallback):
         self.dataCallback = dataCallback
 
@@ -123,4 +132,21 @@ class RetentionPolicy:
                 tmpModuleData = func(simInstance)
                 for (key, value) in tmpModuleData.items():
                     data["custom"][key] = value
-        return data
\ No newline at end of file
+        return data
+
+    @staticmethod
+    def getMetrics(retainedData, retentionPolicies):
+        """ Returns the scalar metrics of a run
+
+        Args:
+            retainedData: The retained data of the run returned by ``getDataForRetention``
+            retentionPolicies: A list of RetentionPolicy objects defining the metrics
+
+        Returns:
+            dictionary of the metric values
+        """
+        metrics = {}
+        for retentionPolicy in retentionPolicies:
+            for name, function in getattr(retentionPolicy, "metricFunctions", {}).items():
+                metrics[name] = float(function(retainedData))
+        return metrics
@@ -0,0 +1,185 @@
+#
+#  ISC License
+#
+#  Copyright (c) 2024, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+DISPERSED = "dispersed"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class RunManifest:
+    """
+    Transactional record of the state of every run of a MonteCarlo, stored as a SQLite database in the archive
+    directory. Each run moves through the states ``dispersed`` (parameters generated), ``running``, and finally
+    ``done`` (with the checksum of its retained data file) or ``failed``.
+
+    The manifest is written by the worker processes as the runs progress, so after a crash it tells the
+    ``Controller`` which runs still have to be executed. A run whose data is retained is only recorded as done by the
+    data writer, once the writer has saved it.
+
+    Args:
+        filename: path to the manifest database
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._connection = None
+
+    def __getstate__(self):
+        # the database connection cannot be sent to another process, it is reopened on first use
+        state = self.__dict__.copy()
+        state["_connection"] = None
+        return state
+
+    def connection(self):
+        if self._connection is None:
+            # the timeout lets the worker processes wait on each other's write transactions
+            self._connection = sqlite3.connect(self.filename, timeout=60.)
+            with self._connection:
+                self._connection.execute("CREATE TABLE IF NOT EXISTS runs ("
+                                         "runIndex INTEGER PRIMARY KEY, "
+                                         "status TEXT NOT NULL, "
+                                         "parameters TEXT, "
+                                         "outputFile TEXT, "
+                                         "checksum TEXT, "
+                                         "wallTime REAL, "
+                                         "metrics TEXT, "
+                                         "updated REAL)")
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def setStatus(self, runIndex, status):
+        with self.connection() as connection:
+            connection.execute("INSERT INTO runs (runIndex, status, updated) VALUES (?, ?, ?) "
+                               "ON CONFLICT(runIndex) DO UPDATE SET status=excluded.status, updated=excluded.updated",
+                               (runIndex, status, time.time()))
+
+    def markDispersed(self, runIndex, modifications):
+        """
+        Record the parameters and random seeds applied to a run
+
+        Args:
+            runIndex: int
+            modifications: dict of the parameter modifications of the run
+        """
+        with self.connection() as connection:
+            connection.execute("INSERT INTO runs (runIndex, status, parameters, updated) VALUES (?, ?, ?, ?) "
+                               "ON CONFLICT(runIndex) DO UPDATE SET status=excluded.status, "
+                               "parameters=excluded.parameters, updated=excluded.updated",
+                               (runIndex, DISPERSED, json.dumps(modifications), time.time()))
+
+    def markRunning(self, runIndex):
+        self.setStatus(runIndex, RUNNING)
+
+    def markFailed(self, runIndex):
+        self.setStatus(runIndex, FAILED)
+
+    def markDone(self, runIndex, outputFile=None, checksum=None, wallTime=None, metrics=None):
+        """
+        Record that a run finished successfully
+
+        Args:
+            runIndex: int
+            outputFile: path to the retained data file of the run, if any
+            checksum: sha256 hex digest of the retained data file
+            wallTime: run wall time in seconds
+            metrics: dict of the scalar metrics of the run
+        """
+        with self.connection() as connection:
+            connection.execute("INSERT INTO runs (runIndex, status, outputFile, checksum, wallTime, metrics, updated) "
+                               "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                               "ON CONFLICT(runIndex) DO UPDATE SET status=excluded.status, "
+                               "outputFile=excluded.outputFile, checksum=excluded.checksum, "
+                               "wallTime=excluded.wallTime, metrics=excluded.metrics, updated=excluded.updated",
+                               (runIndex, DONE, outputFile, checksum, wallTime,
+                                None if metrics is None else json.dumps(metrics), time.time()))
+
+    def getStatus(self, runIndex):
+        """
+        Get the state of a run, or None if the run was never started
+        """
+        row = self.connection().execute("SELECT status FROM runs WHERE runIndex=?", (runIndex,)).fetchone()
+        return None if row is None else row[0]
+
+    def getRunsWithStatus(self, status):
+        """
+        Get the sorted list of the runs in a given state
+        """
+        rows = self.connection().execute("SELECT runIndex FROM runs WHERE status=? ORDER BY runIndex", (status,))
+        return [row[0] for row in rows]
+
+    def getParameters(self, runIndex):
+        """
+        Get the parameter modifications recorded for a run, or None if the run was never dispersed
+        """
+        row = self.connection().execute("SELECT parameters FROM runs WHERE runIndex=?", (runIndex,)).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return json.loads(row[0])
+
+    def getMetrics(self):
+        """
+        Get the metrics recorded for the finished runs, as a dict of the metrics dictionary of each run
+        """
+        rows = self.connection().execute("SELECT runIndex, metrics FROM runs WHERE status=? AND metrics IS NOT NULL",
+                                         (DONE,))
+        return {runIndex: json.loads(metrics) for runIndex, metrics in rows}
+
+    def getPendingRuns(self, numRuns, verify=True):
+        """
+        Get the runs of a MonteCarlo that still have to be executed: the runs that never finished, failed, or whose
+        retained data file no longer matches its recorded checksum.
+
+        Args:
+            numRuns: int
+                The total number of runs of the MonteCarlo.
+            verify: bool
+                Whether to check the retained data files of the finished runs against their checksums.
+        Returns:
+            int[] the sorted list of pending runs
+        """
+        done = set()
+        rows = self.connection().execute("SELECT runIndex, outputFile, checksum FROM runs WHERE status=?", (DONE,))
+        for runIndex, outputFile, checksum in rows:
+            if verify and checksum is not None and fileChecksum(outputFile) != checksum:
+                continue
+            done.add(runIndex)
+        return [runIndex for runIndex in range(numRuns) if runIndex not in done]
+
+
+def fileChecksum(filename):
+    """
+    Compute the sha256 hex digest of a file, or None if the file does not exist
+    """
+    if filename is None or not os.path.exists(filename):
+        return None
+    digest = hashlib.sha256()
+    with open(filename, "rb") as dataFile:
+        for chunk in iter(lambda: dataFile.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
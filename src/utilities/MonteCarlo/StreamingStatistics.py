@@ -0,0 +1,268 @@
+#
+#  ISC License
+#
+#  Copyright (c) 2024, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+import heapq
+
+import numpy as np
+import pandas as pd
+
+
+class StreamingStatistics:
+    """
+    Statistics across the runs of a MonteCarlo for every time sample and component of a retained variable, computed
+    in a single pass over the runs, one run at a time. Only the statistics are held in memory, never the runs.
+
+    For each time sample and component it keeps the number of runs, the mean and variance (Welford's algorithm), the
+    minimum and maximum, and P-squared estimates of the requested quantiles. It also keeps the ``numExtrema`` runs
+    whose values deviate the most from a reference curve (zero unless set with ``setReference()``) within a time
+    window.
+
+    The time samples are those of the first run that has data, or ``times`` if given. Samples of the other runs that
+    are not on these times are ignored.
+
+    A ``StreamingStatistics`` can be attached to the MonteCarlo data writer with ``Controller.addStatistics()``, so
+    the statistics of a variable are saved next to its data as ``<variable>.stats.npz`` when the MonteCarlo finishes.
+
+    Args:
+        quantiles: the probabilities of the quantiles to estimate
+        numExtrema: int, number of most deviant (run, component) pairs to keep
+        window: optional [start, stop] time window in nanoseconds in which the extrema are searched
+        times: optional time samples in nanoseconds
+    """
+
+    def __init__(self, quantiles=(0.05, 0.5, 0.95), numExtrema=0, window=None, times=None):
+        self.quantiles = np.array(quantiles, dtype=float).reshape(-1)
+        self.numExtrema = numExtrema
+        self.window = window
+        self.times = None
+        self.numComponents = None
+        self.reference = None
+        self._extrema = []
+        if times is not None:
+            self.allocate(np.asarray(times, dtype=float), None)
+
+    def allocate(self, times, numComponents):
+        self.times = times
+        self.numComponents = numComponents
+        if numComponents is None:
+            return
+        shape = (len(times), numComponents)
+        self.count = np.zeros(shape, dtype=np.int64)
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+        self.min = np.full(shape, np.inf)
+        self.max = np.full(shape, -np.inf)
+        # P-squared markers (heights) and their positions, five per quantile and per cell
+        self.markers = np.zeros((len(self.quantiles), shape[0] * shape[1], 5))
+        self.positions = np.zeros((len(self.quantiles), shape[0] * shape[1], 5))
+
+    def setReference(self, reference):
+        """
+        Set the curve the deviation of the extrema is measured from, a (numTimes, numComponents) array on the time
+        samples of the statistics, such as the mean of a previous pass
+        """
+        self.reference = np.asarray(reference, dtype=float)
+
+    def update(self, runNum, times, values):
+        """
+        Add one run to the statistics
+
+        Args:
+            runNum: the run index
+            times: array of the time samples of the run in nanoseconds
+            values: (numTimes, numComponents) array of the values of the run
+        """
+        times = np.asarray(times, dtype=float).reshape(-1)
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 1:
+            values = values.reshape(-1, 1)
+        if len(times) == 0 or values.shape[0] != len(times):
+            return
+        if self.times is None or self.numComponents is None:
+            self.allocate(times if self.times is None else self.times, values.shape[1])
+        if values.shape[1] != self.numComponents:
+            return
+
+        # align the run on the time samples of the statistics
+        rows = np.searchsorted(self.times, times)
+        onGrid = rows < len(self.times)
+        onGrid[onGrid] = self.times[rows[onGrid]] == times[onGrid]
+        x = np.full(self.mean.shape, np.nan)
+        x[rows[onGrid]] = values[onGrid]
+        valid = ~np.isnan(x)
+
+        self.count += valid
+        delta = np.where(valid, x - self.mean, 0.)
+        self.mean += np.where(valid, delta / np.maximum(self.count, 1), 0.)
+        self.m2 += np.where(valid, delta * (x - self.mean), 0.)
+        self.min = np.fmin(self.min, x)
+        self.max = np.fmax(self.max, x)
+        if len(self.quantiles) > 0:
+            self.updateQuantiles(x.reshape(-1), valid.reshape(-1), self.count.reshape(-1))
+        if self.numExtrema > 0:
+            self.updateExtrema(runNum, x)
+
+    def updateQuantiles(self, x, valid, count):
+        # cells still collecting their first five observations store them as their markers
+        filling = np.nonzero(valid & (count <= 5))[0]
+        if len(filling) > 0:
+            self.markers[:, filling, count[filling] - 1] = x[filling]
+            ready = filling[count[filling] == 5]
+            self.markers[:, ready] = np.sort(self.markers[:, ready], axis=2)
+            self.positions[:, ready] = np.arange(1., 6.)
+
+        cells = np.nonzero(valid & (count > 5))[0]
+        if len(cells) == 0:
+            return
+        q = self.markers[:, cells]
+        n = self.positions[:, cells]
+        xs = np.broadcast_to(x[cells], q.shape[:2])
+        q[..., 0] = np.minimum(q[..., 0], xs)
+        q[..., 4] = np.maximum(q[..., 4], xs)
+        cellIdx = (xs[..., None] >= q[..., 1:4]).sum(axis=2)
+        n += np.arange(5) > cellIdx[..., None]
+        increments = np.stack([np.zeros_like(self.quantiles), self.quantiles / 2, self.quantiles,
+                               (1 + self.quantiles) / 2, np.ones_like(self.quantiles)], axis=1)
+        desired = 1 + (count[cells][None, :, None] - 1) * increments[:, None, :]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for i in range(1, 4):
+                d = desired[..., i] - n[..., i]
+                adjust = (((d >= 1) & (n[..., i + 1] - n[..., i] > 1))
+                          | ((d <= -1) & (n[..., i - 1] - n[..., i] < -1)))
+                s = np.sign(d)
+                parabolic = q[..., i] + s / (n[..., i + 1] - n[..., i - 1]) * (
+                    (n[..., i] - n[..., i - 1] + s) * (q[..., i + 1] - q[..., i]) / (n[..., i + 1] - n[..., i])
+                    + (n[..., i + 1] - n[..., i] - s) * (q[..., i] - q[..., i - 1]) / (n[..., i] - n[..., i - 1]))
+                qNeighbor = np.where(s > 0, q[..., i + 1], q[..., i - 1])
+                nNeighbor = np.where(s > 0, n[..., i + 1], n[..., i - 1])
+                linear = q[..., i] + s * (qNeighbor - q[..., i]) / (nNeighbor - n[..., i])
+                estimate = np.where((q[..., i - 1] < parabolic) & (parabolic < q[..., i + 1]), parabolic, linear)
+                q[..., i] = np.where(adjust, estimate, q[..., i])
+                n[..., i] += np.where(adjust, s, 0.)
+
+        self.markers[:, cells] = q
+        self.positions[:, cells] = n
+
+    def updateExtrema(self, runNum, x):
+        rows = slice(None)
+        if self.window is not None:
+            rows = (self.times >= self.window[0]) & (self.times <= self.window[1])
+        deviation = np.abs(x - (0. if self.reference is None else self.reference))[rows]
+        hasData = ~np.isnan(deviation).all(axis=0)
+        peak = np.max(np.where(np.isnan(deviation), -np.inf, deviation), axis=0, initial=-np.inf)
+        for component, value in enumerate(peak):
+            if not hasData[component]:
+                continue
+            entry = (float(value), int(runNum), component)
+            if len(self._extrema) < self.numExtrema:
+                heapq.heappush(self._extrema, entry)
+            elif entry > self._extrema[0]:
+                heapq.heapreplace(self._extrema, entry)
+
+    def getCount(self):
+        """Number of runs contributing to every time sample and component"""
+        return self.count
+
+    def getMean(self):
+        return np.where(self.count > 0, self.mean, np.nan)
+
+    def getVariance(self, ddof=1):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.count > ddof, self.m2 / (self.count - ddof), np.nan)
+
+    def getStd(self, ddof=1):
+        return np.sqrt(self.getVariance(ddof))
+
+    def getMin(self):
+        return np.where(self.count > 0, self.min, np.nan)
+
+    def getMax(self):
+        return np.where(self.count > 0, self.max, np.nan)
+
+    def getQuantile(self, probability):
+        """
+        Get the estimate of a quantile that was requested when creating the statistics, as a (numTimes,
+        numComponents) array. Cells with fewer than five runs use the exact quantile of their runs.
+        """
+        matches = np.nonzero(np.isclose(self.quantiles, probability))[0]
+        if len(matches) == 0:
+            raise ValueError("The quantile " + str(probability) + " is not tracked by these statistics, "
+                             "tracked quantiles are " + str(self.quantiles.tolist()))
+        markers = self.markers[matches[0]]
+        count = self.count.reshape(-1)
+        estimate = markers[:, 2].copy()
+        for numRuns in range(1, 5):
+            cells = count == numRuns
+            estimate[cells] = np.quantile(markers[cells, :numRuns], probability, axis=1)
+        estimate[count == 0] = np.nan
+        return estimate.reshape(self.count.shape)
+
+    def getExtrema(self):
+        """
+        Get the (deviation, runNum, component) of the most deviant runs, sorted by decreasing deviation
+        """
+        return sorted(self._extrema, reverse=True)
+
+    def getExtremaRunIndices(self):
+        """
+        Get the run indices of the most deviant (run, component) pairs, sorted by decreasing deviation
+        """
+        return np.array([runNum for _, runNum, _ in self.getExtrema()], dtype=int)
+
+    def getDataFrame(self, values):
+        """
+        Wrap a (numTimes, numComponents) statistic in a dataframe indexed by time
+        """
+        return pd.DataFrame(values, index=pd.Index(self.times, name='time[ns]'))
+
+    def save(self, filename):
+        """
+        Save the statistics, they can be loaded back and updated with more runs
+        """
+        extrema = np.array(self.getExtrema(), dtype=float).reshape(-1, 3)
+        state = {"quantiles": self.quantiles, "numExtrema": self.numExtrema, "extrema": extrema,
+                 "window": np.array([] if self.window is None else self.window, dtype=float)}
+        if self.reference is not None:
+            state["reference"] = self.reference
+        if self.times is not None:
+            state["times"] = self.times
+        if self.times is not None and self.numComponents is not None:
+            state.update(count=self.count, mean=self.mean, m2=self.m2, min=self.min, max=self.max,
+                         markers=self.markers, positions=self.positions)
+        with open(filename, "wb") as statsFile:
+            np.savez(statsFile, **state)
+
+    @classmethod
+    def load(cls, filename):
+        with np.load(filename) as state:
+            window = state["window"].tolist()
+            stats = cls(state["quantiles"], int(state["numExtrema"]), window if len(window) == 2 else None)
+            if "times" in state:
+                stats.times = state["times"]
+                stats.numComponents = None
+            if "count" in state:
+                stats.numComponents = state["count"].shape[1]
+                for name in ["count", "mean", "m2", "min", "max", "markers", "positions"]:
+                    setattr(stats, name, state[name])
+            if "reference" in state:
+                stats.reference = state["reference"]
+            stats._extrema = [(float(value), int(runNum), int(component))
+                              for value, runNum, component in state["extrema"]]
+            heapq.heapify(stats._extrema)
+        return stats
@@ -0,0 +1,393 @@
+#
+#  ISC License
+#
+#  Copyright (c) 2024, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+"""
+Work queue that lets MonteCarlo workers on any number of hosts pull runs from a ``Controller`` over TCP.
+
+The controller serves the runs with ``Controller.setWorkQueue()``. A worker is started on each host with::
+
+    python -m Basilisk.utilities.MonteCarlo.WorkQueue coordinatorHost:port --authkey secret --processes 8
+
+The simulation creation and execution functions of the MonteCarlo are sent by reference, so they must be defined in
+a module that is importable on the worker hosts (not in the ``__main__`` script of the coordinator), and the archive
+directory must be reachable at the same path (shared filesystem).
+"""
+
+import argparse
+import collections
+import multiprocessing as mp
+import os
+import queue
+import socket
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+
+CASE = "case"
+WAIT = "wait"
+STOP = "stop"
+
+# the methods of the work queue that the workers may call
+WORKER_METHODS = ("getCase", "heartbeat", "putResult", "putLost", "putData")
+
+
+class WorkQueue:
+    """
+    Coordinator side state of the work queue: the runs still to be handed out, the runs in flight on the workers and
+    the results sent back. Workers call its public methods through a ``WorkQueueClient``.
+
+    A worker sends a heartbeat for its runs while they execute, and reports the runs whose process died or timed out
+    as lost. A lost run, or a run whose worker has not been heard from for ``heartbeatTimeout`` seconds, is handed out
+    again, up to ``maxRetries`` times, before it is recorded as failed.
+
+    Args:
+        simGenerator: iterable of the SimulationParameters of the runs, only consumed as the workers ask for runs
+        dataOutQueue: the queue of the data writer of the coordinator, None if no data is retained
+        heartbeatTimeout: float, seconds
+        maxRetries: int
+    """
+
+    def __init__(self, simGenerator, dataOutQueue, heartbeatTimeout=60., maxRetries=2):
+        self.simGenerator = iter(simGenerator)
+        self.dataOutQueue = dataOutQueue
+        self.heartbeatTimeout = heartbeatTimeout
+        self.maxRetries = maxRetries
+        self.results = queue.Queue()
+        self.retries = collections.deque()
+        self.inFlight = {}
+        self.attempts = collections.Counter()
+        self.exhausted = False
+        self.stopped = False
+        self.lock = threading.Lock()
+
+    def getCase(self, workerId):
+        """
+        Hand out the next run
+
+        Returns:
+            (``"case"``, SimulationParameters) a run to execute,
+            (``"wait"``, None) if all runs are handed out but some may still have to be retried,
+            (``"stop"``, None) once the MonteCarlo is finished
+        """
+        with self.lock:
+            self.requeueExpired()
+            if self.stopped:
+                return STOP, None
+            simParams = None
+            if self.retries:
+                simParams = self.retries.popleft()
+            elif not self.exhausted:
+                simParams = next(self.simGenerator, None)
+                self.exhausted = simParams is None
+            if simParams is None:
+                return (WAIT, None) if self.inFlight else (STOP, None)
+            self.inFlight[simParams.index] = [simParams, workerId, time.monotonic()]
+            return CASE, simParams
+
+    def heartbeat(self, workerId, indices):
+        """Record that a worker is still executing its runs"""
+        now = time.monotonic()
+        with self.lock:
+            for index in indices:
+                case = self.inFlight.get(index)
+                if case is not None and case[1] == workerId:
+                    case[2] = now
+
+    def putResult(self, workerId, result):
+        """
+        Send back the (success, index, wallTime, metrics) result of a run. Late results of a run that was already handed out
+        to another worker are ignored.
+        """
+        with self.lock:
+            case = self.inFlight.get(result[1])
+            if case is None or case[1] != workerId:
+                return
+            del self.inFlight[result[1]]
+        self.results.put(tuple(result))
+
+    def putLost(self, workerId, index, reason):
+        """Hand out again a run that a worker could not finish"""
+        with self.lock:
+            case = self.inFlight.get(index)
+            if case is None or case[1] != workerId:
+                return
+            del self.inFlight[index]
+            self.loseCase(case[0], workerId, reason)
+
+    def putData(self, item):
+        """Forward the retained data of a run to the data writer of the coordinator"""
+        if self.dataOutQueue is not None:
+            self.dataOutQueue.put(item)
+
+    def requeueExpired(self):
+        # must be called with the lock held
+        now = time.monotonic()
+        for index, (simParams, workerId, lastSeen) in list(self.inFlight.items()):
+            if now - lastSeen <= self.heartbeatTimeout:
+                continue
+            del self.inFlight[index]
+            self.loseCase(simParams, workerId, "no heartbeat")
+
+    def loseCase(self, simParams, workerId, reason):
+        # must be called with the lock held
+        index = simParams.index
+        self.attempts[index] += 1
+        if self.attempts[index] > self.maxRetries:
+            print("Run", index, "lost with worker", workerId, "(" + reason + ") too many times, giving up")
+            self.results.put((False, index, 0., {}))
+        else:
+            print("Run", index, "lost with worker", workerId, "(" + reason + "), handing it out again")
+            self.retries.append(simParams)
+
+    def poll(self):
+        """Hand out again the runs of the workers that stopped sending heartbeats"""
+        with self.lock:
+            self.requeueExpired()
+
+    def stop(self):
+        """Tell the workers to stop once their current runs are done"""
+        with self.lock:
+            self.stopped = True
+
+
+class WorkQueueServer:
+    """
+    Serve a work queue over TCP from a background thread of this process. Each worker connection is served by its own
+    thread, which calls the public methods of the work queue requested by the worker, see ``WorkQueueClient``.
+
+    Args:
+        workQueue: WorkQueue
+        address: (host, port), port 0 picks a free port
+        authkey: bytes, the key the workers authenticate with
+    """
+
+    def __init__(self, workQueue, address, authkey):
+        self.workQueue = workQueue
+        self.listener = Listener(tuple(address), authkey=authkey)
+        host, port = self.listener.address
+        # the address local workers connect to
+        self.address = ("127.0.0.1" if host in ("", "0.0.0.0") else host, port)
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.accept, daemon=True)
+        self.thread.start()
+
+    def accept(self):
+        while not self.stopped.is_set():
+            try:
+                connection = self.listener.accept()
+            except Exception:
+                # a connection that failed to authenticate, or the wake up of stop()
+                continue
+            if self.stopped.is_set():
+                connection.close()
+                break
+            # the work queue serializes the connection threads with its lock
+            threading.Thread(target=self.serve, args=(connection,), daemon=True).start()
+        self.listener.close()
+
+    def serve(self, connection):
+        with connection:
+            while not self.stopped.is_set():
+                try:
+                    method, args = connection.recv()
+                except (EOFError, OSError):
+                    return
+                if method in WORKER_METHODS:
+                    try:
+                        reply = (True, getattr(self.workQueue, method)(*args))
+                    except Exception as e:
+                        reply = (False, e)
+                else:
+                    reply = (False, AttributeError("The work queue has no method " + repr(method)))
+                try:
+                    connection.send(reply)
+                except OSError:
+                    return
+
+    def stop(self):
+        """Stop accepting connections"""
+        self.stopped.set()
+        try:
+            # wake up the thread blocked on accept
+            socket.create_connection(self.address, timeout=1.).close()
+        except OSError:
+            pass
+        self.thread.join(5.)
+
+
+class WorkQueueClient:
+    """
+    Connection of a worker process to the work queue of a coordinator, see ``WorkQueue`` for its methods
+
+    Args:
+        address: (host, port) of the coordinator
+        authkey: bytes
+    """
+
+    def __init__(self, address, authkey):
+        self.connection = Client(tuple(address), authkey=authkey)
+
+    def call(self, method, *args):
+        self.connection.send((method, args))
+        success, value = self.connection.recv()
+        if not success:
+            raise value
+        return value
+
+    def getCase(self, workerId):
+        return self.call("getCase", workerId)
+
+    def heartbeat(self, workerId, indices):
+        self.call("heartbeat", workerId, indices)
+
+    def putResult(self, workerId, result):
+        self.call("putResult", workerId, result)
+
+    def putLost(self, workerId, index, reason):
+        self.call("putLost", workerId, index, reason)
+
+    def putData(self, item):
+        self.call("putData", item)
+
+    def close(self):
+        self.connection.close()
+
+
+def connectWorkQueue(address, authkey):
+    """Connect to the work queue of a coordinator, returns a ``WorkQueueClient``"""
+    return WorkQueueClient(address, authkey)
+
+
+class RemoteDataQueue:
+    """
+    Stand-in for the data queue of the coordinator in the processes of a worker, the retained data of a run is sent
+    through the work queue connection
+    """
+
+    def __init__(self, address, authkey):
+        self.address = address
+        self.authkey = authkey
+        self._workQueue = None
+
+    def __getstate__(self):
+        # the connection cannot be sent to another process, it is reopened on first use
+        state = self.__dict__.copy()
+        state["_workQueue"] = None
+        return state
+
+    def put(self, item):
+        if self._workQueue is None:
+            self._workQueue = connectWorkQueue(self.address, self.authkey)
+        self._workQueue.putData(item)
+
+
+def executeRun(simParams, dataQueue, resultConnection):
+    """Execute one run in a process of a worker, and send its result back to the worker"""
+    from Basilisk.utilities.MonteCarlo.Controller import SimulationExecutor
+
+    try:
+        result = SimulationExecutor()([simParams, dataQueue])
+    except Exception:
+        result = (False, simParams.index, 0., {})
+    resultConnection.send(result)
+    resultConnection.close()
+
+
+def runWorker(address, authkey, numProcess=1, heartbeatInterval=5., runTimeout=None):
+    """
+    Execute runs pulled from the work queue of a coordinator until the MonteCarlo is finished
+
+    Each run is executed in its own process, so the heartbeats are sent even while a simulation holds the GIL. The
+    heartbeats only cover the runs whose process is alive and within the run time limit. A run whose process died,
+    or that exceeded the time limit and was killed, is reported as lost and handed out again by the coordinator.
+
+    Args:
+        address: (host, port) of the coordinator
+        authkey: bytes
+        numProcess: int, the number of runs executed in parallel by this worker
+        heartbeatInterval: float, seconds between two heartbeats
+        runTimeout: float, seconds of wall time after which a run is killed, None for no limit
+    """
+    workerId = socket.gethostname() + ":" + str(os.getpid())
+    workQueue = connectWorkQueue(address, authkey)
+    dataQueue = RemoteDataQueue(tuple(address), authkey)
+    running = {}
+    stopping = False
+    lastHeartbeat = time.monotonic()
+
+    def stopRun(index):
+        process, connection, startTime = running.pop(index)
+        if process.is_alive():
+            process.terminate()
+        process.join()
+        connection.close()
+
+    try:
+        while running or not stopping:
+            for index, (process, connection, startTime) in list(running.items()):
+                # a process that exits right after sending its result still has the result in the pipe
+                alive = process.is_alive()
+                result = None
+                if connection.poll():
+                    try:
+                        result = connection.recv()
+                    except EOFError:
+                        # the process died without sending a result
+                        alive = False
+                if result is not None:
+                    stopRun(index)
+                    workQueue.putResult(workerId, result)
+                elif not alive:
+                    stopRun(index)
+                    workQueue.putLost(workerId, index, "process exited with code " + str(process.exitcode))
+                elif runTimeout is not None and time.monotonic() - startTime > runTimeout:
+                    stopRun(index)
+                    workQueue.putLost(workerId, index, "run exceeded " + str(runTimeout) + " s")
+
+            if running and time.monotonic() - lastHeartbeat > heartbeatInterval:
+                workQueue.heartbeat(workerId, list(running))
+                lastHeartbeat = time.monotonic()
+
+            if not stopping and len(running) < numProcess:
+                kind, simParams = workQueue.getCase(workerId)
+                if kind == CASE:
+                    receiver, sender = mp.Pipe(duplex=False)
+                    process = mp.Process(target=executeRun, args=(simParams, dataQueue, sender), daemon=True)
+                    process.start()
+                    sender.close()
+                    running[simParams.index] = (process, receiver, time.monotonic())
+                    continue
+                stopping = kind == STOP
+            time.sleep(0.1)
+    except Exception as e:
+        print("Stopping worker", workerId, "after losing the coordinator:", e)
+    finally:
+        for index in list(running):
+            stopRun(index)
+        workQueue.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Execute the runs of a MonteCarlo served by a Controller")
+    parser.add_argument("address", help="host:port of the coordinator")
+    parser.add_argument("--authkey", required=True, help="key set with Controller.setWorkQueue()")
+    parser.add_argument("--processes", type=int, default=mp.cpu_count(), help="runs executed in parallel")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds after which a run is killed")
+    args = parser.parse_args()
+    host, port = args.address.rsplit(":", 1)
+    runWorker((host, int(port)), args.authkey.encode(), args.processes, runTimeout=args.timeout)
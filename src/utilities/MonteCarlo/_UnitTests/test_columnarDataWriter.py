@@ -0,0 +1,85 @@
+#
+#  ISC License
+#
+#  Copyright (c) 2024, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+import gzip
+import pickle
+import queue
+
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from Basilisk.utilities.MonteCarlo.DataWriter import ColumnarDataWriter, ColumnarDataReader, isColumnarData, \
+    packRetainedData, releaseSharedBlock
+from Basilisk.utilities.MonteCarlo.RunManifest import RunManifest, fileChecksum
+
+
+def test_columnarDataWriter(tmp_path):
+    """Runs appended by the columnar writer are read back lazily, per run and per time window"""
+    writer = ColumnarDataWriter(None)
+    filePath = str(tmp_path / "scStateMsg.r_BN_N.data")
+
+    runs = {}
+    for runNum in [0, 2, 1]:
+        times = np.arange(5) * 1E9
+        runs[runNum] = np.column_stack([times, np.random.random((5, 3))])
+        writer.writeItem(filePath, runs[runNum], runNum)
+    # a run without data is recorded, but has no rows
+    writer.writeItem(filePath, [], 3)
+
+    assert isColumnarData(filePath)
+    reader = ColumnarDataReader(filePath)
+    assert reader.getRunIndices() == [0, 1, 2, 3]
+    assert reader.numComponents == 3
+    for runNum, runData in runs.items():
+        times, values = reader.getRun(runNum)
+        assert_array_equal(times, runData[:, 0])
+        assert_array_equal(values, runData[:, 1:])
+    times, values = reader.getRun(1, window=[1E9, 3E9])
+    assert_array_equal(values, runs[1][1:4, 1:])
+    assert reader.getRun(3)[1].shape == (0, 3)
+
+    df = reader.getDataFrame(runs=[1, 3], window=[2E9, 4E9])
+    assert list(df.columns.get_level_values(0).unique()) == [1, 3]
+    assert_array_equal(df[1].values, runs[1][2:, 1:])
+    assert np.isnan(df[3].values).all()
+
+
+def test_dataWriterRunFile(tmp_path):
+    """The writer saves the run file of a run handed over through shared memory, then records the run as done"""
+    dataQueue = queue.Queue()
+    writer = ColumnarDataWriter(dataQueue)
+    writer.setLogDir(str(tmp_path) + "/")
+    writer.setManifestFile(str(tmp_path / "manifest.db"))
+
+    runData = np.column_stack([np.arange(5) * 1E9, np.random.random((5, 3))])
+    descriptor, block = packRetainedData({"messages": {"scStateMsg.r_BN_N": runData}})
+    runFile = str(tmp_path / "run4.data")
+    dataQueue.put((descriptor, 4, None, (runFile, 1.5, {"miss": 2.})))
+    releaseSharedBlock(block)
+    dataQueue.put((None, None, True))
+    writer.run()
+
+    with gzip.open(runFile) as pickledData:
+        saved = pickle.load(pickledData)
+    assert saved["index"] == 4
+    assert_array_equal(saved["messages"]["scStateMsg.r_BN_N"], runData)
+    manifest = RunManifest(str(tmp_path / "manifest.db"))
+    assert manifest.getPendingRuns(5) == [0, 1, 2, 3]
+    assert manifest.getMetrics() == {4: {"miss": 2.}}
+    row = manifest.connection().execute("SELECT checksum FROM runs WHERE runIndex=4").fetchone()
+    assert row[0] == fileChecksum(runFile)
+    manifest.close()
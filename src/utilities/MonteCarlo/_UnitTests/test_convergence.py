@@ -0,0 +1,107 @@
+#
+#  ISC License
+#
+#  Copyright (c) 2024, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+import numpy as np
+import pytest
+
+from Basilisk.utilities.MonteCarlo.Controller import Controller
+from Basilisk.utilities.MonteCarlo.Convergence import MeanConvergence, ProbabilityConvergence, IMPORTANCE_WEIGHT
+from Basilisk.utilities.MonteCarlo.Dispersions import UniformDispersion
+from Basilisk.utilities.MonteCarlo.RetentionPolicy import RetentionPolicy
+
+
+class Sim:
+    def __init__(self):
+        self.value = 0.
+        self.TaskList = []
+
+
+def createSim():
+    return Sim()
+
+
+def executeSim(sim):
+    pass
+
+
+def retainValue(sim):
+    return {"value": sim.value}
+
+
+def valueMetric(retainedData):
+    return retainedData["custom"]["value"]
+
+
+def proposalWeight(modifications):
+    # nominal U(0, 1) density over the proposal U(0.8, 1) density
+    return 0.2
+
+
+def createMonteCarlo(archiveDir, bounds):
+    monteCarlo = Controller()
+    monteCarlo.setSimulationFunction(createSim)
+    monteCarlo.setExecutionFunction(executeSim)
+    monteCarlo.setExecutionCount(400)
+    monteCarlo.setThreadCount(2)
+    monteCarlo.setArchiveDir(archiveDir)
+    monteCarlo.addDispersion(UniformDispersion("value", bounds))
+    retentionPolicy = RetentionPolicy()
+    retentionPolicy.addRetentionFunction(retainValue)
+    retentionPolicy.addMetric("value", valueMetric)
+    monteCarlo.addRetentionPolicy(retentionPolicy)
+    return monteCarlo
+
+
+def test_convergenceMean(tmp_path):
+    """Waves of runs stop as soon as the confidence interval of the mean is narrow enough"""
+    monteCarlo = createMonteCarlo(str(tmp_path / "mc"), [0., 1.])
+    monteCarlo.setConvergence([MeanConvergence("value", halfWidth=0.1)], waveSize=10)
+
+    assert monteCarlo.executeSimulations() == []
+    numRuns = len(monteCarlo.getRunMetrics())
+    # about (1.96 * 0.29 / 0.1)^2 = 32 runs are needed, in waves of 10
+    assert 20 <= numRuns < 100 and numRuns % 10 == 0
+    summary = monteCarlo.getConvergenceSummary()[0]
+    assert summary["converged"] and summary["halfWidth"] <= 0.1
+    assert summary["estimate"] == pytest.approx(0.5, abs=0.15)
+
+
+def test_convergenceImportanceSampling(tmp_path):
+    """A tail probability is estimated from runs drawn in the tail, weighted by their likelihood ratio"""
+    monteCarlo = createMonteCarlo(str(tmp_path / "mc"), [0.8, 1.])
+    monteCarlo.setImportanceWeight(proposalWeight)
+    monteCarlo.setConvergence([ProbabilityConvergence("value", 0.9, halfWidth=0.02)], waveSize=20)
+
+    assert monteCarlo.executeSimulations() == []
+    assert all(metrics[IMPORTANCE_WEIGHT] == 0.2 for metrics in monteCarlo.getRunMetrics().values())
+    summary = monteCarlo.getConvergenceSummary()[0]
+    assert summary["converged"]
+    # P(value > 0.9) = 0.1 under the nominal U(0, 1), with a few hundred runs at most instead of thousands
+    assert summary["estimate"] == pytest.approx(0.1, abs=0.03)
+    assert summary["numRuns"] < 400
+
+
+def test_convergenceWavesSharePool(tmp_path):
+    """The waves run on one pool, and a small last wave does not reduce the process count of later executions"""
+    monteCarlo = createMonteCarlo(str(tmp_path / "mc"), [0., 1.])
+    monteCarlo.setExecutionCount(5)
+    monteCarlo.setConvergence([MeanConvergence("value", halfWidth=1e-9)], waveSize=2)
+
+    assert monteCarlo.executeSimulations() == []
+    assert sorted(monteCarlo.getRunMetrics().keys()) == list(range(5))
+    assert monteCarlo.numProcess == 2
+    assert monteCarlo.workerPool is None
@@ -0,0 +1,103 @@
+#
+#  ISC License
+#
+#  Copyright (c) 2024, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+import types
+
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose, assert_array_equal
+
+from Basilisk.utilities.MonteCarlo.DispersionDesign import DispersionDesign
+from Basilisk.utilities.MonteCarlo.Dispersions import UniformDispersion, NormalDispersion, \
+    UniformVectorCartDispersion, UniformVectorDispersion, NormalThrusterUnitDirectionVectorDispersion, \
+    NormalVectorAngleDispersion, toNativeValue
+
+
+class WorkerDispersion(NormalDispersion):
+    """A dispersion that can only be generated by the workers"""
+    generateFromUniform = None
+    numVariates = None
+
+
+@pytest.mark.parametrize("method", ["random", "lhs"])
+def test_dispersionDesign(tmp_path, method):
+    """The design assigns columns to the dispersions that support it and is reproduced from its seed"""
+    dispersions = [UniformDispersion("a", [0., 10.]),
+                   NormalThrusterUnitDirectionVectorDispersion("thrusters.thrusterData[0].thrDir_B"),
+                   UniformVectorCartDispersion("b", [-1., 1.]),
+                   WorkerDispersion("d"),
+                   NormalDispersion("c", 1., 0.1)]
+    if method == "random":
+        design = DispersionDesign(dispersions, 50, method, seed=7)
+    else:
+        # the dispersions left to the workers are not space-filling
+        with pytest.warns(UserWarning, match="WorkerDispersion"):
+            design = DispersionDesign(dispersions, 50, method, seed=7)
+    assert design.matrix.shape == (50, 7)
+    assert design.getSlices() == [slice(0, 1), slice(1, 3), slice(3, 6), None, slice(6, 7)]
+    assert np.all((design.matrix >= 0.) & (design.matrix < 1.))
+    if method == "lhs":
+        # exactly one sample per stratum in every column
+        assert_array_equal(np.sort(np.floor(design.matrix * 50), axis=0), np.tile(np.arange(50), (7, 1)).T)
+
+    assert_array_equal(DispersionDesign(dispersions, 50, method, seed=7).matrix, design.matrix)
+    design.save(str(tmp_path))
+    loaded = DispersionDesign.load(str(tmp_path))
+    assert_array_equal(loaded.matrix, design.matrix)
+    runSeeds = design.getRunSeeds()
+    for loadedSeed, runSeed in zip(loaded.getRunSeeds(), runSeeds):
+        assert loadedSeed.entropy == runSeed.entropy and loadedSeed.spawn_key == runSeed.spawn_key
+    # every run has its own spawn key of the full entropy of the design
+    assert len({runSeed.spawn_key for runSeed in runSeeds}) == 50
+    assert all(runSeed.entropy == design.entropy for runSeed in runSeeds)
+
+    row = design.matrix[3]
+    assert dispersions[0].generateFromUniform(row[0:1]) == pytest.approx(10. * row[0])
+    assert np.all(np.abs(np.array(dispersions[2].generateFromUniform(row[3:6]))) <= 1.)
+    vectorDispersion = UniformVectorDispersion("e", [0., 2.])
+    assert_allclose(vectorDispersion.generateFromUniform([0., 0.5, 0.75]), [0., 1., 1.5])
+    assert vectorDispersion.getDispersionMag() == ["-100.0 %", "0.0 %", "50.0 %"]
+
+
+def test_angleDispersionsFromUniform():
+    """The angle dispersions map the design samples onto unit vectors, at the median for samples of 0.5"""
+    thrDir_B = [[0.], [0.], [1.]]
+    sim = types.SimpleNamespace(thrusters=types.SimpleNamespace(thrusterData=[types.SimpleNamespace(thrDir_B=thrDir_B)]),
+                                vector=np.array(thrDir_B))
+
+    thrusterDisp = NormalThrusterUnitDirectionVectorDispersion("thrusters.thrusterData[0].thrDir_B", phiStd=0.1)
+    assert_allclose(thrusterDisp.generateFromUniform(np.array([0.5, 0.3]), sim), [0., 0., 1.])
+    # the dispersion angle follows the normal quantile of the first sample, for any axis direction
+    for azimuthSample in [0., 0.25, 0.7]:
+        dispVec = thrusterDisp.generateFromUniform(np.array([0.8413447460685429, azimuthSample]), sim)
+        assert np.linalg.norm(dispVec) == pytest.approx(1.)
+        assert np.arccos(dispVec[2]) == pytest.approx(0.1, rel=1e-6)
+
+    angleDisp = NormalVectorAngleDispersion("vector", thetaStd=0.2, phiStd=0.2)
+    dispVec = angleDisp.generateFromUniform(np.array([0.5, 0.8413447460685429]), sim)
+    assert np.linalg.norm(dispVec) == pytest.approx(1.)
+    assert np.arccos(dispVec[2]) == pytest.approx(0.2, rel=1e-6)
+
+
+def test_archivedValues():
+    """Values archived as strings are parsed as literals, with nan and inf, and never evaluated"""
+    assert toNativeValue("[1.5, [2, -3e-2]]") == [1.5, [2, -3e-2]]
+    value = toNativeValue("[nan, -inf, np.inf]")
+    assert np.isnan(value[0]) and value[1:] == [-np.inf, np.inf]
+    for archived in ["__import__('os').getcwd()", "np.zeros(3)", "inf * 2"]:
+        with pytest.raises(ValueError):
+            toNativeValue(archived)
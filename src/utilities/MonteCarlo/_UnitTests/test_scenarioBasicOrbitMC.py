@@ -30,6 +30,7 @@ from Basilisk import __path__
 bskPath = __path__[0]
 
 from Basilisk.utilities.MonteCarlo.Controller import Controller, RetentionPolicy
+from Basilisk.utilities.MonteCarlo.RunManifest import RunManifest
 from Basilisk.utilities.MonteCarlo.Dispersions import UniformEulerAngleMRPDispersion, UniformDispersion, NormalVectorCartDispersion, OrbitalElementDispersion
 # import simulation related support
 from Basilisk.simulation import spacecraft
@@ -174,6 +175,28 @@ def test_MonteCarloSimulation(show_plots):
     failures = monteCarlo.executeSimulations()
 
     assert len(failures) == 0, "No runs should fail"
+    assert sorted(monteCarlo.getRunWallTimes().keys()) == list(range(NUMBER_OF_RUNS)), \
+        "Every run should report its wall time"
+
+    # the manifest records every run as done, so resuming the MonteCarlo has nothing left to execute
+    manifest = RunManifest(dirName + "/manifest.db")
+    assert manifest.getRunsWithStatus("done") == list(range(NUMBER_OF_RUNS)), "Every run should be recorded as done"
+    assert manifest.getPendingRuns(NUMBER_OF_RUNS) == [], "No run should be pending"
+    manifest.close()
+    assert len(monteCarlo.executeSimulations(resume=True)) == 0, "Resuming a finished MonteCarlo should not fail"
+    assert monteCarlo.getRunWallTimes() == {}, "Resuming a finished MonteCarlo should not execute any run"
+
+    # runs forked from a single template simulation reproduce the runs that created their own simulation
+    createdOutputs = [np.array(monteCarlo.getRetainedData(i)["messages"][retainedMessageName + ".r_BN_N"])
+                      for i in range(NUMBER_OF_RUNS)]
+    monteCarlo.setSimulationTemplateReuse(True)
+    assert len(monteCarlo.executeSimulations()) == 0, "No runs forked from the template should fail"
+    assert sorted(monteCarlo.getRunWallTimes().keys()) == list(range(NUMBER_OF_RUNS)), \
+        "Every run forked from the template should be executed"
+    for i in range(NUMBER_OF_RUNS):
+        forkedOutput = np.array(monteCarlo.getRetainedData(i)["messages"][retainedMessageName + ".r_BN_N"])
+        np.testing.assert_allclose(forkedOutput, createdOutputs[i], rtol=1e-12,
+                                   err_msg="Run " + str(i) + " forked from the template should give the same data")
 
     # Test loading data from runs from disk
     monteCarloLoaded = Controller.load(dirName)
@@ -0,0 +1,63 @@
+#
+#  ISC License
+#
+#  Copyright (c) 2024, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+
+from Basilisk.utilities.MonteCarlo.StreamingStatistics import StreamingStatistics
+
+
+def test_streamingStatistics(tmp_path):
+    """Statistics accumulated one run at a time match the statistics of all runs held in memory"""
+    rng = np.random.default_rng(0)
+    times = np.arange(40) * 1E9
+    runs = rng.normal(size=(500, 40, 3)) * np.array([1., 2., 3.]) + np.arange(40)[None, :, None]
+
+    statistics = StreamingStatistics(quantiles=[0.1, 0.5, 0.9], numExtrema=4, window=[5E9, 15E9])
+    for runNum, values in enumerate(runs):
+        statistics.update(runNum, times, values)
+    # runs without data are ignored
+    statistics.update(len(runs), [], np.empty((0, 3)))
+
+    assert_array_equal(statistics.getCount(), 500)
+    assert_allclose(statistics.getMean(), runs.mean(axis=0), atol=1E-10)
+    assert_allclose(statistics.getStd(), runs.std(axis=0, ddof=1), atol=1E-10)
+    assert_array_equal(statistics.getMin(), runs.min(axis=0))
+    assert_array_equal(statistics.getMax(), runs.max(axis=0))
+    for probability in [0.1, 0.5, 0.9]:
+        error = (statistics.getQuantile(probability) - np.quantile(runs, probability, axis=0)) / np.array([1., 2., 3.])
+        assert np.abs(error).mean() < 0.05
+
+    deviation = np.abs(runs[:, 5:16]).max(axis=1)
+    expected = sorted(((deviation[r, c], r, c) for r in range(500) for c in range(3)), reverse=True)[:4]
+    assert_array_equal(statistics.getExtremaRunIndices(), [runNum for _, runNum, _ in expected])
+
+    statistics.save(str(tmp_path / "x.stats.npz"))
+    loaded = StreamingStatistics.load(str(tmp_path / "x.stats.npz"))
+    assert_array_equal(loaded.getQuantile(0.5), statistics.getQuantile(0.5))
+    assert loaded.getExtrema() == statistics.getExtrema()
+
+
+def test_streamingStatisticsTimeAlignment():
+    """Runs are aligned on the time samples of the first run, exact quantiles are used below five runs"""
+    statistics = StreamingStatistics(quantiles=[0.5])
+    statistics.update(0, [0., 1., 2.], [[1.], [2.], [3.]])
+    statistics.update(1, [1., 2., 5.], [[5.], [7.], [9.]])
+    statistics.update(2, [0., 2.], [[3.], [4.]])
+    assert_array_equal(statistics.getCount().ravel(), [2, 2, 3])
+    assert_allclose(statistics.getMean().ravel(), [2., 3.5, 14. / 3.])
+    assert_allclose(statistics.getQuantile(0.5).ravel(), [2., 3.5, 4.])
@@ -0,0 +1,107 @@
+#
+#  ISC License
+#
+#  Copyright (c) 2024, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+import time
+
+import pytest
+
+from Basilisk.utilities.MonteCarlo.Controller import Controller
+from Basilisk.utilities.MonteCarlo.Dispersions import UniformDispersion
+from Basilisk.utilities.MonteCarlo.RunManifest import RunManifest
+from Basilisk.utilities.MonteCarlo.WorkQueue import WorkQueue, WorkQueueServer, WorkQueueClient, CASE, WAIT, STOP
+
+
+class Case:
+    def __init__(self, index):
+        self.index = index
+
+
+class Sim:
+    def __init__(self):
+        self.value = 0.
+        self.TaskList = []
+
+
+def createSim():
+    return Sim()
+
+
+def executeSim(sim):
+    pass
+
+
+def test_workQueueRetries():
+    """Runs of a worker that stops sending heartbeats are handed out again, then failed"""
+    workQueue = WorkQueue((Case(i) for i in range(2)), None, heartbeatTimeout=0.2, maxRetries=1)
+    assert workQueue.getCase("a")[1].index == 0
+    assert workQueue.getCase("b")[1].index == 1
+    assert workQueue.getCase("b")[0] == WAIT
+    workQueue.putResult("b", (True, 1, 0.1))
+
+    # worker "a" went silent, its run is handed out once more, then given up
+    time.sleep(0.3)
+    kind, case = workQueue.getCase("b")
+    assert kind == CASE and case.index == 0
+    time.sleep(0.3)
+    workQueue.poll()
+    # the late result of the first worker is ignored
+    workQueue.putResult("a", (True, 0, 0.1))
+    assert workQueue.getCase("b")[0] == STOP
+    assert workQueue.results.get_nowait() == (True, 1, 0.1)
+    assert workQueue.results.get_nowait() == (False, 0, 0., {})
+    assert workQueue.results.empty()
+
+
+def test_workQueueLostRuns():
+    """Runs whose process a worker reports as lost are handed out again, over the TCP connection of the worker"""
+    workQueue = WorkQueue((Case(i) for i in range(1)), None, maxRetries=1)
+    server = WorkQueueServer(workQueue, ("127.0.0.1", 0), b"basilisk")
+    try:
+        worker = WorkQueueClient(server.address, b"basilisk")
+        for attempt in range(2):
+            kind, case = worker.getCase("a")
+            assert kind == CASE and case.index == 0
+            worker.putLost("a", 0, "process exited with code -9")
+        assert worker.getCase("a")[0] == STOP
+        assert workQueue.results.get_nowait() == (False, 0, 0., {})
+        # only the methods meant for the workers can be called
+        with pytest.raises(AttributeError):
+            worker.call("stop")
+        worker.close()
+    finally:
+        server.stop()
+
+
+def test_workQueueLocalWorkers(tmp_path):
+    """A MonteCarlo served over the loopback interface is executed by local workers"""
+    monteCarlo = Controller()
+    monteCarlo.setSimulationFunction(createSim)
+    monteCarlo.setExecutionFunction(executeSim)
+    monteCarlo.setExecutionCount(6)
+    monteCarlo.setArchiveDir(str(tmp_path / "mc"))
+    monteCarlo.addDispersion(UniformDispersion("value", [0., 1.]))
+    monteCarlo.setWorkQueue(("127.0.0.1", 0), b"basilisk", numLocalWorkers=2)
+
+    assert monteCarlo.executeSimulations() == []
+    assert sorted(monteCarlo.getRunWallTimes().keys()) == list(range(6))
+    manifest = RunManifest(str(tmp_path / "mc" / "manifest.db"))
+    assert manifest.getPendingRuns(6) == []
+    # the coordinator records the parameters of the runs, the workers may not share the archive directory
+    for runIndex in range(6):
+        assert 0. <= manifest.getParameters(runIndex)["value"] <= 1.
+    manifest.close()
+    assert 0. <= monteCarlo.getParameters(3)["value"] <= 1.
@@ -206,6 +206,131 @@ class SimBaseClass:
             print("")
 
 
+    def ShowThreadLoad(self):
+        """
+        Shows the processes executed by each thread, with the wall time the thread spent stepping them and the
+        wall time it spent waiting at the barrier for the other threads
+        """
+        for i in range(self.TotalSim.getThreadCount()):
+            procNames = [proc.processName for proc in self.TotalSim.getThreadProcesses(i)]
+            print(f"{processColor}Thread: {endColor}" + str(i) +
+                  ", " + processColor + "busy: " + endColor + str(self.TotalSim.getThreadBusyTime(i)/1.0e9) + "s" +
+                  ", " + processColor + "barrier wait: " + endColor +
+                  str(self.TotalSim.getThreadBarrierWait(i)/1.0e9) + "s" +
+                  ", " + processColor + "processes: " + endColor + ", ".join(procNames))
+
+
+    def EnableProfiling(self, recordTrace=False):
+        """
+        Starts timing the ``UpdateState()`` calls of every module, see ``GetProfile()``.  The timing of previous
+        profiling runs is cleared.
+
+        :param recordTrace (bool): Also record every ``UpdateState()`` call, for ``WriteChromeTrace()``
+        :return:
+        """
+        self.ResetProfile()
+        for Task in self.TaskList:
+            Task.TaskData.enableProfiling(recordTrace)
+
+    def ResetProfile(self):
+        """
+        Clears the timing recorded so far, the recorded calls and the sub-step counts of the integrators.
+        """
+        for Task in self.TaskList:
+            Task.TaskData.resetProfile()
+        for model, _, _ in self.allModels:
+            integrator = getattr(model, "integrator", None)
+            if integrator is not None:
+                integrator.subStepCount = 0
+
+    def DisableProfiling(self):
+        """
+        Stops timing the ``UpdateState()`` calls.  The timing recorded so far remains available.
+        """
+        for Task in self.TaskList:
+            Task.TaskData.disableProfiling()
+
+    def _taskProcessNames(self):
+        """Names of the process of each task"""
+        taskProcesses = {}
+        for processData in self.TotalSim.processList:
+            for task in processData.processTasks:
+                taskProcesses[task.TaskPtr.TaskName] = processData.processName
+        return taskProcesses
+
+    def GetProfile(self, level="module"):
+        """
+        Returns the wall time spent in the modules, tasks or processes while profiling was enabled, from the
+        most to the least expensive.  The times are in seconds.
+
+        :param level (str): ``"module"`` for the time of each ``UpdateState()``, with the number of sub-steps of the
+            integrator of the dynamic objects, ``"task"`` for the time of each task execution, or ``"process"`` for
+            the total time of the tasks of each process
+        :return: pandas.DataFrame
+        """
+        import pandas as pd
+
+        taskProcesses = self._taskProcessNames()
+        if level == "module":
+            rows = []
+            for model, _, Task in self.allModels:
+                integrator = getattr(model, "integrator", None)
+                rows.append({"process": taskProcesses.get(Task.Name, ""), "task": Task.Name,
+                             "module": model.ModelTag, "calls": Task.TaskData.executionCount,
+                             "totalTime": model.updateNanos * 1.0e-9, "maxTime": model.maxUpdateNanos * 1.0e-9,
+                             "subSteps": getattr(integrator, "subStepCount", None)})
+            profile = pd.DataFrame(rows, columns=["process", "task", "module", "calls", "totalTime", "maxTime",
+                                                  "subSteps"])
+        elif level in ("task", "process"):
+            rows = []
+            for Task in self.TaskList:
+                rows.append({"process": taskProcesses.get(Task.Name, ""), "task": Task.Name,
+                             "calls": Task.TaskData.executionCount,
+                             "totalTime": Task.TaskData.executionNanos * 1.0e-9})
+            profile = pd.DataFrame(rows, columns=["process", "task", "calls", "totalTime"])
+            if level == "process":
+                profile = profile.groupby("process", as_index=False)["totalTime"].sum()
+        else:
+            raise ValueError(f"level must be 'module', 'task' or 'process', not '{level}'")
+        if "calls" in profile:
+            profile["meanTime"] = profile["totalTime"] / profile["calls"].where(profile["calls"] > 0)
+        return profile.sort_values("totalTime", ascending=False, kind="stable", ignore_index=True)
+
+    def WriteChromeTrace(self, fileName):
+        """
+        Writes the ``UpdateState()`` calls recorded with ``EnableProfiling(recordTrace=True)`` as a Chrome trace
+        JSON file, which chrome://tracing and https://ui.perfetto.dev display as a timeline with a row per process.
+
+        :param fileName (str): Path of the JSON file
+        :return:
+        """
+        import ctypes
+        import json
+
+        taskProcesses = self._taskProcessNames()
+        processIds = {processData.processName: i for i, processData in enumerate(self.TotalSim.processList)}
+        traces = []
+        for Task in self.TaskList:
+            count = Task.TaskData.getTraceEventCount()
+            if count == 0:
+                continue
+            buffer = (ctypes.c_uint64 * (4 * count)).from_address(Task.TaskData.traceAddress())
+            traces.append((Task, np.frombuffer(buffer, dtype=np.uint64).reshape((count, 4)).copy()))
+        startNanos = min((int(events[:, 1].min()) for _, events in traces), default=0)
+
+        traceEvents = [{"name": "thread_name", "ph": "M", "pid": 0, "tid": tid, "args": {"name": name}}
+                       for name, tid in processIds.items()]
+        for Task, events in traces:
+            modelTags = [modelPair.ModelPtr.ModelTag for modelPair in Task.TaskData.TaskModels]
+            tid = processIds.get(taskProcesses.get(Task.Name), len(processIds))
+            for index, wallStart, wallDuration, simTime in events.tolist():
+                traceEvents.append({"name": modelTags[index], "cat": Task.Name, "ph": "X", "pid": 0, "tid": tid,
+                                    "ts": (wallStart - startNanos) * 1.0e-3, "dur": wallDuration * 1.0e-3,
+                                    "args": {"simTime": simTime * 1.0e-9}})
+        with open(fileName, "w") as traceFile:
+            json.dump({"traceEvents": traceEvents, "displayTimeUnit": "ms"}, traceFile)
+
+
     def ShowExecutionFigure(self, show_plots=False):
         """
         Shows in what order the Basilisk processes, task lists and modules are executed
@@ -326,6 +451,20 @@ class SimBaseClass:
         return proc
 
 
+    def DoubleBufferMessage(self, msg):
+        """
+        Makes a message thread-safe to read from processes that run on other threads than its author.  The writes
+        to the message are only seen by the subscribers at the end of each frame, see ``TotalSim.setFramePeriod()``,
+        so the results are the same however the processes are spread across the threads.  The simulation shares the
+        ownership of the message buffer, so the message may be deleted before the simulation.
+
+        :param msg: C++ message object, such as ``module.dataOutMsg``.  C message objects can't be double buffered.
+        :return:
+        """
+        if not hasattr(msg, "doubleBuffer"):
+            raise TypeError(f"{type(msg).__name__} can't be double buffered, only C++ message objects can")
+        self.TotalSim.addMessageBuffer(msg.doubleBuffer())
+
     def CreateNewTask(self, TaskName, TaskRate, InputDelay=None, FirstStart=0):
         """
         Creates a simulation task on the C-level with a specific update-frequency (TaskRate), an optional delay, and
@@ -11,9 +11,23 @@ with warnings.catch_warnings():
     from holoviews.streams import RangeXY
     from datashader.colors import Sets1to3
 from Basilisk.utilities import macros
+from Basilisk.utilities.MonteCarlo.DataWriter import ColumnarDataReader, isColumnarData
 
-def pull_and_format_df(path, varIdxLen):
-    df = pd.read_pickle(path)
+def pull_and_format_df(path, varIdxLen, runs=None, window=None):
+    """
+    Load the MonteCarlo dataframe of a retained variable
+
+    :param path: path to the ``<variable>.data`` file
+    :param varIdxLen: number of components of the variable
+    :param runs: optional list of runs to load, only used for columnar data
+    :param window: optional [start, stop] time window in nanoseconds, only used for columnar data
+    :return: dataframe indexed by time with (runNum, varIdx) MultiIndex columns
+    """
+    if isColumnarData(path):
+        # only the requested runs and time window are read from the memory-mapped columns
+        df = ColumnarDataReader(path).getDataFrame(runs, window)
+    else:
+        df = pd.read_pickle(path)
     if len(np.unique(df.columns.codes[1])) is not varIdxLen:
         print("Warning: " + path + " not formatted correctly!")
         newMultIndex = pd.MultiIndex.from_product([df.columns.codes[0], list(range(varIdxLen))], names=['runNum', 'varIdx'])
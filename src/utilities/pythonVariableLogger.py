@@ -1,4 +1,4 @@
-from typing import Callable, Any, Sequence, Union, Dict
+from typing import Callable, Any, Sequence, Union, Dict, Optional
 
 import numpy as np
 
@@ -6,6 +6,87 @@ from Basilisk.architecture import sysModel
 
 LoggingFunction = Callable[[int], Any]
 
+# number of samples collected before they are moved into the numpy buffers
+_CHUNK_SIZE = 256
+
+
+def _objects(samples) -> np.ndarray:
+    """1D object array of samples of different shapes"""
+    objects = np.empty(len(samples), dtype=object)
+    for i, value in enumerate(samples):
+        objects[i] = value.item() if np.ndim(value) == 0 else np.array(value)
+    return objects
+
+
+class _Column:
+    """The samples of a logged variable, stored in a numpy buffer whose first
+    axis grows geometrically. New samples are collected in a short list and
+    moved into the buffer in chunks, which costs less per sample than writing
+    each sample into the buffer.
+
+    The shape and dtype of the buffer are those of the first samples, and the
+    dtype is promoted if later samples need it (for example, an integer
+    variable that becomes a float). Samples whose shape differs from the first
+    ones turn the buffer into an object array."""
+
+    def __init__(self, dtype=None) -> None:
+        self.dtype = dtype
+        self.buffer = None
+        self.size = 0
+        self.pending = []
+        self._view = None
+
+    def __len__(self) -> int:
+        return self.size + len(self.pending)
+
+    def _resize(self, capacity, dtype, shape):
+        buffer = np.empty((capacity,) + shape, dtype=dtype)
+        if shape != self.buffer.shape[1:]:
+            buffer[:self.size] = _objects(self.buffer[:self.size])
+        else:
+            buffer[:self.size] = self.buffer[:self.size]
+        self.buffer = buffer
+
+    def _chunk(self):
+        try:
+            chunk = np.array(self.pending, dtype=self.dtype)
+        except ValueError:
+            # samples of different shapes
+            return _objects(self.pending)
+        return _objects(chunk) if chunk.dtype == object and chunk.ndim == 1 else chunk
+
+    def flush(self, capacity: int = 0) -> None:
+        """Move the pending samples into the buffer, allocated for at least
+        ``capacity`` samples"""
+        if not self.pending:
+            return
+        chunk = self._chunk()
+        self.pending.clear()
+        required = self.size + len(chunk)
+        if self.buffer is None:
+            self.buffer = np.empty((max(capacity, required),) + chunk.shape[1:], dtype=chunk.dtype)
+        else:
+            shape, dtype = self.buffer.shape[1:], np.result_type(self.buffer.dtype, chunk.dtype)
+            if chunk.shape[1:] != shape:
+                chunk = _objects(chunk)
+                shape, dtype = (), object
+            if required > len(self.buffer) or dtype != self.buffer.dtype or shape != self.buffer.shape[1:]:
+                self._resize(max(required, 2 * len(self.buffer)), dtype, shape)
+        self.buffer[self.size:required] = chunk
+        self.size = required
+        self._view = None
+
+    def values(self) -> np.ndarray:
+        """Read-only view of the samples, cached until the next sample"""
+        if self._view is None:
+            if self.buffer is None:
+                self._view = np.array([], dtype=self.dtype)
+            else:
+                self._view = self.buffer[:self.size]
+            self._view.flags.writeable = False
+        return self._view
+
+
 class PythonVariableLogger(sysModel.SysModel):
     """This a Python Module that will call one or multiple functions
     and store their results. After the simulation is over, these
@@ -25,12 +106,18 @@ class PythonVariableLogger(sysModel.SysModel):
         times        = log.times()
         timesSquared = log.a
         timesCubed   = log.b
+
+    The values of each variable are stored in a numpy array that takes the
+    shape and dtype of the first sample and grows geometrically. The arrays
+    returned by ``times()`` and by the variable attributes are read-only views
+    of this storage, and they are cached until the next sample is logged.
     """
 
     def __init__(
         self, 
         logging_functions: Dict[str, LoggingFunction], 
-        min_log_period: int = 0
+        min_log_period: int = 0,
+        stop_time: Optional[int] = None
     ) -> None:
         """Initializer.
 
@@ -42,23 +129,46 @@ class PythonVariableLogger(sysModel.SysModel):
                 called.
             min_log_period (int, optional): The minimum interval between data recordings
                 Defaults to 0.
+            stop_time (int, optional): The simulation stop time in nanoseconds. If given,
+                the storage is allocated for all the samples up to this time once
+                the interval between samples is known, instead of growing while
+                the simulation runs. Defaults to None.
         """
         super().__init__()
 
         self.logging_functions = logging_functions
 
         self.min_log_period = min_log_period
+        self.stop_time = stop_time
         self._next_update_time = 0
         self.clear()
 
     def clear(self):
         """Called to clear the internal data storages"""
-        self._times = []
-        self._variables = {name: [] for name in self.logging_functions}
+        self._times = _Column(np.int64)
+        self._variables = {name: _Column() for name in self.logging_functions}
 
     def times(self):
         """Retrieve the times when the data was logged"""
-        return np.array(self._times)
+        self._flush()
+        return self._times.values()
+
+    def _flush(self):
+        """Move the pending samples of all variables into their buffers"""
+        if not self._times.pending:
+            return
+        capacity = 0
+        times = self._times.pending
+        if self._times.buffer is None and self.stop_time is not None:
+            # preallocate for the samples up to the stop time
+            interval = self.min_log_period
+            if len(times) > 1:
+                interval = max(interval, times[1] - times[0])
+            if interval > 0:
+                capacity = len(times) + max(int(self.stop_time - times[-1]) // int(interval), 0)
+        self._times.flush(capacity)
+        for column in self._variables.values():
+            column.flush(capacity)
     
     def Reset(self, CurrentSimNanos):
         self.clear()
@@ -66,7 +176,8 @@ class PythonVariableLogger(sysModel.SysModel):
     
     def UpdateState(self, CurrentSimNanos):
         if CurrentSimNanos >= self._next_update_time:
-            self._times.append(CurrentSimNanos)
+            times = self._times.pending
+            times.append(CurrentSimNanos)
             for variable_name, logging_function in self.logging_functions.items():
                 try:
                     val = logging_function(CurrentSimNanos)
@@ -76,13 +187,16 @@ class PythonVariableLogger(sysModel.SysModel):
                                         f" in logger '{self.ModelTag}': {ex}")
                     val = None
                 val = np.array(val).squeeze()
-                self._variables[variable_name].append(val)
+                self._variables[variable_name].pending.append(val)
+            if len(times) >= _CHUNK_SIZE:
+                self._flush()
 
             self._next_update_time += self.min_log_period
         return super().UpdateState(CurrentSimNanos)
     
     def __getattr__(self, __name: str) -> Any:
         if __name in self._variables:
-            return np.array(self._variables[__name])
+            self._flush()
+            return self._variables[__name].values()
         raise AttributeError(f"Logger is not logging '{__name}'. "
                              f"Must be one of: {', '.join(self._variables)}")
@@ -497,6 +497,7 @@ def loadGravFromFile(
     fileName: str,
     spherHarm: gravityEffector.SphericalHarmonicsGravityModel,
     maxDeg: int = 2,
+    maxOrder: Optional[int] = None,
 ):
     """Load the gravitational body spherical harmonics coefficients from a file.
 
@@ -508,8 +509,10 @@ def loadGravFromFile(
             The spherical harmonics container of the gravity body.
         maxDeg (int, optional): Maximum degree of spherical harmonics to load.
             Defaults to 2.
+        maxOrder (int, optional): Maximum order of spherical harmonics to use.
+            Defaults to maxDeg.
     """
-    loadGravFromFile_python(fileName, spherHarm, maxDeg)
+    loadGravFromFile_python(fileName, spherHarm, maxDeg, maxOrder)
 
 
 def loadPolyFromFile(fileName: str, poly: gravityEffector.PolyhedralGravityModel):
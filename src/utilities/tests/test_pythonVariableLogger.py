@@ -0,0 +1,63 @@
+# ISC License
+#
+# Copyright (c) 2024, Autonomous Vehicle Systems Lab, University of Colorado at Boulder
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from Basilisk.utilities import pythonVariableLogger
+from Basilisk.utilities.pythonVariableLogger import PythonVariableLogger
+
+
+@pytest.mark.parametrize("stopTime", [None, 900])
+def test_pythonVariableLogger(monkeypatch, stopTime):
+    """Check the samples stored in the chunked numpy buffers of the logger"""
+    monkeypatch.setattr(pythonVariableLogger, "_CHUNK_SIZE", 4)
+    log = PythonVariableLogger({
+        "scalar": lambda t: t / 2,
+        "vector": lambda t: [[t], [2 * t], [3 * t]],
+        "promoted": lambda t: t if t < 500 else t + 0.5,
+        "ragged": lambda t: [1] * (1 + (t >= 500)),
+    }, stop_time=stopTime)
+    log.Reset(0)
+    times = np.arange(0, 1000, 100)
+    for t in times:
+        log.UpdateState(int(t))
+
+    assert_array_equal(log.times(), times)
+    assert_array_equal(log.scalar, times / 2)
+    assert_array_equal(log.vector, np.column_stack([times, 2 * times, 3 * times]))
+    assert log.promoted.dtype == np.float64
+    assert_array_equal(log.promoted, np.where(times < 500, times, times + 0.5))
+    assert log.ragged.dtype == object
+    assert log.ragged[0] == 1
+    assert_array_equal(log.ragged[-1], [1, 1])
+
+    # the views are cached and read-only
+    assert log.scalar is log.scalar
+    with pytest.raises(ValueError):
+        log.scalar[0] = 1.
+
+    view = log.scalar
+    log.UpdateState(1000)
+    assert len(view) == len(times)
+    assert_array_equal(log.scalar[-1], 500)
+
+    log.Reset(0)
+    assert len(log.times()) == 0
+    assert len(log.scalar) == 0
+    with pytest.raises(AttributeError):
+        log.missing